@@ -49,7 +49,23 @@ from tools.stream_analysis import online_calibration as online_cal_mod
 from tools.stream_analysis import online_fit as online_fit_mod
 from tools.stream_analysis import online_runtime as online_runtime_mod
 from tools.stream_analysis import online_tail as online_tail_mod
+from tools.stream_analysis.frame_container import (
+    CODEC_ZLIB as FRAME_CONTAINER_CODEC_ZLIB,
+    CONTAINER_FILENAME as FRAME_CONTAINER_FILENAME,
+    FrameContainerWriter,
+)
 from CaptureTypes import CaptureResult, CaptureSource, CaptureStatus
+from FramePersistence import (
+    DEFAULT_SAVE_PUT_TIMEOUT_S,
+    DEFAULT_SAVE_QUEUE_SIZE,
+    DEFAULT_SAVE_WORKERS,
+    SAVE_FORMAT_NPY,
+    SAVE_FORMATS,
+    FrameSaveStats,
+    OrderedJsonlWriter,
+    normalize_save_format,
+    write_frame_image,
+)
 from GravimetricLedger import (
     EjectionCommandEvent,
     EjectionLedgerSnapshot,
@@ -83,10 +99,19 @@ from CalibrationRecordingReader import (
     CalibrationRecordingReader,
     repair_calibration_index,
 )
+from RefuelLevelDetector import RefuelLevelDetector
 
 
 LOGGER = logging.getLogger(__name__)
 
+# Set to 1 to store recorder captures and camera frame archives in one
+# frames.lcfc container per directory instead of one image file per frame.
+FRAME_CONTAINER_ENV = "LABCRAFT_CALIBRATION_FRAME_CONTAINER"
+
+
+def _frame_container_enabled() -> bool:
+    return str(os.environ.get(FRAME_CONTAINER_ENV, "0")).strip() == "1"
+
 
 def _freeze_candidate_value(value):
     if isinstance(value, Mapping):
@@ -585,8 +610,13 @@ class CalibrationProcessRecorder:
     SCHEMA_VERSION = 1
     CAPTURE_WRITE_DRAIN_TIMEOUT_S = 5.0
 
-    def __init__(self, model):
+    def __init__(self, model, *, frame_container: bool | None = None):
         self.model = model
+        # Captures go to captures/frames.lcfc instead of loose files when enabled;
+        # None follows LABCRAFT_CALIBRATION_FRAME_CONTAINER.
+        self.frame_container = (
+            _frame_container_enabled() if frame_container is None else bool(frame_container)
+        )
         self._lock = threading.Lock()
         self._capture_write_condition = threading.Condition(self._lock)
         self._active = None
@@ -716,9 +746,17 @@ class CalibrationProcessRecorder:
             capture_ref = dict(job.get("capture_ref") or {})
             try:
                 out = self._prepare_image_for_write(job.get("image"))
-                ok = cv2.imwrite(str(job.get("abspath")), out)
-                if not ok:
-                    raise IOError(f"Failed to write capture image: {job.get('abspath')}")
+                container = run.get("frame_container")
+                if container is not None:
+                    container.append(
+                        os.path.basename(str(job.get("abspath"))),
+                        out,
+                        capture_index=capture_ref.get("capture_index"),
+                    )
+                else:
+                    ok = cv2.imwrite(str(job.get("abspath")), out)
+                    if not ok:
+                        raise IOError(f"Failed to write capture image: {job.get('abspath')}")
                 event_payload = {
                     "capture_id": capture_ref.get("capture_id"),
                     "capture_role": capture_ref.get("capture_role"),
@@ -837,6 +875,11 @@ class CalibrationProcessRecorder:
                 "event_index": 0,
                 "capture_policy": requested_policy.storage_name,
                 "minimum_capture_policy": minimum_policy.storage_name,
+                "frame_container": (
+                    FrameContainerWriter(os.path.join(captures_dir, FRAME_CONTAINER_FILENAME))
+                    if self.frame_container
+                    else None
+                ),
             }
 
             meta = {
@@ -1064,6 +1107,9 @@ class CalibrationProcessRecorder:
                 )
 
         self._stop_capture_write_worker()
+        container = run.get("frame_container")
+        if container is not None:
+            container.close()
 
         with self._lock:
             managed_run_meta = bool(run.get("managed_run_meta", False))
@@ -34519,6 +34565,39 @@ class DropletTimecourseProcess(BaseCalibrationProcess):
         self.calibrationCompleted.emit()
 
 
+class DropletBackgroundModel:
+    """Grayscale form of one background capture, shared by the diff-based analyzers.
+
+    A sweep step analyzes many frames against the same background, so the
+    conversion is done once.  ``matches`` rejects a different capture, a
+    capture buffer that was refilled in place, a shape (ROI) change and an
+    exposure change.
+    """
+
+    FINGERPRINT_STRIDE_PX = 61
+
+    def __init__(self, background, *, exposure_time=None):
+        self.source = background
+        self.shape = tuple(background.shape)
+        self.exposure_time = exposure_time
+        self.fingerprint = self._fingerprint(background)
+        self.gray = cv2.cvtColor(background, cv2.COLOR_BGR2GRAY)
+        self.gray.setflags(write=False)
+
+    @classmethod
+    def _fingerprint(cls, background):
+        stride = cls.FINGERPRINT_STRIDE_PX
+        return hash(np.ascontiguousarray(background[::stride, ::stride]).tobytes())
+
+    def matches(self, background, *, exposure_time=None):
+        return (
+            background is self.source
+            and tuple(background.shape) == self.shape
+            and exposure_time == self.exposure_time
+            and self._fingerprint(background) == self.fingerprint
+        )
+
+
 class DropletCameraModel(QObject):
     droplet_image_updated = Signal()
     flash_signal = Signal()
@@ -34565,6 +34644,7 @@ class DropletCameraModel(QObject):
 
         self._k3 = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
         self._roi_cache = None  # (h, w, nzy, margin_up, band_half, roi_top, mask)
+        self._background_model = None  # DropletBackgroundModel for the last background used
         self._last_droplet_center_px = None
 
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -34580,14 +34660,20 @@ class DropletCameraModel(QObject):
         self._save_prefix = "frame"
         self._save_ext = "jpg"
         self._jpeg_quality = 95
+        self._png_compression = None
         self._save_index = 0
 
-        self._save_queue = queue.Queue(maxsize=256)
+        self._save_queue = queue.Queue(maxsize=DEFAULT_SAVE_QUEUE_SIZE)
         self._save_stop_evt = threading.Event()
-        self._save_thread = None
-        self._meta_fp = None
+        self._save_threads = []
+        self._save_workers = DEFAULT_SAVE_WORKERS
+        self._save_put_timeout_s = DEFAULT_SAVE_PUT_TIMEOUT_S
+        self._save_seq = itertools.count(1)
+        self._save_stats = FrameSaveStats()
+        self._last_save_stats = None
+        self._meta_writer = None
+        self._frame_container = None
         self._analysis_fp = None
-        self._meta_lock = threading.Lock()
         self._analysis_lock = threading.Lock()
         self._shutdown_complete = False
 
@@ -35023,6 +35109,7 @@ class DropletCameraModel(QObject):
         if self.exposure_time == value:
             return False
         self.exposure_time = value
+        self._background_model = None
         self.flash_signal.emit()
         return True
 
@@ -35112,11 +35199,32 @@ class DropletCameraModel(QObject):
         create_subdir: bool = True,
         image_ext: str = "jpg",
         jpeg_quality: int = 95,
+        png_compression: int | None = None,
+        save_workers: int = DEFAULT_SAVE_WORKERS,
+        save_queue_size: int = DEFAULT_SAVE_QUEUE_SIZE,
+        save_put_timeout_s: float = DEFAULT_SAVE_PUT_TIMEOUT_S,
+        frame_container: bool | None = None,
+        container_codec: str = FRAME_CONTAINER_CODEC_ZLIB,
     ):
         """
         Enables saving of every captured frame into a *new directory*.
         Returns the active save directory.
+
+        Frames are encoded by ``save_workers`` threads (jpg, png at
+        ``png_compression`` 0-9, or raw RGB ``npy``). When the queue is full a
+        producer waits up to ``save_put_timeout_s`` before the frame is counted
+        as dropped; see ``get_save_stats()``.
+
+        With ``frame_container`` every frame and aux image is appended to one
+        ``frames.lcfc`` file (``container_codec`` raw/zlib/png) instead of a
+        file per image. Metadata rows keep their usual filenames, which the
+        stream-analysis readers resolve through the container. ``None`` follows
+        the ``LABCRAFT_CALIBRATION_FRAME_CONTAINER`` setting.
         """
+        save_format = normalize_save_format(image_ext)
+        if save_format not in SAVE_FORMATS:
+            raise ValueError(f"Unsupported image format for saving: {image_ext}")
+
         # If already saving, stop and start fresh (new folder)
         if self._saving_enabled:
             self.stop_saving()
@@ -35137,16 +35245,33 @@ class DropletCameraModel(QObject):
 
         self._save_dir = save_dir
         self._save_prefix = "frame" if str(prefix or "capture") == "capture" else str(prefix)
-        self._save_ext = image_ext.lstrip(".").lower()
+        self._save_ext = save_format
         self._jpeg_quality = int(jpeg_quality)
+        self._png_compression = None if png_compression is None else int(png_compression)
         self._save_index = 0
+        self._save_workers = max(1, int(save_workers or 1))
+        self._save_put_timeout_s = max(0.0, float(save_put_timeout_s or 0.0))
+        if self._save_queue.maxsize != int(save_queue_size) and self._save_queue.empty():
+            self._save_queue = queue.Queue(maxsize=max(1, int(save_queue_size)))
+        self._save_seq = itertools.count(1)
+        self._save_stats = FrameSaveStats()
+        self._last_save_stats = None
+
+        self._frame_container = None
+        if frame_container is None:
+            frame_container = _frame_container_enabled()
+        if frame_container:
+            self._frame_container = FrameContainerWriter(
+                os.path.join(self._save_dir, FRAME_CONTAINER_FILENAME),
+                codec=container_codec,
+            )
 
-        # metadata jsonl
+        # metadata jsonl; block-buffered because the writer flushes in batches
         try:
             meta_path = os.path.join(self._save_dir, "metadata.jsonl")
-            self._meta_fp = open(meta_path, "a", buffering=1)
+            self._meta_writer = OrderedJsonlWriter(open(meta_path, "a"))
         except Exception as e:
-            self._meta_fp = None
+            self._meta_writer = None
             print(f"[DropletCameraModel] Could not open metadata.jsonl: {e}")
 
         # analysis jsonl (NEW)
@@ -35202,6 +35327,7 @@ class DropletCameraModel(QObject):
                 break
             else:
                 dropped += 1
+                self._save_stats.record_dropped()
                 try:
                     self._save_queue.task_done()
                 except Exception:
@@ -35236,11 +35362,21 @@ class DropletCameraModel(QObject):
 
         # close metadata file
         try:
-            if self._meta_fp:
-                self._meta_fp.close()
+            if self._meta_writer:
+                self._meta_writer.close()
         except Exception:
             pass
-        self._meta_fp = None
+
+        try:
+            if self._frame_container:
+                self._frame_container.close()
+        except Exception as e:
+            print(f"[DropletCameraModel] Failed to close frame container: {e}")
+
+        self._last_save_stats = self.get_save_stats()
+        self.write_json("save_stats.json", self._last_save_stats)
+        self._meta_writer = None
+        self._frame_container = None
 
         try:
             if self._analysis_fp:
@@ -35249,7 +35385,12 @@ class DropletCameraModel(QObject):
             pass
         self._analysis_fp = None
 
-        print(f"[DropletCameraModel] Saving stopped (dir was {self._save_dir})")
+        stats = self._last_save_stats
+        print(
+            f"[DropletCameraModel] Saving stopped (dir was {self._save_dir}); "
+            f"saved={stats['saved']} dropped={stats['dropped_frames']} "
+            f"queue_high_water={stats['queue_depth_high_water']} encode_ms_p95={stats['encode_ms_p95']}"
+        )
         self._save_dir = None
         self._last_saved = None
 
@@ -35301,9 +35442,7 @@ class DropletCameraModel(QObject):
             "capture_info": capture_info,
         }
 
-        try:
-            self._save_queue.put_nowait((fpath, frame.copy(), meta))
-        except queue.Full:
+        if not self._enqueue_save_job(fpath, frame, meta):
             print("[DropletCameraModel] Save queue full — dropping frame.")
             return None
 
@@ -35331,12 +35470,10 @@ class DropletCameraModel(QObject):
         if meta_extra:
             meta.update(meta_extra)
 
-        try:
-            self._save_queue.put_nowait((fpath, image.copy(), meta))
-            return fpath
-        except queue.Full:
+        if not self._enqueue_save_job(fpath, image, meta):
             print("[DropletCameraModel] Save queue full — dropping aux image.")
             return None
+        return fpath
 
     def append_analysis_record(self, record: dict):
         """
@@ -35406,22 +35543,68 @@ class DropletCameraModel(QObject):
                 return cand
         raise RuntimeError("Could not create a unique capture directory (too many collisions).")
 
+    def _enqueue_save_job(self, path: str, image: np.ndarray, meta: dict) -> bool:
+        """
+        Queue a copy of ``image`` for the encoder pool. A full queue blocks for up
+        to ``_save_put_timeout_s`` so a short encode backlog costs a brief wait
+        instead of a lost frame.
+        """
+        seq = next(self._save_seq)
+        if self._frame_container is not None:
+            meta = dict(meta, container=FRAME_CONTAINER_FILENAME)
+        elif self._save_ext == SAVE_FORMAT_NPY:
+            meta = dict(meta, color_order="rgb")
+        item = (seq, path, image.copy(), meta)
+        waited = False
+        try:
+            self._save_queue.put_nowait(item)
+        except queue.Full:
+            waited = True
+            try:
+                self._save_queue.put(item, timeout=self._save_put_timeout_s)
+            except queue.Full:
+                self._save_stats.record_dropped()
+                if self._meta_writer:
+                    self._meta_writer.skip(seq)
+                return False
+        self._save_stats.record_enqueued(self._save_queue.qsize(), waited=waited)
+        return True
+
+    def get_save_stats(self) -> dict:
+        """Counters for the current (or last) saving session."""
+        stats = self._save_stats.snapshot()
+        stats["save_workers"] = int(self._save_workers)
+        stats["save_format"] = self._save_ext
+        stats["queue_capacity"] = int(self._save_queue.maxsize)
+        stats["queue_depth"] = self._save_queue_pending_count()
+        stats["metadata_flushes"] = self._meta_writer.flush_count if self._meta_writer else None
+        stats["container_frames"] = self._frame_container.frame_count if self._frame_container else None
+        return stats
+
     def _start_save_thread(self):
-        if self._save_thread and self._save_thread.is_alive():
+        self._save_threads = [thread for thread in self._save_threads if thread.is_alive()]
+        if self._save_threads:
             return
         self._save_stop_evt.clear()
-        self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
-        self._save_thread.start()
+        for worker_index in range(max(1, int(self._save_workers))):
+            thread = threading.Thread(
+                target=self._save_worker,
+                name=f"droplet-frame-writer-{worker_index}",
+                daemon=True,
+            )
+            thread.start()
+            self._save_threads.append(thread)
 
     def _stop_save_thread(self):
         self._save_stop_evt.set()
-        if self._save_thread:
-            self._save_thread.join(timeout=3.0)
-            self._save_thread = None
+        for thread in self._save_threads:
+            thread.join(timeout=3.0)
+        self._save_threads = []
 
     def _save_worker(self):
         """
-        Background writer: pulls (path, image_rgb, meta_dict) and writes to disk.
+        Background writer: pulls (seq, path, image_rgb, meta_dict), encodes the
+        image and commits its metadata in sequence order once it is on disk.
         """
         while (not self._save_stop_evt.is_set()) or (not self._save_queue.empty()):
             try:
@@ -35430,33 +35613,42 @@ class DropletCameraModel(QObject):
                 continue
 
             if item is None:
+                self._save_queue.task_done()
                 continue
 
-            path, img_rgb, meta = item
+            seq, path, img_rgb, meta = item
+            record = None
             try:
-                # cv2.imwrite expects BGR; your frames are RGB
-                img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-
-                if self._save_ext.lower() in ("jpg", "jpeg"):
-                    cv2.imwrite(
-                        path,
-                        img_bgr,
-                        [int(cv2.IMWRITE_JPEG_QUALITY), int(self._jpeg_quality)]
+                started = time.perf_counter()
+                container = self._frame_container
+                if container is not None:
+                    is_frame = meta.get("kind", "frame") == "frame"
+                    container.append(
+                        os.path.basename(path),
+                        img_rgb,
+                        capture_index=meta.get("index") if is_frame else -1,
+                        color_order="rgb",
                     )
                 else:
-                    # png or others
-                    cv2.imwrite(path, img_bgr)
-
-                # append metadata jsonl
-                if self._meta_fp:
-                    with self._meta_lock:
-                        self._meta_fp.write(json.dumps(meta, default=str) + "\n")
-                        self._meta_fp.flush()
-
+                    write_frame_image(
+                        path,
+                        img_rgb,
+                        self._save_ext,
+                        jpeg_quality=self._jpeg_quality,
+                        png_compression=self._png_compression,
+                    )
+                self._save_stats.record_saved((time.perf_counter() - started) * 1000.0)
+                record = meta
             except Exception as e:
                 # don’t crash the writer; log and continue
+                self._save_stats.record_failed()
                 print(f"[DropletCameraModel] Failed to save {path}: {e}")
             finally:
+                try:
+                    if self._meta_writer:
+                        self._meta_writer.commit(seq, record)
+                except Exception as e:
+                    print(f"[DropletCameraModel] Failed to write metadata for {path}: {e}")
                 try:
                     self._save_queue.task_done()
                 except Exception:
@@ -35532,16 +35724,14 @@ class DropletCameraModel(QObject):
                         continue
                     meta[key] = value
 
-            # hand a copy to the writer to avoid accidental mutation
-            try:
-                self._save_queue.put_nowait((fpath, frame.copy(), meta))
+            if self._enqueue_save_job(fpath, frame, meta):
                 self._last_saved = {
                     "index": int(self._save_index),
                     "filename": fname,
                     "path": fpath,
                     "saved_at": meta["saved_at"],
                 }
-            except queue.Full:
+            else:
                 print("[DropletCameraModel] Save queue full — dropping frame.")
 
         # continue your usual flow (emit, analyze, etc.)
@@ -35759,6 +35949,17 @@ class DropletCameraModel(QObject):
 
         return droplet_results, annotated
 
+    def background_model(self, background):
+        """
+        Return the grayscale background model, rebuilt only for a new background capture.
+        """
+        exposure_time = getattr(self, "exposure_time", None)
+        model = getattr(self, "_background_model", None)
+        if model is None or not model.matches(background, exposure_time=exposure_time):
+            model = DropletBackgroundModel(background, exposure_time=exposure_time)
+            self._background_model = model
+        return model
+
     def calc_diff_image(self,image, background):
         """
         Compute the difference image between the image and the background.
@@ -35774,7 +35975,7 @@ class DropletCameraModel(QObject):
             diff = cv2.bitwise_not(image_gray)
 
         else:
-            background_gray = cv2.cvtColor(background, cv2.COLOR_BGR2GRAY)
+            background_gray = self.background_model(background).gray
 
             # Compute the absolute difference between the background and the image
             diff = cv2.absdiff(background_gray, image_gray)
@@ -35797,7 +35998,7 @@ class DropletCameraModel(QObject):
             dark = cv2.bitwise_not(image_gray)
             return image_gray, dark
 
-        bg_gray = cv2.cvtColor(background, cv2.COLOR_BGR2GRAY)
+        bg_gray = self.background_model(background).gray
         # Saturating subtraction: negative values get clamped to 0
         # => only pixels that got darker are nonzero
         dark = cv2.subtract(bg_gray, image_gray)
@@ -36077,45 +36278,48 @@ class DropletCameraModel(QObject):
                     return 0.0
                 return float(np.percentile(patch_roi, 95))
 
-            def _horizontal_overlap_px(a, b):
-                ax, _ay, aw, _ah = [int(v) for v in a.get("bbox", [0, 0, 0, 0])]
-                bx, _by, bw, _bh = [int(v) for v in b.get("bbox", [0, 0, 0, 0])]
-                return int(max(0, min(ax + aw, bx + bw) - max(ax, bx)))
-
             stacked_challengers = []
             bx, by, bw, bh = [int(v) for v in base_chosen.get("bbox", [0, 0, 0, 0])]
             base_bottom = int(base_chosen.get("bottom", by + bh))
             base_area = float(base_chosen.get("contour_area", 0.0))
             base_x_pen = float(base_chosen.get("x_pen", 0.0))
-            for candidate in keep[1:]:
-                if int(candidate.get("pri", 99)) > int(base_chosen.get("pri", 99)):
-                    continue
-                cx0, cy0, cw, ch = [int(v) for v in candidate.get("bbox", [0, 0, 0, 0])]
-                candidate_bottom = int(candidate.get("bottom", cy0 + ch))
-                candidate_area = float(candidate.get("contour_area", 0.0))
-                if cy0 <= by or candidate_bottom <= base_bottom:
-                    continue
-                vertical_gap = int(cy0 - base_bottom)
-                max_vertical_gap = int(max(24, round(0.75 * float(max(ch, bh, 1)))))
-                if vertical_gap > max_vertical_gap:
-                    continue
-
-                overlap_px = _horizontal_overlap_px(base_chosen, candidate)
-                min_width = int(max(1, min(cw, bw)))
-                center_dx = abs(float(cx0 + cw / 2.0) - float(bx + bw / 2.0))
-                if overlap_px < int(round(0.25 * float(min_width))) and center_dx > max(24.0, 0.35 * float(min_width)):
-                    continue
-
-                candidate_x_pen = float(candidate.get("x_pen", 0.0))
-                if candidate_x_pen > max(base_x_pen + 80.0, 120.0):
-                    continue
-                if candidate_area < max(float(min_contour_area) * 8.0, 0.15 * max(base_area, 1.0)):
-                    continue
-                candidate_p95 = _candidate_patch_p95(candidate)
-                if candidate_p95 < float(min_peak_delta):
-                    continue
-                candidate["stacked_p95"] = float(candidate_p95)
-                stacked_challengers.append(candidate)
+            others = keep[1:]
+            if others:
+                # Geometry gates for every remaining candidate at once; only
+                # survivors pay for the patch percentile.
+                boxes = np.asarray([d["bbox"] for d in others], dtype=np.int64).reshape(-1, 4)
+                cx0, cy0, cw, ch = boxes.T
+                candidate_bottom = np.asarray([d["bottom"] for d in others], dtype=np.int64)
+                candidate_area = np.asarray([d["contour_area"] for d in others], dtype=float)
+                candidate_x_pen = np.asarray([d["x_pen"] for d in others], dtype=float)
+                candidate_pri = np.asarray([d["pri"] for d in others], dtype=np.int64)
+
+                max_vertical_gap = np.maximum(
+                    24,
+                    np.round(0.75 * np.maximum(np.maximum(ch, bh), 1).astype(float)).astype(np.int64),
+                )
+                overlap_px = np.maximum(0, np.minimum(bx + bw, cx0 + cw) - np.maximum(bx, cx0))
+                min_width = np.maximum(1, np.minimum(cw, bw))
+                center_dx = np.abs((cx0 + cw / 2.0) - float(bx + bw / 2.0))
+                viable = (
+                    (candidate_pri <= int(base_chosen.get("pri", 99)))
+                    & (cy0 > by)
+                    & (candidate_bottom > base_bottom)
+                    & ((cy0 - base_bottom) <= max_vertical_gap)
+                    & ~(
+                        (overlap_px < np.round(0.25 * min_width.astype(float)).astype(np.int64))
+                        & (center_dx > np.maximum(24.0, 0.35 * min_width.astype(float)))
+                    )
+                    & (candidate_x_pen <= max(base_x_pen + 80.0, 120.0))
+                    & (candidate_area >= max(float(min_contour_area) * 8.0, 0.15 * max(base_area, 1.0)))
+                )
+                for index in np.flatnonzero(viable):
+                    candidate = others[int(index)]
+                    candidate_p95 = _candidate_patch_p95(candidate)
+                    if candidate_p95 < float(min_peak_delta):
+                        continue
+                    candidate["stacked_p95"] = float(candidate_p95)
+                    stacked_challengers.append(candidate)
 
             details["stacked_candidate_count"] = int(len(stacked_challengers))
             if stacked_challengers:
@@ -36254,6 +36458,42 @@ class DropletCameraModel(QObject):
             return area, center, overlay, details
         return area, center, overlay
 
+    @staticmethod
+    def _mask_row_widths(mask):
+        """Return the first-to-last foreground span of every mask row (0 for empty rows)."""
+        fg = np.asarray(mask) > 0
+        if fg.size == 0:
+            return np.zeros(fg.shape[:1], dtype=np.int64)
+        occupied = fg.any(axis=1)
+        first = np.argmax(fg, axis=1)
+        last = fg.shape[1] - 1 - np.argmax(fg[:, ::-1], axis=1)
+        return np.where(occupied, last - first + 1, 0).astype(np.int64)
+
+    @staticmethod
+    def _neck_candidate_rows(profile, search_start, search_stop, min_distal_widening):
+        """
+        Return profile indices that are local minima followed by at least
+        ``min_distal_widening`` of distal widening, best candidate first
+        (largest widening, then narrowest, then most distal).
+        """
+        profile = np.asarray(profile, dtype=float)
+        lo = int(max(1, search_start))
+        hi = int(min(max(search_start, search_stop), len(profile) - 2))
+        if hi <= lo:
+            return np.zeros(0, dtype=np.int64)
+        idx = np.arange(lo, hi, dtype=np.int64)
+        cur = profile[idx]
+        distal_max = np.maximum.accumulate(profile[::-1])[::-1]
+        widening = distal_max[idx + 1] - cur
+        keep = (
+            (cur <= profile[idx - 1])
+            & (cur <= profile[idx + 1])
+            & (widening >= float(min_distal_widening))
+        )
+        idx = idx[keep]
+        order = np.lexsort((-idx, cur[keep], -widening[keep]))
+        return idx[order]
+
     def _fill_binary_holes(self, mask):
         work = np.uint8(mask > 0) * 255
         if work.size == 0:
@@ -36323,7 +36563,7 @@ class DropletCameraModel(QObject):
                 return metrics, overlay, details
             return metrics, overlay
 
-        bg_gray = cv2.cvtColor(background, cv2.COLOR_BGR2GRAY)
+        bg_gray = self.background_model(background).gray
         signal = cv2.absdiff(bg_gray, _img_gray)
 
         h, w = dark.shape[:2]
@@ -36419,25 +36659,22 @@ class DropletCameraModel(QObject):
             np.uint8(weak_mask > 0),
             connectivity=8,
         )
+        # Per-label strong overlap and nozzle contact in one pass over the ROI.
+        strong_overlap_by_label = np.bincount(labels[strong_mask > 0], minlength=nlab)
+        contact_by_label = np.bincount(
+            labels[contact_y0:contact_y1, contact_x0:contact_x1].ravel(),
+            minlength=nlab,
+        )
         candidates = []
-        for lab in range(1, nlab):
-            rx, ry, rw, rh, area = [int(v) for v in stats[lab]]
-            if area < int(min_contour_area):
+        for lab in np.flatnonzero(stats[:, cv2.CC_STAT_AREA] >= int(min_contour_area)):
+            if lab == 0:
                 continue
-            comp_mask = np.uint8(labels[ry:ry + rh, rx:rx + rw] == lab) * 255
-            strong_view = strong_mask[ry:ry + rh, rx:rx + rw]
-            strong_overlap_px = int(np.count_nonzero((comp_mask > 0) & (strong_view > 0)))
+            rx, ry, rw, rh, area = [int(v) for v in stats[lab]]
+            strong_overlap_px = int(strong_overlap_by_label[lab])
             fx = int(rx + x0)
             fy = int(ry + y0)
             bottom = int(fy + rh)
-            nozzle_contact = False
-            cx0 = max(rx, contact_x0)
-            cy0 = max(ry, contact_y0)
-            cx1 = min(rx + rw, contact_x1)
-            cy1 = min(ry + rh, contact_y1)
-            if cx1 > cx0 and cy1 > cy0:
-                comp_view = comp_mask[(cy0 - ry):(cy1 - ry), (cx0 - rx):(cx1 - rx)]
-                nozzle_contact = bool(np.any(comp_view > 0))
+            nozzle_contact = bool(contact_by_label[lab] > 0)
             contour_class = "ambiguous"
             if nozzle_contact or (fy <= (nzy + 6) and bottom >= (nzy + 2)):
                 contour_class = "attached"
@@ -36451,7 +36688,7 @@ class DropletCameraModel(QObject):
                     "pri": int(pri),
                     "x_pen": float(abs((fx + rw / 2.0) - nzx)),
                     "bottom": int(bottom),
-                    "component_mask": comp_mask,
+                    "label": int(lab),
                     "component_area_px": int(area),
                     "strong_overlap_px": int(strong_overlap_px),
                     "seed_contact_detected": bool(nozzle_contact),
@@ -36499,7 +36736,8 @@ class DropletCameraModel(QObject):
             for item in list(candidates[1:])
             if str(item.get("contour_class", "")) == "detached"
         ]
-        comp_mask = np.uint8(chosen["component_mask"])
+        crx, cry, crw, crh = [int(v) for v in stats[chosen["label"], :4]]
+        comp_mask = np.uint8(labels[cry:cry + crh, crx:crx + crw] == chosen["label"]) * 255
         comp_mask = self._fill_binary_holes(comp_mask)
         comp_mask = cv2.morphologyEx(comp_mask, cv2.MORPH_CLOSE, fill_kernel, iterations=1)
         contours_local, _ = cv2.findContours(comp_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -36588,17 +36826,13 @@ class DropletCameraModel(QObject):
 
         row_start = int(max(0, nzy - y))
         row_end = int(min(hh - 1, max(0, chosen["bottom"] - 1 - y)))
-        while row_start <= row_end and not np.any(mask[row_start] > 0):
-            row_start += 1
-        widths = []
-        row_positions = []
-        if row_end >= row_start:
-            for row_idx in range(row_start, row_end + 1):
-                xs = np.where(mask[row_idx] > 0)[0]
-                widths.append(int(xs[-1] - xs[0] + 1) if xs.size else 0)
-                row_positions.append(int(y + row_idx))
-
-        if not widths:
+        mask_row_widths = self._mask_row_widths(mask)
+        occupied_rows = np.flatnonzero(mask_row_widths[row_start:row_end + 1] > 0)
+        row_start = int(row_start + occupied_rows[0]) if occupied_rows.size else int(max(row_start, row_end + 1))
+        widths = mask_row_widths[row_start:row_end + 1]
+        row_positions = np.arange(row_start, row_start + widths.size, dtype=np.int64) + int(y)
+
+        if widths.size == 0:
             details.update({"status": "none", "reason": "no_row_profile"})
             if return_details:
                 return metrics, overlay, details
@@ -36620,7 +36854,7 @@ class DropletCameraModel(QObject):
             smoothed = widths_arr
 
         search_start = int(min(max(1, 4), max(1, len(smoothed) - 1)))
-        max_width = int(max(widths))
+        max_width = int(widths.max())
         tip_idx = int(max(0, len(smoothed) - 1))
         tip_y = int(row_positions[tip_idx])
         tip_width = int(max(0, round(smoothed[tip_idx]))) if len(smoothed) else 0
@@ -36630,33 +36864,10 @@ class DropletCameraModel(QObject):
             tail_guard = int(min(max(2, tail_guard), max(2, len(smoothed) - search_start - 1)))
         candidate_stop = int(max(search_start + 1, len(smoothed) - tail_guard))
         min_distal_widening = float(max(6.0, 0.12 * float(max_width)))
-        neck_candidates = []
-        for idx in range(search_start, max(search_start, candidate_stop)):
-            if idx <= 0 or idx >= (len(smoothed) - 1):
-                continue
-            cur = float(smoothed[idx])
-            prev_val = float(smoothed[idx - 1])
-            next_val = float(smoothed[idx + 1])
-            if cur > prev_val or cur > next_val:
-                continue
-            distal_profile = smoothed[idx + 1:]
-            if len(distal_profile) < 2:
-                continue
-            distal_max = float(np.max(distal_profile))
-            distal_widening = float(distal_max - cur)
-            if distal_widening < min_distal_widening:
-                continue
-            neck_candidates.append(
-                (
-                    -float(distal_widening),
-                    float(cur),
-                    -int(idx),
-                    int(idx),
-                )
-            )
+        neck_candidates = self._neck_candidate_rows(smoothed, search_start, candidate_stop, min_distal_widening)
 
-        if neck_candidates:
-            neck_idx = int(sorted(neck_candidates)[0][3])
+        if neck_candidates.size:
+            neck_idx = int(neck_candidates[0])
             neck_selection_reason = "local_min_before_distal_widening"
         elif candidate_stop > search_start:
             neck_idx = int(np.argmin(smoothed[search_start:candidate_stop]) + search_start)
@@ -36686,17 +36897,20 @@ class DropletCameraModel(QObject):
         min_peak_separation = int(max(4, round(0.08 * float(len(lobe_profile)))))
         peak_positions = []
         if len(distal_profile) >= 3:
-            for idx in range(1, len(distal_profile) - 1):
-                if distal_profile[idx] >= distal_profile[idx - 1] and distal_profile[idx] > distal_profile[idx + 1]:
-                    if distal_profile[idx] < max(8.0, 0.72 * float(distal_max_width)):
-                        continue
-                    global_idx = int(idx + distal_start)
-                    if peak_positions and (global_idx - peak_positions[-1]) < min_peak_separation:
-                        prev_idx = int(peak_positions[-1])
-                        if float(lobe_profile[global_idx]) > float(lobe_profile[prev_idx]):
-                            peak_positions[-1] = int(global_idx)
-                        continue
-                    peak_positions.append(int(global_idx))
+            inner = distal_profile[1:-1]
+            is_peak = (
+                (inner >= distal_profile[:-2])
+                & (inner > distal_profile[2:])
+                & (inner >= max(8.0, 0.72 * float(distal_max_width)))
+            )
+            for idx in np.flatnonzero(is_peak) + 1:
+                global_idx = int(idx + distal_start)
+                if peak_positions and (global_idx - peak_positions[-1]) < min_peak_separation:
+                    prev_idx = int(peak_positions[-1])
+                    if float(lobe_profile[global_idx]) > float(lobe_profile[prev_idx]):
+                        peak_positions[-1] = int(global_idx)
+                    continue
+                peak_positions.append(int(global_idx))
         secondary_lobe_count = int(max(0, len(peak_positions) - 1))
         bulb_present = bool(max_width >= max(10, int(round(neck_width * 1.35))) and distal_area > 0)
 
@@ -37480,69 +37694,10 @@ class DropletCameraModel(QObject):
 
 
 
-class ImageAnalysisThread(QThread):
-    # Define signals to send results back to the main thread
-    # analysis_done = Signal(object,object,object,object)  # Send original, thresholded, and analyzed image and result
+class ImageAnalysisThread(RefuelLevelDetector, QThread):
+    """One-shot QThread around ``RefuelLevelDetector`` that emits its result through ``analysis_done``."""
+
     analysis_done = Signal(object, object, object, object)  # Send original, annotated image, level, and meniscus row
-    CANONICAL_ANALYSIS_HEIGHT = 480
-    CANONICAL_ANALYSIS_WIDTH = 640
-    ANALYSIS_PREPROCESSING_MODE = "aspect_preserving_long_side_640"
-    TRACKING_WINDOW_PX = 30
-    TRACKING_PROMINENCE_RATIO = 0.70
-    TOP_TIE_GUARD_PX = 25
-    TOP_TIE_PROMINENCE_RATIO = 0.85
-    BOTTOM_TIE_PROMINENCE_RATIO = 0.70
-    BOTTOM_CLUSTER_PROMINENCE_RATIO = 0.70
-    TOP_VISIBLE_PROMINENCE_MIN = 5.0
-    FULL_TOP_GUARD_PX = 8
-    BOTTOM_ARTIFACT_GUARD_PX = 25
-    SHORT_CHANNEL_MAX_HEIGHT_PX = 80
-    SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN = 10.0
-    TOP_EDGE_VISIBLE_PROMINENCE_MIN = 8.0
-    TOP_NEAR_VISIBLE_PROMINENCE_MIN = 9.5
-    TOP_BAND_VISIBLE_PROMINENCE_MIN = 10.0
-    MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX = -1
-    BOTTOM_POLARITY_PRE_OUTER_PX = 14
-    BOTTOM_POLARITY_PRE_INNER_PX = 2
-    BOTTOM_POLARITY_POST_INNER_PX = 1
-    BOTTOM_POLARITY_POST_OUTER_PX = 9
-    BOTTOM_POLARITY_REJECT_DELTA_MAX = -20.0
-    BOTTOM_POLARITY_REJECT_SLOPE_MAX = -1.4
-    BOTTOM_BRIGHTNESS_PRE_OUTER_PX = 35
-    BOTTOM_BRIGHTNESS_PRE_INNER_PX = 3
-    BOTTOM_BRIGHTNESS_POST_INNER_PX = 2
-    BOTTOM_BRIGHTNESS_POST_OUTER_PX = 35
-    BOTTOM_BRIGHTNESS_PERCENTILE = 90.0
-    BOTTOM_BRIGHTNESS_REJECT_DELTA_MAX = -2.0
-    FILL_REFERENCE_MIN_MEAN = 40.0
-    HEAD_CLOSE_KERNEL = (65, 9)
-    COMPONENT_MIN_AREA = 800
-    COMPONENT_X_MIN = 80
-    COMPONENT_X_MAX = 540
-    COMPONENT_MIN_HEIGHT = 45
-    MERGE_VERTICAL_OVERLAP_MIN = 0.55
-    MERGE_HORIZONTAL_GAP_MAX = 70
-    CHANNEL_SEARCH_RADIUS_PX = 25
-    RIGHT_WALL_SEARCH_RADIUS_PX = 15
-    CHANNEL_SPACING_MIN_PX = 12
-    CHANNEL_SPACING_MAX_PX = 35
-    CHANNEL_WALL_PROFILE_VERTICAL_GUARD_PX = 8
-    CHANNEL_WALL_PEAK_PROMINENCE_MIN = 6.0
-    CHANNEL_WALL_PEAK_DISTANCE_PX = 8
-    CHANNEL_WALL_REL_X_MIN = 25
-    CHANNEL_WALL_REL_X_MAX = 95
-    CHANNEL_WALL_PAIR_LEFT_REL_MIN = 35
-    CHANNEL_WALL_PAIR_LEFT_REL_MAX = 60
-    CHANNEL_WALL_PAIR_SPACING_MIN = 14
-    CHANNEL_WALL_PAIR_SPACING_MAX = 30
-    CHANNEL_WALL_EXPECTED_LEFT_REL_X = 48
-    CHANNEL_WALL_PAIR_ACCEPT_SCORE_MAX = 12.0
-    LED_TRIM_HEIGHT_MAX_PX = 108
-    LED_TRIM_ASPECT_MIN = 1.8
-    LED_SEPARATOR_PROMINENCE_MIN = 15
-    LED_SEPARATOR_BRIGHT_DELTA_MIN = 20
-    LED_SEPARATOR_ROW_MIN_FRAC = 0.45
-    LED_SEPARATOR_ROW_MAX_FRAC = 0.80
 
     def __init__(
         self,
@@ -37557,880 +37712,22 @@ class ImageAnalysisThread(QThread):
         capture_debug=False,
         bottom_guard_px=2,
     ):
-        super().__init__(parent)
-        self.offset = offset
-        self.width = width
-        self.threshold = threshold
-        self.prominence = prominence
-        self.empty_cutoff = empty_cutoff
-        self.last_row = last_row
-        try:
-            self.bottom_guard_px = max(0, int(bottom_guard_px))
-        except Exception:
-            self.bottom_guard_px = 2
-        self.input_shape = tuple(image.shape) if image is not None else None
-        self.original_image = image
-        self.annotated_image = None
-        self.level_data = None
-        self.meniscus_row = None
-        self.head_bbox = None
-        self.channel_bounds = None
-        self.detected_status = "not_found"
-        self.detected_details = {}
-        self.capture_debug = bool(capture_debug)
-        self.debug_details = {}
-        self.debug_artifacts = {}
-        self.peak_selection_details = {}
-        self.detector_runtime_ms = None
-        self.analysis_image_shape = None
-
-    def _debug_array(self, key, value):
-        if self.capture_debug and value is not None:
-            self.debug_artifacts[str(key)] = np.asarray(value).copy()
-
-    def _debug_update(self, payload):
-        if self.capture_debug:
-            self.debug_details.update(payload)
-
-    @staticmethod
-    def _debug_numeric(value):
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except Exception:
-            return None
-
-    @staticmethod
-    def _shape_hw(shape):
-        if shape is None or len(shape) < 2:
-            return None
-        try:
-            return int(shape[0]), int(shape[1])
-        except Exception:
-            return None
-
-    def _current_analysis_shape(self, shape=None):
-        candidate = self._shape_hw(shape)
-        if candidate is not None:
-            return candidate
-        candidate = self._shape_hw(getattr(self, "analysis_image_shape", None))
-        if candidate is not None:
-            return candidate
-        return int(self.CANONICAL_ANALYSIS_HEIGHT), int(self.CANONICAL_ANALYSIS_WIDTH)
-
-    def _x_scale(self, shape=None):
-        _height, width = self._current_analysis_shape(shape)
-        return float(width) / float(max(1, int(self.CANONICAL_ANALYSIS_WIDTH)))
-
-    def _y_scale(self, shape=None):
-        height, _width = self._current_analysis_shape(shape)
-        return float(height) / float(max(1, int(self.CANONICAL_ANALYSIS_HEIGHT)))
-
-    def _area_scale(self, shape=None):
-        return float(self._x_scale(shape)) * float(self._y_scale(shape))
-
-    @staticmethod
-    def _scaled_positive(value, scale, *, min_value=1):
-        try:
-            raw = float(value)
-        except Exception:
-            raw = 0.0
-        if raw <= 0:
-            return 0 if min_value <= 0 else int(min_value)
-        return max(int(min_value), int(round(raw * float(scale))))
-
-    def _x_px(self, value, shape=None, *, min_value=1):
-        return self._scaled_positive(value, self._x_scale(shape), min_value=min_value)
-
-    def _y_px(self, value, shape=None, *, min_value=1):
-        return self._scaled_positive(value, self._y_scale(shape), min_value=min_value)
-
-    def _area_px(self, value, shape=None, *, min_value=1):
-        return self._scaled_positive(value, self._area_scale(shape), min_value=min_value)
-
-    def _scaled_peak_selection_parameters(self, shape=None):
-        return {
-            "tracking_window_px": int(self._y_px(self.TRACKING_WINDOW_PX, shape)),
-            "tracking_prominence_ratio": float(self.TRACKING_PROMINENCE_RATIO),
-            "top_tie_guard_px": int(self._y_px(self.TOP_TIE_GUARD_PX, shape)),
-            "top_tie_prominence_ratio": float(self.TOP_TIE_PROMINENCE_RATIO),
-            "bottom_tie_prominence_ratio": float(self.BOTTOM_TIE_PROMINENCE_RATIO),
-            "bottom_cluster_prominence_ratio": float(self.BOTTOM_CLUSTER_PROMINENCE_RATIO),
-            "top_visible_prominence_min": float(self.TOP_VISIBLE_PROMINENCE_MIN),
-            "full_top_guard_px": int(self._y_px(self.FULL_TOP_GUARD_PX, shape)),
-            "bottom_artifact_guard_px": int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX, shape)),
-            "short_channel_max_height_px": int(self._y_px(self.SHORT_CHANNEL_MAX_HEIGHT_PX, shape)),
-            "short_channel_top_visible_prominence_min": float(self.SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN),
-            "top_edge_visible_prominence_min": float(self.TOP_EDGE_VISIBLE_PROMINENCE_MIN),
-            "top_near_visible_prominence_min": float(self.TOP_NEAR_VISIBLE_PROMINENCE_MIN),
-            "top_band_visible_prominence_min": float(self.TOP_BAND_VISIBLE_PROMINENCE_MIN),
-            "meniscus_visible_output_row_offset_px": int(self.MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX),
-            "bottom_polarity_pre_outer_px": int(self._y_px(self.BOTTOM_POLARITY_PRE_OUTER_PX, shape)),
-            "bottom_polarity_pre_inner_px": int(self._y_px(self.BOTTOM_POLARITY_PRE_INNER_PX, shape)),
-            "bottom_polarity_post_inner_px": int(self._y_px(self.BOTTOM_POLARITY_POST_INNER_PX, shape)),
-            "bottom_polarity_post_outer_px": int(self._y_px(self.BOTTOM_POLARITY_POST_OUTER_PX, shape)),
-            "bottom_polarity_reject_delta_max": float(self.BOTTOM_POLARITY_REJECT_DELTA_MAX),
-            "bottom_polarity_reject_slope_max": float(self.BOTTOM_POLARITY_REJECT_SLOPE_MAX),
-        }
-
-    def _analysis_metadata_payload(self, shape=None):
-        analysis_hw = self._current_analysis_shape(shape)
-        analysis_shape = list(analysis_hw)
-        if self.original_image is not None:
-            try:
-                analysis_shape = list(np.asarray(self.original_image).shape)
-            except Exception:
-                pass
-        return {
-            "analysis_preprocessing_mode": self.ANALYSIS_PREPROCESSING_MODE,
-            "input_shape": list(self.input_shape) if self.input_shape is not None else None,
-            "analysis_image_shape": analysis_shape,
-            "canonical_analysis_shape": [int(self.CANONICAL_ANALYSIS_HEIGHT), int(self.CANONICAL_ANALYSIS_WIDTH)],
-            "analysis_x_scale": float(self._x_scale(shape)),
-            "analysis_y_scale": float(self._y_scale(shape)),
-        }
-
-    def _debug_profile_stats(self, profile):
-        if profile is None or len(profile) == 0:
-            return {"length": 0, "min": None, "max": None, "mean": None}
-        arr = np.asarray(profile, dtype=float)
-        return {
-            "length": int(arr.size),
-            "min": float(np.min(arr)),
-            "max": float(np.max(arr)),
-            "mean": float(np.mean(arr)),
-        }
-
-    @classmethod
-    def peak_selection_parameters(cls):
-        return {
-            "tracking_window_px": int(cls.TRACKING_WINDOW_PX),
-            "tracking_prominence_ratio": float(cls.TRACKING_PROMINENCE_RATIO),
-            "top_tie_guard_px": int(cls.TOP_TIE_GUARD_PX),
-            "top_tie_prominence_ratio": float(cls.TOP_TIE_PROMINENCE_RATIO),
-            "bottom_tie_prominence_ratio": float(cls.BOTTOM_TIE_PROMINENCE_RATIO),
-            "bottom_cluster_prominence_ratio": float(cls.BOTTOM_CLUSTER_PROMINENCE_RATIO),
-            "top_visible_prominence_min": float(cls.TOP_VISIBLE_PROMINENCE_MIN),
-            "full_top_guard_px": int(cls.FULL_TOP_GUARD_PX),
-            "bottom_artifact_guard_px": int(cls.BOTTOM_ARTIFACT_GUARD_PX),
-            "short_channel_max_height_px": int(cls.SHORT_CHANNEL_MAX_HEIGHT_PX),
-            "short_channel_top_visible_prominence_min": float(cls.SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN),
-            "top_edge_visible_prominence_min": float(cls.TOP_EDGE_VISIBLE_PROMINENCE_MIN),
-            "top_near_visible_prominence_min": float(cls.TOP_NEAR_VISIBLE_PROMINENCE_MIN),
-            "top_band_visible_prominence_min": float(cls.TOP_BAND_VISIBLE_PROMINENCE_MIN),
-            "meniscus_visible_output_row_offset_px": int(cls.MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX),
-            "bottom_polarity_pre_outer_px": int(cls.BOTTOM_POLARITY_PRE_OUTER_PX),
-            "bottom_polarity_pre_inner_px": int(cls.BOTTOM_POLARITY_PRE_INNER_PX),
-            "bottom_polarity_post_inner_px": int(cls.BOTTOM_POLARITY_POST_INNER_PX),
-            "bottom_polarity_post_outer_px": int(cls.BOTTOM_POLARITY_POST_OUTER_PX),
-            "bottom_polarity_reject_delta_max": float(cls.BOTTOM_POLARITY_REJECT_DELTA_MAX),
-            "bottom_polarity_reject_slope_max": float(cls.BOTTOM_POLARITY_REJECT_SLOPE_MAX),
-        }
-
-    def _select_peak_candidate(self, peaks, prominences, last_row=None, channel_height=None):
-        peaks = np.asarray(peaks, dtype=int)
-        prominences = np.asarray(prominences, dtype=float)
-        tracking_window_px = self._y_px(self.TRACKING_WINDOW_PX)
-        top_tie_guard_px = self._y_px(self.TOP_TIE_GUARD_PX)
-        bottom_start = None
-        if channel_height is not None:
-            try:
-                bottom_start = max(0, int(channel_height) - int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX)))
-            except Exception:
-                bottom_start = None
-        details = {
-            "candidate_rows": [int(row) for row in peaks.tolist()],
-            "candidate_prominences": [float(value) for value in prominences.tolist()],
-            "best_peak_row": None,
-            "best_peak_prominence": None,
-            "selected_peak_row": None,
-            "selected_peak_prominence": None,
-            "selected_peak_reason": "no_peaks",
-            "top_tie_eligible_rows": [],
-            "non_bottom_eligible_rows": [],
-            "upper_bottom_eligible_rows": [],
-            "tracking_eligible_rows": [],
-            "tracking_window_px": int(tracking_window_px),
-            "tracking_prominence_ratio": float(self.TRACKING_PROMINENCE_RATIO),
-            "top_tie_guard_px": int(top_tie_guard_px),
-            "top_tie_prominence_ratio": float(self.TOP_TIE_PROMINENCE_RATIO),
-            "bottom_tie_prominence_ratio": float(self.BOTTOM_TIE_PROMINENCE_RATIO),
-            "bottom_tie_start_row": None if bottom_start is None else int(bottom_start),
-        }
-        if len(peaks) == 0:
-            return details
-
-        best_idx = int(np.argmax(prominences))
-        best_prominence = float(prominences[best_idx])
-        details["best_peak_row"] = int(peaks[best_idx])
-        details["best_peak_prominence"] = best_prominence
-
-        top_threshold = best_prominence * float(self.TOP_TIE_PROMINENCE_RATIO)
-        top_indices = [
-            int(idx)
-            for idx, row in enumerate(peaks)
-            if int(row) <= int(top_tie_guard_px) and float(prominences[idx]) >= top_threshold
-        ]
-        details["top_tie_eligible_rows"] = [int(peaks[idx]) for idx in top_indices]
-
-        non_bottom_indices = []
-        upper_bottom_indices = []
-        if bottom_start is not None and int(peaks[best_idx]) >= int(bottom_start):
-            non_bottom_threshold = best_prominence * float(self.BOTTOM_TIE_PROMINENCE_RATIO)
-            non_bottom_indices = [
-                int(idx)
-                for idx, row in enumerate(peaks)
-                if int(row) < int(bottom_start) and float(prominences[idx]) >= non_bottom_threshold
-            ]
-            bottom_cluster_threshold = best_prominence * float(self.BOTTOM_CLUSTER_PROMINENCE_RATIO)
-            upper_bottom_indices = [
-                int(idx)
-                for idx, row in enumerate(peaks)
-                if int(row) >= int(bottom_start)
-                and int(row) < int(peaks[best_idx])
-                and float(prominences[idx]) >= bottom_cluster_threshold
-            ]
-        details["non_bottom_eligible_rows"] = [int(peaks[idx]) for idx in non_bottom_indices]
-        details["upper_bottom_eligible_rows"] = [int(peaks[idx]) for idx in upper_bottom_indices]
-
-        tracking_indices = []
-        if last_row is not None:
-            tracking_threshold = best_prominence * float(self.TRACKING_PROMINENCE_RATIO)
-            tracking_indices = [
-                int(idx)
-                for idx, row in enumerate(peaks)
-                if abs(int(row) - int(last_row)) <= int(tracking_window_px)
-                and float(prominences[idx]) >= tracking_threshold
-            ]
-        details["tracking_eligible_rows"] = [int(peaks[idx]) for idx in tracking_indices]
-
-        if top_indices:
-            selected_idx = max(top_indices, key=lambda idx: float(prominences[idx]))
-            reason = "top_tie_candidate"
-        elif non_bottom_indices:
-            selected_idx = max(non_bottom_indices, key=lambda idx: float(prominences[idx]))
-            reason = "non_bottom_candidate_gated"
-        elif upper_bottom_indices:
-            selected_idx = min(upper_bottom_indices, key=lambda idx: int(peaks[idx]))
-            reason = "upper_bottom_candidate_gated"
-        elif tracking_indices:
-            selected_idx = min(tracking_indices, key=lambda idx: abs(int(peaks[idx]) - int(last_row)))
-            reason = "nearest_last_row_gated"
-        else:
-            selected_idx = best_idx
-            reason = "max_prominence"
-
-        details["selected_peak_row"] = int(peaks[selected_idx])
-        details["selected_peak_prominence"] = float(prominences[selected_idx])
-        details["selected_peak_reason"] = reason
-        return details
-
-    def _has_credible_interior_peak(self, selection, channel_height):
-        rows = selection.get("candidate_rows") or []
-        prominences = selection.get("candidate_prominences") or []
-        credible_rows = []
-        lower = int(self._y_px(self.FULL_TOP_GUARD_PX))
-        upper = max(lower + 1, int(channel_height) - int(self._y_px(25)))
-        for row, prominence in zip(rows, prominences):
-            row = int(row)
-            prominence = float(prominence)
-            if lower < row < upper and prominence >= float(self.TOP_VISIBLE_PROMINENCE_MIN):
-                credible_rows.append(row)
-        self._debug_update({"credible_interior_peak_rows": credible_rows})
-        return bool(credible_rows)
-
-    def _selected_peak_fill_override(self, selection, channel_height):
-        row = selection.get("selected_peak_row")
-        prominence = selection.get("selected_peak_prominence")
-        if row is None or prominence is None:
-            return None, "visible_peak"
-        is_weak_top = (
-            int(row) <= int(self._y_px(self.FULL_TOP_GUARD_PX))
-            and float(prominence) < float(self.TOP_VISIBLE_PROMINENCE_MIN)
-        )
-        if is_weak_top and not self._has_credible_interior_peak(selection, channel_height):
-            return "full", "weak_top_boundary_full"
-        return None, "visible_peak"
-
-    def _top_visible_prominence_threshold(self, row, channel_height):
-        row = int(row)
-        if int(channel_height) <= int(self._y_px(self.SHORT_CHANNEL_MAX_HEIGHT_PX)):
-            return float(self.SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN)
-        if row <= int(self._y_px(5)):
-            return float(self.TOP_EDGE_VISIBLE_PROMINENCE_MIN)
-        if row <= int(self._y_px(10)):
-            return float(self.TOP_NEAR_VISIBLE_PROMINENCE_MIN)
-        if row <= int(self._y_px(self.TOP_TIE_GUARD_PX)):
-            return float(self.TOP_BAND_VISIBLE_PROMINENCE_MIN)
-        return None
-
-    def _bottom_peak_polarity(self, profile, selected_row):
-        slope_half_window = int(self._y_px(18))
-        pre_outer = int(self._y_px(self.BOTTOM_POLARITY_PRE_OUTER_PX))
-        pre_inner = int(self._y_px(self.BOTTOM_POLARITY_PRE_INNER_PX))
-        post_inner = int(self._y_px(self.BOTTOM_POLARITY_POST_INNER_PX))
-        post_outer = int(self._y_px(self.BOTTOM_POLARITY_POST_OUTER_PX))
-        details = {
-            "bottom_peak_polarity_available": False,
-            "bottom_peak_polarity_enough_samples": False,
-            "bottom_peak_polarity_row": None,
-            "bottom_peak_polarity_pre_start": None,
-            "bottom_peak_polarity_pre_end": None,
-            "bottom_peak_polarity_post_start": None,
-            "bottom_peak_polarity_post_end": None,
-            "bottom_peak_polarity_pre_n": 0,
-            "bottom_peak_polarity_post_n": 0,
-            "bottom_peak_polarity_pre_mean": None,
-            "bottom_peak_polarity_post_mean": None,
-            "bottom_peak_polarity_post_minus_pre": None,
-            "bottom_peak_polarity_immediate_step": None,
-            "bottom_peak_polarity_slope": None,
-            "bottom_peak_polarity_slope_half_window_px": int(slope_half_window),
-            "bottom_peak_polarity_reject_delta_max": float(self.BOTTOM_POLARITY_REJECT_DELTA_MAX),
-            "bottom_peak_polarity_reject_slope_max": float(self.BOTTOM_POLARITY_REJECT_SLOPE_MAX),
-            "bottom_peak_polarity_reject_condition": None,
-        }
-        if profile is None or selected_row is None:
-            return details
-        try:
-            values = np.asarray(profile, dtype=float).ravel()
-            row = int(selected_row)
-        except Exception:
-            return details
-        if values.size == 0 or row < 0 or row >= int(values.size):
-            return details
-
-        pre_start = max(0, row - pre_outer)
-        pre_end = max(0, row - pre_inner)
-        post_start = min(int(values.size), row + post_inner)
-        post_end = min(int(values.size), row + post_outer)
-        pre = values[pre_start:pre_end]
-        post = values[post_start:post_end]
-        slope_start = max(0, row - int(slope_half_window))
-        slope_end = min(int(values.size), row + int(slope_half_window) + 1)
-        slope_window = values[slope_start:slope_end]
-
-        pre_mean = float(np.mean(pre)) if len(pre) else None
-        post_mean = float(np.mean(post)) if len(post) else None
-        post_minus_pre = None if pre_mean is None or post_mean is None else float(post_mean - pre_mean)
-        immediate_step = None
-        if row + 1 < int(values.size):
-            immediate_step = float(values[row + 1] - values[row])
-        slope = None
-        if len(slope_window) >= 8:
-            xs = np.arange(slope_start, slope_end, dtype=float)
-            try:
-                slope = float(np.polyfit(xs, slope_window.astype(float), 1)[0])
-            except Exception:
-                slope = None
-        enough_samples = len(pre) >= 3 and len(post) >= 2 and slope is not None
-        details.update(
-            {
-                "bottom_peak_polarity_available": bool(enough_samples),
-                "bottom_peak_polarity_enough_samples": bool(enough_samples),
-                "bottom_peak_polarity_row": int(row),
-                "bottom_peak_polarity_pre_start": int(pre_start),
-                "bottom_peak_polarity_pre_end": int(pre_end),
-                "bottom_peak_polarity_post_start": int(post_start),
-                "bottom_peak_polarity_post_end": int(post_end),
-                "bottom_peak_polarity_pre_n": int(len(pre)),
-                "bottom_peak_polarity_post_n": int(len(post)),
-                "bottom_peak_polarity_pre_mean": pre_mean,
-                "bottom_peak_polarity_post_mean": post_mean,
-                "bottom_peak_polarity_post_minus_pre": post_minus_pre,
-                "bottom_peak_polarity_immediate_step": immediate_step,
-                "bottom_peak_polarity_slope": slope,
-            }
-        )
-        return details
-
-    def _bottom_peak_brightness_drop(self, profile, selected_row):
-        pre_outer = int(self._y_px(self.BOTTOM_BRIGHTNESS_PRE_OUTER_PX))
-        pre_inner = int(self._y_px(self.BOTTOM_BRIGHTNESS_PRE_INNER_PX))
-        post_inner = int(self._y_px(self.BOTTOM_BRIGHTNESS_POST_INNER_PX))
-        post_outer = int(self._y_px(self.BOTTOM_BRIGHTNESS_POST_OUTER_PX))
-        details = {
-            "bottom_peak_brightness_pre_start": None,
-            "bottom_peak_brightness_pre_end": None,
-            "bottom_peak_brightness_post_start": None,
-            "bottom_peak_brightness_post_end": None,
-            "bottom_peak_brightness_pre_p90": None,
-            "bottom_peak_brightness_post_p90": None,
-            "bottom_peak_brightness_post_minus_pre_p90": None,
-            "bottom_peak_brightness_reject_delta_max": float(self.BOTTOM_BRIGHTNESS_REJECT_DELTA_MAX),
-            "bottom_peak_brightness_reject_condition": None,
-        }
-        if profile is None or selected_row is None:
-            return details
-        try:
-            values = np.asarray(profile, dtype=float).ravel()
-            row = int(selected_row)
-        except Exception:
-            return details
-        if values.size == 0 or row < 0 or row >= int(values.size):
-            return details
-
-        pre_start = max(0, row - pre_outer)
-        pre_end = max(0, row - pre_inner + 1)
-        post_start = min(int(values.size), row + post_inner)
-        post_end = min(int(values.size), row + post_outer + 1)
-        pre = values[pre_start:pre_end]
-        post = values[post_start:post_end]
-
-        pre_p90 = float(np.percentile(pre, self.BOTTOM_BRIGHTNESS_PERCENTILE)) if len(pre) else None
-        post_p90 = float(np.percentile(post, self.BOTTOM_BRIGHTNESS_PERCENTILE)) if len(post) else None
-        post_minus_pre = None if pre_p90 is None or post_p90 is None else float(post_p90 - pre_p90)
-        details.update(
-            {
-                "bottom_peak_brightness_pre_start": int(pre_start),
-                "bottom_peak_brightness_pre_end": int(pre_end),
-                "bottom_peak_brightness_post_start": int(post_start),
-                "bottom_peak_brightness_post_end": int(post_end),
-                "bottom_peak_brightness_pre_p90": pre_p90,
-                "bottom_peak_brightness_post_p90": post_p90,
-                "bottom_peak_brightness_post_minus_pre_p90": post_minus_pre,
-            }
-        )
-        return details
-
-    def _selected_peak_visible_decision(self, selection, channel_height, fill_state, profile=None):
-        rows = [int(row) for row in (selection.get("candidate_rows") or [])]
-        prominences = [float(value) for value in (selection.get("candidate_prominences") or [])]
-        row = selection.get("selected_peak_row")
-        prominence = selection.get("selected_peak_prominence")
-        bottom_start = max(0, int(channel_height) - int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX)))
-        top_tie_guard_px = int(self._y_px(self.TOP_TIE_GUARD_PX))
-        top_rows = [int(candidate) for candidate in rows if int(candidate) <= top_tie_guard_px]
-        bottom_rows = [int(candidate) for candidate in rows if int(candidate) >= bottom_start]
-        debug_payload = {
-            "boundary_peak_rows": top_rows,
-            "bottom_artifact_rows": bottom_rows,
-            "credible_visible_peak": False,
-            "visible_peak_reason": "no_selected_peak",
-            "visible_peak_required_prominence": None,
-        }
-        if row is None or prominence is None:
-            self._debug_update(debug_payload)
-            return False, "no_selected_peak"
-
-        row = int(row)
-        prominence = float(prominence)
-        min_prominence = float(self.prominence if self.prominence is not None else 0)
-
-        if row >= bottom_start:
-            if top_rows:
-                reason = "bottom_artifact_with_top_boundary_peak"
-                if str(fill_state) == "full":
-                    reason = "bottom_artifact_with_top_boundary_full"
-                debug_payload.update({"visible_peak_reason": reason})
-                self._debug_update(debug_payload)
-                return False, reason
-            polarity = self._bottom_peak_polarity(profile, row)
-            debug_payload.update(polarity)
-            if (
-                str(fill_state) == "full"
-                and bool(polarity.get("bottom_peak_polarity_available"))
-                and polarity.get("bottom_peak_polarity_post_minus_pre") is not None
-                and float(polarity["bottom_peak_polarity_post_minus_pre"]) <= float(self.BOTTOM_POLARITY_REJECT_DELTA_MAX)
-            ):
-                reason = "bottom_negative_profile_full_artifact"
-                debug_payload.update({
-                    "visible_peak_reason": reason,
-                    "bottom_peak_polarity_reject_condition": "delta_full_bottom",
-                })
-                self._debug_update(debug_payload)
-                return False, reason
-            brightness = self._bottom_peak_brightness_drop(profile, row)
-            debug_payload.update(brightness)
-            if (
-                str(fill_state) == "full"
-                and brightness.get("bottom_peak_brightness_post_minus_pre_p90") is not None
-                and float(brightness["bottom_peak_brightness_post_minus_pre_p90"]) <= float(self.BOTTOM_BRIGHTNESS_REJECT_DELTA_MAX)
-            ):
-                reason = "bottom_high_brightness_drop_full_artifact"
-                debug_payload.update({
-                    "visible_peak_reason": reason,
-                    "bottom_peak_brightness_reject_condition": "p90_drop_full_bottom",
-                })
-                self._debug_update(debug_payload)
-                return False, reason
-            debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": "bottom_visible_without_top_boundary"})
-            self._debug_update(debug_payload)
-            return True, "bottom_visible_without_top_boundary"
-
-        top_threshold = self._top_visible_prominence_threshold(row, channel_height)
-        if top_threshold is not None:
-            debug_payload["visible_peak_required_prominence"] = float(top_threshold)
-            if prominence >= top_threshold:
-                debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": "top_visible_prominence"})
-                self._debug_update(debug_payload)
-                return True, "top_visible_prominence"
-            if int(channel_height) > int(self._y_px(self.SHORT_CHANNEL_MAX_HEIGHT_PX)) and not bottom_rows and prominence >= min_prominence:
-                reason = "modest_top_visible_without_bottom_artifact"
-                debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": reason})
-                self._debug_update(debug_payload)
-                return True, reason
-            reason = "top_boundary_below_visible_threshold"
-            debug_payload.update({"visible_peak_reason": reason})
-            self._debug_update(debug_payload)
-            return False, reason
-
-        if prominence >= min_prominence:
-            debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": "interior_visible_prominence"})
-            self._debug_update(debug_payload)
-            return True, "interior_visible_prominence"
-
-        reason = "interior_below_visible_threshold"
-        debug_payload.update({"visible_peak_reason": reason, "visible_peak_required_prominence": float(min_prominence)})
-        self._debug_update(debug_payload)
-        return False, reason
-
-    @staticmethod
-    def _bbox_union(bboxes):
-        bboxes = [bbox for bbox in bboxes if bbox is not None]
-        if not bboxes:
-            return None
-        x0 = min(int(bbox[0]) for bbox in bboxes)
-        y0 = min(int(bbox[1]) for bbox in bboxes)
-        x1 = max(int(bbox[0]) + int(bbox[2]) for bbox in bboxes)
-        y1 = max(int(bbox[1]) + int(bbox[3]) for bbox in bboxes)
-        return [int(x0), int(y0), int(x1 - x0), int(y1 - y0)]
-
-    @staticmethod
-    def _bbox_horizontal_gap(a, b):
-        ax0, ay0, aw, ah = [int(value) for value in a]
-        bx0, by0, bw, bh = [int(value) for value in b]
-        ax1 = ax0 + aw
-        bx1 = bx0 + bw
-        if ax1 < bx0:
-            return int(bx0 - ax1)
-        if bx1 < ax0:
-            return int(ax0 - bx1)
-        return 0
-
-    @staticmethod
-    def _bbox_vertical_overlap_fraction(a, b):
-        _ax0, ay0, _aw, ah = [int(value) for value in a]
-        _bx0, by0, _bw, bh = [int(value) for value in b]
-        overlap = max(0, min(ay0 + ah, by0 + bh) - max(ay0, by0))
-        denom = max(1, min(ah, bh))
-        return float(overlap) / float(denom)
-
-    def _component_rows_from_mask(self, mask):
-        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        rows = []
-        for contour in cnts:
-            area = float(cv2.contourArea(contour))
-            x, y, w, h = cv2.boundingRect(contour)
-            rows.append({"bbox": [int(x), int(y), int(w), int(h)], "area": area})
-        return rows
-
-    def _filter_head_components(self, components):
-        kept = []
-        shape = getattr(self, "analysis_image_shape", None)
-        min_area = float(self._area_px(self.COMPONENT_MIN_AREA, shape))
-        min_height = int(self._y_px(self.COMPONENT_MIN_HEIGHT, shape))
-        x_min = int(self._x_px(self.COMPONENT_X_MIN, shape, min_value=0))
-        x_max = int(self._x_px(self.COMPONENT_X_MAX, shape, min_value=0))
-        for row in components:
-            x, _y, _w, h = row["bbox"]
-            if row["area"] < min_area:
-                continue
-            if int(h) < min_height:
-                continue
-            if int(x) < x_min or int(x) > x_max:
-                continue
-            kept.append(row)
-        return kept
-
-    def _merge_head_component_bboxes(self, bboxes):
-        groups = [[list(map(int, bbox))] for bbox in sorted(bboxes, key=lambda rect: (rect[0], rect[1]))]
-        changed = True
-        while changed:
-            changed = False
-            merged_groups = []
-            while groups:
-                group = groups.pop(0)
-                group_bbox = self._bbox_union(group)
-                did_merge = False
-                for idx, other in enumerate(groups):
-                    other_bbox = self._bbox_union(other)
-                    overlap = self._bbox_vertical_overlap_fraction(group_bbox, other_bbox)
-                    gap = self._bbox_horizontal_gap(group_bbox, other_bbox)
-                    if overlap >= float(self.MERGE_VERTICAL_OVERLAP_MIN) and gap <= int(self._x_px(self.MERGE_HORIZONTAL_GAP_MAX)):
-                        groups[idx] = group + other
-                        changed = True
-                        did_merge = True
-                        break
-                if not did_merge:
-                    merged_groups.append(group)
-            groups = merged_groups
-        return [self._bbox_union(group) for group in groups if self._bbox_union(group) is not None]
-
-    def _find_led_separator_row(self, gray, bbox):
-        x, y, w, h = [int(value) for value in bbox]
-        if h <= 0 or w <= 0:
-            return None, "invalid_bbox"
-        aspect = float(w) / float(max(h, 1))
-        aspect_min = float(self.LED_TRIM_ASPECT_MIN) * float(self._x_scale()) / float(max(self._y_scale(), 1e-6))
-        if h > int(self._y_px(self.LED_TRIM_HEIGHT_MAX_PX)) or aspect < aspect_min:
-            return None, "not_short_wide"
-
-        x0 = x + int(round(w * 0.15))
-        x1 = x + int(round(w * 0.85))
-        if x1 <= x0:
-            return None, "invalid_central_roi"
-        roi = gray[y : y + h, x0:x1]
-        if roi.size == 0:
-            return None, "empty_central_roi"
-
-        row_mean = roi.mean(axis=1).astype(np.float32)
-        smooth = cv2.GaussianBlur(row_mean.reshape(-1, 1), (1, 9), 0).ravel()
-        valleys, props = find_peaks(-smooth, prominence=float(self.LED_SEPARATOR_PROMINENCE_MIN))
-        row_min = int(round(float(h) * float(self.LED_SEPARATOR_ROW_MIN_FRAC)))
-        row_max = int(round(float(h) * float(self.LED_SEPARATOR_ROW_MAX_FRAC)))
-        candidates = []
-        for idx, row in enumerate(valleys):
-            row = int(row)
-            if row < row_min or row > row_max:
-                continue
-            above = smooth[max(0, row - int(self._y_px(5))) : row]
-            below = smooth[min(h, row + int(self._y_px(5))) : min(h, row + int(self._y_px(20)))]
-            if len(above) == 0 or len(below) == 0:
-                continue
-            delta = float(np.mean(below) - np.mean(above))
-            prominence = float(props.get("prominences", [])[idx])
-            if delta >= float(self.LED_SEPARATOR_BRIGHT_DELTA_MIN):
-                candidates.append((prominence, delta, row))
-        if not candidates:
-            return None, "no_led_separator"
-        candidates.sort(reverse=True)
-        return int(y + candidates[0][2]), "led_separator"
-
-    def _detect_channel_bounds_from_geometry(self, gray, merged_bbox, head_bottom_row, left_offset=40, channel_width=30):
-        x, y, w, h = [int(value) for value in merged_bbox]
-        try:
-            left_offset = int(left_offset if left_offset is not None else 40)
-        except Exception:
-            left_offset = 40
-        try:
-            channel_width = int(channel_width if channel_width is not None else 20)
-        except Exception:
-            channel_width = 20
-        shape = gray.shape[:2]
-        left_offset = int(self._x_px(left_offset, shape, min_value=0))
-        channel_width = int(self._x_px(channel_width, shape))
-        image_h, image_w = gray.shape[:2]
-        fallback_x = max(0, min(image_w - 1, int(x + left_offset)))
-        fallback_width = max(1, int(channel_width))
-        channel_y = max(0, min(image_h - 1, int(y)))
-        channel_bottom = max(channel_y + 1, min(image_h, int(head_bottom_row)))
-        fallback_height = max(1, int(channel_bottom - channel_y))
-
-        roi = gray[channel_y:channel_bottom, x : x + w]
-        detected_pair = None
-        peaks_payload = []
-        pair_candidates = []
-        selected_pair = None
-        selected_score = None
-        reason = "fallback_offset"
-        if roi.size:
-            guard = int(self._y_px(self.CHANNEL_WALL_PROFILE_VERTICAL_GUARD_PX, shape))
-            band = roi[guard : max(guard + 1, roi.shape[0] - guard), :]
-            if band.size == 0:
-                band = roi
-            col_mean = band.mean(axis=0).astype(np.float32)
-            smooth = cv2.GaussianBlur(col_mean.reshape(1, -1), (9, 1), 0).ravel()
-            dark_signal = float(np.max(smooth)) - smooth
-            peak_distance_px = int(self._x_px(self.CHANNEL_WALL_PEAK_DISTANCE_PX, shape))
-            rel_x_min = int(self._x_px(self.CHANNEL_WALL_REL_X_MIN, shape, min_value=0))
-            rel_x_max = int(self._x_px(self.CHANNEL_WALL_REL_X_MAX, shape, min_value=0))
-            pair_left_min = int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MIN, shape, min_value=0))
-            pair_left_max = int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MAX, shape, min_value=0))
-            pair_spacing_min = int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MIN, shape))
-            pair_spacing_max = int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MAX, shape))
-            expected_left_rel_x = int(self._x_px(self.CHANNEL_WALL_EXPECTED_LEFT_REL_X, shape, min_value=0))
-            accept_score_max = float(self.CHANNEL_WALL_PAIR_ACCEPT_SCORE_MAX) * float(self._x_scale(shape))
-            peaks, props = find_peaks(
-                dark_signal,
-                prominence=float(self.CHANNEL_WALL_PEAK_PROMINENCE_MIN),
-                distance=peak_distance_px,
-            )
-            prominences = props.get("prominences", [])
-            peaks_payload = [
-                {
-                    "x": int(x + peak),
-                    "relative_x": int(peak),
-                    "prominence": float(prominences[idx]),
-                    "within_channel_search_window": bool(
-                        rel_x_min <= int(peak) <= rel_x_max
-                    ),
-                }
-                for idx, peak in enumerate(peaks)
-            ]
-            best = None
-            for left_idx, left in enumerate(peaks):
-                left = int(left)
-                if left < pair_left_min or left > pair_left_max:
-                    continue
-                for right_idx, right in enumerate(peaks):
-                    right = int(right)
-                    if right <= left:
-                        continue
-                    if right < rel_x_min or right > rel_x_max:
-                        continue
-                    spacing = right - left
-                    if spacing < pair_spacing_min or spacing > pair_spacing_max:
-                        continue
-                    left_prominence = float(prominences[left_idx])
-                    right_prominence = float(prominences[right_idx])
-                    prominence_bonus = left_prominence + right_prominence
-                    score = (
-                        abs(left - expected_left_rel_x) * 1.0
-                        + abs(spacing - int(fallback_width)) * 1.5
-                        - 0.04 * prominence_bonus
-                    )
-                    pair_payload = {
-                        "left_x": int(x + left),
-                        "right_x": int(x + right),
-                        "left_relative_x": int(left),
-                        "right_relative_x": int(right),
-                        "spacing_px": int(spacing),
-                        "left_prominence": left_prominence,
-                        "right_prominence": right_prominence,
-                        "score": float(score),
-                    }
-                    pair_candidates.append(pair_payload)
-                    candidate = (float(score), int(left), int(right), int(spacing), pair_payload)
-                    if best is None or candidate[:4] < best[:4]:
-                        best = candidate
-            if best is not None:
-                score, left, right, spacing, pair_payload = best
-                detected_pair = [int(x + left), int(x + right)]
-                selected_pair = dict(pair_payload)
-                selected_score = float(score)
-                if score <= accept_score_max:
-                    fallback_x = int(x + left)
-                    fallback_width = int(spacing)
-                    reason = "profile_wall_pair"
-                else:
-                    reason = "fallback_offset_profile_pair_low_confidence"
-
-        fallback_x = max(0, min(image_w - 1, fallback_x))
-        fallback_width = max(1, min(int(fallback_width), image_w - fallback_x))
-        return {
-            "channel_bounds": [int(fallback_x), int(channel_y), int(fallback_width), int(fallback_height)],
-            "channel_detection_reason": reason,
-            "detected_channel_wall_xs": detected_pair,
-            "channel_wall_peaks": peaks_payload,
-            "channel_wall_pair_candidates": pair_candidates,
-            "selected_channel_wall_pair": selected_pair,
-            "selected_channel_wall_pair_score": selected_score,
-            "channel_wall_profile_parameters": {
-                "vertical_guard_px": int(self._y_px(self.CHANNEL_WALL_PROFILE_VERTICAL_GUARD_PX, shape)),
-                "peak_prominence_min": float(self.CHANNEL_WALL_PEAK_PROMINENCE_MIN),
-                "peak_distance_px": int(self._x_px(self.CHANNEL_WALL_PEAK_DISTANCE_PX, shape)),
-                "relative_x_min": int(self._x_px(self.CHANNEL_WALL_REL_X_MIN, shape, min_value=0)),
-                "relative_x_max": int(self._x_px(self.CHANNEL_WALL_REL_X_MAX, shape, min_value=0)),
-                "pair_left_relative_x_min": int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MIN, shape, min_value=0)),
-                "pair_left_relative_x_max": int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MAX, shape, min_value=0)),
-                "pair_spacing_min_px": int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MIN, shape)),
-                "pair_spacing_max_px": int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MAX, shape)),
-                "expected_left_relative_x": int(self._x_px(self.CHANNEL_WALL_EXPECTED_LEFT_REL_X, shape, min_value=0)),
-                "expected_spacing_px": int(channel_width),
-                "accept_score_max": float(self.CHANNEL_WALL_PAIR_ACCEPT_SCORE_MAX) * float(self._x_scale(shape)),
-            },
-        }
-
-    def _detect_refuel_head_geometry(self, cur_img, threshold_value=50):
-        self.analysis_image_shape = tuple(cur_img.shape[:2])
-        cur_gray = cv2.cvtColor(cur_img, cv2.COLOR_BGR2GRAY)
-        _, mask = cv2.threshold(cur_gray, threshold_value, 255, cv2.THRESH_BINARY)
-        self._debug_array("head_threshold_mask", mask)
-
-        kernel = cv2.getStructuringElement(
-            cv2.MORPH_RECT,
-            (
-                int(self._x_px(self.HEAD_CLOSE_KERNEL[0], cur_img.shape)),
-                int(self._y_px(self.HEAD_CLOSE_KERNEL[1], cur_img.shape)),
-            ),
-        )
-        closed_mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-        self._debug_array("head_closed_mask", closed_mask)
-
-        raw_components = self._component_rows_from_mask(mask)
-        kept_raw_components = self._filter_head_components(raw_components)
-        closed_components = self._component_rows_from_mask(closed_mask)
-        kept_components = self._filter_head_components(closed_components)
-        kept_bboxes = [row["bbox"] for row in kept_components]
-        merged_bboxes = self._merge_head_component_bboxes(kept_bboxes)
-
-        geometry = {
-            "head_bbox": None,
-            "merged_head_bbox": None,
-            "channel_bounds": None,
-            "head_bottom_row": None,
-            "raw_component_bboxes": [row["bbox"] for row in raw_components],
-            "kept_component_bboxes": kept_bboxes,
-            "merged_component_bboxes": merged_bboxes,
-            "raw_contour_count": int(len(raw_components)),
-            "area_filtered_contour_count": int(len(kept_raw_components)),
-            "kept_contour_count": int(len(kept_components)),
-            "channel_detection_reason": None,
-            "head_bottom_reason": None,
-            "geometry_warning": None,
-        }
-
-        if not merged_bboxes:
-            geometry["geometry_warning"] = "no_head_components"
-            self._debug_update({**geometry, "failure_reason": "no_printer_head_contours"})
-            return geometry
-
-        merged_bbox = max(merged_bboxes, key=lambda rect: int(rect[2]) * int(rect[3]))
-        x, y, w, h = [int(value) for value in merged_bbox]
-        head_bottom_row, head_bottom_reason = self._find_led_separator_row(cur_gray, merged_bbox)
-        if head_bottom_row is None:
-            head_bottom_row = int(y + h)
-            head_bottom_reason = "merged_bbox_bottom"
-        head_bottom_row = max(int(y + 1), min(int(y + h), int(head_bottom_row)))
-
-        channel = self._detect_channel_bounds_from_geometry(
-            cur_gray,
-            merged_bbox,
-            head_bottom_row,
-            left_offset=self.offset,
-            channel_width=self.width,
-        )
-        geometry.update(
-            {
-                "head_bbox": [int(x), int(y), int(w), int(head_bottom_row - y)],
-                "merged_head_bbox": [int(x), int(y), int(w), int(h)],
-                "selected_head_bbox": [int(x), int(y), int(w), int(head_bottom_row - y)],
-                "head_bottom_row": int(head_bottom_row),
-                "head_bottom_reason": str(head_bottom_reason),
-                **channel,
-            }
-        )
-        self._debug_update(
-            {
-                **geometry,
-                "threshold_value": int(threshold_value),
-                "kept_contour_bboxes": kept_bboxes,
-                "kept_contour_areas": [float(row["area"]) for row in kept_components],
-            }
+        QThread.__init__(self, parent)
+        RefuelLevelDetector.__init__(
+            self,
+            image,
+            offset,
+            width,
+            threshold,
+            prominence,
+            empty_cutoff,
+            last_row,
+            capture_debug=capture_debug,
+            bottom_guard_px=bottom_guard_px,
         )
-        return geometry
 
     def run(self):
-        # Perform image analysis
-        start_perf = time.perf_counter()
-        self.analyze_image()
-        self.detector_runtime_ms = float((time.perf_counter() - start_perf) * 1000.0)
-        if isinstance(self.detected_details, dict):
-            self.detected_details["detector_runtime_ms"] = self.detector_runtime_ms
-        self._debug_update({"detector_runtime_ms": self.detector_runtime_ms})
-        # Emit results
+        self.run_detection()
         self.analysis_done.emit(
             self.original_image,
             self.annotated_image,
@@ -38438,404 +37735,91 @@ class ImageAnalysisThread(QThread):
             self.meniscus_row,
         )
 
-    def find_printer_head(self,cur_img, threshold_value=50):
-        """
-        Given a current image, this function detects the printer head in the image.
-        It returns the bounding box coordinates of the detected printer head.
-        """
-        geometry = self._detect_refuel_head_geometry(cur_img, threshold_value=threshold_value)
-        bbox = geometry.get("head_bbox")
-        if bbox is None:
-            print("No contours found.")
-            return None, None, None, None
-        return tuple(int(value) for value in bbox)
-
-    def get_channel_bounds(self,cur_img, x, y, w, h, left_offset=40, channel_width=30):
-        """
-        Given the bounding box coordinates of the printer head, this function identifies the channel area.
-        It returns the bounding box coordinates of the detected channel area.
-        """
-        # Identify the channel area using the sides of the bounding box
-        x0 = x + left_offset
-        return x0, y, channel_width, h
-
-    def get_channel_profile(self,image, x0, y0, w, h):
-        """
-        Extracts the channel profile from the image.
-        """
-        crop = image[y0:y0+h, x0:x0+w]              # 1. crop to channel  
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-        blur = cv2.GaussianBlur(gray, (5,5), 0)    # 2. smooth out noise  
-
-        profile = blur.mean(axis=1)
-        self._debug_array("channel_crop_bgr", crop)
-        self._debug_array("channel_crop_gray", gray)
-        self._debug_array("channel_crop_blur", blur)
-        self._debug_array("profile", profile)
-        self._debug_update({"profile_stats": self._debug_profile_stats(profile)})
-        return profile
-
-
-    def detect_meniscus_row(self,profile,
-                        last_row=None,
-                        fluid_darker=True,
-                        search_band=None,
-                        min_prominence=8):
-        """
-        profile       : 1-D numpy array of mean‐intensities per row
-        last_row      : previous detection (for temporal smoothing / disambiguation)
-        fluid_darker  : True if liquid is darker than air (so meniscus is a downward step)
-        search_band   : (row_min, row_max)  to restrict valid meniscus locations
-        min_prominence: threshold to reject small bumps
-        
-        returns meniscus_row  (index into `profile` where the level sits)
-        """
-        # 1) gradient
-        grad = np.diff(profile)
-
-        # 2) orient so meniscus becomes a *peak* in `sig`
-        sig = -grad if fluid_darker else grad
-        self._debug_array("profile_gradient", grad)
-        self._debug_array("oriented_signal", sig)
-
-        # 3) find all peaks above a certain prominence
-        peaks, props = find_peaks(sig, prominence=min_prominence)
-
-        # 4) if we have a band, throw away peaks outside it
-        if search_band is not None:
-            lo, hi = search_band
-            mask = (peaks >= lo) & (peaks < hi)
-            peaks = peaks[mask]
-            for k in list(props):
-                props[k] = props[k][mask]
-
-        prominences = props.get("prominences", [])
-        selection = self._select_peak_candidate(peaks, prominences, last_row=last_row, channel_height=len(profile))
-        self.peak_selection_details = dict(selection)
-        if self.capture_debug:
-            attempts = list(self.debug_details.get("peak_search_attempts") or [])
-            attempts.append(
-                {
-                    "min_prominence": int(min_prominence),
-                    "fluid_darker": bool(fluid_darker),
-                    "search_band": None if search_band is None else [int(search_band[0]), int(search_band[1])],
-                    "candidate_rows": [int(row) for row in np.asarray(peaks).tolist()],
-                    "candidate_prominences": [float(value) for value in np.asarray(prominences).tolist()],
-                    "best_peak_row": selection.get("best_peak_row"),
-                    "best_peak_prominence": selection.get("best_peak_prominence"),
-                    "selected_peak_row": selection.get("selected_peak_row"),
-                    "selected_peak_prominence": selection.get("selected_peak_prominence"),
-                    "selected_peak_reason": selection.get("selected_peak_reason"),
-                    "top_tie_eligible_rows": selection.get("top_tie_eligible_rows"),
-                    "tracking_eligible_rows": selection.get("tracking_eligible_rows"),
-                }
-            )
-            self.debug_details["peak_search_attempts"] = attempts
-            self.debug_details["peak_rows"] = selection.get("candidate_rows") or []
-            self.debug_details["peak_prominences"] = selection.get("candidate_prominences") or []
-            self.debug_details["best_peak_row"] = selection.get("best_peak_row")
-            self.debug_details["best_peak_prominence"] = selection.get("best_peak_prominence")
-            self.debug_details["selected_peak_row"] = selection.get("selected_peak_row")
-            self.debug_details["selected_peak_prominence"] = selection.get("selected_peak_prominence")
-            self.debug_details["selected_peak_reason"] = selection.get("selected_peak_reason")
-            self.debug_details["top_tie_eligible_rows"] = selection.get("top_tie_eligible_rows") or []
-            self.debug_details["non_bottom_eligible_rows"] = selection.get("non_bottom_eligible_rows") or []
-            self.debug_details["upper_bottom_eligible_rows"] = selection.get("upper_bottom_eligible_rows") or []
-            self.debug_details["tracking_eligible_rows"] = selection.get("tracking_eligible_rows") or []
-            self.debug_details["search_band"] = attempts[-1]["search_band"]
-            self.debug_details["fluid_darker"] = bool(fluid_darker)
-            self.debug_details["peak_selection_parameters"] = self._scaled_peak_selection_parameters()
-
-        # 5) if any candidates remain, pick best
-        selected_row = selection.get("selected_peak_row")
-        if selected_row is not None:
-            return int(selected_row)
-        if last_row is not None:
-            if last_row < len(profile) -20 and last_row > 20 and min_prominence > 4:
-                # If we have a last row, we can try to find the meniscus row again with a lower prominence
-                # This is useful if the meniscus is not very pronounced
-                return self.detect_meniscus_row(profile,
-                            last_row=last_row,
-                            fluid_darker=fluid_darker,
-                            search_band=search_band,
-                            min_prominence=min_prominence-1)
-
-        # 6) If no peaks were found, return None
-        self._debug_update({"selected_peak_row": None, "selected_peak_reason": "no_peaks"})
-        return None
-
-    def classify_fill_state(self, image, x0, y0, w0, h0, empty_cutoff=0.15):
-        """
-        Checks nearby printer-head patches to determine whether the channel is empty or full.
-        """
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        patch_size = max(1, int(w0))
-        max_square_start = max(0, int(gray.shape[0]) - patch_size)
-        square_start = max(0, min(max_square_start, int(y0 + h0 - patch_size - 30)))
-        square_end = square_start + patch_size
-        channel_patch = gray[square_start:square_end, x0:x0+patch_size]
-        self._debug_array("fill_channel_patch", channel_patch)
-
-        reference_offsets = [
-            ("left_far", -2 * patch_size - 10),
-            ("left_near", -patch_size - 5),
-            ("right_near", patch_size + 5),
-            ("right_mid", 2 * patch_size + 10),
-            ("right_far", 3 * patch_size + 15),
-        ]
-        reference_scores = []
-        best = None
-        if channel_patch.shape == (patch_size, patch_size):
-            for name, offset in reference_offsets:
-                ref_x0 = int(x0 + offset)
-                ref_x1 = int(ref_x0 + patch_size)
-                row = {
-                    "name": str(name),
-                    "x0": int(ref_x0),
-                    "x1": int(ref_x1),
-                    "valid": False,
-                    "score": None,
-                    "reference_mean": None,
-                    "reason": "out_of_bounds",
-                }
-                if ref_x0 < 0 or ref_x1 > int(gray.shape[1]):
-                    reference_scores.append(row)
-                    continue
-                reference_patch = gray[square_start:square_end, ref_x0:ref_x1]
-                if reference_patch.shape != channel_patch.shape:
-                    row["reason"] = "shape_mismatch"
-                    reference_scores.append(row)
-                    continue
-                ref_mean = float(np.mean(reference_patch))
-                row["reference_mean"] = ref_mean
-                if ref_mean < float(self.FILL_REFERENCE_MIN_MEAN):
-                    row["reason"] = "reference_too_dark"
-                    reference_scores.append(row)
-                    continue
-                try:
-                    score = float(ssim(channel_patch, reference_patch))
-                except Exception as exc:
-                    row["reason"] = f"ssim_error:{exc}"
-                    reference_scores.append(row)
-                    continue
-                row.update({"valid": True, "score": score, "reason": "ok"})
-                reference_scores.append(row)
-                candidate = (score, name, ref_x0, reference_patch.copy())
-                if best is None or candidate[0] > best[0]:
-                    best = candidate
 
-        if best is None:
-            score = -1.0
-            chosen_name = None
-            chosen_x0 = None
-            chosen_patch = None
-            reason = "no_valid_reference_patches"
-        else:
-            score, chosen_name, chosen_x0, chosen_patch = best
-            reason = "max_reference_ssim"
-            self._debug_array("fill_reference_patch", chosen_patch)
-
-        if score < empty_cutoff:
-            row = h0 - 3
-            state = "empty"
-            reason = "ssim_below_empty_cutoff"
-        else:
-            row = 3
-            state = "full"
-            reason = "ssim_at_or_above_empty_cutoff"
-        self._debug_update(
-            {
-                "fill_square_start": int(square_start),
-                "fill_square_end": int(square_end),
-                "fill_score": float(score),
-                "fill_score_method": "max_reference_ssim",
-                "fill_reference_scores": reference_scores,
-                "fill_reference_choice": None if chosen_name is None else {
-                    "name": str(chosen_name),
-                    "x0": int(chosen_x0),
-                    "x1": int(chosen_x0 + patch_size),
-                    "score": float(score),
-                },
-                "fill_reference_min_mean": float(self.FILL_REFERENCE_MIN_MEAN),
-                "fill_channel_mean": float(np.mean(channel_patch)) if channel_patch.size else None,
-                "fill_candidate_state": str(state),
-                "fill_candidate_reason": str(reason),
-                "empty_cutoff": float(empty_cutoff),
-            }
-        )
-        return row, state, float(score), reason
+class RefuelAnalysisWorker(QThread):
+    """
+    Long-lived refuel detector thread fed through a one-slot mailbox.
 
-    def check_fill_state(self,image,x0,y0,w0,h0,empty_cutoff=0.15, return_details=False):
-        row, state, score, _reason = self.classify_fill_state(
-            image,
-            x0,
-            y0,
-            w0,
-            h0,
-            empty_cutoff=empty_cutoff,
-        )
-        if return_details:
-            return row, state, score
-        return row
+    ``submit`` replaces a job that is still waiting, so the detector always
+    starts on the newest frame; the replaced job is handed back to the caller.
+    One ``RefuelLevelDetector`` is reused for every job; finished jobs carry a
+    result snapshot and are emitted through ``analysis_done``.
+    """
 
-    def analyze_image(self):
-        # self.original_image = cv2.rotate(self.original_image, cv2.ROTATE_180)
-        # Rotate the image 90 degrees counter-clockwise
-        self.original_image = cv2.rotate(self.original_image, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        cur_img = self.original_image.copy()
-        self.analysis_image_shape = tuple(cur_img.shape[:2])
-        self._debug_array("analysis_image", cur_img)
-        if self.capture_debug:
-            self._debug_update(
-                {
-                    **self._analysis_metadata_payload(cur_img.shape),
-                    "analysis_parameters": {
-                        "offset": int(self.offset),
-                        "width": int(self.width),
-                        "threshold": int(self.threshold),
-                        "prominence": int(self.prominence),
-                        "empty_cutoff": float(self.empty_cutoff),
-                        "bottom_guard_px": int(self.bottom_guard_px),
-                    },
-                    "last_row": int(self.last_row) if self.last_row is not None else None,
-                    "peak_selection_parameters": self._scaled_peak_selection_parameters(cur_img.shape),
-                }
-            )
+    analysis_done = Signal(object)
 
-        geometry = self._detect_refuel_head_geometry(cur_img, threshold_value=self.threshold)
-        head_bbox = geometry.get("head_bbox")
-        channel_bounds = geometry.get("channel_bounds")
-        if head_bbox is None or channel_bounds is None:
-            print("Printer head not found, using default values")
-            self.annotated_image = cur_img.copy()
-            self.level_data = None
-            self.meniscus_row = None
-            self.detected_status = "not_found"
-            self.detected_details = {**self._analysis_metadata_payload(cur_img.shape), "reason": "printer_head_not_found"}
-            self._debug_update(
-                {
-                    "detected_status": "not_found",
-                    "meniscus_row": None,
-                    "level_data": None,
-                    "failure_reason": "printer_head_not_found",
-                }
-            )
-            return
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.detector = RefuelLevelDetector()
+        self._mailbox = threading.Condition()
+        self._pending_job = None
+        self._busy = False
+        self._stop_requested = False
+        self.jobs_completed = 0
+        self.frames_superseded = 0
+
+    def submit(self, job):
+        """Queue ``job`` and return the still-pending job it superseded, if any."""
+        with self._mailbox:
+            superseded = self._pending_job
+            self._pending_job = job
+            if superseded is not None:
+                self.frames_superseded += 1
+            self._mailbox.notify()
+        return superseded
+
+    def has_work(self):
+        with self._mailbox:
+            return bool(self._busy or self._pending_job is not None)
+
+    def stop(self, timeout_ms=3000):
+        """Stop the thread and return the job that never started, if any."""
+        with self._mailbox:
+            self._stop_requested = True
+            pending = self._pending_job
+            self._pending_job = None
+            self._mailbox.notify_all()
+        self.requestInterruption()
+        if self.isRunning():
+            self.wait(int(timeout_ms))
+        return pending
 
-        x, y, w, h = [int(value) for value in head_bbox]
-        x0, y0, w0, h0 = [int(value) for value in channel_bounds]
-        self.head_bbox = (int(x), int(y), int(w), int(h))
-        self.channel_bounds = (int(x0), int(y0), int(w0), int(h0))
-        self._debug_update(
-            {
-                "head_bbox": list(self.head_bbox),
-                "channel_bounds": list(self.channel_bounds),
-            }
-        )
+    def _next_job(self):
+        with self._mailbox:
+            while self._pending_job is None:
+                if self._stop_requested or self.isInterruptionRequested():
+                    return None
+                self._mailbox.wait(0.1)
+            job = self._pending_job
+            self._pending_job = None
+            self._busy = True
+            return job
+
+    def run_job(self, job):
+        timing = job.setdefault("timing_context", {})
+        started = time.perf_counter()
+        enqueued = timing.get("analysis_enqueued_perf_s")
+        if enqueued is not None:
+            timing["analysis_queue_wait_ms"] = float((started - float(enqueued)) * 1000.0)
+        try:
+            self.detector.load_frame(job["frame"], **job["detector_parameters"])
+            self.detector.run_detection()
+            job["result"] = self.detector.result()
+        except Exception as exc:
+            job["error"] = str(exc)
+        return job
 
-        profile = self.get_channel_profile(cur_img, x0, y0, w0, h0)
-
-        fill_row, fill_candidate_state, fill_score, fill_candidate_reason = self.classify_fill_state(
-            cur_img,
-            x0,
-            y0,
-            w0,
-            h0,
-            empty_cutoff=self.empty_cutoff,
-        )
-
-        scaled_bottom_guard_px = int(self._y_px(self.bottom_guard_px, min_value=0))
-        search_band = (0, max(0, int(h0) - scaled_bottom_guard_px))
-        meniscus_row = self.detect_meniscus_row(profile,
-                            last_row=self.last_row,
-                            fluid_darker=False,
-                            search_band=search_band,
-                            min_prominence=self.prominence)
-        fill_state = "visible"
-        fill_reason = "visible_peak"
-        final_decision_reason = "visible_peak"
-
-        if meniscus_row is None:
-            meniscus_row = int(fill_row)
-            fill_state = str(fill_candidate_state)
-            fill_reason = str(fill_candidate_reason)
-            final_decision_reason = "no_peak_using_fill_state"
-            self._debug_update(
-                {
-                    "credible_visible_peak": False,
-                    "visible_peak_reason": "no_selected_peak",
-                }
-            )
-        else:
-            visible_peak_ok, visible_reason = self._selected_peak_visible_decision(
-                self.peak_selection_details,
-                h0,
-                fill_candidate_state,
-                profile=profile,
-            )
-            if visible_peak_ok:
-                fill_state = "visible"
-                fill_reason = str(visible_reason)
-                final_decision_reason = "credible_visible_peak"
-            else:
-                meniscus_row = int(fill_row)
-                fill_state = str(fill_candidate_state)
-                fill_reason = str(fill_candidate_reason)
-                final_decision_reason = f"{visible_reason}_using_fill_state"
-            self._debug_update(
-                {
-                    "fill_state": str(fill_state),
-                    "fill_state_reason": str(fill_reason),
-                    "fill_candidate_state": str(fill_candidate_state),
-                    "fill_candidate_reason": str(fill_candidate_reason),
-                    "final_decision_reason": str(final_decision_reason),
-                    "full_top_guard_px": int(self._y_px(self.FULL_TOP_GUARD_PX)),
-                    "top_visible_prominence_min": float(self.TOP_VISIBLE_PROMINENCE_MIN),
-                    "bottom_artifact_guard_px": int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX)),
-                }
-            )
-        if str(fill_state) == "visible":
-            meniscus_row = max(0, min(int(h0) - 1, int(meniscus_row) + int(self.MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX)))
-        level_y = y0 + meniscus_row
-
-        cv2.line(cur_img, (x0, level_y), (x0 + w0, level_y), (0, 0, 255), 2)  # Red line
-        cv2.rectangle(cur_img, (x0, y0), (x0 + w0, y0 + h0), (255, 0, 0), 2)  # Blue rectangle
-        # Draw the printer head bounding box
-        cv2.rectangle(cur_img, (x, y), (x + w, y + h), (0, 255, 0), 2)  # Green rectangle
-
-        self.annotated_image = cur_img.copy()
-        self.meniscus_row = int(meniscus_row)
-        self.detected_status = str(fill_state or "visible")
-        self.detected_details = {
-            **self._analysis_metadata_payload(cur_img.shape),
-            "head_bbox": list(self.head_bbox) if self.head_bbox is not None else None,
-            "channel_bounds": list(self.channel_bounds) if self.channel_bounds is not None else None,
-            "fill_score": float(fill_score) if fill_score is not None else None,
-            "fill_state_reason": str(fill_reason),
-            "fill_candidate_state": str(fill_candidate_state),
-            "fill_candidate_reason": str(fill_candidate_reason),
-            "final_decision_reason": str(final_decision_reason),
-            "selected_peak_row": self.peak_selection_details.get("selected_peak_row"),
-            "selected_peak_prominence": self.peak_selection_details.get("selected_peak_prominence"),
-            "selected_peak_reason": self.peak_selection_details.get("selected_peak_reason"),
-            "last_row": int(self.last_row) if self.last_row is not None else None,
-        }
+    def run(self):
+        while not self.isInterruptionRequested():
+            job = self._next_job()
+            if job is None:
+                break
+            self.run_job(job)
+            with self._mailbox:
+                self._busy = False
+                self.jobs_completed += 1
+            self.analysis_done.emit(job)
 
-        # Calculate level data by calculating the difference between the meniscus row and the bottom of the channel
-        self.level_data = h0 - self.meniscus_row
-        self._debug_update(
-            {
-                "detected_status": self.detected_status,
-                "meniscus_row": int(self.meniscus_row),
-                "level_data": float(self.level_data),
-                "fill_score": float(fill_score) if fill_score is not None else None,
-                "fill_state": str(fill_state or "visible"),
-                "fill_state_reason": str(fill_reason),
-                "fill_candidate_state": str(fill_candidate_state),
-                "fill_candidate_reason": str(fill_candidate_reason),
-                "final_decision_reason": str(final_decision_reason),
-            }
-        )
 
 class RefuelCameraModel(QObject):
     """
@@ -38849,6 +37833,8 @@ class RefuelCameraModel(QObject):
     REFUEL_EJECTION_EVENT_LOG_LIMIT = 300
     REFUEL_STALE_FRAME_REPEAT_THRESHOLD = 3
     REFUEL_NO_VALID_SAMPLE_TICK_THRESHOLD = 3
+    # One working frame in the detector, one waiting in the mailbox, one being resized.
+    ANALYSIS_FRAME_BUFFER_POOL_SIZE = 3
 
     update_level_ui_signal = Signal()
 
@@ -38915,7 +37901,8 @@ class RefuelCameraModel(QObject):
         self.analysis_input_image = None
         self.original_image = None
         self.annotated_image = None
-        self.analysis_thread = None
+        self.last_analysis_result = None
+        self._dataset_seed_detector = RefuelLevelDetector()
 
         self.target_level_px = None
         self.target_meniscus_row = None
@@ -38939,6 +37926,8 @@ class RefuelCameraModel(QObject):
         self._analysis_context = None
         self._analysis_timing_context = None
         self._analysis_in_progress = False
+        self._analysis_worker = None
+        self._analysis_frame_buffers = []
         self._burst_state = None
         self._shutdown_complete = False
 
@@ -40226,14 +39215,33 @@ class RefuelCameraModel(QObject):
         return int(out_width), int(out_height)
 
     @staticmethod
-    def _build_analysis_working_frame(frame):
+    def _build_analysis_working_frame(frame, out=None):
         if frame is None:
             return None
-        size = RefuelCameraModel._analysis_working_size_for_shape(np.asarray(frame).shape)
+        frame = np.asarray(frame)
+        size = RefuelCameraModel._analysis_working_size_for_shape(frame.shape)
         if size is None:
             return None
+        shape = (int(size[1]), int(size[0])) + tuple(frame.shape[2:])
+        if out is not None and out.shape == shape and out.dtype == frame.dtype:
+            return cv2.resize(frame, size, dst=out, interpolation=cv2.INTER_AREA)
         return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
 
+    def _acquire_analysis_frame_buffer(self, raw_frame):
+        size = self._analysis_working_size_for_shape(np.asarray(raw_frame).shape)
+        if size is None:
+            return None
+        shape = (int(size[1]), int(size[0])) + tuple(np.asarray(raw_frame).shape[2:])
+        for index, buffer in enumerate(self._analysis_frame_buffers):
+            if buffer.shape == shape and buffer.dtype == raw_frame.dtype:
+                return self._analysis_frame_buffers.pop(index)
+        return np.empty(shape, dtype=raw_frame.dtype)
+
+    def _release_analysis_frame_buffer(self, buffer):
+        if buffer is None or len(self._analysis_frame_buffers) >= self.ANALYSIS_FRAME_BUFFER_POOL_SIZE:
+            return
+        self._analysis_frame_buffers.append(buffer)
+
     @staticmethod
     def _map_analysis_point_to_raw(point, raw_shape, input_shape):
         if point is None or raw_shape is None or input_shape is None:
@@ -40263,7 +39271,7 @@ class RefuelCameraModel(QObject):
         try:
             params = self._seed_analysis_parameters()
             resized = self._build_analysis_working_frame(frame)
-            worker = ImageAnalysisThread(
+            worker = self._dataset_seed_detector.load_frame(
                 resized,
                 params["offset"],
                 params["width"],
@@ -40319,7 +39327,7 @@ class RefuelCameraModel(QObject):
             "details": {
                 **(worker.detected_details or {}),
                 "analysis_parameters": params,
-                "peak_selection_parameters": ImageAnalysisThread.peak_selection_parameters(),
+                "peak_selection_parameters": RefuelLevelDetector.peak_selection_parameters(),
             },
         }
 
@@ -40664,54 +39672,107 @@ class RefuelCameraModel(QObject):
         return sample
 
     def start_analysis(self, frame, context=None):
+        """
+        Hand ``frame`` to the analysis worker. A frame submitted while the
+        detector is busy waits in the worker mailbox and replaces any frame
+        already waiting there, so results always describe the newest capture.
+        """
         if frame is None:
             return False
-        if self._analysis_in_progress:
-            return False
 
         copy_resize_start = time.perf_counter()
         raw_frame = self._copy_frame(frame)
         if raw_frame is None:
             return False
-        frame = self._build_analysis_working_frame(raw_frame)
+        buffer = self._acquire_analysis_frame_buffer(raw_frame)
+        frame = self._build_analysis_working_frame(raw_frame, out=buffer)
+        if frame is not buffer:
+            buffer = None
         copy_resize_duration_ms = float((time.perf_counter() - copy_resize_start) * 1000.0)
         self.raw_capture_image = raw_frame
         normalized_context = self._normalize_capture_context(context)
         normalized_context.setdefault("last_meniscus_row_before_analysis", self.last_meniscus_row)
-        self._analysis_context = normalized_context
-        self._analysis_timing_context = {
-            "copy_resize_duration_ms": copy_resize_duration_ms,
-            "analysis_enqueued_perf_s": time.perf_counter(),
+        job = {
+            "frame": frame,
+            "detector_parameters": {
+                "offset": self.offset,
+                "width": self.width,
+                "threshold": self.threshold,
+                "prominence": self.prominence,
+                "empty_cutoff": self.empty_cutoff,
+                "last_row": self.last_meniscus_row,
+                "bottom_guard_px": self.bottom_guard_px,
+            },
+            "context": normalized_context,
+            "frame_buffer": buffer,
+            "timing_context": {
+                "copy_resize_duration_ms": copy_resize_duration_ms,
+                "analysis_enqueued_perf_s": time.perf_counter(),
+            },
         }
+        worker = self._ensure_analysis_worker()
         self._analysis_in_progress = True
-        self.analysis_thread = ImageAnalysisThread(
-            frame,
-            self.offset,
-            self.width,
-            self.threshold,
-            self.prominence,
-            self.empty_cutoff,
-            self.last_meniscus_row,
-            bottom_guard_px=self.bottom_guard_px,
-        )
-        try:
-            finished_signal = getattr(self.analysis_thread, "finished", None)
-            if finished_signal is not None:
-                finished_signal.connect(self._mark_analysis_finished)
-        except Exception:
-            pass
-        try:
-            self.analysis_thread.analysis_done.connect(self.update_ui_with_analysis)
-            self.analysis_thread.start()
-        except Exception:
-            self._analysis_in_progress = False
-            self._analysis_context = None
-            self._analysis_timing_context = None
-            raise
+        superseded = worker.submit(job)
+        if superseded is not None:
+            self._discard_superseded_analysis_job(superseded, worker)
         return True
 
-    def _mark_analysis_finished(self):
-        self._analysis_in_progress = False
+    def _ensure_analysis_worker(self):
+        worker = self._analysis_worker
+        if worker is None:
+            worker = RefuelAnalysisWorker()
+            worker.analysis_done.connect(self._on_analysis_job_done)
+            self._analysis_worker = worker
+        if not worker.isRunning():
+            worker.start()
+        return worker
+
+    def _analysis_worker_counters(self, worker):
+        if worker is None:
+            return {}
+        return {
+            "analysis_worker_jobs_completed": int(worker.jobs_completed),
+            "analysis_superseded_frames": int(worker.frames_superseded),
+        }
+
+    def _discard_superseded_analysis_job(self, job, worker=None):
+        self._release_analysis_frame_buffer(job.get("frame_buffer"))
+        context = job.get("context") or {}
+        if context.get("refuel_monitor_tick_index") is None:
+            return
+        payload = {
+            "tick_index": context.get("refuel_monitor_tick_index"),
+            "event_kind": "superseded",
+            "capture_duration_ms": context.get("refuel_monitor_capture_duration_ms"),
+            "copy_resize_duration_ms": (job.get("timing_context") or {}).get("copy_resize_duration_ms"),
+            "analysis_started": False,
+            **self._analysis_worker_counters(worker),
+        }
+        payload.update(self._copy_frame_signature_fields(context))
+        self.record_refuel_monitor_timing(payload)
+
+    def _on_analysis_job_done(self, job):
+        worker = self._analysis_worker
+        self._release_analysis_frame_buffer(job.pop("frame_buffer", None))
+        result = job.get("result")
+        timing_context = dict(job.get("timing_context") or {})
+        timing_context.update(self._analysis_worker_counters(worker))
+        if job.get("error"):
+            print(f"[RefuelCameraModel] refuel analysis failed: {job['error']}")
+            timing_context["analysis_error"] = job["error"]
+        self.last_analysis_result = result
+        self._analysis_context = job.get("context")
+        self._analysis_timing_context = timing_context
+        if job.get("error") or result is None:
+            self.update_ui_with_analysis(None, None, None, None)
+        else:
+            self.update_ui_with_analysis(
+                result.original_image,
+                result.annotated_image,
+                result.level_data,
+                result.meniscus_row,
+            )
+        self._analysis_in_progress = bool(worker is not None and worker.has_work())
 
     def update_ui_with_analysis(self, original_image, annotated_image, level_data, meniscus_row):
         context = self._analysis_context
@@ -40735,8 +39796,8 @@ class RefuelCameraModel(QObject):
         if level_data is not None:
             self.update_current_level(float(level_data))
             sample_context = dict(context or {})
-            detector_status = getattr(self.analysis_thread, "detected_status", None)
-            detected_details = getattr(self.analysis_thread, "detected_details", None)
+            detector_status = getattr(self.last_analysis_result, "detected_status", None)
+            detected_details = getattr(self.last_analysis_result, "detected_details", None)
             if detector_status is not None:
                 sample_context["detector_status"] = detector_status
             if isinstance(detected_details, dict):
@@ -40762,8 +39823,8 @@ class RefuelCameraModel(QObject):
                     total_latency_ms = float((time.perf_counter() - float(tick_started_perf_s)) * 1000.0)
             except Exception:
                 total_latency_ms = None
-            detector_runtime_ms = getattr(self.analysis_thread, "detector_runtime_ms", None)
-            detector_status = getattr(self.analysis_thread, "detected_status", None)
+            detector_runtime_ms = getattr(self.last_analysis_result, "detector_runtime_ms", None)
+            detector_status = getattr(self.last_analysis_result, "detected_status", None)
             timing_payload = {
                     "tick_index": monitor_tick_index,
                     "event_kind": "sample_result",
@@ -40782,7 +39843,7 @@ class RefuelCameraModel(QObject):
                 for key in ("last_meniscus_row_before_analysis",):
                     if context.get(key) is not None:
                         timing_payload[key] = context.get(key)
-            detected_details = getattr(self.analysis_thread, "detected_details", None)
+            detected_details = getattr(self.last_analysis_result, "detected_details", None)
             if isinstance(detected_details, dict):
                 for key in (
                     "final_decision_reason",
@@ -40795,6 +39856,8 @@ class RefuelCameraModel(QObject):
             if isinstance(sample, dict):
                 timing_payload["level_delta_from_previous_sample_px"] = sample.get("level_delta_from_previous_sample_px")
                 timing_payload["same_level_streak_count"] = sample.get("same_level_streak_count")
+            for key, value in timing_context.items():
+                timing_payload.setdefault(key, value)
             self.record_refuel_monitor_timing(timing_payload)
         self.update_level_ui_signal.emit()
 
@@ -40867,18 +39930,16 @@ class RefuelCameraModel(QObject):
         if self._burst_state is not None:
             self.cancel_burst("Application shutdown")
         self.close_session()
-        thread = self.analysis_thread
-        if thread is not None:
-            try:
-                thread.requestInterruption()
-            except Exception:
-                pass
+        worker = self._analysis_worker
+        if worker is not None:
             try:
-                if thread.isRunning():
-                    thread.wait(3000)
+                pending = worker.stop(3000)
+                if pending is not None:
+                    self._release_analysis_frame_buffer(pending.get("frame_buffer"))
             except Exception:
                 pass
-        self.analysis_thread = None
+        self._analysis_worker = None
+        self.last_analysis_result = None
         self._analysis_in_progress = False
         self.refuel_monitor_camera_active = False
         self._shutdown_complete = True
@@ -6369,22 +6369,8 @@ class DropletImagingDialog(QtWidgets.QDialog):
         except Exception:
             pass
 
-        try:
-            if model.is_analysis_in_progress():
-                model.record_refuel_monitor_skip(
-                    "analysis_in_progress",
-                    state="monitoring",
-                    message="Waiting for refuel analysis",
-                )
-                self._record_refuel_monitor_tick_timing(
-                    timing_context,
-                    event_kind="skip",
-                    skip_reason="analysis_in_progress",
-                )
-                return
-        except Exception:
-            pass
-
+        # A tick that lands while the detector is busy still captures: the
+        # analysis worker keeps only the newest waiting frame.
         model.record_refuel_monitor_attempt("Monitoring")
         try:
             result = self.controller.capture_refuel_image_with_context(
@@ -1,4 +1,4 @@
-from .Model import RefuelCameraModel, ImageAnalysisThread, DropletCameraModel, \
+from .Model import RefuelCameraModel, RefuelAnalysisWorker, ImageAnalysisThread, DropletCameraModel, \
     CalibrationManager, NozzlePositionChecklistStore, TransientCharacterizationCandidate
 from .View import RefuelCameraWindow, DropletImagingDialog, RackCalibrationFixDialog, \
     NozzlePositionDatasetCaptureWindow, ManualRefuelCheckDialog
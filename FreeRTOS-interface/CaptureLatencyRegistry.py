@@ -0,0 +1,216 @@
+"""Always-on latency histograms for the droplet-camera capture path.
+
+``DropletCamera`` records a handful of spans for every capture (trigger to
+flash-ack edge, edge to selected frame, frame-to-result selection) and for
+every grabbed frame (``make_array`` and signal mean).  Unlike the per-request
+capture performance traces, recording does not depend on diagnostics being
+enabled: each span costs one deque append and one bucket increment.
+
+Each metric keeps a rolling window of recent durations for p50/p95/p99 and
+lifetime bucket counts, so regressions across a long calibration session show
+up without verbose debug logging.  Recent spans are also kept for export as a
+Chrome trace (``chrome://tracing`` / Perfetto); each track has its own bounded
+span log, so the per-frame grabber spans never evict the per-capture ones.
+
+The module has no Qt dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+
+METRIC_TRIGGER_TO_EDGE = "trigger_to_edge"
+METRIC_EDGE_TO_FRAME = "edge_to_frame"
+METRIC_MAKE_ARRAY = "make_array"
+METRIC_SIGNAL_MEAN = "signal_mean"
+METRIC_SELECTION = "selection"
+METRIC_TRIGGER_TO_RESULT = "trigger_to_result"
+CAPTURE_LATENCY_METRICS = (
+    METRIC_TRIGGER_TO_EDGE,
+    METRIC_EDGE_TO_FRAME,
+    METRIC_MAKE_ARRAY,
+    METRIC_SIGNAL_MEAN,
+    METRIC_SELECTION,
+    METRIC_TRIGGER_TO_RESULT,
+)
+
+TRACK_CAPTURE = "capture"
+TRACK_GRABBER = "grabber"
+
+DEFAULT_LATENCY_WINDOW = 1024
+DEFAULT_TRACE_EVENT_LIMIT = 4096
+BUCKET_UPPER_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+def _round_ms(value):
+    return None if value is None else round(float(value), 4)
+
+
+class LatencyHistogram:
+    """Rolling-window percentiles and lifetime bucket counts for one metric, in ms."""
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW):
+        self._window = deque(maxlen=max(1, int(window)))
+        self._buckets = [0] * (len(BUCKET_UPPER_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = None
+
+    def record(self, duration_ms: float):
+        duration_ms = float(duration_ms)
+        self._window.append(duration_ms)
+        self._buckets[bisect_left(BUCKET_UPPER_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if self.max_ms is None or duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def snapshot(self) -> dict:
+        samples = np.asarray(self._window, dtype=float)
+        out = {
+            "count": int(self.count),
+            "window_count": int(samples.size),
+            "mean_ms": _round_ms(self.total_ms / self.count) if self.count else None,
+            "max_ms": _round_ms(self.max_ms),
+        }
+        if samples.size:
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            out.update({"p50_ms": _round_ms(p50), "p95_ms": _round_ms(p95), "p99_ms": _round_ms(p99)})
+            out["window_max_ms"] = _round_ms(samples.max())
+        else:
+            out.update({"p50_ms": None, "p95_ms": None, "p99_ms": None, "window_max_ms": None})
+        labels = [f"le_{bound:g}ms" for bound in BUCKET_UPPER_BOUNDS_MS] + [f"gt_{BUCKET_UPPER_BOUNDS_MS[-1]:g}ms"]
+        out["buckets"] = dict(zip(labels, self._buckets))
+        return out
+
+
+class CaptureLatencyRegistry:
+    """Thread-safe set of named latency histograms plus a bounded span log per track."""
+
+    def __init__(
+        self,
+        *,
+        window: int = DEFAULT_LATENCY_WINDOW,
+        trace_event_limit: int = DEFAULT_TRACE_EVENT_LIMIT,
+        metrics=CAPTURE_LATENCY_METRICS,
+    ):
+        self.window = max(1, int(window))
+        self._lock = threading.Lock()
+        self._metric_names = tuple(metrics)
+        self._histograms = {name: LatencyHistogram(self.window) for name in self._metric_names}
+        self.trace_event_limit = max(1, int(trace_event_limit))
+        self._spans_by_track = {}
+        self.started_monotonic_ns = time.monotonic_ns()
+
+    def _histogram_locked(self, metric: str) -> LatencyHistogram:
+        histogram = self._histograms.get(metric)
+        if histogram is None:
+            histogram = LatencyHistogram(self.window)
+            self._histograms[metric] = histogram
+        return histogram
+
+    def record(self, metric: str, duration_ms: float):
+        if duration_ms is None or duration_ms < 0:
+            return
+        with self._lock:
+            self._histogram_locked(str(metric)).record(duration_ms)
+
+    def record_span(self, metric: str, start_ns, end_ns, *, track: str = TRACK_CAPTURE, args=None):
+        """Record ``end_ns - start_ns`` (monotonic ns) and keep the span for trace export."""
+        if start_ns is None or end_ns is None:
+            return
+        start_ns = int(start_ns)
+        duration_ns = int(end_ns) - start_ns
+        if duration_ns < 0:
+            return
+        with self._lock:
+            self._histogram_locked(str(metric)).record(duration_ns / 1_000_000.0)
+            track = str(track)
+            spans = self._spans_by_track.get(track)
+            if spans is None:
+                spans = deque(maxlen=self.trace_event_limit)
+                self._spans_by_track[track] = spans
+            spans.append((str(metric), start_ns, duration_ns, track, args))
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name: LatencyHistogram(self.window) for name in self._metric_names}
+            self._spans_by_track = {}
+            self.started_monotonic_ns = time.monotonic_ns()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+            span_counts = {track: len(spans) for track, spans in self._spans_by_track.items()}
+        return {
+            "kind": "capture_latency_histograms",
+            "schema_version": SNAPSHOT_SCHEMA_VERSION,
+            "window": self.window,
+            "started_monotonic_ns": int(self.started_monotonic_ns),
+            "uptime_s": round((time.monotonic_ns() - self.started_monotonic_ns) / 1_000_000_000.0, 3),
+            "retained_span_count": int(sum(span_counts.values())),
+            "retained_span_counts": span_counts,
+            "metrics": metrics,
+        }
+
+    def chrome_trace(self) -> dict:
+        """Retained spans in Chrome trace-event JSON, one thread per track."""
+        with self._lock:
+            spans = sorted(
+                (span for track_spans in self._spans_by_track.values() for span in track_spans),
+                key=lambda span: span[1],
+            )
+            origin_ns = min([self.started_monotonic_ns] + [span[1] for span in spans])
+        track_ids = {}
+        events = []
+        for name, start_ns, duration_ns, track, args in spans:
+            tid = track_ids.setdefault(track, len(track_ids) + 1)
+            event = {
+                "name": name,
+                "cat": track,
+                "ph": "X",
+                "ts": (start_ns - origin_ns) / 1000.0,
+                "dur": duration_ns / 1000.0,
+                "pid": 1,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = dict(args)
+            events.append(event)
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "DropletCamera"}}
+        ] + [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}}
+            for track, tid in track_ids.items()
+        ]
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"kind": "capture_latency_trace", "schema_version": SNAPSHOT_SCHEMA_VERSION},
+        }
+
+    def write_json(self, path) -> Path:
+        return _write_json(path, self.snapshot())
+
+    def write_chrome_trace(self, path) -> Path:
+        return _write_json(path, self.chrome_trace())
+
+
+def _write_json(path, payload) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, default=str)
+        handle.write("\n")
+    tmp_path.replace(path)
+    return path
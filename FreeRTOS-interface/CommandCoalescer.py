@@ -0,0 +1,154 @@
+"""Drop redundant queue commands before they are framed and sent.
+
+``Machine.add_command_to_queue`` asks the coalescer about every new command.
+A command is eliminated when it cannot change machine state:
+
+* a relative X/Y/Z move of zero steps;
+* an absolute move, pressure target or pulse-width set whose parameters
+  equal the value already established by an earlier queued command, with
+  nothing queued in between that could have changed that value.
+
+The coalescer only tracks what the host queued.  Any command it does not
+understand invalidates every tracked value, as do a queue clear (seen as a
+new queue generation) and cancellation of the command that established a
+value.  Dispenses invalidate the pressure targets because the firmware's
+absolute-pressure command also waits for the regulator to recover.
+"""
+
+from __future__ import annotations
+
+
+MOTION_KEYS = ("X", "Y", "XY", "Z")
+PRESSURE_KEYS = ("PRESSURE_P", "PRESSURE_R")
+
+# command type -> (tracked key it establishes, keys it invalidates)
+ABSOLUTE_TARGETS = {
+    "ABSOLUTE_X": ("X", ("XY",)),
+    "ABSOLUTE_Y": ("Y", ("XY",)),
+    "ABSOLUTE_XY": ("XY", ("X", "Y")),
+    "ABSOLUTE_Z": ("Z", ()),
+    "ABSOLUTE_PRESSURE_P": ("PRESSURE_P", ()),
+    "ABSOLUTE_PRESSURE_R": ("PRESSURE_R", ()),
+    "SET_WIDTH_P": ("WIDTH_P", ()),
+    "SET_WIDTH_R": ("WIDTH_R", ()),
+}
+
+# Relative moves carry (direction, steps, speed); zero steps is a no-op.
+RELATIVE_MOVES = {
+    "RELATIVE_X": ("X", "XY"),
+    "RELATIVE_Y": ("Y", "XY"),
+    "RELATIVE_Z": ("Z",),
+}
+
+INVALIDATES = {
+    "DISPENSE": PRESSURE_KEYS,
+    "DISPENSE_PRINT": PRESSURE_KEYS,
+    "DISPENSE_REFUEL": PRESSURE_KEYS,
+}
+
+NEUTRAL_COMMANDS = frozenset(
+    {
+        "WAIT",
+        "LED_ON",
+        "LED_OFF",
+        "SET_AXIS_MAXSPEED",
+        "SET_AXIS_ACCEL",
+        "SET_AXIS_PROFILE",
+        "CHANGE_ACCEL",
+        "START_READ_CAMERA",
+        "STOP_READ_CAMERA",
+        "SET_WIDTH_F",
+        "SET_DELAY_F",
+        "SET_IMAGE_DROPLETS",
+    }
+)
+
+
+class CommandCoalescer:
+    """Track queued targets and report which new commands are redundant."""
+
+    def __init__(self, *, enabled=True):
+        self.enabled = bool(enabled)
+        self._targets = {}
+        self._generation = None
+        self.submitted = 0
+        self.eliminated = 0
+        self.eliminated_by_reason = {}
+        self.eliminated_by_type = {}
+
+    def invalidate(self, keys=None):
+        if keys is None:
+            self._targets.clear()
+            return
+        for key in keys:
+            self._targets.pop(key, None)
+
+    def _sync_generation(self, generation):
+        if generation != self._generation:
+            self._targets.clear()
+            self._generation = generation
+
+    def redundant_reason(self, command_type, param1, param2, param3, *, generation=None):
+        """Return why the command is redundant, or None if it must be sent."""
+        self.submitted += 1
+        if not self.enabled:
+            return None
+        self._sync_generation(generation)
+        command_type = str(command_type)
+        if command_type in RELATIVE_MOVES:
+            return "zero_length_move" if int(param2) == 0 else None
+        target = ABSOLUTE_TARGETS.get(command_type)
+        if target is None:
+            return None
+        entry = self._targets.get(target[0])
+        if entry is None:
+            return None
+        params, command = entry
+        if getattr(command, "status", None) == "Canceled":
+            self._targets.pop(target[0], None)
+            return None
+        if params != (int(param1), int(param2), int(param3)):
+            return None
+        if target[0] in MOTION_KEYS:
+            return "repeated_move_target"
+        return "setting_matches_target"
+
+    def record(self, command, *, generation=None):
+        """Update tracked targets after ``command`` was queued."""
+        self._sync_generation(generation)
+        command_type = str(getattr(command, "command_type", "") or "")
+        target = ABSOLUTE_TARGETS.get(command_type)
+        if target is not None:
+            key, invalidated = target
+            self.invalidate(invalidated)
+            self._targets[key] = (
+                (int(command.param1), int(command.param2), int(command.param3)),
+                command,
+            )
+        elif command_type in RELATIVE_MOVES:
+            self.invalidate(RELATIVE_MOVES[command_type])
+        elif command_type in INVALIDATES:
+            self.invalidate(INVALIDATES[command_type])
+        elif command_type not in NEUTRAL_COMMANDS:
+            self.invalidate()
+
+    def note_eliminated(self, command_type, reason):
+        self.eliminated += 1
+        self.eliminated_by_reason[reason] = self.eliminated_by_reason.get(reason, 0) + 1
+        command_type = str(command_type)
+        self.eliminated_by_type[command_type] = self.eliminated_by_type.get(command_type, 0) + 1
+
+    def reset_stats(self):
+        self.submitted = 0
+        self.eliminated = 0
+        self.eliminated_by_reason = {}
+        self.eliminated_by_type = {}
+
+    def stats(self):
+        return {
+            "enabled": bool(self.enabled),
+            "submitted": int(self.submitted),
+            "eliminated": int(self.eliminated),
+            "eliminated_by_reason": dict(self.eliminated_by_reason),
+            "eliminated_by_type": dict(self.eliminated_by_type),
+        }
@@ -0,0 +1,192 @@
+"""Adaptive sizing of the host command transport window.
+
+The host keeps up to ``size`` queue commands sent-but-not-retired on the MCU.
+A fixed window of four throttles short commands on ACK round-trips, so the
+window is resized from three signals:
+
+* queue ACK latency (sent -> accepted) for first-attempt sends only, so a
+  resend never contributes an ambiguous sample;
+* the firmware command-queue depth reported in status frames;
+* resend, busy and gap-repair events, which halve the window.
+
+Growth is additive (one slot per window's worth of clean ACKs) and never
+exceeds the firmware-advertised maximum from the HELLO ACK.  Firmware that
+does not advertise a maximum keeps the historical window of four.
+
+The module has no Qt dependency; ``Machine`` feeds it events and applies the
+resulting size to ``CommandQueue.max_inflight_commands``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+
+
+DEFAULT_INFLIGHT_WINDOW = 4
+MIN_INFLIGHT_WINDOW = 2
+LATENCY_EWMA_ALPHA = 0.2
+# Shrink when smoothed ACK latency exceeds this multiple of the recent floor.
+LATENCY_INFLATION_LIMIT = 2.5
+LATENCY_FLOOR_SAMPLES = 32
+# Stop growing once the firmware queue is within this many slots of its capacity.
+FIRMWARE_QUEUE_HEADROOM = 2
+# Orchestrator command-queue length (TRANSPORT_MAX_INFLIGHT_COMMANDS) for
+# firmware that does not advertise it in the HELLO ACK.
+FIRMWARE_QUEUE_CAPACITY = 16
+
+
+class AdaptiveInflightWindow:
+    """AIMD controller for the number of in-flight queue commands."""
+
+    def __init__(
+        self,
+        *,
+        initial=DEFAULT_INFLIGHT_WINDOW,
+        minimum=MIN_INFLIGHT_WINDOW,
+        enabled=True,
+        history_size=256,
+        clock_ns=time.monotonic_ns,
+    ):
+        self.initial = max(1, int(initial))
+        self.minimum = max(1, min(int(minimum), self.initial))
+        self.enabled = bool(enabled)
+        self._clock_ns = clock_ns
+        self.firmware_cap = None
+        self.history = deque(maxlen=max(1, int(history_size)))
+        self._reset_state()
+        self.size = self.initial
+
+    def _reset_state(self):
+        self.latency_ewma_ms = None
+        self._latency_samples_ms = deque(maxlen=LATENCY_FLOOR_SAMPLES)
+        self._clean_acks = 0
+        self.firmware_queue_depth = None
+        self.ack_samples = 0
+        self.shrink_events = 0
+        self.grow_events = 0
+
+    @property
+    def cap(self):
+        """Largest window the connected firmware accepts."""
+        limit = DEFAULT_INFLIGHT_WINDOW if self.firmware_cap is None else self.firmware_cap
+        if not self.enabled:
+            limit = min(limit, self.initial)
+        return limit
+
+    @property
+    def firmware_queue_capacity(self):
+        """Length of the MCU command queue that reported depths are measured against."""
+        return FIRMWARE_QUEUE_CAPACITY if self.firmware_cap is None else self.firmware_cap
+
+    @property
+    def latency_floor_ms(self):
+        if not self._latency_samples_ms:
+            return None
+        return min(self._latency_samples_ms)
+
+    def reset(self, firmware_cap=None, *, reason="session_reset"):
+        """Start a new transport session, optionally with an advertised cap."""
+        self._reset_state()
+        cap = None if firmware_cap is None else max(1, int(firmware_cap))
+        self.firmware_cap = cap
+        return self._set_size(min(self.initial, self.cap), reason)
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        self._clean_acks = 0
+        target = self.size if self.enabled else self.initial
+        return self._set_size(target, "adaptive_enabled" if self.enabled else "adaptive_disabled")
+
+    def on_ack(self, latency_ns):
+        """Record a clean first-attempt queue ACK and maybe resize."""
+        if latency_ns is None or latency_ns < 0:
+            return None
+        latency_ms = float(latency_ns) / 1_000_000.0
+        self.ack_samples += 1
+        self._latency_samples_ms.append(latency_ms)
+        if self.latency_ewma_ms is None:
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.latency_ewma_ms += LATENCY_EWMA_ALPHA * (latency_ms - self.latency_ewma_ms)
+        if not self.enabled:
+            return None
+
+        floor = self.latency_floor_ms
+        if floor is not None and floor > 0.0 and self.latency_ewma_ms > floor * LATENCY_INFLATION_LIMIT:
+            self._clean_acks = 0
+            return self._shrink_to(self.size - 1, "ack_latency_inflated")
+
+        self._clean_acks += 1
+        if self._clean_acks < self.size or self.size >= self.cap:
+            return None
+        self._clean_acks = 0
+        depth = self.firmware_queue_depth
+        if depth is not None and depth >= self.firmware_queue_capacity - FIRMWARE_QUEUE_HEADROOM:
+            return None
+        self.grow_events += 1
+        return self._set_size(self.size + 1, "ack_clean_round")
+
+    def on_firmware_queue_depth(self, depth):
+        """Track the MCU queue depth; a full firmware queue sheds one slot."""
+        if depth is None:
+            return None
+        self.firmware_queue_depth = max(0, int(depth))
+        if self.enabled and self.firmware_queue_depth >= self.firmware_queue_capacity:
+            self._clean_acks = 0
+            return self._shrink_to(self.size - 1, "firmware_queue_full")
+        return None
+
+    def on_resend(self, reason):
+        """Halve the window after a resend, busy ACK or gap repair."""
+        self._clean_acks = 0
+        if not self.enabled:
+            return None
+        return self._shrink_to(self.size // 2, str(reason or "resend"))
+
+    def _shrink_to(self, size, reason):
+        if size >= self.size or self.size <= self.minimum:
+            return None
+        self.shrink_events += 1
+        return self._set_size(size, reason)
+
+    def _set_size(self, size, reason):
+        size = max(min(self.minimum, self.cap), min(int(size), self.cap))
+        if size == self.size:
+            return None
+        previous = self.size
+        self.size = size
+        change = {
+            "monotonic_ns": int(self._clock_ns()),
+            "window": int(size),
+            "previous_window": int(previous),
+            "reason": str(reason),
+            "cap": int(self.cap),
+            "ack_latency_ewma_ms": (
+                None if self.latency_ewma_ms is None else round(self.latency_ewma_ms, 3)
+            ),
+            "ack_latency_floor_ms": (
+                None if self.latency_floor_ms is None else round(self.latency_floor_ms, 3)
+            ),
+            "firmware_queue_depth": self.firmware_queue_depth,
+        }
+        self.history.append(change)
+        return change
+
+    def snapshot(self):
+        return {
+            "enabled": bool(self.enabled),
+            "window": int(self.size),
+            "cap": int(self.cap),
+            "firmware_cap": self.firmware_cap,
+            "ack_samples": int(self.ack_samples),
+            "ack_latency_ewma_ms": (
+                None if self.latency_ewma_ms is None else round(self.latency_ewma_ms, 3)
+            ),
+            "ack_latency_floor_ms": (
+                None if self.latency_floor_ms is None else round(self.latency_floor_ms, 3)
+            ),
+            "firmware_queue_depth": self.firmware_queue_depth,
+            "grow_events": int(self.grow_events),
+            "shrink_events": int(self.shrink_events),
+        }
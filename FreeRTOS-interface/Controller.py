@@ -41,6 +41,12 @@ from MachineDataTransactions import (
     ConfigurationValidationError,
     read_governed_documents,
 )
+from WellPathPlanner import (
+    WELL_ORDER_LINEAR,
+    WELL_ORDER_SERPENTINE,
+    WELL_ORDER_TRAVEL_OPTIMIZED,
+    normalize_well_order_mode,
+)
 from ConfigurationSafetyPolicy import (
     ConfigurationSafetyError,
     parse_guard_assessment,
@@ -4880,6 +4886,8 @@ class Controller(QObject):
             "soft_stop_recovery_reason": context.get("soft_stop_recovery_reason"),
             "soft_stop_clear_uncertain": bool(getattr(self, "_soft_stop_clear_uncertain", False)),
             "serpentine": bool(getattr(self, "_array_print_serpentine", ARRAY_PRINT_SERPENTINE)),
+            "well_order_mode": context.get("well_order_mode"),
+            "well_order_travel": context.get("well_order_travel"),
             "expected_volume_uL": context.get("expected_volume"),
             "droplet_volume_nL": context.get("droplet_volume"),
             "update_volume": bool(context.get("update_volume", False)),
@@ -7920,11 +7928,56 @@ class Controller(QObject):
             return False
         return True
 
+    def _get_array_well_order_mode(self):
+        serpentine = bool(getattr(self, "_array_print_serpentine", ARRAY_PRINT_SERPENTINE))
+        default_mode = WELL_ORDER_SERPENTINE if serpentine else WELL_ORDER_LINEAR
+        experiment_model = getattr(getattr(self, "model", None), "experiment_model", None)
+        getter = getattr(experiment_model, "get_well_order_mode", None)
+        mode = getter() if callable(getter) else None
+        if mode == WELL_ORDER_TRAVEL_OPTIMIZED:
+            return mode
+        return default_mode
+
+    def _get_array_path_obstacles(self):
+        location_model = getattr(getattr(self, "model", None), "location_model", None)
+        getter = getattr(location_model, "get_obstacles", None)
+        if not callable(getter):
+            return []
+        try:
+            return list(getter() or [])
+        except Exception:
+            return []
+
+    def estimate_array_well_order_travel(self, stock_id=None):
+        """Estimate travel for the travel-optimized well order versus serpentine."""
+        if stock_id is None:
+            printer_head = self.model.rack_model.get_gripper_printer_head()
+            stock_id = printer_head.get_stock_id() if printer_head is not None else None
+        if not stock_id:
+            return None
+        estimator = getattr(self.model.well_plate, "estimate_well_order_travel", None)
+        if not callable(estimator):
+            return None
+        return estimator(
+            stock_id=stock_id,
+            fill_by="rows",
+            obstacles=self._get_array_path_obstacles(),
+        )
+
     def _get_array_remaining_wells(self, stock_id):
         if not stock_id:
             return []
-        serpentine = bool(getattr(self, "_array_print_serpentine", ARRAY_PRINT_SERPENTINE))
-        reaction_wells = self.model.well_plate.get_all_wells_with_reactions(fill_by='rows', serpentine=serpentine)
+        mode = self._get_array_well_order_mode()
+        if mode == WELL_ORDER_TRAVEL_OPTIMIZED:
+            reaction_wells = self.model.well_plate.get_all_wells_with_reactions(
+                fill_by='rows',
+                order=mode,
+                stock_id=stock_id,
+                obstacles=self._get_array_path_obstacles(),
+            )
+        else:
+            serpentine = mode == WELL_ORDER_SERPENTINE
+            reaction_wells = self.model.well_plate.get_all_wells_with_reactions(fill_by='rows', serpentine=serpentine)
         return [well for well in reaction_wells if well.get_remaining_droplets(stock_id) > 0]
 
     def _start_array_run_context(self):
@@ -7949,6 +8002,28 @@ class Controller(QObject):
             self._array_context = None
             return False
 
+        reset_coalescing_stats = getattr(
+            getattr(self, "machine", None), "reset_command_coalescing_stats", None
+        )
+        if callable(reset_coalescing_stats):
+            reset_coalescing_stats()
+
+        well_order_mode = self._get_array_well_order_mode()
+        well_order_travel = None
+        if well_order_mode == WELL_ORDER_TRAVEL_OPTIMIZED:
+            try:
+                well_order_travel = self.estimate_array_well_order_travel(current_stock_id)
+            except Exception as exc:
+                print(f"Controller: could not estimate well order travel: {exc}")
+            if isinstance(well_order_travel, dict):
+                print(
+                    "Controller: travel-optimized well order "
+                    f"{well_order_travel['planned']['distance_steps']:.0f} steps / "
+                    f"{well_order_travel['planned']['time_s']:.1f} s vs serpentine "
+                    f"{well_order_travel['serpentine']['distance_steps']:.0f} steps / "
+                    f"{well_order_travel['serpentine']['time_s']:.1f} s"
+                )
+
         self._array_context = {
             "stock_id": current_stock_id,
             "expected_volume": expected_volume,
@@ -7988,6 +8063,8 @@ class Controller(QObject):
             ),
             "last_planned_row_num": None,
             "last_planned_col": None,
+            "well_order_mode": well_order_mode,
+            "well_order_travel": well_order_travel,
         }
         return True
 
@@ -8150,6 +8227,7 @@ class Controller(QObject):
             ),
             "last_planned_row_num": None,
             "last_planned_col": None,
+            "well_order_mode": self._get_array_well_order_mode(),
         }
         plate_authorized = False
 
@@ -8262,8 +8340,13 @@ class Controller(QObject):
         last_row_num = context.get("last_planned_row_num")
         if row_num is None or col is None or last_row_num is None:
             return None
+        # The travel-optimized tour can enter rows in any order, so every row
+        # change gets the approach move rather than only forward row advances.
+        travel_optimized = context.get("well_order_mode") == WELL_ORDER_TRAVEL_OPTIMIZED
         try:
-            if row_num <= int(last_row_num):
+            if travel_optimized and row_num == int(last_row_num):
+                return None
+            if not travel_optimized and row_num <= int(last_row_num):
                 return None
         except Exception:
             return None
@@ -8618,6 +8701,13 @@ class Controller(QObject):
         except Exception:
             audit_details = {}
         audit_details["finalize_reason"] = reason
+        coalescing = self.get_command_coalescing_stats()
+        if isinstance(coalescing, dict):
+            audit_details["command_coalescing"] = coalescing
+            print(
+                f"Command coalescing eliminated {coalescing['eliminated']} of "
+                f"{coalescing['submitted']} queued frames"
+            )
         experiment_model = getattr(self.model, "experiment_model", None)
         try:
             if reason == "completed":
@@ -10542,6 +10632,27 @@ class Controller(QObject):
     def set_command_dispatch_interval(self, interval_ms: int):
         self.machine.set_execution_interval_ms(interval_ms)
 
+    def set_status_coalesce_interval(self, interval_ms: int):
+        setter = getattr(self.machine, "set_status_coalesce_interval_ms", None)
+        if callable(setter):
+            setter(interval_ms)
+
+    def set_adaptive_command_window(self, enabled: bool):
+        setter = getattr(self.machine, "set_adaptive_command_window", None)
+        if callable(setter):
+            setter(enabled)
+
+    def set_command_coalescing_enabled(self, enabled: bool):
+        setter = getattr(self.machine, "set_command_coalescing_enabled", None)
+        if callable(setter):
+            setter(enabled)
+
+    def get_command_coalescing_stats(self):
+        getter = getattr(getattr(self, "machine", None), "get_command_coalescing_stats", None)
+        if not callable(getter):
+            return None
+        return getter()
+
     def set_save_directory(self, directory):
         self.model.droplet_camera_model.set_save_directory(directory)      
 
@@ -11077,8 +11188,23 @@ class Controller(QObject):
                 summaries.setdefault("machine_status_delivery", getter())
             except Exception:
                 pass
+        if "droplet_capture_latency" not in summaries:
+            latency = self.get_droplet_capture_latency_snapshot()
+            if latency is not None:
+                summaries["droplet_capture_latency"] = latency
         return summaries
 
+    def get_droplet_capture_latency_snapshot(self):
+        getter = getattr(getattr(self, "machine", None), "get_droplet_capture_latency_snapshot", None)
+        if callable(getter):
+            try:
+                snapshot = getter()
+                if isinstance(snapshot, dict):
+                    return snapshot
+            except Exception:
+                pass
+        return None
+
     def build_droplet_capture_performance_snapshot(
         self,
         reason="manual_export",
@@ -11122,6 +11248,24 @@ class Controller(QObject):
             raise
         return path
 
+    def write_droplet_capture_latency_report(self, directory=None):
+        """Write the camera latency histograms and a Chrome trace of recent spans.
+
+        Returns ``{"histograms": path, "trace": path}``, or ``None`` when the
+        droplet camera does not keep a latency registry.
+        """
+        getter = getattr(getattr(self, "machine", None), "get_droplet_capture_latency_registry", None)
+        registry = getter() if callable(getter) else None
+        if registry is None:
+            return None
+        out_dir = Path(directory) if directory is not None else self._default_droplet_capture_performance_snapshot_dir()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        stem = f"droplet_capture_latency_{stamp}_{uuid.uuid4().hex[:8]}"
+        return {
+            "histograms": registry.write_json(out_dir / f"{stem}.json"),
+            "trace": registry.write_chrome_trace(out_dir / f"{stem}_trace.json"),
+        }
+
     def _record_active_calibration_event(self, event_type, payload=None, *, level="info"):
         try:
             active = getattr(self.model.calibration_manager, "activeCalibration", None)
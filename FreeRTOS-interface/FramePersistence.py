@@ -0,0 +1,205 @@
+"""Building blocks for the droplet-camera frame writer.
+
+``DropletCameraModel`` hands every saved frame to a bounded queue drained by a
+small pool of encoder threads.  ``cv2.imwrite`` and ``np.save`` release the
+GIL, so several frames encode at once while capture and analysis continue.
+
+Encoders finish out of order, but ``metadata.jsonl`` must stay in capture
+order and must only name images that are already on disk.  Each job therefore
+carries a sequence number; ``OrderedJsonlWriter`` holds completed records
+until every earlier sequence number has been committed (or skipped) and
+flushes them in batches instead of once per frame.
+
+``FrameSaveStats`` keeps the counters exported with a recording: queue depth
+high-water mark, encode-time percentiles, and how many frames had to wait for
+queue space or were dropped.
+
+The module has no Qt dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+SAVE_FORMAT_JPEG = "jpg"
+SAVE_FORMAT_PNG = "png"
+SAVE_FORMAT_NPY = "npy"
+SAVE_FORMATS = (SAVE_FORMAT_JPEG, SAVE_FORMAT_PNG, SAVE_FORMAT_NPY)
+
+DEFAULT_SAVE_WORKERS = 2
+DEFAULT_SAVE_QUEUE_SIZE = 256
+# How long a producer waits for queue space before a frame is counted as dropped.
+DEFAULT_SAVE_PUT_TIMEOUT_S = 0.25
+METADATA_FLUSH_EVERY = 32
+METADATA_FLUSH_INTERVAL_S = 0.5
+ENCODE_SAMPLE_WINDOW = 2048
+
+
+def normalize_save_format(image_ext: str) -> str:
+    ext = str(image_ext or SAVE_FORMAT_JPEG).lstrip(".").lower()
+    if ext == "jpeg":
+        return SAVE_FORMAT_JPEG
+    return ext
+
+
+def write_frame_image(
+    path: str,
+    image_rgb: np.ndarray,
+    save_format: str,
+    *,
+    jpeg_quality: int = 95,
+    png_compression: int | None = None,
+):
+    """Encode one RGB frame to ``path``.
+
+    JPEG and PNG are written as BGR for OpenCV.  ``npy`` keeps the raw RGB
+    array so no encode or colour conversion happens on the save path.
+    """
+    if save_format == SAVE_FORMAT_NPY:
+        with open(path, "wb") as fp:
+            np.save(fp, np.ascontiguousarray(image_rgb), allow_pickle=False)
+        return
+
+    if image_rgb.ndim == 3 and image_rgb.shape[2] == 3:
+        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+    else:
+        image_bgr = image_rgb
+    params = []
+    if save_format == SAVE_FORMAT_JPEG:
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+    elif save_format == SAVE_FORMAT_PNG and png_compression is not None:
+        params = [int(cv2.IMWRITE_PNG_COMPRESSION), int(min(9, max(0, int(png_compression))))]
+    if not cv2.imwrite(path, image_bgr, params):
+        raise OSError(f"cv2.imwrite could not write {path}")
+
+
+class OrderedJsonlWriter:
+    """Append JSONL records in sequence order from concurrent producers."""
+
+    def __init__(
+        self,
+        fp,
+        *,
+        first_seq: int = 1,
+        flush_every: int = METADATA_FLUSH_EVERY,
+        flush_interval_s: float = METADATA_FLUSH_INTERVAL_S,
+        default=str,
+    ):
+        self._fp = fp
+        self._next_seq = int(first_seq)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_every = max(1, int(flush_every))
+        self._flush_interval_s = max(0.0, float(flush_interval_s))
+        self._default = default
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self.records_written = 0
+        self.flush_count = 0
+
+    def commit(self, seq: int, record: dict | None):
+        """Hand over the record for ``seq``; ``None`` marks a frame with no record."""
+        with self._lock:
+            self._pending[int(seq)] = record
+            while self._next_seq in self._pending:
+                self._write_locked(self._pending.pop(self._next_seq))
+                self._next_seq += 1
+            if self._unflushed and (
+                self._unflushed >= self._flush_every
+                or time.monotonic() - self._last_flush >= self._flush_interval_s
+            ):
+                self._flush_locked()
+
+    def skip(self, seq: int):
+        self.commit(seq, None)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        # Records still waiting behind a sequence number that never arrived (a job
+        # discarded on shutdown) are written in order rather than lost.
+        with self._lock:
+            for seq in sorted(self._pending):
+                self._write_locked(self._pending.pop(seq))
+            self._flush_locked()
+            try:
+                self._fp.close()
+            except Exception:
+                pass
+
+    def _write_locked(self, record):
+        if record is None:
+            return
+        self._fp.write(json.dumps(record, default=self._default) + "\n")
+        self._unflushed += 1
+        self.records_written += 1
+
+    def _flush_locked(self):
+        if self._unflushed:
+            self._fp.flush()
+            self.flush_count += 1
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+
+class FrameSaveStats:
+    """Thread-safe counters for one saving session."""
+
+    def __init__(self, *, sample_window: int = ENCODE_SAMPLE_WINDOW):
+        self._lock = threading.Lock()
+        self._encode_ms = deque(maxlen=max(1, int(sample_window)))
+        self.enqueued = 0
+        self.saved = 0
+        self.failed = 0
+        self.dropped = 0
+        self.waited_for_space = 0
+        self.queue_high_water = 0
+
+    def record_enqueued(self, depth: int, *, waited: bool = False):
+        with self._lock:
+            self.enqueued += 1
+            if waited:
+                self.waited_for_space += 1
+            if depth > self.queue_high_water:
+                self.queue_high_water = int(depth)
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def record_saved(self, encode_ms: float):
+        with self._lock:
+            self.saved += 1
+            self._encode_ms.append(float(encode_ms))
+
+    def record_failed(self):
+        with self._lock:
+            self.failed += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = np.asarray(self._encode_ms, dtype=float)
+            out = {
+                "enqueued": self.enqueued,
+                "saved": self.saved,
+                "failed": self.failed,
+                "dropped_frames": self.dropped,
+                "waited_for_queue_space": self.waited_for_space,
+                "queue_depth_high_water": self.queue_high_water,
+            }
+        if samples.size:
+            out["encode_ms_p50"] = round(float(np.percentile(samples, 50)), 3)
+            out["encode_ms_p95"] = round(float(np.percentile(samples, 95)), 3)
+            out["encode_ms_max"] = round(float(samples.max()), 3)
+        else:
+            out["encode_ms_p50"] = out["encode_ms_p95"] = out["encode_ms_max"] = None
+        return out
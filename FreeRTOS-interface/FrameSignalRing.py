@@ -0,0 +1,91 @@
+"""Fixed-size history of recent droplet-camera grabber frames.
+
+``DropletCamera`` uses the frames completed just before a capture is armed to
+set its detection threshold (baseline mean + k * std).  The grabber appends
+one entry per camera request, so the history is a ring of preallocated slots:
+signal means and completion times live in NumPy arrays and the baseline is a
+vectorized slice, while request metadata and diagnostics timing are kept in
+per-slot lists that are overwritten in place.
+
+Pixel arrays are not kept here.  Only the brightest post-arm frame of an
+active capture can be selected, and the grabber holds that one directly.
+
+The module has no Qt dependency.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+DEFAULT_FRAME_RING_CAPACITY = 16
+
+
+class FrameSignalRing:
+    """Ring of (metadata, t_done_ns, mean, frame_timing) for recent frames."""
+
+    def __init__(self, capacity: int = DEFAULT_FRAME_RING_CAPACITY):
+        self.capacity = max(1, int(capacity))
+        self._t_done_ns = np.zeros(self.capacity, dtype=np.int64)
+        self._means = np.zeros(self.capacity, dtype=np.float64)
+        self._metadata = [None] * self.capacity
+        self._frame_timing = [None] * self.capacity
+        self._appended = 0
+
+    def __len__(self):
+        return min(self._appended, self.capacity)
+
+    def _slot(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("frame ring index out of range")
+        return (self._appended - size + index) % self.capacity
+
+    def __getitem__(self, index: int):
+        slot = self._slot(int(index))
+        return (
+            self._metadata[slot],
+            int(self._t_done_ns[slot]),
+            float(self._means[slot]),
+            self._frame_timing[slot],
+        )
+
+    def append(self, t_done_ns: int, mean: float, *, md=None, frame_timing=None) -> int:
+        slot = self._appended % self.capacity
+        self._t_done_ns[slot] = int(t_done_ns)
+        self._means[slot] = float(mean)
+        self._metadata[slot] = md
+        self._frame_timing[slot] = frame_timing
+        self._appended += 1
+        return slot
+
+    def clear(self):
+        self._metadata[:] = [None] * self.capacity
+        self._frame_timing[:] = [None] * self.capacity
+        self._appended = 0
+
+    def _ordered(self):
+        size = len(self)
+        if size < self.capacity:
+            return self._t_done_ns[:size], self._means[:size]
+        start = self._appended % self.capacity
+        order = np.r_[start : self.capacity, 0:start]
+        return self._t_done_ns[order], self._means[order]
+
+    def baseline_before(self, cutoff_ns: int, n: int = 4) -> tuple[float, float]:
+        """Mean/std of the last up-to-``n`` frames completed before ``cutoff_ns``.
+
+        With fewer than two such frames, only the newest ``n`` entries are
+        considered, and an empty result gives ``(0.0, 0.0)``.
+        """
+        n = max(1, int(n))
+        t_done_ns, means = self._ordered()
+        before = means[t_done_ns < int(cutoff_ns)][-n:]
+        if before.size < 2:
+            tail_t, tail_means = t_done_ns[-n:], means[-n:]
+            before = tail_means[tail_t < int(cutoff_ns)]
+            if before.size == 0:
+                return 0.0, 0.0
+        return float(before.mean()), float(before.std())
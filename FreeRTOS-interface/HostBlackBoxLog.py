@@ -1,4 +1,5 @@
 import json
+import os
 import re
 import time
 import uuid
@@ -8,6 +9,7 @@ from pathlib import Path
 
 
 SCHEMA_VERSION = "host_black_box_v2"
+LOG_DIR_ENV = "LABCRAFT_BLACK_BOX_LOG_DIR"
 
 
 def utc_now_iso():
@@ -41,7 +43,9 @@ class HostBlackBoxRecorder:
     def __init__(self, log_dir=None, *, event_limit=512, snapshot_limit=64):
         self.session_id = f"{_filename_timestamp()}-{uuid.uuid4().hex[:8]}"
         if log_dir is None:
-            log_dir = Path(__file__).resolve().parents[1] / "logs" / "machine_black_box"
+            log_dir = os.environ.get(LOG_DIR_ENV) or (
+                Path(__file__).resolve().parents[1] / "logs" / "machine_black_box"
+            )
         self.log_dir = Path(log_dir)
         self.events = deque(maxlen=int(event_limit))
         self.snapshots = deque(maxlen=int(snapshot_limit))
@@ -40,6 +40,28 @@ from GravimetricLedger import (
     ImagingEjectionEvent,
     ImagingEjectionLifecycle,
 )
+from CommandCoalescer import CommandCoalescer
+from CommandWindow import AdaptiveInflightWindow
+from FrameSignalRing import DEFAULT_FRAME_RING_CAPACITY, FrameSignalRing
+from CaptureLatencyRegistry import (
+    METRIC_EDGE_TO_FRAME,
+    METRIC_MAKE_ARRAY,
+    METRIC_SELECTION,
+    METRIC_SIGNAL_MEAN,
+    METRIC_TRIGGER_TO_EDGE,
+    METRIC_TRIGGER_TO_RESULT,
+    TRACK_GRABBER,
+    CaptureLatencyRegistry,
+)
+from SerialFrameCodec import (
+    FRAME_CRC_LEN,
+    FRAME_HEADER_LEN,
+    StreamFrameDecoder,
+    TlvLayoutDecoder,
+    crc16_x25,
+    decode_tlv_fields,
+    encode_frame,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +69,10 @@ LOG_READER_SERIAL_TIMEOUT_S = 0.1
 SERIAL_READER_STOP_WAIT_MS = 250
 LOG_READER_STOP_WAIT_MS = 250
 READER_STOP_FALLBACK_WAIT_MS = 1000
+# Ports without ``in_waiting`` get a bounded chunk read instead.
+SERIAL_READER_FALLBACK_READ_BYTES = 256
+# Status frames are delivered one signal each unless a coalescing interval is set.
+STATUS_COALESCE_INTERVAL_MS = 0
 
 try:
     from picamera2 import Picamera2
@@ -485,10 +511,9 @@ class DropletCamera(QObject):
         self._stream_buffer_count = None
         self.latest_frame = None
 
-        # Ring buffer of recent detection frames. Default mode stores
-        # (arr, md, t_done_ns, mean, frame_timing); dual-stream mode stores
-        # dict entries without retaining released camera requests.
-        self._buf = deque(maxlen=16)
+        # Signal means and timestamps of recent detection frames, used for the
+        # pre-arm baseline. Pixel arrays are not retained here.
+        self._buf = FrameSignalRing(DEFAULT_FRAME_RING_CAPACITY)
         self._grabber_frame_index = 0
         self._last_grabber_frame_done_ns = None
 
@@ -511,6 +536,7 @@ class DropletCamera(QObject):
         self._cap_ack_ns = None
         self._cap_ack_frame_index = None
         self._cap_ack_frame_done_ns = None
+        self._cap_trigger_ns = None
         self._signal_stride   = 1
         self._signal_channel  = 0     # None => full RGB mean, else BGR channel index
         self._requested_capture_profile = "default"
@@ -529,6 +555,7 @@ class DropletCamera(QObject):
         self._capture_performance_diagnostics_enabled = False
         self._capture_performance_trace_lock = threading.Lock()
         self._capture_performance_traces = {}
+        self._capture_latency_registry = CaptureLatencyRegistry()
         self._capture_debug_logging_enabled = False
         
         # threshold tuning
@@ -791,6 +818,20 @@ class DropletCamera(QObject):
     def is_capture_performance_diagnostics_enabled(self):
         return bool(getattr(self, "_capture_performance_diagnostics_enabled", False))
 
+    def get_capture_latency_registry(self):
+        """Always-on capture latency histograms; independent of performance diagnostics."""
+        registry = getattr(self, "_capture_latency_registry", None)
+        if registry is None:
+            registry = CaptureLatencyRegistry()
+            self._capture_latency_registry = registry
+        return registry
+
+    def get_capture_latency_snapshot(self):
+        return self.get_capture_latency_registry().snapshot()
+
+    def get_capture_latency_chrome_trace(self):
+        return self.get_capture_latency_registry().chrome_trace()
+
     def set_capture_debug_logging_enabled(self, enabled):
         self._capture_debug_logging_enabled = bool(enabled)
         return self._capture_debug_logging_enabled
@@ -1495,6 +1536,7 @@ class DropletCamera(QObject):
                 continue
             t_done_ns = time.monotonic_ns()  # completion time (local monotonic)
             diagnostics_enabled = self.is_capture_performance_diagnostics_enabled()
+            latency = self.get_capture_latency_registry()
             dual_stream = self._dual_stream_detection_enabled()
             main_arr = None
             md = None
@@ -1504,13 +1546,13 @@ class DropletCamera(QObject):
                 md  = req.get_metadata()
                 if dual_stream:
                     try:
-                        lores_started_ns = time.monotonic_ns() if diagnostics_enabled else None
+                        lores_started_ns = time.monotonic_ns()
                         lores_done_ns = None
                         lores = req.make_array("lores")
-                        lores_done_ns = time.monotonic_ns() if diagnostics_enabled else None
-                        mean_started_ns = time.monotonic_ns() if diagnostics_enabled else None
+                        lores_done_ns = time.monotonic_ns()
+                        mean_started_ns = time.monotonic_ns()
                         mean = self._lores_signal_mean(lores)
-                        mean_done_ns = time.monotonic_ns() if diagnostics_enabled else None
+                        mean_done_ns = time.monotonic_ns()
                         if not self._is_valid_lores_detection(lores, mean):
                             raise RuntimeError("invalid lores detection frame")
                     except Exception as exc:
@@ -1541,13 +1583,13 @@ class DropletCamera(QObject):
                             "main_converted_for_selected_frame": False,
                         }
                 else:
-                    make_array_started_ns = time.monotonic_ns() if diagnostics_enabled else None
+                    make_array_started_ns = time.monotonic_ns()
                     make_array_done_ns = None
                     main_arr = req.make_array("main")
-                    make_array_done_ns = time.monotonic_ns() if diagnostics_enabled else None
-                    mean_started_ns = time.monotonic_ns() if diagnostics_enabled else None
+                    make_array_done_ns = time.monotonic_ns()
+                    mean_started_ns = time.monotonic_ns()
                     mean = self._signal_mean(main_arr)
-                    mean_done_ns = time.monotonic_ns() if diagnostics_enabled else None
+                    mean_done_ns = time.monotonic_ns()
                     if diagnostics_enabled:
                         main_make_array_ms = (
                             float(make_array_done_ns - make_array_started_ns) / 1_000_000.0
@@ -1566,6 +1608,13 @@ class DropletCamera(QObject):
                             "main_converted_for_selected_frame": True,
                         }
                 # print(f"{mean}")  # your debug
+                if dual_stream:
+                    latency.record_span(METRIC_MAKE_ARRAY, lores_started_ns, lores_done_ns, track=TRACK_GRABBER)
+                else:
+                    latency.record_span(
+                        METRIC_MAKE_ARRAY, make_array_started_ns, make_array_done_ns, track=TRACK_GRABBER
+                    )
+                latency.record_span(METRIC_SIGNAL_MEAN, mean_started_ns, mean_done_ns, track=TRACK_GRABBER)
 
                 with self._cv:
                     previous_frame_done_ns = getattr(self, "_last_grabber_frame_done_ns", None)
@@ -1585,17 +1634,7 @@ class DropletCamera(QObject):
                                 ),
                             }
                         )
-                    if dual_stream:
-                        entry = {
-                            "arr": None,
-                            "md": md,
-                            "t_done_ns": t_done_ns,
-                            "mean": mean,
-                            "frame_timing": frame_timing,
-                        }
-                    else:
-                        entry = (main_arr, md, t_done_ns, mean, frame_timing)
-                    self._buf.append(entry)
+                    self._buf.append(t_done_ns, mean, md=md, frame_timing=frame_timing)
 
                     if self._cap_active:
                         # time-gated: only evaluate frames strictly after arming time
@@ -1610,9 +1649,10 @@ class DropletCamera(QObject):
                                 except Exception:
                                     brightest_mean = None
                             if (self._cap_brightest is None) or (brightest_mean is None) or (mean > brightest_mean):
-                                self._cap_brightest = entry
+                                self._cap_brightest = (main_arr, md, t_done_ns, mean, frame_timing)
 
                             selected_arr = None if dual_stream else main_arr
+                            selected_done_ns = t_done_ns
                             selected_md = md
                             selected_mean = mean
                             selected_timing = frame_timing
@@ -1624,7 +1664,7 @@ class DropletCamera(QObject):
                             elif (self._cap_seen >= self._cap_max_new) or (time.monotonic() > self._cap_deadline):
                                 selected_reason = "fallback"
                                 if not dual_stream and self._cap_brightest is not None:
-                                    selected_arr, selected_md, _b_t, selected_mean, selected_timing = (
+                                    selected_arr, selected_md, selected_done_ns, selected_mean, selected_timing = (
                                         self._frame_buffer_entry_parts(self._cap_brightest)
                                     )
 
@@ -1635,8 +1675,6 @@ class DropletCamera(QObject):
                                     main_arr = req.make_array("main")
                                     main_done_ns = time.monotonic_ns() if diagnostics_enabled else None
                                     selected_arr = main_arr
-                                    if isinstance(entry, dict):
-                                        entry["arr"] = main_arr
                                     if diagnostics_enabled:
                                         if selected_timing is None:
                                             selected_timing = {}
@@ -1661,6 +1699,24 @@ class DropletCamera(QObject):
                                     reason=selected_reason,
                                     frame_timing=selected_timing,
                                 )
+                                result_ns = time.monotonic_ns()
+                                span_args = {
+                                    "request_id": getattr(self, "_cap_request_id", None),
+                                    "reason": selected_reason,
+                                }
+                                latency.record_span(METRIC_SELECTION, t_done_ns, result_ns, args=span_args)
+                                latency.record_span(
+                                    METRIC_EDGE_TO_FRAME,
+                                    getattr(self, "_cap_ack_ns", None),
+                                    selected_done_ns,
+                                    args=span_args,
+                                )
+                                latency.record_span(
+                                    METRIC_TRIGGER_TO_RESULT,
+                                    getattr(self, "_cap_trigger_ns", None),
+                                    result_ns,
+                                    args=span_args,
+                                )
 
                     self._cv.notify_all()
             finally:
@@ -1755,22 +1811,7 @@ class DropletCamera(QObject):
     # --- helpers ---
     def _baseline_before_ns_locked(self, cutoff_ns, N=4):
         """Compute baseline mean/std from the last up-to-N frames with t_done_ns < cutoff_ns."""
-        vals = []
-        for entry in reversed(self._buf):
-            _arr, _md, t_done_ns, mean, _frame_timing = self._frame_buffer_entry_parts(entry)
-            if t_done_ns < cutoff_ns:
-                vals.append(mean)
-                if len(vals) >= N:
-                    break
-        if len(vals) < 2:
-            tail = []
-            for entry in list(self._buf)[-N:]:
-                _arr, _md, t_done_ns, mean, _frame_timing = self._frame_buffer_entry_parts(entry)
-                if t_done_ns < cutoff_ns:
-                    tail.append(mean)
-            vals = tail if tail else [0.0, 0.0]
-        vals = np.array(vals, dtype=float)
-        return float(np.mean(vals)), float(np.std(vals))
+        return self._buf.baseline_before(cutoff_ns, N)
 
     # --- public API ---
     def get_latest_frame(self):
@@ -1873,6 +1914,7 @@ class DropletCamera(QObject):
             self._cap_ack_ns = None
             self._cap_ack_frame_index = None
             self._cap_ack_frame_done_ns = None
+            self._cap_trigger_ns = None
 
         # Drain stale edges from previous runs
         drain_start_ns = time.monotonic_ns()
@@ -1935,6 +1977,7 @@ class DropletCamera(QObject):
             # Pulse the MCU trigger, then wait for the flash-fired ACK with the
             # line low so delayed flash work cannot trip firmware line-high safety.
             trigger_pulse_s = self._trigger_pulse_duration_s()
+            trigger_ns = time.monotonic_ns()
             backend.trigger_high()
             trigger_asserted = True
             ejection_triggered = True
@@ -2034,8 +2077,15 @@ class DropletCamera(QObject):
                 )
                 return
             ack_ns = time.monotonic_ns()
+            self.get_capture_latency_registry().record_span(
+                METRIC_TRIGGER_TO_EDGE,
+                trigger_ns,
+                ack_ns,
+                args={"request_id": request_id},
+            )
             with self._cv:
                 self._cap_ack_ns = ack_ns
+                self._cap_trigger_ns = trigger_ns
                 self._cap_ack_frame_index = getattr(self, "_grabber_frame_index", None)
                 self._cap_ack_frame_done_ns = getattr(self, "_last_grabber_frame_done_ns", None)
             backend.event_consume()
@@ -2727,6 +2777,7 @@ ACK_TLV_SEQ32 = 0x10
 ACK_TLV_RESULT = 0x11
 ACK_TLV_EXPECTED_SEQ32 = 0x12
 ACK_TLV_CAPABILITIES = 0x13
+ACK_TLV_MAX_INFLIGHT = 0x14
 
 ACK_RESULT_ACCEPTED = 1
 ACK_RESULT_DUPLICATE = 2
@@ -3681,17 +3732,6 @@ def _regulator_context_summary(context):
         )
     return " Regulator context: " + "; ".join(parts) + "."
 
-def crc16_x25(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return crc & 0xFFFF
-
 def build_frame(cmd, seq32, *, p1=None, p2=None, p3=None):
     TAG_SEQ32 = ACK_TLV_SEQ32
     seq8 = seq32 & 0xFF
@@ -3706,12 +3746,7 @@ def build_frame(cmd, seq32, *, p1=None, p2=None, p3=None):
         if value is None:
             continue
         payload += bytes([tag, 4]) + struct.pack("<I", int(value) & 0xFFFFFFFF)
-    if len(payload) > 255:
-        raise ValueError("Payload length exceeds 255 bytes")
-    header  = bytes([START_BYTE, len(payload)])
-    c       = crc16_x25(payload)
-    tail    = struct.pack("<H", c)
-    return header + payload + tail
+    return encode_frame(payload)
 
 def parse_tlvs(payload: bytes) -> dict[int, bytes]:
     idx = 0
@@ -3732,36 +3767,7 @@ def parse_tlv_payload(payload: bytes) -> dict:
     Walk the payload as tag‐len‐value, return a dict name->value.
     Unknown tags are skipped.
     """
-    idx = 0
-    result = {}
-    while idx + 2 <= len(payload):
-        tag    = payload[idx];    idx += 1
-        length = payload[idx];    idx += 1
-        if idx + length > len(payload):
-            logger.warning("Malformed TLV payload: tag=0x%02X len=%d exceeds payload", tag, length)
-            break  # malformed/truncated
-        raw = payload[idx:idx+length]
-        idx += length
-
-        entry = TAG_MAP.get(tag)
-        if not entry:
-            logger.warning("Unknown TLV tag: 0x%02X", tag)
-            continue  # unknown tag
-        name, expected_len, signed = entry
-        if expected_len != length:
-            # length mismatch; skip or handle as error
-            logger.warning(
-                "TLV length mismatch for %s: expected=%d got=%d",
-                name,
-                expected_len,
-                length,
-            )
-            continue
-
-        value = int.from_bytes(raw, byteorder="little", signed=signed)
-        result[name] = value
-
-    return result
+    return decode_tlv_fields(payload, TAG_MAP)
 
 
 def default_flash_safety_state() -> dict:
@@ -3850,6 +3856,7 @@ def orch_stack_phase_name(phase) -> str:
 
 class SerialReader(QThread):
     status_received = Signal(dict)
+    status_batch_received = Signal(list)  # coalesced status dicts, oldest first
     ackReceived     = Signal(object)  # dict with ack_cmd, seq8, seq32
     resetReportReceived = Signal(dict)
     readerStopped = Signal(dict)
@@ -3858,6 +3865,75 @@ class SerialReader(QThread):
         super().__init__(parent)
         self.ser = ser
         self._stop_requested = False
+        self._decoder = StreamFrameDecoder()
+        self._status_decoder = TlvLayoutDecoder(TAG_MAP)
+        self._read_calls = 0
+        self._started_monotonic_ns = None
+        self._status_coalesce_interval_ns = 0
+        self._pending_status = []
+        self._last_status_flush_ns = 0
+
+    def set_status_coalesce_interval_ms(self, interval_ms):
+        """Batch status frames into one signal per interval; 0 emits each frame."""
+        self._status_coalesce_interval_ns = max(0, int(interval_ms or 0)) * 1_000_000
+
+    def _flush_status_batch(self, force=False):
+        pending = self._pending_status
+        if not pending:
+            return
+        now_ns = time.monotonic_ns()
+        interval_ns = self._status_coalesce_interval_ns
+        if not force and interval_ns > 0 and now_ns - self._last_status_flush_ns < interval_ns:
+            return
+        self._pending_status = []
+        self._last_status_flush_ns = now_ns
+        self.status_batch_received.emit(pending)
+
+    def get_rx_stats(self):
+        """Return decoder counters plus read-call and frame-rate totals."""
+        stats = self._decoder.stats()
+        stats["status_decode"] = self._status_decoder.stats()
+        stats["read_calls"] = int(self._read_calls)
+        started_ns = self._started_monotonic_ns
+        elapsed_s = None
+        if started_ns is not None:
+            elapsed_s = max(0.0, (time.monotonic_ns() - started_ns) / 1e9)
+        stats["elapsed_s"] = round(elapsed_s, 3) if elapsed_s is not None else None
+        stats["frames_per_s"] = (
+            round(stats["frames_decoded"] / elapsed_s, 3) if elapsed_s else None
+        )
+        return stats
+
+    def _read_available(self):
+        """Read everything the driver already holds, or block for one byte."""
+        waiting = getattr(self.ser, "in_waiting", None)
+        if waiting is None:
+            size = SERIAL_READER_FALLBACK_READ_BYTES
+        else:
+            size = max(1, int(waiting))
+        self._read_calls += 1
+        return self.ser.read(size)
+
+    def _dispatch_frame(self, payload):
+        cmd = payload[0]
+        if cmd == CMD_STATUS:
+            data = self._status_decoder.decode(payload, 1)
+            data["__host_rx_monotonic_ns"] = int(time.monotonic_ns())
+            if self._status_coalesce_interval_ns > 0:
+                self._pending_status.append(data)
+            else:
+                self.status_received.emit(data)
+        elif cmd == RESET_REPORT:
+            report = self._parse_reset_report(payload)
+            if report is not None:
+                self.resetReportReceived.emit(report)
+        else:
+            # HELLO_ACK, BYE_ACK, CLEAR_ACK, etc
+            ack = self._parse_ack(payload)
+            if ack.get("ack_cmd") is None:
+                return
+            print(f"Ack received: {ack['ack_cmd']} seq8={ack['seq8']} seq32={ack['seq32']}")
+            self.ackReceived.emit(ack)
 
     def _reader_stop_info(self, reason, exc=None):
         info = {
@@ -3883,6 +3959,7 @@ class SerialReader(QThread):
                 "ack_result": None,
                 "expected_seq32": None,
                 "capabilities": None,
+                "max_inflight": None,
             }
 
         ack_cmd = payload[0]
@@ -3891,6 +3968,7 @@ class SerialReader(QThread):
         ack_result = None
         expected_seq32 = None
         capabilities = None
+        max_inflight = None
         i = 2
         while i + 1 < len(payload):
             tag = payload[i]; ln = payload[i+1]; i += 2
@@ -3904,6 +3982,8 @@ class SerialReader(QThread):
                 expected_seq32 = struct.unpack_from("<I", payload, i)[0]
             elif tag == ACK_TLV_CAPABILITIES and ln == 4:
                 capabilities = struct.unpack_from("<I", payload, i)[0]
+            elif tag == ACK_TLV_MAX_INFLIGHT and ln == 4:
+                max_inflight = struct.unpack_from("<I", payload, i)[0]
             i += ln
         return {
             "ack_cmd": ack_cmd,
@@ -3912,6 +3992,7 @@ class SerialReader(QThread):
             "ack_result": ack_result,
             "expected_seq32": expected_seq32,
             "capabilities": capabilities,
+            "max_inflight": max_inflight,
         }
 
     @staticmethod
@@ -4054,6 +4135,7 @@ class SerialReader(QThread):
 
     def run(self):
         stop_info = None
+        self._started_monotonic_ns = int(time.monotonic_ns())
         try:
             while True:
                 if self.isInterruptionRequested():
@@ -4063,40 +4145,17 @@ class SerialReader(QThread):
                     reason = "requested_stop" if self._stop_requested else "serial_closed"
                     stop_info = self._reader_stop_info(reason)
                     break
-                hdr = self.ser.read(2)
-                if len(hdr)!=2 or hdr[0]!=START_BYTE: continue
-                length = hdr[1]
-                payload = self.ser.read(length)
-                if len(payload) != length: continue
-                if length == 0:
-                    continue
-                tail = self.ser.read(2)
-                if len(tail) != 2: continue
-                rec_crc = tail[0] | (tail[1]<<8)
-                if crc16_x25(payload)!=rec_crc: continue
-
-                cmd = payload[0]
-                if cmd == CMD_STATUS:
-                    data = parse_tlv_payload(payload[1:])
-                    data["__host_rx_monotonic_ns"] = int(time.monotonic_ns())
-                    self.status_received.emit(data)
-                elif cmd == RESET_REPORT:
-                    report = self._parse_reset_report(payload)
-                    if report is not None:
-                        self.resetReportReceived.emit(report)
-                else:
-                    # HELLO_ACK, BYE_ACK, CLEAR_ACK, etc
-                    # print(f"Non-status frame: cmd=0x{cmd:02X}, len={length}")
-                    ack = self._parse_ack(payload)
-                    if ack.get("ack_cmd") is None:
-                        continue
-                    print(f"Ack received: {ack['ack_cmd']} seq8={ack['seq8']} seq32={ack['seq32']}")
-                    self.ackReceived.emit(ack)
-
+                chunk = self._read_available()
+                if chunk:
+                    for payload in self._decoder.feed(chunk):
+                        if payload:
+                            self._dispatch_frame(payload)
+                self._flush_status_batch()
         except (serial.SerialException, OSError, TypeError, ValueError, IndexError) as exc:
             reason = "requested_stop" if self._stop_requested else "exception"
             stop_info = self._reader_stop_info(reason, exc)
         finally:
+            self._flush_status_batch(force=True)
             if stop_info is None:
                 reason = "requested_stop" if self._stop_requested else "completed"
                 stop_info = self._reader_stop_info(reason)
@@ -4317,16 +4376,19 @@ class Command:
             raise ValueError("Payload length exceeds 255 bytes")
 
         # 2) wrap in header/CRC/footer
-        self.header = bytes([START_BYTE, len(self.payload)])
-        self.crc    = crc16_x25(self.payload)
-        self.tail   = struct.pack("<H", self.crc)
-        self.frame  = self.header + self.payload + self.tail
+        self.frame  = encode_frame(self.payload)
+        self.header = self.frame[:FRAME_HEADER_LEN]
+        self.tail   = self.frame[-FRAME_CRC_LEN:]
+        self.crc    = self.tail[0] | (self.tail[1] << 8)
 
         # other metadata...
         self.status = "Added"
+        self._status_observer = None  # set by the owning CommandQueue
+        self._queue_position = None
         self.timestamp = time.time()
         self.handler   = handler
         self.kwargs    = kwargs or {}
+        self.coalesced_handlers = []
         self.trace_metadata = dict(trace_metadata or {})
         self.send_attempts = 0
         self.lifecycle_ns = {
@@ -4340,8 +4402,14 @@ class Command:
         self.signal = f'<{command_type} {self.command_number} {param1},{param2},{param3}>'
 
 
+    def _set_status(self, status):
+        previous = self.status
+        self.status = status
+        if previous != status and self._status_observer is not None:
+            self._status_observer(self, previous, status)
+
     def mark_as_sent(self):
-        self.status = "Sent"
+        self._set_status("Sent")
         if self.lifecycle_ns["sent"] is None:
             self.lifecycle_ns["sent"] = int(time.monotonic_ns())
             return True
@@ -4350,7 +4418,7 @@ class Command:
     def mark_as_accepted(self):
         if self.status in ("Completed", "Canceled"):
             return False
-        self.status = "Accepted"
+        self._set_status("Accepted")
         if self.lifecycle_ns["accepted"] is None:
             self.lifecycle_ns["accepted"] = int(time.monotonic_ns())
             return True
@@ -4359,14 +4427,14 @@ class Command:
     def mark_as_executing(self):
         if self.status in ("Completed", "Canceled"):
             return False
-        self.status = "Executing"
+        self._set_status("Executing")
         if self.lifecycle_ns["executing"] is None:
             self.lifecycle_ns["executing"] = int(time.monotonic_ns())
             return True
         return False
 
     def mark_as_completed(self):
-        self.status = "Completed"
+        self._set_status("Completed")
         if self.lifecycle_ns["completed"] is None:
             self.lifecycle_ns["completed"] = int(time.monotonic_ns())
             self.execute_handler()
@@ -4374,7 +4442,7 @@ class Command:
         return False
 
     def mark_as_canceled(self):
-        self.status = "Canceled"
+        self._set_status("Canceled")
         if self.lifecycle_ns["canceled"] is None:
             self.lifecycle_ns["canceled"] = int(time.monotonic_ns())
             return True
@@ -4383,7 +4451,7 @@ class Command:
     def reset_for_resend(self):
         if self.status in ("Completed", "Canceled"):
             return False
-        self.status = "Added"
+        self._set_status("Added")
         self.lifecycle_ns["sent"] = None
         self.lifecycle_ns["accepted"] = None
         self.lifecycle_ns["executing"] = None
@@ -4398,9 +4466,15 @@ class Command:
     def get_timestamp(self):
         return self.timestamp
 
+    def add_coalesced_handler(self, handler, kwargs=None):
+        """Run the handler of an eliminated redundant command after this one."""
+        self.coalesced_handlers.append((handler, dict(kwargs or {})))
+
     def execute_handler(self):
         if self.handler is not None:
             self.handler(**self.kwargs)
+        for handler, kwargs in self.coalesced_handlers:
+            handler(**kwargs)
 
 
 class CommandQueue(QObject):
@@ -4412,6 +4486,8 @@ class CommandQueue(QObject):
     queue_updated = Signal()  # Signal to emit when the queue is updated
     commands_completed = Signal()  # Signal to emit when all commands are completed
 
+    INFLIGHT_STATUSES = ("Sent", "Accepted", "Executing")
+
     def __init__(self, event_callback=None):
         super().__init__()  # Initialize the QObject
         self.queue = deque()
@@ -4420,6 +4496,38 @@ class CommandQueue(QObject):
         self.max_inflight_commands = 4  # Sliding-window size for accepted or pending-ack commands
         self._event_callback = event_callback
         self._empty_completion_emitted = True
+        # Per-status counts of retained commands, kept current by Command._set_status.
+        self._status_counts = dict.fromkeys(
+            ("Added", "Sent", "Accepted", "Executing", "Completed", "Canceled"), 0
+        )
+        # Positions are absolute (trimmed + deque index) so they survive popleft().
+        self._trimmed_count = 0
+        self._next_unsent_position = 0
+        # Bumped on every clear so cached per-queue state can detect the reset.
+        self.generation = 0
+
+    def _on_command_status_changed(self, command, previous, status):
+        self._status_counts[previous] = self._status_counts.get(previous, 0) - 1
+        self._status_counts[status] = self._status_counts.get(status, 0) + 1
+        if status == "Added" and command._queue_position < self._next_unsent_position:
+            self._next_unsent_position = command._queue_position
+
+    def _commands_through(self, command_number):
+        """Snapshot the retained commands numbered at or below command_number.
+
+        The queue is appended in command-number order, so the scan stops at the
+        first later command instead of copying the whole backlog.
+        """
+        commands = []
+        for cmd in self.queue:
+            if cmd.command_number > command_number:
+                break
+            commands.append(cmd)
+        return commands
+
+    def get_status_counts(self):
+        """Return a copy of the per-status counts for retained commands."""
+        return dict(self._status_counts)
 
     def _emit_command_event(self, command, event_name):
         if callable(self._event_callback):
@@ -4445,6 +4553,9 @@ class CommandQueue(QObject):
             kwargs,
             trace_metadata=trace_metadata,
         )
+        command._queue_position = self._trimmed_count + len(self.queue)
+        command._status_observer = self._on_command_status_changed
+        self._status_counts[command.status] += 1
         self.queue.append(command)
         self._empty_completion_emitted = False
         self._emit_command_event(command, "queued")
@@ -4452,20 +4563,35 @@ class CommandQueue(QObject):
 
     def get_inflight_command_count(self):
         """Return the number of non-terminal commands currently occupying the transport window."""
-        active_statuses = {"Sent", "Accepted", "Executing"}
-        return len([command for command in self.queue if command.status in active_statuses])
+        counts = self._status_counts
+        return counts["Sent"] + counts["Accepted"] + counts["Executing"]
 
     def get_next_command(self):
         """Return the next locally queued command if the sliding window has capacity."""
-        if self.queue and self.get_inflight_command_count() < self.max_inflight_commands:
-            for command in self.queue:
-                if command.status == "Added":
-                    return command
+        if not self.queue or self._status_counts["Added"] <= 0:
+            return None
+        if self.get_inflight_command_count() >= self.max_inflight_commands:
+            return None
+        # Every command before the cursor is known to be sent or terminal; a
+        # resend moves the cursor back in _on_command_status_changed().
+        queue = self.queue
+        index = max(0, self._next_unsent_position - self._trimmed_count)
+        while index < len(queue):
+            command = queue[index]
+            if command.status == "Added":
+                self._next_unsent_position = self._trimmed_count + index
+                return command
+            index += 1
+        self._next_unsent_position = self._trimmed_count + len(queue)
         return None
 
     def _trim_terminal_commands(self):
         while self.queue and self.queue[0].status in {"Completed", "Canceled"}:
             completed_command = self.queue.popleft()
+            self._trimmed_count += 1
+            if completed_command._status_observer is not None:
+                self._status_counts[completed_command.status] -= 1
+                completed_command._status_observer = None
             self.completed.append(completed_command)
             if len(self.completed) > 100:
                 self.completed.popleft()
@@ -4473,6 +4599,8 @@ class CommandQueue(QObject):
     def mark_command_accepted(self, command_number):
         target = int(command_number or 0)
         for cmd in self.queue:
+            if cmd.command_number > target:
+                break
             if cmd.command_number == target:
                 if cmd.mark_as_accepted():
                     self._emit_command_event(cmd, "accepted")
@@ -4517,28 +4645,28 @@ class CommandQueue(QObject):
         accepted = int(last_accepted_command if last_accepted_command is not None else last)
         retired = int(last_retired_command if last_retired_command is not None else last)
 
-        for cmd in list(self.queue):
-            if cmd.status in {"Added", "Sent"} and cmd.command_number <= accepted:
+        for cmd in self._commands_through(accepted):
+            if cmd.status in {"Added", "Sent"}:
                 if cmd.mark_as_accepted():
                     self._emit_command_event(cmd, "accepted")
 
         # 1) Complete everything <= last.
-        for cmd in list(self.queue):
-            if cmd.status in {"Sent", "Accepted", "Executing"} and cmd.command_number <= last:
+        for cmd in self._commands_through(last):
+            if cmd.status in {"Sent", "Accepted", "Executing"}:
                 if cmd.mark_as_completed():
                     self._emit_command_event(cmd, "completed")
 
         # 2) Retire contiguous canceled commands after the completed frontier.
-        for cmd in list(self.queue):
-            if cmd.status in {"Sent", "Accepted", "Executing"} and last < cmd.command_number <= retired:
+        for cmd in self._commands_through(retired):
+            if cmd.status in {"Sent", "Accepted", "Executing"} and last < cmd.command_number:
                 if cmd.mark_as_canceled():
                     self._emit_command_event(cmd, "canceled")
 
         # 3) Optionally mark one accepted command in (last, curr] as executing.
         if curr >= 0 and curr > last:
             cand = None
-            for cmd in self.queue:
-                if cmd.status in {"Accepted", "Sent"} and last < cmd.command_number <= curr:
+            for cmd in self._commands_through(curr):
+                if cmd.status in {"Accepted", "Sent"} and last < cmd.command_number:
                     cand = cmd
                     break
             if cand:
@@ -4555,8 +4683,15 @@ class CommandQueue(QObject):
 
     def clear_queue(self, *, reset_counter=True):
         """Clear queue state; keep the seq counter unless a whole transport session is being reset."""
+        for command in self.queue:
+            command._status_observer = None
         self.queue.clear()
         self.completed.clear()
+        for status in self._status_counts:
+            self._status_counts[status] = 0
+        self._trimmed_count = 0
+        self._next_unsent_position = 0
+        self.generation += 1
         if reset_counter:
             self.command_number = 0
         self._empty_completion_emitted = True
@@ -4639,6 +4774,9 @@ class Machine(QObject):
         self.balance_droplets = []   # <-- for legacy Balance simulation queue
 
         self.command_queue = CommandQueue(event_callback=self._record_command_event)
+        self.command_window = AdaptiveInflightWindow()
+        self.command_coalescer = CommandCoalescer()
+        self.command_queue.max_inflight_commands = self.command_window.size
         self.baud = 115200  # Default baud rate for serial communication
         # RX ownership invariant: after begin_reader_thread(), SerialReader is the
         # only component allowed to consume or discard bytes from the main port.
@@ -4658,6 +4796,7 @@ class Machine(QObject):
 
         self.execution_timer = None
         self.execution_interval_ms = 90
+        self.status_coalesce_interval_ms = STATUS_COALESCE_INTERVAL_MS
         self.sent_command = None
         self._last_reset_report = None
         self._flash_state = default_flash_safety_state()
@@ -4884,6 +5023,7 @@ class Machine(QObject):
             "ack_result": ack.get("ack_result"),
             "expected_seq32": self._coerce_optional_int(ack.get("expected_seq32")),
             "capabilities": self._coerce_optional_int(ack.get("capabilities")),
+            "max_inflight": self._coerce_optional_int(ack.get("max_inflight")),
             "matched_pending": bool(matched_pending),
             "ignored_control_ack": bool(ignored_control_ack),
         }
@@ -4954,8 +5094,26 @@ class Machine(QObject):
             "last_mcu_rx_age_ms": round(last_rx_age, 3) if last_rx_age is not None else None,
             "mcu_response_timeout_ms": self._coerce_optional_int(getattr(self, "_mcu_response_timeout_ms", None)),
             "mcu_unresponsive_reported": bool(getattr(self, "_mcu_unresponsive_reported", False)),
+            "serial_rx": self._serial_rx_stats_for_black_box(),
+            "command_window": self._command_window_for_black_box(),
+            "command_coalescing": self.get_command_coalescing_stats(),
         }
 
+    def _command_window_for_black_box(self):
+        window = getattr(self, "command_window", None)
+        if window is None:
+            return None
+        return window.snapshot()
+
+    def _serial_rx_stats_for_black_box(self):
+        get_stats = getattr(getattr(self, "reader", None), "get_rx_stats", None)
+        if not callable(get_stats):
+            return None
+        try:
+            return dict(get_stats())
+        except Exception:
+            return None
+
     def _build_black_box_snapshot(self, reason, trigger=None):
         recorder = getattr(self, "black_box_recorder", None)
         queue = getattr(getattr(self, "command_queue", None), "queue", [])
@@ -5388,6 +5546,10 @@ class Machine(QObject):
         self._reset_xy_motion_recovery("clean_hello")
         self._session_recovery_in_progress = False
         self._transport_capabilities = capabilities
+        self._feed_command_window(
+            "reset",
+            self._coerce_optional_int((ack or {}).get("max_inflight")),
+        )
         self._transport_ready = True
         self._ever_transport_ready = True
         self._command_queue_blocked_reason = None
@@ -5798,6 +5960,12 @@ class Machine(QObject):
             self._expected_serial_reader_stop_reason = None
             self.reader = SerialReader(self.ser)
             self.reader.status_received.connect(self.update_status)
+            status_batch = getattr(self.reader, "status_batch_received", None)
+            if status_batch is not None:
+                status_batch.connect(self.update_status_batch)
+            set_coalesce = getattr(self.reader, "set_status_coalesce_interval_ms", None)
+            if callable(set_coalesce):
+                set_coalesce(self.status_coalesce_interval_ms)
             self.reader.ackReceived.connect(self._on_any_ack)
             self.reader.resetReportReceived.connect(self._on_reset_report)
             reader_stopped = getattr(self.reader, "readerStopped", None)
@@ -6228,6 +6396,28 @@ class Machine(QObject):
         if self.execution_timer is not None and self.execution_timer.isActive():
             self.execution_timer.start(self.execution_interval_ms)
 
+    def set_status_coalesce_interval_ms(self, interval_ms: int):
+        """Deliver reader status frames in batches every ``interval_ms``; 0 disables."""
+        self.status_coalesce_interval_ms = max(0, int(interval_ms or 0))
+        set_coalesce = getattr(self.reader, "set_status_coalesce_interval_ms", None)
+        if callable(set_coalesce):
+            set_coalesce(self.status_coalesce_interval_ms)
+
+    def set_adaptive_command_window(self, enabled: bool):
+        """Let the in-flight window follow ACK latency; False pins it at the default."""
+        self._feed_command_window("set_enabled", bool(enabled))
+
+    def _feed_command_window(self, event, *args):
+        """Forward a transport event to the window and apply the resulting size."""
+        window = getattr(self, "command_window", None)
+        if window is None:
+            return None
+        change = getattr(window, event)(*args)
+        self.command_queue.max_inflight_commands = int(window.size)
+        if change:
+            self._record_black_box_event("command_window_changed", change)
+        return change
+
     def stop_execution_timer(self):
         print('Stopping execution timer')
         if self.execution_timer.isActive():
@@ -6890,18 +7080,45 @@ class Machine(QObject):
             "stall_hint": stall_hint,
         }
 
+    def _record_status_sample(self, data):
+        self._mark_mcu_rx("status")
+        observed_monotonic_ns = int(time.monotonic_ns())
+        sample = self._status_sample_from_dict(data, observed_monotonic_ns)
+        self._status_sample_count = int(getattr(self, "_status_sample_count", 0)) + 1
+        self.status_history.append(sample)
+        self._latest_status_sample = dict(sample)
+        self._update_pause_after_requests_from_status(sample)
+        return sample
+
+    def update_status_batch(self, batch):
+        """
+        Apply a coalesced batch of status frames from the reader thread.
+
+        Every sample is recorded into the telemetry history, but only the
+        newest one drives the model and transport state.  An older sample that
+        would latch an XY motion fault is applied in full so coalescing can
+        never hide a fault transition.
+        """
+        samples = [data for data in (batch or []) if isinstance(data, dict)]
+        if not samples:
+            return
+        for data in samples[:-1]:
+            if self._detect_xy_motion_fault(data) is not None:
+                self.update_status(data)
+            else:
+                self._record_status_sample(data)
+        self.update_status(samples[-1])
+
     def update_status(self, data):
         """
         Update the status of the machine with the received data.
         """
         if isinstance(data, dict):
-            self._mark_mcu_rx("status")
-            observed_monotonic_ns = int(time.monotonic_ns())
-            sample = self._status_sample_from_dict(data, observed_monotonic_ns)
-            self._status_sample_count = int(getattr(self, "_status_sample_count", 0)) + 1
-            self.status_history.append(sample)
-            self._latest_status_sample = dict(sample)
-            self._update_pause_after_requests_from_status(sample)
+            self._record_status_sample(data)
+            self._feed_command_window(
+                "on_firmware_queue_depth",
+                self._coerce_optional_int(data.get("cmd_depth")),
+            )
             fault_report = None
             release_after_status = False
             fault_candidate = self._detect_xy_motion_fault(data)
@@ -7035,6 +7252,12 @@ class Machine(QObject):
             print(message)
             self.error_occurred.emit(message)
             return False
+        if not recovery_authorized:
+            anchor = self._coalesce_redundant_command(
+                command_type, param1, param2, param3, handler, kwargs, trace_metadata
+            )
+            if anchor is not None:
+                return anchor
         command = self.command_queue.add_command(
             command_type,
             param1,
@@ -7044,12 +7267,68 @@ class Machine(QObject):
             kwargs,
             trace_metadata=trace_metadata,
         )
+        coalescer = getattr(self, "command_coalescer", None)
+        if coalescer is not None:
+            coalescer.record(command, generation=self.command_queue.generation)
         if recovery_authorized:
             self._xy_rehome_batch_index += 1
         if self._transport_ready and not self._tx_paused and not self._sequence_pause:
             self.pump_send_queue()
         return command
     
+    def _coalesce_redundant_command(self, command_type, param1, param2, param3, handler, kwargs, trace_metadata):
+        """Return the queued command that makes this one redundant, or None.
+
+        The newest retained command must still be pending so the eliminated
+        command's handler can run on its completion in queue order.
+        """
+        coalescer = getattr(self, "command_coalescer", None)
+        if coalescer is None or trace_metadata:
+            return None
+        reason = coalescer.redundant_reason(
+            command_type,
+            param1,
+            param2,
+            param3,
+            generation=self.command_queue.generation,
+        )
+        if reason is None:
+            return None
+        queue = self.command_queue.queue
+        anchor = queue[-1] if queue else None
+        if anchor is None or anchor.status in {"Completed", "Canceled"}:
+            return None
+        if handler is not None:
+            anchor.add_coalesced_handler(handler, kwargs)
+        coalescer.note_eliminated(command_type, reason)
+        self._record_black_box_event(
+            "command_coalesced",
+            {
+                "command_type": str(command_type or ""),
+                "params": [int(param1), int(param2), int(param3)],
+                "reason": reason,
+                "anchor_command_number": int(anchor.command_number),
+            },
+        )
+        return anchor
+
+    def set_command_coalescing_enabled(self, enabled: bool):
+        coalescer = getattr(self, "command_coalescer", None)
+        if coalescer is not None:
+            coalescer.enabled = bool(enabled)
+            coalescer.invalidate()
+
+    def get_command_coalescing_stats(self):
+        coalescer = getattr(self, "command_coalescer", None)
+        if coalescer is None:
+            return None
+        return coalescer.stats()
+
+    def reset_command_coalescing_stats(self):
+        coalescer = getattr(self, "command_coalescer", None)
+        if coalescer is not None:
+            coalescer.reset_stats()
+
     def check_if_all_completed(self):
         """Check if all commands have been completed."""
         if len(self.command_queue.queue) == 0:
@@ -7443,15 +7722,20 @@ class Machine(QObject):
                 return
 
         if ack_result in {"accepted", "duplicate"}:
+            sent_ns = command.lifecycle_ns.get("sent")
+            if ack_result == "accepted" and sent_ns is not None and int(command.send_attempts or 0) == 1:
+                self._feed_command_window("on_ack", time.monotonic_ns() - int(sent_ns))
             self.command_queue.mark_command_accepted(seq32)
             self.pump_send_queue()
             return
 
         if ack_result == "gap":
+            self._feed_command_window("on_resend", "queue_gap")
             self._start_queue_gap_repair(seq32, expected_seq32)
             return
 
         if ack_result == "busy":
+            self._feed_command_window("on_resend", "queue_busy")
             if int(getattr(command, "send_attempts", 0) or 0) >= int(self._queue_ack_max_retries):
                 self._handle_transport_fault(
                     f"MCU remained busy for command {seq32} after {command.send_attempts} attempts.",
@@ -7527,6 +7811,7 @@ class Machine(QObject):
                 },
             )
             return
+        self._feed_command_window("on_resend", "ack_timeout")
         if command.reset_for_resend():
             self._record_command_event(command, "requeued")
         self.pump_send_queue()
@@ -8631,6 +8916,18 @@ class Machine(QObject):
             "fallback_error": None,
         }
 
+    def get_droplet_capture_latency_snapshot(self):
+        getter = getattr(self.droplet_camera, "get_capture_latency_snapshot", None)
+        if callable(getter):
+            return getter()
+        return None
+
+    def get_droplet_capture_latency_registry(self):
+        getter = getattr(self.droplet_camera, "get_capture_latency_registry", None)
+        if callable(getter):
+            return getter()
+        return None
+
     def set_droplet_capture_performance_diagnostics_enabled(self, enabled):
         setter = getattr(self.droplet_camera, "set_capture_performance_diagnostics_enabled", None)
         if callable(setter):
@@ -131,6 +131,14 @@ from LocalConfig import (
     get_machine_config_path,
 )
 from hardware.profile import CURRENT_PROFILE, HardwareProfile
+from WellPathPlanner import (
+    WELL_ORDER_LINEAR,
+    WELL_ORDER_SERPENTINE,
+    WELL_ORDER_TRAVEL_OPTIMIZED,
+    compare_orders,
+    normalize_well_order_mode,
+    plan_travel_order,
+)
 
 
 @dataclass(frozen=True)
@@ -552,6 +560,7 @@ class ExperimentModel(QObject):
             "start_row": 0,
             "start_col": 0,
             "well_selection": self._default_well_selection(),
+            "well_order_mode": WELL_ORDER_SERPENTINE,
         }
         self.calibration_storage_policy: CalibrationStoragePolicy = (
             new_experiment_policy()
@@ -718,6 +727,10 @@ class ExperimentModel(QObject):
     def set_metadata(self, **kwargs):
         self.metadata.update(kwargs)
 
+    def get_well_order_mode(self) -> str:
+        """Return the array-print well ordering chosen for this experiment."""
+        return normalize_well_order_mode(self.metadata.get("well_order_mode"))
+
     @staticmethod
     def _default_well_selection() -> Dict[str, object]:
         return {
@@ -12784,6 +12797,7 @@ class ExperimentModel(QObject):
             "start_row": 0,
             "start_col": 0,
             "well_selection": self._default_well_selection(),
+            "well_order_mode": WELL_ORDER_SERPENTINE,
         }
         self.calibration_storage_policy = new_experiment_policy()
         self._sync_calibration_storage_policy_to_manager()
@@ -13342,6 +13356,7 @@ class WellPlate(QObject):
         self.cols = self.current_plate_data['columns']
         self.wells = self.create_wells()
         self.excluded_wells = set()
+        self._travel_order_cache = None
 
         self.calibration_applied = False
         self.temp_calibration_data = {}
@@ -13916,6 +13931,81 @@ class WellPlate(QObject):
 
         return wells
 
+    @staticmethod
+    def _travel_point(well):
+        coordinates = well.get_coordinates()
+        return {axis: float(coordinates[axis]) for axis in ("X", "Y", "Z")}
+
+    def travel_order(self, wells, fill_by="rows", obstacles=None):
+        """
+        Return wells ordered to minimize XY travel between them.
+
+        The path starts at the first zigzag well so the head still enters the
+        plate where the serpentine order would, and avoids straight moves that
+        cross a LocationModel obstacle where possible. Falls back to the zigzag
+        order when any well has no coordinates.
+
+        Args:
+            wells (list of Well): The list of wells to be ordered.
+            fill_by (str): Fill direction used to choose the starting well.
+            obstacles (list of dict): LocationModel obstacle boxes.
+
+        Returns:
+            list of Well: The list of wells in travel-optimized order.
+        """
+        ordered = self.zigzag_order(list(wells), fill_by=fill_by)
+        if len(ordered) < 3:
+            return ordered
+        try:
+            points = [self._travel_point(well) for well in ordered]
+        except (TypeError, KeyError, ValueError):
+            return ordered
+
+        # Array printing asks for the remaining wells before every well, so
+        # keep the last tour until the wells, coordinates or obstacles change.
+        key = (
+            tuple(well.well_id for well in ordered),
+            tuple((p["X"], p["Y"], p["Z"]) for p in points),
+            json.dumps(obstacles or [], sort_keys=True, default=str),
+        )
+        cached = getattr(self, "_travel_order_cache", None)
+        if cached is not None and cached[0] == key:
+            indices = cached[1]
+        else:
+            indices = plan_travel_order(points, obstacles=obstacles)
+            self._travel_order_cache = (key, indices)
+        return [ordered[index] for index in indices]
+
+    def estimate_well_order_travel(self, stock_id=None, fill_by="rows", obstacles=None):
+        """
+        Compare estimated travel of the travel-optimized order with serpentine.
+
+        Args:
+            stock_id (str): Only consider wells that need this stock.
+            fill_by (str): Fill direction of the serpentine baseline.
+            obstacles (list of dict): LocationModel obstacle boxes.
+
+        Returns:
+            dict: Planned and serpentine distance (steps) and time (s) estimates,
+            or None when the wells have no coordinates.
+        """
+        serpentine = self.get_all_wells_with_reactions(fill_by=fill_by, stock_id=stock_id)
+        try:
+            points = [self._travel_point(well) for well in serpentine]
+        except (TypeError, KeyError, ValueError):
+            return None
+        planned = self.travel_order(serpentine, fill_by=fill_by, obstacles=obstacles)
+        index_by_id = {well.well_id: index for index, well in enumerate(serpentine)}
+        report = compare_orders(
+            points,
+            [index_by_id[well.well_id] for well in planned],
+            list(range(len(serpentine))),
+            obstacles=obstacles,
+        )
+        report["stock_id"] = stock_id
+        report["well_count"] = len(serpentine)
+        return report
+
     def get_available_wells(self, fill_by="columns",start_row=0,start_col=0,included_wells=None):
         """
         Get a list of available wells, sorted by rows or columns in a zigzag pattern.
@@ -14044,20 +14134,31 @@ class WellPlate(QObject):
 
         return reaction_assignment
     
-    def get_all_wells_with_reactions(self, fill_by="columns", serpentine=True):
+    def get_all_wells_with_reactions(self, fill_by="columns", serpentine=True, order=None, stock_id=None, obstacles=None):
         """
         Get all wells that have been assigned a reaction.
 
         Args:
             fill_by (str): Whether to fill wells by "rows" or "columns".
             serpentine (bool): Whether to use the existing zigzag pattern.
+            order (str): "serpentine", "linear" or "travel_optimized"; overrides serpentine.
+            stock_id (str): Only return wells that need droplets of this stock.
+            obstacles (list of dict): LocationModel obstacles for "travel_optimized".
 
         Returns:
             list of Well: Sorted list of wells with assigned reactions.
         """
         wells_with_reactions = [well for well in self.wells.values() if well.assigned_reaction is not None]
+        if stock_id is not None:
+            wells_with_reactions = [
+                well for well in wells_with_reactions if well.get_target_droplets(stock_id) > 0
+            ]
 
-        if serpentine:
+        default_order = WELL_ORDER_SERPENTINE if serpentine else WELL_ORDER_LINEAR
+        order = normalize_well_order_mode(order, default=default_order)
+        if order == WELL_ORDER_TRAVEL_OPTIMIZED:
+            return self.travel_order(wells_with_reactions, fill_by=fill_by, obstacles=obstacles)
+        if order == WELL_ORDER_SERPENTINE:
             return self.zigzag_order(wells_with_reactions, fill_by=fill_by)
         return self.linear_order(wells_with_reactions, fill_by=fill_by)
     
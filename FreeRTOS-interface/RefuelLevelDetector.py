@@ -0,0 +1,1427 @@
+"""Refuel-camera meniscus detector.
+
+``RefuelLevelDetector`` finds the printer head and its refuel channel in a
+working frame, then picks the meniscus row from the channel brightness profile
+or, when no credible peak is visible, classifies the channel as full or empty
+against reference patches.  Per-frame state lives on the instance and is reset
+by ``load_frame``, so one detector can be reused for every frame on the thread
+that owns it.  ``result`` returns an immutable snapshot that can be handed to
+another thread while the detector moves on to the next frame.
+
+The module has no Qt dependency.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+from scipy.signal import find_peaks
+from skimage.metrics import structural_similarity as ssim
+
+
+@dataclass(frozen=True)
+class RefuelDetectionResult:
+    original_image: Any
+    annotated_image: Any
+    level_data: float | None
+    meniscus_row: int | None
+    detected_status: str
+    detected_details: dict
+    detector_runtime_ms: float | None
+    head_bbox: tuple | None
+    channel_bounds: tuple | None
+    input_shape: tuple | None
+
+
+class RefuelLevelDetector:
+    CANONICAL_ANALYSIS_HEIGHT = 480
+    CANONICAL_ANALYSIS_WIDTH = 640
+    ANALYSIS_PREPROCESSING_MODE = "aspect_preserving_long_side_640"
+    TRACKING_WINDOW_PX = 30
+    TRACKING_PROMINENCE_RATIO = 0.70
+    TOP_TIE_GUARD_PX = 25
+    TOP_TIE_PROMINENCE_RATIO = 0.85
+    BOTTOM_TIE_PROMINENCE_RATIO = 0.70
+    BOTTOM_CLUSTER_PROMINENCE_RATIO = 0.70
+    TOP_VISIBLE_PROMINENCE_MIN = 5.0
+    FULL_TOP_GUARD_PX = 8
+    BOTTOM_ARTIFACT_GUARD_PX = 25
+    SHORT_CHANNEL_MAX_HEIGHT_PX = 80
+    SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN = 10.0
+    TOP_EDGE_VISIBLE_PROMINENCE_MIN = 8.0
+    TOP_NEAR_VISIBLE_PROMINENCE_MIN = 9.5
+    TOP_BAND_VISIBLE_PROMINENCE_MIN = 10.0
+    MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX = -1
+    BOTTOM_POLARITY_PRE_OUTER_PX = 14
+    BOTTOM_POLARITY_PRE_INNER_PX = 2
+    BOTTOM_POLARITY_POST_INNER_PX = 1
+    BOTTOM_POLARITY_POST_OUTER_PX = 9
+    BOTTOM_POLARITY_REJECT_DELTA_MAX = -20.0
+    BOTTOM_POLARITY_REJECT_SLOPE_MAX = -1.4
+    BOTTOM_BRIGHTNESS_PRE_OUTER_PX = 35
+    BOTTOM_BRIGHTNESS_PRE_INNER_PX = 3
+    BOTTOM_BRIGHTNESS_POST_INNER_PX = 2
+    BOTTOM_BRIGHTNESS_POST_OUTER_PX = 35
+    BOTTOM_BRIGHTNESS_PERCENTILE = 90.0
+    BOTTOM_BRIGHTNESS_REJECT_DELTA_MAX = -2.0
+    FILL_REFERENCE_MIN_MEAN = 40.0
+    HEAD_CLOSE_KERNEL = (65, 9)
+    COMPONENT_MIN_AREA = 800
+    COMPONENT_X_MIN = 80
+    COMPONENT_X_MAX = 540
+    COMPONENT_MIN_HEIGHT = 45
+    MERGE_VERTICAL_OVERLAP_MIN = 0.55
+    MERGE_HORIZONTAL_GAP_MAX = 70
+    CHANNEL_SEARCH_RADIUS_PX = 25
+    RIGHT_WALL_SEARCH_RADIUS_PX = 15
+    CHANNEL_SPACING_MIN_PX = 12
+    CHANNEL_SPACING_MAX_PX = 35
+    CHANNEL_WALL_PROFILE_VERTICAL_GUARD_PX = 8
+    CHANNEL_WALL_PEAK_PROMINENCE_MIN = 6.0
+    CHANNEL_WALL_PEAK_DISTANCE_PX = 8
+    CHANNEL_WALL_REL_X_MIN = 25
+    CHANNEL_WALL_REL_X_MAX = 95
+    CHANNEL_WALL_PAIR_LEFT_REL_MIN = 35
+    CHANNEL_WALL_PAIR_LEFT_REL_MAX = 60
+    CHANNEL_WALL_PAIR_SPACING_MIN = 14
+    CHANNEL_WALL_PAIR_SPACING_MAX = 30
+    CHANNEL_WALL_EXPECTED_LEFT_REL_X = 48
+    CHANNEL_WALL_PAIR_ACCEPT_SCORE_MAX = 12.0
+    LED_TRIM_HEIGHT_MAX_PX = 108
+    LED_TRIM_ASPECT_MIN = 1.8
+    LED_SEPARATOR_PROMINENCE_MIN = 15
+    LED_SEPARATOR_BRIGHT_DELTA_MIN = 20
+    LED_SEPARATOR_ROW_MIN_FRAC = 0.45
+    LED_SEPARATOR_ROW_MAX_FRAC = 0.80
+
+    def __init__(
+        self,
+        image=None,
+        offset=40,
+        width=20,
+        threshold=60,
+        prominence=4,
+        empty_cutoff=0.25,
+        last_row=None,
+        capture_debug=False,
+        bottom_guard_px=2,
+    ):
+        self.load_frame(
+            image,
+            offset,
+            width,
+            threshold,
+            prominence,
+            empty_cutoff,
+            last_row,
+            capture_debug=capture_debug,
+            bottom_guard_px=bottom_guard_px,
+        )
+
+    def load_frame(
+        self,
+        image,
+        offset,
+        width,
+        threshold,
+        prominence,
+        empty_cutoff,
+        last_row,
+        *,
+        capture_debug=False,
+        bottom_guard_px=2,
+    ):
+        """Reset the per-frame state so the next ``run_detection`` analyzes ``image``."""
+        self.offset = offset
+        self.width = width
+        self.threshold = threshold
+        self.prominence = prominence
+        self.empty_cutoff = empty_cutoff
+        self.last_row = last_row
+        try:
+            self.bottom_guard_px = max(0, int(bottom_guard_px))
+        except Exception:
+            self.bottom_guard_px = 2
+        self.input_shape = tuple(image.shape) if image is not None else None
+        self.original_image = image
+        self.annotated_image = None
+        self.level_data = None
+        self.meniscus_row = None
+        self.head_bbox = None
+        self.channel_bounds = None
+        self.detected_status = "not_found"
+        self.detected_details = {}
+        self.capture_debug = bool(capture_debug)
+        self.debug_details = {}
+        self.debug_artifacts = {}
+        self.peak_selection_details = {}
+        self.detector_runtime_ms = None
+        self.analysis_image_shape = None
+        return self
+
+    def result(self):
+        """Snapshot of the last detection that stays valid after the next ``load_frame``."""
+        return RefuelDetectionResult(
+            original_image=self.original_image,
+            annotated_image=self.annotated_image,
+            level_data=self.level_data,
+            meniscus_row=self.meniscus_row,
+            detected_status=self.detected_status,
+            detected_details=dict(self.detected_details or {}),
+            detector_runtime_ms=self.detector_runtime_ms,
+            head_bbox=self.head_bbox,
+            channel_bounds=self.channel_bounds,
+            input_shape=self.input_shape,
+        )
+
+    def _debug_array(self, key, value):
+        if self.capture_debug and value is not None:
+            self.debug_artifacts[str(key)] = np.asarray(value).copy()
+
+    def _debug_update(self, payload):
+        if self.capture_debug:
+            self.debug_details.update(payload)
+
+    @staticmethod
+    def _debug_numeric(value):
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _shape_hw(shape):
+        if shape is None or len(shape) < 2:
+            return None
+        try:
+            return int(shape[0]), int(shape[1])
+        except Exception:
+            return None
+
+    def _current_analysis_shape(self, shape=None):
+        candidate = self._shape_hw(shape)
+        if candidate is not None:
+            return candidate
+        candidate = self._shape_hw(getattr(self, "analysis_image_shape", None))
+        if candidate is not None:
+            return candidate
+        return int(self.CANONICAL_ANALYSIS_HEIGHT), int(self.CANONICAL_ANALYSIS_WIDTH)
+
+    def _x_scale(self, shape=None):
+        _height, width = self._current_analysis_shape(shape)
+        return float(width) / float(max(1, int(self.CANONICAL_ANALYSIS_WIDTH)))
+
+    def _y_scale(self, shape=None):
+        height, _width = self._current_analysis_shape(shape)
+        return float(height) / float(max(1, int(self.CANONICAL_ANALYSIS_HEIGHT)))
+
+    def _area_scale(self, shape=None):
+        return float(self._x_scale(shape)) * float(self._y_scale(shape))
+
+    @staticmethod
+    def _scaled_positive(value, scale, *, min_value=1):
+        try:
+            raw = float(value)
+        except Exception:
+            raw = 0.0
+        if raw <= 0:
+            return 0 if min_value <= 0 else int(min_value)
+        return max(int(min_value), int(round(raw * float(scale))))
+
+    def _x_px(self, value, shape=None, *, min_value=1):
+        return self._scaled_positive(value, self._x_scale(shape), min_value=min_value)
+
+    def _y_px(self, value, shape=None, *, min_value=1):
+        return self._scaled_positive(value, self._y_scale(shape), min_value=min_value)
+
+    def _area_px(self, value, shape=None, *, min_value=1):
+        return self._scaled_positive(value, self._area_scale(shape), min_value=min_value)
+
+    def _scaled_peak_selection_parameters(self, shape=None):
+        return {
+            "tracking_window_px": int(self._y_px(self.TRACKING_WINDOW_PX, shape)),
+            "tracking_prominence_ratio": float(self.TRACKING_PROMINENCE_RATIO),
+            "top_tie_guard_px": int(self._y_px(self.TOP_TIE_GUARD_PX, shape)),
+            "top_tie_prominence_ratio": float(self.TOP_TIE_PROMINENCE_RATIO),
+            "bottom_tie_prominence_ratio": float(self.BOTTOM_TIE_PROMINENCE_RATIO),
+            "bottom_cluster_prominence_ratio": float(self.BOTTOM_CLUSTER_PROMINENCE_RATIO),
+            "top_visible_prominence_min": float(self.TOP_VISIBLE_PROMINENCE_MIN),
+            "full_top_guard_px": int(self._y_px(self.FULL_TOP_GUARD_PX, shape)),
+            "bottom_artifact_guard_px": int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX, shape)),
+            "short_channel_max_height_px": int(self._y_px(self.SHORT_CHANNEL_MAX_HEIGHT_PX, shape)),
+            "short_channel_top_visible_prominence_min": float(self.SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN),
+            "top_edge_visible_prominence_min": float(self.TOP_EDGE_VISIBLE_PROMINENCE_MIN),
+            "top_near_visible_prominence_min": float(self.TOP_NEAR_VISIBLE_PROMINENCE_MIN),
+            "top_band_visible_prominence_min": float(self.TOP_BAND_VISIBLE_PROMINENCE_MIN),
+            "meniscus_visible_output_row_offset_px": int(self.MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX),
+            "bottom_polarity_pre_outer_px": int(self._y_px(self.BOTTOM_POLARITY_PRE_OUTER_PX, shape)),
+            "bottom_polarity_pre_inner_px": int(self._y_px(self.BOTTOM_POLARITY_PRE_INNER_PX, shape)),
+            "bottom_polarity_post_inner_px": int(self._y_px(self.BOTTOM_POLARITY_POST_INNER_PX, shape)),
+            "bottom_polarity_post_outer_px": int(self._y_px(self.BOTTOM_POLARITY_POST_OUTER_PX, shape)),
+            "bottom_polarity_reject_delta_max": float(self.BOTTOM_POLARITY_REJECT_DELTA_MAX),
+            "bottom_polarity_reject_slope_max": float(self.BOTTOM_POLARITY_REJECT_SLOPE_MAX),
+        }
+
+    def _analysis_metadata_payload(self, shape=None):
+        analysis_hw = self._current_analysis_shape(shape)
+        analysis_shape = list(analysis_hw)
+        if self.original_image is not None:
+            try:
+                analysis_shape = list(np.asarray(self.original_image).shape)
+            except Exception:
+                pass
+        return {
+            "analysis_preprocessing_mode": self.ANALYSIS_PREPROCESSING_MODE,
+            "input_shape": list(self.input_shape) if self.input_shape is not None else None,
+            "analysis_image_shape": analysis_shape,
+            "canonical_analysis_shape": [int(self.CANONICAL_ANALYSIS_HEIGHT), int(self.CANONICAL_ANALYSIS_WIDTH)],
+            "analysis_x_scale": float(self._x_scale(shape)),
+            "analysis_y_scale": float(self._y_scale(shape)),
+        }
+
+    def _debug_profile_stats(self, profile):
+        if profile is None or len(profile) == 0:
+            return {"length": 0, "min": None, "max": None, "mean": None}
+        arr = np.asarray(profile, dtype=float)
+        return {
+            "length": int(arr.size),
+            "min": float(np.min(arr)),
+            "max": float(np.max(arr)),
+            "mean": float(np.mean(arr)),
+        }
+
+    @classmethod
+    def peak_selection_parameters(cls):
+        return {
+            "tracking_window_px": int(cls.TRACKING_WINDOW_PX),
+            "tracking_prominence_ratio": float(cls.TRACKING_PROMINENCE_RATIO),
+            "top_tie_guard_px": int(cls.TOP_TIE_GUARD_PX),
+            "top_tie_prominence_ratio": float(cls.TOP_TIE_PROMINENCE_RATIO),
+            "bottom_tie_prominence_ratio": float(cls.BOTTOM_TIE_PROMINENCE_RATIO),
+            "bottom_cluster_prominence_ratio": float(cls.BOTTOM_CLUSTER_PROMINENCE_RATIO),
+            "top_visible_prominence_min": float(cls.TOP_VISIBLE_PROMINENCE_MIN),
+            "full_top_guard_px": int(cls.FULL_TOP_GUARD_PX),
+            "bottom_artifact_guard_px": int(cls.BOTTOM_ARTIFACT_GUARD_PX),
+            "short_channel_max_height_px": int(cls.SHORT_CHANNEL_MAX_HEIGHT_PX),
+            "short_channel_top_visible_prominence_min": float(cls.SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN),
+            "top_edge_visible_prominence_min": float(cls.TOP_EDGE_VISIBLE_PROMINENCE_MIN),
+            "top_near_visible_prominence_min": float(cls.TOP_NEAR_VISIBLE_PROMINENCE_MIN),
+            "top_band_visible_prominence_min": float(cls.TOP_BAND_VISIBLE_PROMINENCE_MIN),
+            "meniscus_visible_output_row_offset_px": int(cls.MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX),
+            "bottom_polarity_pre_outer_px": int(cls.BOTTOM_POLARITY_PRE_OUTER_PX),
+            "bottom_polarity_pre_inner_px": int(cls.BOTTOM_POLARITY_PRE_INNER_PX),
+            "bottom_polarity_post_inner_px": int(cls.BOTTOM_POLARITY_POST_INNER_PX),
+            "bottom_polarity_post_outer_px": int(cls.BOTTOM_POLARITY_POST_OUTER_PX),
+            "bottom_polarity_reject_delta_max": float(cls.BOTTOM_POLARITY_REJECT_DELTA_MAX),
+            "bottom_polarity_reject_slope_max": float(cls.BOTTOM_POLARITY_REJECT_SLOPE_MAX),
+        }
+
+    def _select_peak_candidate(self, peaks, prominences, last_row=None, channel_height=None):
+        peaks = np.asarray(peaks, dtype=int)
+        prominences = np.asarray(prominences, dtype=float)
+        tracking_window_px = self._y_px(self.TRACKING_WINDOW_PX)
+        top_tie_guard_px = self._y_px(self.TOP_TIE_GUARD_PX)
+        bottom_start = None
+        if channel_height is not None:
+            try:
+                bottom_start = max(0, int(channel_height) - int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX)))
+            except Exception:
+                bottom_start = None
+        details = {
+            "candidate_rows": [int(row) for row in peaks.tolist()],
+            "candidate_prominences": [float(value) for value in prominences.tolist()],
+            "best_peak_row": None,
+            "best_peak_prominence": None,
+            "selected_peak_row": None,
+            "selected_peak_prominence": None,
+            "selected_peak_reason": "no_peaks",
+            "top_tie_eligible_rows": [],
+            "non_bottom_eligible_rows": [],
+            "upper_bottom_eligible_rows": [],
+            "tracking_eligible_rows": [],
+            "tracking_window_px": int(tracking_window_px),
+            "tracking_prominence_ratio": float(self.TRACKING_PROMINENCE_RATIO),
+            "top_tie_guard_px": int(top_tie_guard_px),
+            "top_tie_prominence_ratio": float(self.TOP_TIE_PROMINENCE_RATIO),
+            "bottom_tie_prominence_ratio": float(self.BOTTOM_TIE_PROMINENCE_RATIO),
+            "bottom_tie_start_row": None if bottom_start is None else int(bottom_start),
+        }
+        if len(peaks) == 0:
+            return details
+
+        best_idx = int(np.argmax(prominences))
+        best_prominence = float(prominences[best_idx])
+        details["best_peak_row"] = int(peaks[best_idx])
+        details["best_peak_prominence"] = best_prominence
+
+        top_threshold = best_prominence * float(self.TOP_TIE_PROMINENCE_RATIO)
+        top_indices = [
+            int(idx)
+            for idx, row in enumerate(peaks)
+            if int(row) <= int(top_tie_guard_px) and float(prominences[idx]) >= top_threshold
+        ]
+        details["top_tie_eligible_rows"] = [int(peaks[idx]) for idx in top_indices]
+
+        non_bottom_indices = []
+        upper_bottom_indices = []
+        if bottom_start is not None and int(peaks[best_idx]) >= int(bottom_start):
+            non_bottom_threshold = best_prominence * float(self.BOTTOM_TIE_PROMINENCE_RATIO)
+            non_bottom_indices = [
+                int(idx)
+                for idx, row in enumerate(peaks)
+                if int(row) < int(bottom_start) and float(prominences[idx]) >= non_bottom_threshold
+            ]
+            bottom_cluster_threshold = best_prominence * float(self.BOTTOM_CLUSTER_PROMINENCE_RATIO)
+            upper_bottom_indices = [
+                int(idx)
+                for idx, row in enumerate(peaks)
+                if int(row) >= int(bottom_start)
+                and int(row) < int(peaks[best_idx])
+                and float(prominences[idx]) >= bottom_cluster_threshold
+            ]
+        details["non_bottom_eligible_rows"] = [int(peaks[idx]) for idx in non_bottom_indices]
+        details["upper_bottom_eligible_rows"] = [int(peaks[idx]) for idx in upper_bottom_indices]
+
+        tracking_indices = []
+        if last_row is not None:
+            tracking_threshold = best_prominence * float(self.TRACKING_PROMINENCE_RATIO)
+            tracking_indices = [
+                int(idx)
+                for idx, row in enumerate(peaks)
+                if abs(int(row) - int(last_row)) <= int(tracking_window_px)
+                and float(prominences[idx]) >= tracking_threshold
+            ]
+        details["tracking_eligible_rows"] = [int(peaks[idx]) for idx in tracking_indices]
+
+        if top_indices:
+            selected_idx = max(top_indices, key=lambda idx: float(prominences[idx]))
+            reason = "top_tie_candidate"
+        elif non_bottom_indices:
+            selected_idx = max(non_bottom_indices, key=lambda idx: float(prominences[idx]))
+            reason = "non_bottom_candidate_gated"
+        elif upper_bottom_indices:
+            selected_idx = min(upper_bottom_indices, key=lambda idx: int(peaks[idx]))
+            reason = "upper_bottom_candidate_gated"
+        elif tracking_indices:
+            selected_idx = min(tracking_indices, key=lambda idx: abs(int(peaks[idx]) - int(last_row)))
+            reason = "nearest_last_row_gated"
+        else:
+            selected_idx = best_idx
+            reason = "max_prominence"
+
+        details["selected_peak_row"] = int(peaks[selected_idx])
+        details["selected_peak_prominence"] = float(prominences[selected_idx])
+        details["selected_peak_reason"] = reason
+        return details
+
+    def _has_credible_interior_peak(self, selection, channel_height):
+        rows = selection.get("candidate_rows") or []
+        prominences = selection.get("candidate_prominences") or []
+        credible_rows = []
+        lower = int(self._y_px(self.FULL_TOP_GUARD_PX))
+        upper = max(lower + 1, int(channel_height) - int(self._y_px(25)))
+        for row, prominence in zip(rows, prominences):
+            row = int(row)
+            prominence = float(prominence)
+            if lower < row < upper and prominence >= float(self.TOP_VISIBLE_PROMINENCE_MIN):
+                credible_rows.append(row)
+        self._debug_update({"credible_interior_peak_rows": credible_rows})
+        return bool(credible_rows)
+
+    def _selected_peak_fill_override(self, selection, channel_height):
+        row = selection.get("selected_peak_row")
+        prominence = selection.get("selected_peak_prominence")
+        if row is None or prominence is None:
+            return None, "visible_peak"
+        is_weak_top = (
+            int(row) <= int(self._y_px(self.FULL_TOP_GUARD_PX))
+            and float(prominence) < float(self.TOP_VISIBLE_PROMINENCE_MIN)
+        )
+        if is_weak_top and not self._has_credible_interior_peak(selection, channel_height):
+            return "full", "weak_top_boundary_full"
+        return None, "visible_peak"
+
+    def _top_visible_prominence_threshold(self, row, channel_height):
+        row = int(row)
+        if int(channel_height) <= int(self._y_px(self.SHORT_CHANNEL_MAX_HEIGHT_PX)):
+            return float(self.SHORT_CHANNEL_TOP_VISIBLE_PROMINENCE_MIN)
+        if row <= int(self._y_px(5)):
+            return float(self.TOP_EDGE_VISIBLE_PROMINENCE_MIN)
+        if row <= int(self._y_px(10)):
+            return float(self.TOP_NEAR_VISIBLE_PROMINENCE_MIN)
+        if row <= int(self._y_px(self.TOP_TIE_GUARD_PX)):
+            return float(self.TOP_BAND_VISIBLE_PROMINENCE_MIN)
+        return None
+
+    def _bottom_peak_polarity(self, profile, selected_row):
+        slope_half_window = int(self._y_px(18))
+        pre_outer = int(self._y_px(self.BOTTOM_POLARITY_PRE_OUTER_PX))
+        pre_inner = int(self._y_px(self.BOTTOM_POLARITY_PRE_INNER_PX))
+        post_inner = int(self._y_px(self.BOTTOM_POLARITY_POST_INNER_PX))
+        post_outer = int(self._y_px(self.BOTTOM_POLARITY_POST_OUTER_PX))
+        details = {
+            "bottom_peak_polarity_available": False,
+            "bottom_peak_polarity_enough_samples": False,
+            "bottom_peak_polarity_row": None,
+            "bottom_peak_polarity_pre_start": None,
+            "bottom_peak_polarity_pre_end": None,
+            "bottom_peak_polarity_post_start": None,
+            "bottom_peak_polarity_post_end": None,
+            "bottom_peak_polarity_pre_n": 0,
+            "bottom_peak_polarity_post_n": 0,
+            "bottom_peak_polarity_pre_mean": None,
+            "bottom_peak_polarity_post_mean": None,
+            "bottom_peak_polarity_post_minus_pre": None,
+            "bottom_peak_polarity_immediate_step": None,
+            "bottom_peak_polarity_slope": None,
+            "bottom_peak_polarity_slope_half_window_px": int(slope_half_window),
+            "bottom_peak_polarity_reject_delta_max": float(self.BOTTOM_POLARITY_REJECT_DELTA_MAX),
+            "bottom_peak_polarity_reject_slope_max": float(self.BOTTOM_POLARITY_REJECT_SLOPE_MAX),
+            "bottom_peak_polarity_reject_condition": None,
+        }
+        if profile is None or selected_row is None:
+            return details
+        try:
+            values = np.asarray(profile, dtype=float).ravel()
+            row = int(selected_row)
+        except Exception:
+            return details
+        if values.size == 0 or row < 0 or row >= int(values.size):
+            return details
+
+        pre_start = max(0, row - pre_outer)
+        pre_end = max(0, row - pre_inner)
+        post_start = min(int(values.size), row + post_inner)
+        post_end = min(int(values.size), row + post_outer)
+        pre = values[pre_start:pre_end]
+        post = values[post_start:post_end]
+        slope_start = max(0, row - int(slope_half_window))
+        slope_end = min(int(values.size), row + int(slope_half_window) + 1)
+        slope_window = values[slope_start:slope_end]
+
+        pre_mean = float(np.mean(pre)) if len(pre) else None
+        post_mean = float(np.mean(post)) if len(post) else None
+        post_minus_pre = None if pre_mean is None or post_mean is None else float(post_mean - pre_mean)
+        immediate_step = None
+        if row + 1 < int(values.size):
+            immediate_step = float(values[row + 1] - values[row])
+        slope = None
+        if len(slope_window) >= 8:
+            xs = np.arange(slope_start, slope_end, dtype=float)
+            try:
+                slope = float(np.polyfit(xs, slope_window.astype(float), 1)[0])
+            except Exception:
+                slope = None
+        enough_samples = len(pre) >= 3 and len(post) >= 2 and slope is not None
+        details.update(
+            {
+                "bottom_peak_polarity_available": bool(enough_samples),
+                "bottom_peak_polarity_enough_samples": bool(enough_samples),
+                "bottom_peak_polarity_row": int(row),
+                "bottom_peak_polarity_pre_start": int(pre_start),
+                "bottom_peak_polarity_pre_end": int(pre_end),
+                "bottom_peak_polarity_post_start": int(post_start),
+                "bottom_peak_polarity_post_end": int(post_end),
+                "bottom_peak_polarity_pre_n": int(len(pre)),
+                "bottom_peak_polarity_post_n": int(len(post)),
+                "bottom_peak_polarity_pre_mean": pre_mean,
+                "bottom_peak_polarity_post_mean": post_mean,
+                "bottom_peak_polarity_post_minus_pre": post_minus_pre,
+                "bottom_peak_polarity_immediate_step": immediate_step,
+                "bottom_peak_polarity_slope": slope,
+            }
+        )
+        return details
+
+    def _bottom_peak_brightness_drop(self, profile, selected_row):
+        pre_outer = int(self._y_px(self.BOTTOM_BRIGHTNESS_PRE_OUTER_PX))
+        pre_inner = int(self._y_px(self.BOTTOM_BRIGHTNESS_PRE_INNER_PX))
+        post_inner = int(self._y_px(self.BOTTOM_BRIGHTNESS_POST_INNER_PX))
+        post_outer = int(self._y_px(self.BOTTOM_BRIGHTNESS_POST_OUTER_PX))
+        details = {
+            "bottom_peak_brightness_pre_start": None,
+            "bottom_peak_brightness_pre_end": None,
+            "bottom_peak_brightness_post_start": None,
+            "bottom_peak_brightness_post_end": None,
+            "bottom_peak_brightness_pre_p90": None,
+            "bottom_peak_brightness_post_p90": None,
+            "bottom_peak_brightness_post_minus_pre_p90": None,
+            "bottom_peak_brightness_reject_delta_max": float(self.BOTTOM_BRIGHTNESS_REJECT_DELTA_MAX),
+            "bottom_peak_brightness_reject_condition": None,
+        }
+        if profile is None or selected_row is None:
+            return details
+        try:
+            values = np.asarray(profile, dtype=float).ravel()
+            row = int(selected_row)
+        except Exception:
+            return details
+        if values.size == 0 or row < 0 or row >= int(values.size):
+            return details
+
+        pre_start = max(0, row - pre_outer)
+        pre_end = max(0, row - pre_inner + 1)
+        post_start = min(int(values.size), row + post_inner)
+        post_end = min(int(values.size), row + post_outer + 1)
+        pre = values[pre_start:pre_end]
+        post = values[post_start:post_end]
+
+        pre_p90 = float(np.percentile(pre, self.BOTTOM_BRIGHTNESS_PERCENTILE)) if len(pre) else None
+        post_p90 = float(np.percentile(post, self.BOTTOM_BRIGHTNESS_PERCENTILE)) if len(post) else None
+        post_minus_pre = None if pre_p90 is None or post_p90 is None else float(post_p90 - pre_p90)
+        details.update(
+            {
+                "bottom_peak_brightness_pre_start": int(pre_start),
+                "bottom_peak_brightness_pre_end": int(pre_end),
+                "bottom_peak_brightness_post_start": int(post_start),
+                "bottom_peak_brightness_post_end": int(post_end),
+                "bottom_peak_brightness_pre_p90": pre_p90,
+                "bottom_peak_brightness_post_p90": post_p90,
+                "bottom_peak_brightness_post_minus_pre_p90": post_minus_pre,
+            }
+        )
+        return details
+
+    def _selected_peak_visible_decision(self, selection, channel_height, fill_state, profile=None):
+        rows = [int(row) for row in (selection.get("candidate_rows") or [])]
+        prominences = [float(value) for value in (selection.get("candidate_prominences") or [])]
+        row = selection.get("selected_peak_row")
+        prominence = selection.get("selected_peak_prominence")
+        bottom_start = max(0, int(channel_height) - int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX)))
+        top_tie_guard_px = int(self._y_px(self.TOP_TIE_GUARD_PX))
+        top_rows = [int(candidate) for candidate in rows if int(candidate) <= top_tie_guard_px]
+        bottom_rows = [int(candidate) for candidate in rows if int(candidate) >= bottom_start]
+        debug_payload = {
+            "boundary_peak_rows": top_rows,
+            "bottom_artifact_rows": bottom_rows,
+            "credible_visible_peak": False,
+            "visible_peak_reason": "no_selected_peak",
+            "visible_peak_required_prominence": None,
+        }
+        if row is None or prominence is None:
+            self._debug_update(debug_payload)
+            return False, "no_selected_peak"
+
+        row = int(row)
+        prominence = float(prominence)
+        min_prominence = float(self.prominence if self.prominence is not None else 0)
+
+        if row >= bottom_start:
+            if top_rows:
+                reason = "bottom_artifact_with_top_boundary_peak"
+                if str(fill_state) == "full":
+                    reason = "bottom_artifact_with_top_boundary_full"
+                debug_payload.update({"visible_peak_reason": reason})
+                self._debug_update(debug_payload)
+                return False, reason
+            polarity = self._bottom_peak_polarity(profile, row)
+            debug_payload.update(polarity)
+            if (
+                str(fill_state) == "full"
+                and bool(polarity.get("bottom_peak_polarity_available"))
+                and polarity.get("bottom_peak_polarity_post_minus_pre") is not None
+                and float(polarity["bottom_peak_polarity_post_minus_pre"]) <= float(self.BOTTOM_POLARITY_REJECT_DELTA_MAX)
+            ):
+                reason = "bottom_negative_profile_full_artifact"
+                debug_payload.update({
+                    "visible_peak_reason": reason,
+                    "bottom_peak_polarity_reject_condition": "delta_full_bottom",
+                })
+                self._debug_update(debug_payload)
+                return False, reason
+            brightness = self._bottom_peak_brightness_drop(profile, row)
+            debug_payload.update(brightness)
+            if (
+                str(fill_state) == "full"
+                and brightness.get("bottom_peak_brightness_post_minus_pre_p90") is not None
+                and float(brightness["bottom_peak_brightness_post_minus_pre_p90"]) <= float(self.BOTTOM_BRIGHTNESS_REJECT_DELTA_MAX)
+            ):
+                reason = "bottom_high_brightness_drop_full_artifact"
+                debug_payload.update({
+                    "visible_peak_reason": reason,
+                    "bottom_peak_brightness_reject_condition": "p90_drop_full_bottom",
+                })
+                self._debug_update(debug_payload)
+                return False, reason
+            debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": "bottom_visible_without_top_boundary"})
+            self._debug_update(debug_payload)
+            return True, "bottom_visible_without_top_boundary"
+
+        top_threshold = self._top_visible_prominence_threshold(row, channel_height)
+        if top_threshold is not None:
+            debug_payload["visible_peak_required_prominence"] = float(top_threshold)
+            if prominence >= top_threshold:
+                debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": "top_visible_prominence"})
+                self._debug_update(debug_payload)
+                return True, "top_visible_prominence"
+            if int(channel_height) > int(self._y_px(self.SHORT_CHANNEL_MAX_HEIGHT_PX)) and not bottom_rows and prominence >= min_prominence:
+                reason = "modest_top_visible_without_bottom_artifact"
+                debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": reason})
+                self._debug_update(debug_payload)
+                return True, reason
+            reason = "top_boundary_below_visible_threshold"
+            debug_payload.update({"visible_peak_reason": reason})
+            self._debug_update(debug_payload)
+            return False, reason
+
+        if prominence >= min_prominence:
+            debug_payload.update({"credible_visible_peak": True, "visible_peak_reason": "interior_visible_prominence"})
+            self._debug_update(debug_payload)
+            return True, "interior_visible_prominence"
+
+        reason = "interior_below_visible_threshold"
+        debug_payload.update({"visible_peak_reason": reason, "visible_peak_required_prominence": float(min_prominence)})
+        self._debug_update(debug_payload)
+        return False, reason
+
+    @staticmethod
+    def _bbox_union(bboxes):
+        bboxes = [bbox for bbox in bboxes if bbox is not None]
+        if not bboxes:
+            return None
+        x0 = min(int(bbox[0]) for bbox in bboxes)
+        y0 = min(int(bbox[1]) for bbox in bboxes)
+        x1 = max(int(bbox[0]) + int(bbox[2]) for bbox in bboxes)
+        y1 = max(int(bbox[1]) + int(bbox[3]) for bbox in bboxes)
+        return [int(x0), int(y0), int(x1 - x0), int(y1 - y0)]
+
+    @staticmethod
+    def _bbox_horizontal_gap(a, b):
+        ax0, ay0, aw, ah = [int(value) for value in a]
+        bx0, by0, bw, bh = [int(value) for value in b]
+        ax1 = ax0 + aw
+        bx1 = bx0 + bw
+        if ax1 < bx0:
+            return int(bx0 - ax1)
+        if bx1 < ax0:
+            return int(ax0 - bx1)
+        return 0
+
+    @staticmethod
+    def _bbox_vertical_overlap_fraction(a, b):
+        _ax0, ay0, _aw, ah = [int(value) for value in a]
+        _bx0, by0, _bw, bh = [int(value) for value in b]
+        overlap = max(0, min(ay0 + ah, by0 + bh) - max(ay0, by0))
+        denom = max(1, min(ah, bh))
+        return float(overlap) / float(denom)
+
+    def _component_rows_from_mask(self, mask):
+        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        rows = []
+        for contour in cnts:
+            area = float(cv2.contourArea(contour))
+            x, y, w, h = cv2.boundingRect(contour)
+            rows.append({"bbox": [int(x), int(y), int(w), int(h)], "area": area})
+        return rows
+
+    def _filter_head_components(self, components):
+        kept = []
+        shape = getattr(self, "analysis_image_shape", None)
+        min_area = float(self._area_px(self.COMPONENT_MIN_AREA, shape))
+        min_height = int(self._y_px(self.COMPONENT_MIN_HEIGHT, shape))
+        x_min = int(self._x_px(self.COMPONENT_X_MIN, shape, min_value=0))
+        x_max = int(self._x_px(self.COMPONENT_X_MAX, shape, min_value=0))
+        for row in components:
+            x, _y, _w, h = row["bbox"]
+            if row["area"] < min_area:
+                continue
+            if int(h) < min_height:
+                continue
+            if int(x) < x_min or int(x) > x_max:
+                continue
+            kept.append(row)
+        return kept
+
+    def _merge_head_component_bboxes(self, bboxes):
+        groups = [[list(map(int, bbox))] for bbox in sorted(bboxes, key=lambda rect: (rect[0], rect[1]))]
+        changed = True
+        while changed:
+            changed = False
+            merged_groups = []
+            while groups:
+                group = groups.pop(0)
+                group_bbox = self._bbox_union(group)
+                did_merge = False
+                for idx, other in enumerate(groups):
+                    other_bbox = self._bbox_union(other)
+                    overlap = self._bbox_vertical_overlap_fraction(group_bbox, other_bbox)
+                    gap = self._bbox_horizontal_gap(group_bbox, other_bbox)
+                    if overlap >= float(self.MERGE_VERTICAL_OVERLAP_MIN) and gap <= int(self._x_px(self.MERGE_HORIZONTAL_GAP_MAX)):
+                        groups[idx] = group + other
+                        changed = True
+                        did_merge = True
+                        break
+                if not did_merge:
+                    merged_groups.append(group)
+            groups = merged_groups
+        return [self._bbox_union(group) for group in groups if self._bbox_union(group) is not None]
+
+    def _find_led_separator_row(self, gray, bbox):
+        x, y, w, h = [int(value) for value in bbox]
+        if h <= 0 or w <= 0:
+            return None, "invalid_bbox"
+        aspect = float(w) / float(max(h, 1))
+        aspect_min = float(self.LED_TRIM_ASPECT_MIN) * float(self._x_scale()) / float(max(self._y_scale(), 1e-6))
+        if h > int(self._y_px(self.LED_TRIM_HEIGHT_MAX_PX)) or aspect < aspect_min:
+            return None, "not_short_wide"
+
+        x0 = x + int(round(w * 0.15))
+        x1 = x + int(round(w * 0.85))
+        if x1 <= x0:
+            return None, "invalid_central_roi"
+        roi = gray[y : y + h, x0:x1]
+        if roi.size == 0:
+            return None, "empty_central_roi"
+
+        row_mean = roi.mean(axis=1).astype(np.float32)
+        smooth = cv2.GaussianBlur(row_mean.reshape(-1, 1), (1, 9), 0).ravel()
+        valleys, props = find_peaks(-smooth, prominence=float(self.LED_SEPARATOR_PROMINENCE_MIN))
+        row_min = int(round(float(h) * float(self.LED_SEPARATOR_ROW_MIN_FRAC)))
+        row_max = int(round(float(h) * float(self.LED_SEPARATOR_ROW_MAX_FRAC)))
+        candidates = []
+        for idx, row in enumerate(valleys):
+            row = int(row)
+            if row < row_min or row > row_max:
+                continue
+            above = smooth[max(0, row - int(self._y_px(5))) : row]
+            below = smooth[min(h, row + int(self._y_px(5))) : min(h, row + int(self._y_px(20)))]
+            if len(above) == 0 or len(below) == 0:
+                continue
+            delta = float(np.mean(below) - np.mean(above))
+            prominence = float(props.get("prominences", [])[idx])
+            if delta >= float(self.LED_SEPARATOR_BRIGHT_DELTA_MIN):
+                candidates.append((prominence, delta, row))
+        if not candidates:
+            return None, "no_led_separator"
+        candidates.sort(reverse=True)
+        return int(y + candidates[0][2]), "led_separator"
+
+    def _detect_channel_bounds_from_geometry(self, gray, merged_bbox, head_bottom_row, left_offset=40, channel_width=30):
+        x, y, w, h = [int(value) for value in merged_bbox]
+        try:
+            left_offset = int(left_offset if left_offset is not None else 40)
+        except Exception:
+            left_offset = 40
+        try:
+            channel_width = int(channel_width if channel_width is not None else 20)
+        except Exception:
+            channel_width = 20
+        shape = gray.shape[:2]
+        left_offset = int(self._x_px(left_offset, shape, min_value=0))
+        channel_width = int(self._x_px(channel_width, shape))
+        image_h, image_w = gray.shape[:2]
+        fallback_x = max(0, min(image_w - 1, int(x + left_offset)))
+        fallback_width = max(1, int(channel_width))
+        channel_y = max(0, min(image_h - 1, int(y)))
+        channel_bottom = max(channel_y + 1, min(image_h, int(head_bottom_row)))
+        fallback_height = max(1, int(channel_bottom - channel_y))
+
+        roi = gray[channel_y:channel_bottom, x : x + w]
+        detected_pair = None
+        peaks_payload = []
+        pair_candidates = []
+        selected_pair = None
+        selected_score = None
+        reason = "fallback_offset"
+        if roi.size:
+            guard = int(self._y_px(self.CHANNEL_WALL_PROFILE_VERTICAL_GUARD_PX, shape))
+            band = roi[guard : max(guard + 1, roi.shape[0] - guard), :]
+            if band.size == 0:
+                band = roi
+            col_mean = band.mean(axis=0).astype(np.float32)
+            smooth = cv2.GaussianBlur(col_mean.reshape(1, -1), (9, 1), 0).ravel()
+            dark_signal = float(np.max(smooth)) - smooth
+            peak_distance_px = int(self._x_px(self.CHANNEL_WALL_PEAK_DISTANCE_PX, shape))
+            rel_x_min = int(self._x_px(self.CHANNEL_WALL_REL_X_MIN, shape, min_value=0))
+            rel_x_max = int(self._x_px(self.CHANNEL_WALL_REL_X_MAX, shape, min_value=0))
+            pair_left_min = int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MIN, shape, min_value=0))
+            pair_left_max = int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MAX, shape, min_value=0))
+            pair_spacing_min = int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MIN, shape))
+            pair_spacing_max = int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MAX, shape))
+            expected_left_rel_x = int(self._x_px(self.CHANNEL_WALL_EXPECTED_LEFT_REL_X, shape, min_value=0))
+            accept_score_max = float(self.CHANNEL_WALL_PAIR_ACCEPT_SCORE_MAX) * float(self._x_scale(shape))
+            peaks, props = find_peaks(
+                dark_signal,
+                prominence=float(self.CHANNEL_WALL_PEAK_PROMINENCE_MIN),
+                distance=peak_distance_px,
+            )
+            prominences = props.get("prominences", [])
+            peaks_payload = [
+                {
+                    "x": int(x + peak),
+                    "relative_x": int(peak),
+                    "prominence": float(prominences[idx]),
+                    "within_channel_search_window": bool(
+                        rel_x_min <= int(peak) <= rel_x_max
+                    ),
+                }
+                for idx, peak in enumerate(peaks)
+            ]
+            best = None
+            for left_idx, left in enumerate(peaks):
+                left = int(left)
+                if left < pair_left_min or left > pair_left_max:
+                    continue
+                for right_idx, right in enumerate(peaks):
+                    right = int(right)
+                    if right <= left:
+                        continue
+                    if right < rel_x_min or right > rel_x_max:
+                        continue
+                    spacing = right - left
+                    if spacing < pair_spacing_min or spacing > pair_spacing_max:
+                        continue
+                    left_prominence = float(prominences[left_idx])
+                    right_prominence = float(prominences[right_idx])
+                    prominence_bonus = left_prominence + right_prominence
+                    score = (
+                        abs(left - expected_left_rel_x) * 1.0
+                        + abs(spacing - int(fallback_width)) * 1.5
+                        - 0.04 * prominence_bonus
+                    )
+                    pair_payload = {
+                        "left_x": int(x + left),
+                        "right_x": int(x + right),
+                        "left_relative_x": int(left),
+                        "right_relative_x": int(right),
+                        "spacing_px": int(spacing),
+                        "left_prominence": left_prominence,
+                        "right_prominence": right_prominence,
+                        "score": float(score),
+                    }
+                    pair_candidates.append(pair_payload)
+                    candidate = (float(score), int(left), int(right), int(spacing), pair_payload)
+                    if best is None or candidate[:4] < best[:4]:
+                        best = candidate
+            if best is not None:
+                score, left, right, spacing, pair_payload = best
+                detected_pair = [int(x + left), int(x + right)]
+                selected_pair = dict(pair_payload)
+                selected_score = float(score)
+                if score <= accept_score_max:
+                    fallback_x = int(x + left)
+                    fallback_width = int(spacing)
+                    reason = "profile_wall_pair"
+                else:
+                    reason = "fallback_offset_profile_pair_low_confidence"
+
+        fallback_x = max(0, min(image_w - 1, fallback_x))
+        fallback_width = max(1, min(int(fallback_width), image_w - fallback_x))
+        return {
+            "channel_bounds": [int(fallback_x), int(channel_y), int(fallback_width), int(fallback_height)],
+            "channel_detection_reason": reason,
+            "detected_channel_wall_xs": detected_pair,
+            "channel_wall_peaks": peaks_payload,
+            "channel_wall_pair_candidates": pair_candidates,
+            "selected_channel_wall_pair": selected_pair,
+            "selected_channel_wall_pair_score": selected_score,
+            "channel_wall_profile_parameters": {
+                "vertical_guard_px": int(self._y_px(self.CHANNEL_WALL_PROFILE_VERTICAL_GUARD_PX, shape)),
+                "peak_prominence_min": float(self.CHANNEL_WALL_PEAK_PROMINENCE_MIN),
+                "peak_distance_px": int(self._x_px(self.CHANNEL_WALL_PEAK_DISTANCE_PX, shape)),
+                "relative_x_min": int(self._x_px(self.CHANNEL_WALL_REL_X_MIN, shape, min_value=0)),
+                "relative_x_max": int(self._x_px(self.CHANNEL_WALL_REL_X_MAX, shape, min_value=0)),
+                "pair_left_relative_x_min": int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MIN, shape, min_value=0)),
+                "pair_left_relative_x_max": int(self._x_px(self.CHANNEL_WALL_PAIR_LEFT_REL_MAX, shape, min_value=0)),
+                "pair_spacing_min_px": int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MIN, shape)),
+                "pair_spacing_max_px": int(self._x_px(self.CHANNEL_WALL_PAIR_SPACING_MAX, shape)),
+                "expected_left_relative_x": int(self._x_px(self.CHANNEL_WALL_EXPECTED_LEFT_REL_X, shape, min_value=0)),
+                "expected_spacing_px": int(channel_width),
+                "accept_score_max": float(self.CHANNEL_WALL_PAIR_ACCEPT_SCORE_MAX) * float(self._x_scale(shape)),
+            },
+        }
+
+    def _detect_refuel_head_geometry(self, cur_img, threshold_value=50):
+        self.analysis_image_shape = tuple(cur_img.shape[:2])
+        cur_gray = cv2.cvtColor(cur_img, cv2.COLOR_BGR2GRAY)
+        _, mask = cv2.threshold(cur_gray, threshold_value, 255, cv2.THRESH_BINARY)
+        self._debug_array("head_threshold_mask", mask)
+
+        kernel = cv2.getStructuringElement(
+            cv2.MORPH_RECT,
+            (
+                int(self._x_px(self.HEAD_CLOSE_KERNEL[0], cur_img.shape)),
+                int(self._y_px(self.HEAD_CLOSE_KERNEL[1], cur_img.shape)),
+            ),
+        )
+        closed_mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        self._debug_array("head_closed_mask", closed_mask)
+
+        raw_components = self._component_rows_from_mask(mask)
+        kept_raw_components = self._filter_head_components(raw_components)
+        closed_components = self._component_rows_from_mask(closed_mask)
+        kept_components = self._filter_head_components(closed_components)
+        kept_bboxes = [row["bbox"] for row in kept_components]
+        merged_bboxes = self._merge_head_component_bboxes(kept_bboxes)
+
+        geometry = {
+            "head_bbox": None,
+            "merged_head_bbox": None,
+            "channel_bounds": None,
+            "head_bottom_row": None,
+            "raw_component_bboxes": [row["bbox"] for row in raw_components],
+            "kept_component_bboxes": kept_bboxes,
+            "merged_component_bboxes": merged_bboxes,
+            "raw_contour_count": int(len(raw_components)),
+            "area_filtered_contour_count": int(len(kept_raw_components)),
+            "kept_contour_count": int(len(kept_components)),
+            "channel_detection_reason": None,
+            "head_bottom_reason": None,
+            "geometry_warning": None,
+        }
+
+        if not merged_bboxes:
+            geometry["geometry_warning"] = "no_head_components"
+            self._debug_update({**geometry, "failure_reason": "no_printer_head_contours"})
+            return geometry
+
+        merged_bbox = max(merged_bboxes, key=lambda rect: int(rect[2]) * int(rect[3]))
+        x, y, w, h = [int(value) for value in merged_bbox]
+        head_bottom_row, head_bottom_reason = self._find_led_separator_row(cur_gray, merged_bbox)
+        if head_bottom_row is None:
+            head_bottom_row = int(y + h)
+            head_bottom_reason = "merged_bbox_bottom"
+        head_bottom_row = max(int(y + 1), min(int(y + h), int(head_bottom_row)))
+
+        channel = self._detect_channel_bounds_from_geometry(
+            cur_gray,
+            merged_bbox,
+            head_bottom_row,
+            left_offset=self.offset,
+            channel_width=self.width,
+        )
+        geometry.update(
+            {
+                "head_bbox": [int(x), int(y), int(w), int(head_bottom_row - y)],
+                "merged_head_bbox": [int(x), int(y), int(w), int(h)],
+                "selected_head_bbox": [int(x), int(y), int(w), int(head_bottom_row - y)],
+                "head_bottom_row": int(head_bottom_row),
+                "head_bottom_reason": str(head_bottom_reason),
+                **channel,
+            }
+        )
+        self._debug_update(
+            {
+                **geometry,
+                "threshold_value": int(threshold_value),
+                "kept_contour_bboxes": kept_bboxes,
+                "kept_contour_areas": [float(row["area"]) for row in kept_components],
+            }
+        )
+        return geometry
+
+    def run_detection(self):
+        """Analyze the frame on the calling thread and record the detector runtime."""
+        start_perf = time.perf_counter()
+        self.analyze_image()
+        self.detector_runtime_ms = float((time.perf_counter() - start_perf) * 1000.0)
+        if isinstance(self.detected_details, dict):
+            self.detected_details["detector_runtime_ms"] = self.detector_runtime_ms
+        self._debug_update({"detector_runtime_ms": self.detector_runtime_ms})
+        return self
+
+    def find_printer_head(self,cur_img, threshold_value=50):
+        """
+        Given a current image, this function detects the printer head in the image.
+        It returns the bounding box coordinates of the detected printer head.
+        """
+        geometry = self._detect_refuel_head_geometry(cur_img, threshold_value=threshold_value)
+        bbox = geometry.get("head_bbox")
+        if bbox is None:
+            print("No contours found.")
+            return None, None, None, None
+        return tuple(int(value) for value in bbox)
+
+    def get_channel_bounds(self,cur_img, x, y, w, h, left_offset=40, channel_width=30):
+        """
+        Given the bounding box coordinates of the printer head, this function identifies the channel area.
+        It returns the bounding box coordinates of the detected channel area.
+        """
+        # Identify the channel area using the sides of the bounding box
+        x0 = x + left_offset
+        return x0, y, channel_width, h
+
+    def get_channel_profile(self,image, x0, y0, w, h):
+        """
+        Extracts the channel profile from the image.
+        """
+        crop = image[y0:y0+h, x0:x0+w]              # 1. crop to channel  
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        blur = cv2.GaussianBlur(gray, (5,5), 0)    # 2. smooth out noise  
+
+        profile = blur.mean(axis=1)
+        self._debug_array("channel_crop_bgr", crop)
+        self._debug_array("channel_crop_gray", gray)
+        self._debug_array("channel_crop_blur", blur)
+        self._debug_array("profile", profile)
+        self._debug_update({"profile_stats": self._debug_profile_stats(profile)})
+        return profile
+
+
+    def detect_meniscus_row(self,profile,
+                        last_row=None,
+                        fluid_darker=True,
+                        search_band=None,
+                        min_prominence=8):
+        """
+        profile       : 1-D numpy array of mean‐intensities per row
+        last_row      : previous detection (for temporal smoothing / disambiguation)
+        fluid_darker  : True if liquid is darker than air (so meniscus is a downward step)
+        search_band   : (row_min, row_max)  to restrict valid meniscus locations
+        min_prominence: threshold to reject small bumps
+        
+        returns meniscus_row  (index into `profile` where the level sits)
+        """
+        # 1) gradient
+        grad = np.diff(profile)
+
+        # 2) orient so meniscus becomes a *peak* in `sig`
+        sig = -grad if fluid_darker else grad
+        self._debug_array("profile_gradient", grad)
+        self._debug_array("oriented_signal", sig)
+
+        # 3) find all peaks above a certain prominence
+        peaks, props = find_peaks(sig, prominence=min_prominence)
+
+        # 4) if we have a band, throw away peaks outside it
+        if search_band is not None:
+            lo, hi = search_band
+            mask = (peaks >= lo) & (peaks < hi)
+            peaks = peaks[mask]
+            for k in list(props):
+                props[k] = props[k][mask]
+
+        prominences = props.get("prominences", [])
+        selection = self._select_peak_candidate(peaks, prominences, last_row=last_row, channel_height=len(profile))
+        self.peak_selection_details = dict(selection)
+        if self.capture_debug:
+            attempts = list(self.debug_details.get("peak_search_attempts") or [])
+            attempts.append(
+                {
+                    "min_prominence": int(min_prominence),
+                    "fluid_darker": bool(fluid_darker),
+                    "search_band": None if search_band is None else [int(search_band[0]), int(search_band[1])],
+                    "candidate_rows": [int(row) for row in np.asarray(peaks).tolist()],
+                    "candidate_prominences": [float(value) for value in np.asarray(prominences).tolist()],
+                    "best_peak_row": selection.get("best_peak_row"),
+                    "best_peak_prominence": selection.get("best_peak_prominence"),
+                    "selected_peak_row": selection.get("selected_peak_row"),
+                    "selected_peak_prominence": selection.get("selected_peak_prominence"),
+                    "selected_peak_reason": selection.get("selected_peak_reason"),
+                    "top_tie_eligible_rows": selection.get("top_tie_eligible_rows"),
+                    "tracking_eligible_rows": selection.get("tracking_eligible_rows"),
+                }
+            )
+            self.debug_details["peak_search_attempts"] = attempts
+            self.debug_details["peak_rows"] = selection.get("candidate_rows") or []
+            self.debug_details["peak_prominences"] = selection.get("candidate_prominences") or []
+            self.debug_details["best_peak_row"] = selection.get("best_peak_row")
+            self.debug_details["best_peak_prominence"] = selection.get("best_peak_prominence")
+            self.debug_details["selected_peak_row"] = selection.get("selected_peak_row")
+            self.debug_details["selected_peak_prominence"] = selection.get("selected_peak_prominence")
+            self.debug_details["selected_peak_reason"] = selection.get("selected_peak_reason")
+            self.debug_details["top_tie_eligible_rows"] = selection.get("top_tie_eligible_rows") or []
+            self.debug_details["non_bottom_eligible_rows"] = selection.get("non_bottom_eligible_rows") or []
+            self.debug_details["upper_bottom_eligible_rows"] = selection.get("upper_bottom_eligible_rows") or []
+            self.debug_details["tracking_eligible_rows"] = selection.get("tracking_eligible_rows") or []
+            self.debug_details["search_band"] = attempts[-1]["search_band"]
+            self.debug_details["fluid_darker"] = bool(fluid_darker)
+            self.debug_details["peak_selection_parameters"] = self._scaled_peak_selection_parameters()
+
+        # 5) if any candidates remain, pick best
+        selected_row = selection.get("selected_peak_row")
+        if selected_row is not None:
+            return int(selected_row)
+        if last_row is not None:
+            if last_row < len(profile) -20 and last_row > 20 and min_prominence > 4:
+                # If we have a last row, we can try to find the meniscus row again with a lower prominence
+                # This is useful if the meniscus is not very pronounced
+                return self.detect_meniscus_row(profile,
+                            last_row=last_row,
+                            fluid_darker=fluid_darker,
+                            search_band=search_band,
+                            min_prominence=min_prominence-1)
+
+        # 6) If no peaks were found, return None
+        self._debug_update({"selected_peak_row": None, "selected_peak_reason": "no_peaks"})
+        return None
+
+    def classify_fill_state(self, image, x0, y0, w0, h0, empty_cutoff=0.15):
+        """
+        Checks nearby printer-head patches to determine whether the channel is empty or full.
+        """
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        patch_size = max(1, int(w0))
+        max_square_start = max(0, int(gray.shape[0]) - patch_size)
+        square_start = max(0, min(max_square_start, int(y0 + h0 - patch_size - 30)))
+        square_end = square_start + patch_size
+        channel_patch = gray[square_start:square_end, x0:x0+patch_size]
+        self._debug_array("fill_channel_patch", channel_patch)
+
+        reference_offsets = [
+            ("left_far", -2 * patch_size - 10),
+            ("left_near", -patch_size - 5),
+            ("right_near", patch_size + 5),
+            ("right_mid", 2 * patch_size + 10),
+            ("right_far", 3 * patch_size + 15),
+        ]
+        reference_scores = []
+        best = None
+        if channel_patch.shape == (patch_size, patch_size):
+            for name, offset in reference_offsets:
+                ref_x0 = int(x0 + offset)
+                ref_x1 = int(ref_x0 + patch_size)
+                row = {
+                    "name": str(name),
+                    "x0": int(ref_x0),
+                    "x1": int(ref_x1),
+                    "valid": False,
+                    "score": None,
+                    "reference_mean": None,
+                    "reason": "out_of_bounds",
+                }
+                if ref_x0 < 0 or ref_x1 > int(gray.shape[1]):
+                    reference_scores.append(row)
+                    continue
+                reference_patch = gray[square_start:square_end, ref_x0:ref_x1]
+                if reference_patch.shape != channel_patch.shape:
+                    row["reason"] = "shape_mismatch"
+                    reference_scores.append(row)
+                    continue
+                ref_mean = float(np.mean(reference_patch))
+                row["reference_mean"] = ref_mean
+                if ref_mean < float(self.FILL_REFERENCE_MIN_MEAN):
+                    row["reason"] = "reference_too_dark"
+                    reference_scores.append(row)
+                    continue
+                try:
+                    score = float(ssim(channel_patch, reference_patch))
+                except Exception as exc:
+                    row["reason"] = f"ssim_error:{exc}"
+                    reference_scores.append(row)
+                    continue
+                row.update({"valid": True, "score": score, "reason": "ok"})
+                reference_scores.append(row)
+                candidate = (score, name, ref_x0, reference_patch.copy())
+                if best is None or candidate[0] > best[0]:
+                    best = candidate
+
+        if best is None:
+            score = -1.0
+            chosen_name = None
+            chosen_x0 = None
+            chosen_patch = None
+            reason = "no_valid_reference_patches"
+        else:
+            score, chosen_name, chosen_x0, chosen_patch = best
+            reason = "max_reference_ssim"
+            self._debug_array("fill_reference_patch", chosen_patch)
+
+        if score < empty_cutoff:
+            row = h0 - 3
+            state = "empty"
+            reason = "ssim_below_empty_cutoff"
+        else:
+            row = 3
+            state = "full"
+            reason = "ssim_at_or_above_empty_cutoff"
+        self._debug_update(
+            {
+                "fill_square_start": int(square_start),
+                "fill_square_end": int(square_end),
+                "fill_score": float(score),
+                "fill_score_method": "max_reference_ssim",
+                "fill_reference_scores": reference_scores,
+                "fill_reference_choice": None if chosen_name is None else {
+                    "name": str(chosen_name),
+                    "x0": int(chosen_x0),
+                    "x1": int(chosen_x0 + patch_size),
+                    "score": float(score),
+                },
+                "fill_reference_min_mean": float(self.FILL_REFERENCE_MIN_MEAN),
+                "fill_channel_mean": float(np.mean(channel_patch)) if channel_patch.size else None,
+                "fill_candidate_state": str(state),
+                "fill_candidate_reason": str(reason),
+                "empty_cutoff": float(empty_cutoff),
+            }
+        )
+        return row, state, float(score), reason
+
+    def check_fill_state(self,image,x0,y0,w0,h0,empty_cutoff=0.15, return_details=False):
+        row, state, score, _reason = self.classify_fill_state(
+            image,
+            x0,
+            y0,
+            w0,
+            h0,
+            empty_cutoff=empty_cutoff,
+        )
+        if return_details:
+            return row, state, score
+        return row
+
+    def analyze_image(self):
+        # self.original_image = cv2.rotate(self.original_image, cv2.ROTATE_180)
+        # Rotate the image 90 degrees counter-clockwise
+        self.original_image = cv2.rotate(self.original_image, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        cur_img = self.original_image.copy()
+        self.analysis_image_shape = tuple(cur_img.shape[:2])
+        self._debug_array("analysis_image", cur_img)
+        if self.capture_debug:
+            self._debug_update(
+                {
+                    **self._analysis_metadata_payload(cur_img.shape),
+                    "analysis_parameters": {
+                        "offset": int(self.offset),
+                        "width": int(self.width),
+                        "threshold": int(self.threshold),
+                        "prominence": int(self.prominence),
+                        "empty_cutoff": float(self.empty_cutoff),
+                        "bottom_guard_px": int(self.bottom_guard_px),
+                    },
+                    "last_row": int(self.last_row) if self.last_row is not None else None,
+                    "peak_selection_parameters": self._scaled_peak_selection_parameters(cur_img.shape),
+                }
+            )
+
+        geometry = self._detect_refuel_head_geometry(cur_img, threshold_value=self.threshold)
+        head_bbox = geometry.get("head_bbox")
+        channel_bounds = geometry.get("channel_bounds")
+        if head_bbox is None or channel_bounds is None:
+            print("Printer head not found, using default values")
+            self.annotated_image = cur_img.copy()
+            self.level_data = None
+            self.meniscus_row = None
+            self.detected_status = "not_found"
+            self.detected_details = {**self._analysis_metadata_payload(cur_img.shape), "reason": "printer_head_not_found"}
+            self._debug_update(
+                {
+                    "detected_status": "not_found",
+                    "meniscus_row": None,
+                    "level_data": None,
+                    "failure_reason": "printer_head_not_found",
+                }
+            )
+            return
+
+        x, y, w, h = [int(value) for value in head_bbox]
+        x0, y0, w0, h0 = [int(value) for value in channel_bounds]
+        self.head_bbox = (int(x), int(y), int(w), int(h))
+        self.channel_bounds = (int(x0), int(y0), int(w0), int(h0))
+        self._debug_update(
+            {
+                "head_bbox": list(self.head_bbox),
+                "channel_bounds": list(self.channel_bounds),
+            }
+        )
+
+        profile = self.get_channel_profile(cur_img, x0, y0, w0, h0)
+
+        fill_row, fill_candidate_state, fill_score, fill_candidate_reason = self.classify_fill_state(
+            cur_img,
+            x0,
+            y0,
+            w0,
+            h0,
+            empty_cutoff=self.empty_cutoff,
+        )
+
+        scaled_bottom_guard_px = int(self._y_px(self.bottom_guard_px, min_value=0))
+        search_band = (0, max(0, int(h0) - scaled_bottom_guard_px))
+        meniscus_row = self.detect_meniscus_row(profile,
+                            last_row=self.last_row,
+                            fluid_darker=False,
+                            search_band=search_band,
+                            min_prominence=self.prominence)
+        fill_state = "visible"
+        fill_reason = "visible_peak"
+        final_decision_reason = "visible_peak"
+
+        if meniscus_row is None:
+            meniscus_row = int(fill_row)
+            fill_state = str(fill_candidate_state)
+            fill_reason = str(fill_candidate_reason)
+            final_decision_reason = "no_peak_using_fill_state"
+            self._debug_update(
+                {
+                    "credible_visible_peak": False,
+                    "visible_peak_reason": "no_selected_peak",
+                }
+            )
+        else:
+            visible_peak_ok, visible_reason = self._selected_peak_visible_decision(
+                self.peak_selection_details,
+                h0,
+                fill_candidate_state,
+                profile=profile,
+            )
+            if visible_peak_ok:
+                fill_state = "visible"
+                fill_reason = str(visible_reason)
+                final_decision_reason = "credible_visible_peak"
+            else:
+                meniscus_row = int(fill_row)
+                fill_state = str(fill_candidate_state)
+                fill_reason = str(fill_candidate_reason)
+                final_decision_reason = f"{visible_reason}_using_fill_state"
+            self._debug_update(
+                {
+                    "fill_state": str(fill_state),
+                    "fill_state_reason": str(fill_reason),
+                    "fill_candidate_state": str(fill_candidate_state),
+                    "fill_candidate_reason": str(fill_candidate_reason),
+                    "final_decision_reason": str(final_decision_reason),
+                    "full_top_guard_px": int(self._y_px(self.FULL_TOP_GUARD_PX)),
+                    "top_visible_prominence_min": float(self.TOP_VISIBLE_PROMINENCE_MIN),
+                    "bottom_artifact_guard_px": int(self._y_px(self.BOTTOM_ARTIFACT_GUARD_PX)),
+                }
+            )
+        if str(fill_state) == "visible":
+            meniscus_row = max(0, min(int(h0) - 1, int(meniscus_row) + int(self.MENISCUS_VISIBLE_OUTPUT_ROW_OFFSET_PX)))
+        level_y = y0 + meniscus_row
+
+        cv2.line(cur_img, (x0, level_y), (x0 + w0, level_y), (0, 0, 255), 2)  # Red line
+        cv2.rectangle(cur_img, (x0, y0), (x0 + w0, y0 + h0), (255, 0, 0), 2)  # Blue rectangle
+        # Draw the printer head bounding box
+        cv2.rectangle(cur_img, (x, y), (x + w, y + h), (0, 255, 0), 2)  # Green rectangle
+
+        self.annotated_image = cur_img.copy()
+        self.meniscus_row = int(meniscus_row)
+        self.detected_status = str(fill_state or "visible")
+        self.detected_details = {
+            **self._analysis_metadata_payload(cur_img.shape),
+            "head_bbox": list(self.head_bbox) if self.head_bbox is not None else None,
+            "channel_bounds": list(self.channel_bounds) if self.channel_bounds is not None else None,
+            "fill_score": float(fill_score) if fill_score is not None else None,
+            "fill_state_reason": str(fill_reason),
+            "fill_candidate_state": str(fill_candidate_state),
+            "fill_candidate_reason": str(fill_candidate_reason),
+            "final_decision_reason": str(final_decision_reason),
+            "selected_peak_row": self.peak_selection_details.get("selected_peak_row"),
+            "selected_peak_prominence": self.peak_selection_details.get("selected_peak_prominence"),
+            "selected_peak_reason": self.peak_selection_details.get("selected_peak_reason"),
+            "last_row": int(self.last_row) if self.last_row is not None else None,
+        }
+
+        # Calculate level data by calculating the difference between the meniscus row and the bottom of the channel
+        self.level_data = h0 - self.meniscus_row
+        self._debug_update(
+            {
+                "detected_status": self.detected_status,
+                "meniscus_row": int(self.meniscus_row),
+                "level_data": float(self.level_data),
+                "fill_score": float(fill_score) if fill_score is not None else None,
+                "fill_state": str(fill_state or "visible"),
+                "fill_state_reason": str(fill_reason),
+                "fill_candidate_state": str(fill_candidate_state),
+                "fill_candidate_reason": str(fill_candidate_reason),
+                "final_decision_reason": str(final_decision_reason),
+            }
+        )
+
@@ -0,0 +1,422 @@
+"""Shared CRC and frame codec for the host <-> MCU serial protocol.
+
+Every frame on the wire is ``START_BYTE, len, payload[len], crc_lo, crc_hi``.
+The CRC is the reflected 0xA001 polynomial seeded with 0xFFFF over the
+payload only, matching ``crc16_x25`` in the firmware.
+
+The module intentionally has no Qt, serial-port or application dependencies
+so the host application and the stand-alone tools can share one
+implementation.  NumPy is optional and only used by the batched CRC path.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+from collections import namedtuple
+from typing import Iterable, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised on minimal tool installs
+    np = None
+
+
+START_BYTE = 0xAA
+CRC16_POLY = 0xA001
+CRC16_INIT = 0xFFFF
+FRAME_HEADER_LEN = 2
+FRAME_CRC_LEN = 2
+FRAME_OVERHEAD = FRAME_HEADER_LEN + FRAME_CRC_LEN
+MAX_PAYLOAD_LEN = 255
+MAX_FRAME_LEN = FRAME_OVERHEAD + MAX_PAYLOAD_LEN
+
+# Below this many equal-length payloads the per-column NumPy overhead costs
+# more than the scalar table loop.
+BATCH_CRC_MIN_GROUP = 32
+
+_HEADER = struct.Struct("<BB")
+_CRC = struct.Struct("<H")
+_TLV_VALUE_FORMATS = {
+    (1, False): "B", (1, True): "b",
+    (2, False): "H", (2, True): "h",
+    (4, False): "I", (4, True): "i",
+    (8, False): "Q", (8, True): "q",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _build_crc16_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ CRC16_POLY if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _build_crc16_table()
+_CRC16_TABLE_NP = None if np is None else np.asarray(CRC16_TABLE, dtype=np.uint16)
+
+
+def crc16_x25(data, crc: int = CRC16_INIT) -> int:
+    """Return the protocol CRC of ``data`` using the 256-entry lookup table.
+
+    ``data`` may be ``bytes``, ``bytearray`` or a byte ``memoryview``.  Pass a
+    previous result as ``crc`` to continue a running checksum.
+    """
+    table = CRC16_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc & 0xFFFF
+
+
+def crc16_x25_bitwise(data) -> int:
+    """Reference bit-at-a-time implementation kept for vector checks."""
+    crc = CRC16_INIT
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ CRC16_POLY
+            else:
+                crc >>= 1
+    return crc & 0xFFFF
+
+
+def crc16_x25_batch(payloads: Sequence) -> list[int]:
+    """Return the CRC of every payload in ``payloads``, preserving order.
+
+    Payloads with the same length are stacked into one 2-D array and their
+    CRCs advanced one byte column at a time, so a burst of fixed-layout
+    status frames costs one table lookup per byte column instead of one per
+    byte.  Falls back to the scalar path without NumPy or for small groups.
+    """
+    results = [0] * len(payloads)
+    if np is None:
+        for index, payload in enumerate(payloads):
+            results[index] = crc16_x25(payload)
+        return results
+
+    groups: dict[int, list[int]] = {}
+    for index, payload in enumerate(payloads):
+        groups.setdefault(len(payload), []).append(index)
+
+    for length, indices in groups.items():
+        if len(indices) < BATCH_CRC_MIN_GROUP or length == 0:
+            for index in indices:
+                results[index] = crc16_x25(payloads[index])
+            continue
+        block = np.frombuffer(
+            b"".join(bytes(payloads[index]) for index in indices),
+            dtype=np.uint8,
+        ).reshape(len(indices), length)
+        crc = np.full(len(indices), CRC16_INIT, dtype=np.uint16)
+        for column in range(length):
+            crc = (crc >> 8) ^ _CRC16_TABLE_NP[(crc ^ block[:, column]) & 0xFF]
+        for index, value in zip(indices, crc.tolist()):
+            results[index] = int(value)
+    return results
+
+
+def encode_frame_into(buffer, offset: int, payload) -> int:
+    """Write one framed ``payload`` into ``buffer`` at ``offset``.
+
+    ``buffer`` must be a writable, preallocated byte buffer (``bytearray`` or
+    ``memoryview``) with room for ``len(payload) + FRAME_OVERHEAD`` bytes.
+    Returns the number of bytes written.
+    """
+    length = len(payload)
+    if length > MAX_PAYLOAD_LEN:
+        raise ValueError("Payload length exceeds 255 bytes")
+    end = offset + FRAME_HEADER_LEN + length
+    _HEADER.pack_into(buffer, offset, START_BYTE, length)
+    buffer[offset + FRAME_HEADER_LEN:end] = payload
+    _CRC.pack_into(buffer, end, crc16_x25(payload))
+    return length + FRAME_OVERHEAD
+
+
+def encode_frame(payload) -> bytes:
+    """Return ``payload`` wrapped in the start byte, length and CRC tail."""
+    frame = bytearray(len(payload) + FRAME_OVERHEAD)
+    encode_frame_into(frame, 0, payload)
+    return bytes(frame)
+
+
+def encode_frames(payloads: Iterable) -> bytearray:
+    """Frame several payloads back-to-back into one buffer for a single write."""
+    payloads = list(payloads)
+    out = bytearray(sum(len(payload) + FRAME_OVERHEAD for payload in payloads))
+    offset = 0
+    for payload in payloads:
+        offset += encode_frame_into(out, offset, payload)
+    return out
+
+
+def split_frames(buffer) -> tuple[list[memoryview], int, int]:
+    """Split back-to-back frames in ``buffer`` and validate them in one batch.
+
+    Returns ``(payloads, consumed, rejected)`` where ``payloads`` are
+    zero-copy ``memoryview`` slices of CRC-valid frames in arrival order,
+    ``consumed`` is the byte count of complete frames walked and ``rejected``
+    counts complete frames whose CRC did not match.  Scanning stops at the
+    first byte that is not ``START_BYTE`` or at a trailing partial frame.
+    """
+    view = memoryview(buffer).cast("B")
+    total = len(view)
+    offset = 0
+    payloads = []
+    received = []
+    while offset + FRAME_OVERHEAD <= total and view[offset] == START_BYTE:
+        length = view[offset + 1]
+        end = offset + FRAME_HEADER_LEN + length
+        if end + FRAME_CRC_LEN > total:
+            break
+        payloads.append(view[offset + FRAME_HEADER_LEN:end])
+        received.append(view[end] | (view[end + 1] << 8))
+        offset = end + FRAME_CRC_LEN
+
+    valid = []
+    for payload, expected, actual in zip(payloads, received, crc16_x25_batch(payloads)):
+        if expected == actual:
+            valid.append(payload)
+    return valid, offset, len(payloads) - len(valid)
+
+
+class StreamFrameDecoder:
+    """Incremental frame decoder that resynchronizes on line noise.
+
+    Bytes from any number of reads are appended to one compacting buffer.
+    Each ``feed`` scans for ``START_BYTE``, validates length and CRC in place
+    and returns every complete payload, so one bulk read yields all frames
+    that arrived since the previous wakeup.  A frame that fails its CRC only
+    costs its start byte: scanning restarts at the next byte instead of
+    skipping the whole declared length, which shortens recovery when the
+    corrupted byte was the length itself.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._synchronized = True
+        self.frames_decoded = 0
+        self.bytes_received = 0
+        self.dropped_bytes = 0
+        self.resync_events = 0
+        self.crc_failures = 0
+
+    @property
+    def buffered_byte_count(self) -> int:
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._synchronized = True
+
+    def feed(self, data) -> list[bytes]:
+        buffer = self._buffer
+        buffer += data
+        self.bytes_received += len(data)
+        total = len(buffer)
+        frames = []
+        pos = 0
+        while pos < total:
+            start = buffer.find(START_BYTE, pos)
+            if start < 0:
+                self._drop(total - pos)
+                pos = total
+                break
+            if start > pos:
+                self._drop(start - pos)
+            pos = start
+            if total - start < FRAME_OVERHEAD:
+                break
+            end = start + FRAME_HEADER_LEN + buffer[start + 1]
+            if end + FRAME_CRC_LEN > total:
+                break
+            payload = bytes(buffer[start + FRAME_HEADER_LEN:end])
+            if crc16_x25(payload) != (buffer[end] | (buffer[end + 1] << 8)):
+                self.crc_failures += 1
+                self._drop(1)
+                pos = start + 1
+                continue
+            frames.append(payload)
+            self._synchronized = True
+            pos = end + FRAME_CRC_LEN
+        # Anything left is at most one partial frame starting at START_BYTE.
+        del buffer[:pos]
+        self.frames_decoded += len(frames)
+        return frames
+
+    def _drop(self, count: int) -> None:
+        if count <= 0:
+            return
+        self.dropped_bytes += count
+        if self._synchronized:
+            self._synchronized = False
+            self.resync_events += 1
+
+    def stats(self) -> dict:
+        return {
+            "frames_decoded": int(self.frames_decoded),
+            "bytes_received": int(self.bytes_received),
+            "dropped_bytes": int(self.dropped_bytes),
+            "resync_events": int(self.resync_events),
+            "crc_failures": int(self.crc_failures),
+            "buffered_bytes": len(self._buffer),
+        }
+
+
+def decode_tlv_fields(payload, tag_map: Mapping[int, tuple], offset: int = 0) -> dict:
+    """Walk ``payload[offset:]`` as tag-len-value and return ``name -> int``.
+
+    ``tag_map`` maps a tag to ``(name, expected_len, signed)``.  Unknown
+    tags and length mismatches are logged and skipped; a truncated entry
+    stops the walk.
+    """
+    idx = offset
+    end = len(payload)
+    result = {}
+    while idx + 2 <= end:
+        tag = payload[idx]
+        length = payload[idx + 1]
+        idx += 2
+        if idx + length > end:
+            logger.warning("Malformed TLV payload: tag=0x%02X len=%d exceeds payload", tag, length)
+            break
+        raw = payload[idx:idx + length]
+        idx += length
+
+        entry = tag_map.get(tag)
+        if not entry:
+            logger.warning("Unknown TLV tag: 0x%02X", tag)
+            continue
+        name, expected_len, signed = entry
+        if expected_len != length:
+            logger.warning(
+                "TLV length mismatch for %s: expected=%d got=%d",
+                name,
+                expected_len,
+                length,
+            )
+            continue
+        result[name] = int.from_bytes(raw, byteorder="little", signed=signed)
+    return result
+
+
+class _CompiledTlvLayout:
+    __slots__ = ("offset", "size", "signature", "signature_struct", "values_struct", "names", "record_type")
+
+    def __init__(self, offset, size, signature, signature_fmt, values_fmt, names):
+        self.offset = offset
+        self.size = size
+        self.signature = signature
+        self.signature_struct = struct.Struct(signature_fmt)
+        self.values_struct = struct.Struct(values_fmt)
+        self.names = names
+        self.record_type = namedtuple("TlvRecord", names)
+
+
+class TlvLayoutDecoder:
+    """Decode fixed-layout TLV payloads with one precompiled ``struct`` unpack.
+
+    The first payload that walks cleanly is compiled into two ``struct``
+    formats: one that extracts every tag and length byte, used to confirm a
+    later payload has the same layout, and one that extracts only the known
+    values.  Payloads with a different length or layout go through the
+    generic walker and the new layout is learned from them.
+    """
+
+    def __init__(self, tag_map: Mapping[int, tuple]):
+        self._tag_map = tag_map
+        self._layout = None
+        self.compiled_hits = 0
+        self.fallback_decodes = 0
+        self.layout_changes = 0
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return self._layout.names if self._layout is not None else ()
+
+    def _compile(self, payload, offset):
+        end = len(payload)
+        idx = offset
+        prefix = f"<{offset}x" if offset else "<"
+        signature = []
+        signature_fmt = [prefix]
+        values_fmt = [prefix]
+        names = []
+        while idx + 2 <= end:
+            tag = payload[idx]
+            length = payload[idx + 1]
+            if idx + 2 + length > end:
+                return None
+            signature.extend((tag, length))
+            signature_fmt.append(f"BB{length}x" if length else "BB")
+            entry = self._tag_map.get(tag)
+            value_fmt = None
+            if entry and entry[1] == length:
+                if entry[0] in names:
+                    return None  # repeated field: leave last-wins to the walker
+                value_fmt = _TLV_VALUE_FORMATS.get((length, bool(entry[2])))
+                if value_fmt is None:
+                    return None
+            if value_fmt is None:
+                # Unknown tag or length mismatch: skipped, as the walker does.
+                values_fmt.append(f"{length + 2}x")
+            else:
+                values_fmt.append(f"2x{value_fmt}")
+                names.append(entry[0])
+            idx += 2 + length
+        if idx != end or not names:
+            return None
+        return _CompiledTlvLayout(
+            offset,
+            end,
+            tuple(signature),
+            "".join(signature_fmt),
+            "".join(values_fmt),
+            tuple(names),
+        )
+
+    def decode_values(self, payload, offset: int = 0):
+        """Return ``(names, values)`` for the TLVs in ``payload[offset:]``."""
+        layout = self._layout
+        if (
+            layout is not None
+            and layout.offset == offset
+            and len(payload) == layout.size
+            and layout.signature_struct.unpack_from(payload) == layout.signature
+        ):
+            self.compiled_hits += 1
+            return layout.names, layout.values_struct.unpack_from(payload)
+
+        result = decode_tlv_fields(payload, self._tag_map, offset)
+        self.fallback_decodes += 1
+        compiled = self._compile(payload, offset)
+        if compiled is not None:
+            if layout is not None:
+                self.layout_changes += 1
+            self._layout = compiled
+        return tuple(result), tuple(result.values())
+
+    def decode(self, payload, offset: int = 0) -> dict:
+        names, values = self.decode_values(payload, offset)
+        return dict(zip(names, values))
+
+    def decode_record(self, payload, offset: int = 0):
+        """Return a namedtuple record when the layout is compiled, else a dict."""
+        names, values = self.decode_values(payload, offset)
+        layout = self._layout
+        if layout is not None and names is layout.names:
+            return layout.record_type._make(values)
+        return dict(zip(names, values))
+
+    def stats(self) -> dict:
+        return {
+            "compiled_hits": int(self.compiled_hits),
+            "fallback_decodes": int(self.fallback_decodes),
+            "layout_changes": int(self.layout_changes),
+            "field_count": len(self.field_names),
+        }
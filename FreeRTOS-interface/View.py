@@ -46,6 +46,11 @@ import copy
 from utilities import ShortcutManager, apply_pressure_plot_style
 from ExperimentAuditReader import ExperimentAuditReader, build_audit_markdown
 from ConfigurationHistoryReader import ConfigurationHistoryReader
+from WellPathPlanner import (
+    WELL_ORDER_SERPENTINE,
+    WELL_ORDER_TRAVEL_OPTIMIZED,
+    normalize_well_order_mode,
+)
 import CalibrationClasses
 from typing import Mapping, Sequence, Optional, Any, List, Dict, Tuple, Set
 from hardware.profile import CURRENT_PROFILE, HardwareProfile
@@ -13046,6 +13051,18 @@ class ExperimentDesignDialog(QDialog):
         self.allow_two_chk.setToolTip("Enable two-stock fallback when a single stock cannot satisfy the targets under the current bounds.")
         options_form.addRow(QLabel("Allow Two Stock Solutions"), self.allow_two_chk)
 
+        # Array-print well ordering
+        self.well_order_combo = QComboBox()
+        self.well_order_combo.addItem("Serpentine", WELL_ORDER_SERPENTINE)
+        self.well_order_combo.addItem("Travel optimized", WELL_ORDER_TRAVEL_OPTIMIZED)
+        self._set_well_order_combo(self.model.metadata.get("well_order_mode"))
+        self.well_order_combo.setToolTip(
+            "Order in which wells are printed for each stock. Travel optimized plans the "
+            "shortest head path through the wells that need the loaded stock; the estimated "
+            "travel versus serpentine is logged when printing starts."
+        )
+        options_form.addRow(QLabel("Print Path"), self.well_order_combo)
+
         # Fill reagent name
         self.fill_name_edit = QLineEdit(self.model.metadata.get("fill_reagent_name", "Water"))
         reaction_form.addRow(QLabel("Fill Reagent Name"), self.fill_name_edit)
@@ -15989,6 +16006,11 @@ class ExperimentDesignDialog(QDialog):
             ),
             final_reaction_volume_nL=float(self.final_v_spin.value()),
             allow_two_stock_solutions=bool(self.allow_two_chk.isChecked()),
+            well_order_mode=normalize_well_order_mode(
+                self.well_order_combo.currentData()
+                if getattr(self, "well_order_combo", None) is not None
+                else getattr(self.model, "metadata", {}).get("well_order_mode")
+            ),
             randomize_assignments=randomize,
             random_seed=(seed if randomize else None),
             use_subset_design=bool(self.subset_chk.isChecked()),
@@ -16010,6 +16032,10 @@ class ExperimentDesignDialog(QDialog):
             except Exception as e:
                 print(f"[ExperimentDesignDialog] WARNING: could not persist reagent identities: {e}")
 
+    def _set_well_order_combo(self, mode) -> None:
+        idx = self.well_order_combo.findData(normalize_well_order_mode(mode))
+        self.well_order_combo.setCurrentIndex(idx if idx >= 0 else 0)
+
     def _allow_two_setting(self) -> bool:
         if hasattr(self, "allow_two_chk") and self.allow_two_chk is not None:
             return bool(self.allow_two_chk.isChecked())
@@ -16895,6 +16921,8 @@ class ExperimentDesignDialog(QDialog):
         )))
         self.volume_tolerance_spin.setValue(float(md.get("printed_volume_tolerance_nL", 50.0)))
         self.allow_two_chk.setChecked(bool(md.get("allow_two_stock_solutions", False)))
+        if hasattr(self, "well_order_combo"):
+            self._set_well_order_combo(md.get("well_order_mode"))
 
         if hasattr(self, "randomize_chk"):
             self.randomize_chk.setChecked(bool(md.get("randomize_assignments", False)))
@@ -17033,6 +17061,7 @@ class ExperimentDesignDialog(QDialog):
                         "mode": "start_offset",
                         "included_wells": None,
                     },
+                    "well_order_mode": WELL_ORDER_SERPENTINE,
                 }
                 # factors + caches
                 self.model.factors = []
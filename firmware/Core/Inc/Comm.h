@@ -113,6 +113,9 @@ static constexpr uint32_t TRANSPORT_CAPABILITIES =
     TRANSPORT_CAP_STATUS_FRONTIERS |
     TRANSPORT_CAP_PAUSE_AFTER_SEQ32 |
     TRANSPORT_CAP_SESSION_SEQ_PERSIST;
+// Orchestrator command-queue length, advertised in HELLO_ACK so the host can
+// size its in-flight window without overrunning the queue.
+static constexpr uint32_t TRANSPORT_MAX_INFLIGHT_COMMANDS = 16u;
 
 
 
@@ -154,7 +157,9 @@ public:
         bool includeExpectedSeq32 = false,
         uint32_t expectedSeq32 = 0,
         bool includeCapabilities = false,
-        uint32_t capabilities = 0
+        uint32_t capabilities = 0,
+        bool includeMaxInflight = false,
+        uint32_t maxInflight = 0
     );
     bool sendResetReport(uint8_t seq8, uint32_t seq32, const CrashLogSnapshot* snap, uint32_t recoveryBoot);
 
@@ -14,6 +14,7 @@ static constexpr uint8_t TAG_SEQ32 = 0x10;
 static constexpr uint8_t TAG_ACK_RESULT = 0x11;
 static constexpr uint8_t TAG_EXPECTED_SEQ32 = 0x12;
 static constexpr uint8_t TAG_CAPABILITIES = 0x13;
+static constexpr uint8_t TAG_MAX_INFLIGHT = 0x14;
 static constexpr uint8_t TAG_PROFILE = 0x20;
 static constexpr uint8_t TAG_RUN_ID = 0x21;
 static constexpr uint8_t TAG_TIMEOUT_MS = 0x22;
@@ -83,7 +84,9 @@ uint8_t buildAckPayload(
     bool includeExpectedSeq32 = false,
     uint32_t expectedSeq32 = 0,
     bool includeCapabilities = false,
-    uint32_t capabilities = 0
+    uint32_t capabilities = 0,
+    bool includeMaxInflight = false,
+    uint32_t maxInflight = 0
 );
 
 FeedResult feedRxByte(RxParser& parser, uint8_t b, uint8_t& outPayloadLen);
@@ -337,6 +337,8 @@ public:
       uint32_t expectedSeq32 = 0;
       bool includeCapabilities = false;
       uint32_t capabilities = 0;
+      bool includeMaxInflight = false;
+      uint32_t maxInflight = 0;
   };
 
   void clearQueue();
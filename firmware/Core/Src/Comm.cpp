@@ -249,12 +249,14 @@ void Comm::sendAckWithSeq32(
     bool includeExpectedSeq32,
     uint32_t expectedSeq32,
     bool includeCapabilities,
-    uint32_t capabilities
+    uint32_t capabilities,
+    bool includeMaxInflight,
+    uint32_t maxInflight
 ) {
   if (xSemaphoreTake(_txMutex, pdMS_TO_TICKS(50)) != pdTRUE) {
       return;
   }
-  uint8_t payload[24] = {0};
+  uint8_t payload[32] = {0};
   const uint8_t payloadLen = CommCodec::buildAckPayload(
       ackCmd,
       seq8,
@@ -267,7 +269,9 @@ void Comm::sendAckWithSeq32(
       includeExpectedSeq32,
       expectedSeq32,
       includeCapabilities,
-      capabilities
+      capabilities,
+      includeMaxInflight,
+      maxInflight
   );
   if (payloadLen == 0) {
       xSemaphoreGive(_txMutex);
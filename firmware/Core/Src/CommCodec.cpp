@@ -43,7 +43,9 @@ uint8_t buildAckPayload(
     bool includeExpectedSeq32,
     uint32_t expectedSeq32,
     bool includeCapabilities,
-    uint32_t capabilities
+    uint32_t capabilities,
+    bool includeMaxInflight,
+    uint32_t maxInflight
 ) {
     uint8_t needed = 2u;
     if (includeSeq32) {
@@ -58,6 +60,9 @@ uint8_t buildAckPayload(
     if (includeCapabilities) {
         needed = static_cast<uint8_t>(needed + 6u);
     }
+    if (includeMaxInflight) {
+        needed = static_cast<uint8_t>(needed + 6u);
+    }
     if (!outPayload || outCap < needed) {
         return 0;
     }
@@ -99,6 +104,15 @@ uint8_t buildAckPayload(
         outPayload[idx++] = static_cast<uint8_t>((capabilities >> 24) & 0xFFu);
     }
 
+    if (includeMaxInflight) {
+        outPayload[idx++] = TAG_MAX_INFLIGHT;
+        outPayload[idx++] = 4u;
+        outPayload[idx++] = static_cast<uint8_t>(maxInflight & 0xFFu);
+        outPayload[idx++] = static_cast<uint8_t>((maxInflight >> 8) & 0xFFu);
+        outPayload[idx++] = static_cast<uint8_t>((maxInflight >> 16) & 0xFFu);
+        outPayload[idx++] = static_cast<uint8_t>((maxInflight >> 24) & 0xFFu);
+    }
+
     return idx;
 }
 
@@ -195,7 +195,7 @@ Orchestrator* Orchestrator::instance() {
 
 void Orchestrator::begin() {
   // queue for up to 16 commands
-  _cmdQueue    = xQueueCreate(16, sizeof(Command));
+  _cmdQueue    = xQueueCreate(TRANSPORT_MAX_INFLIGHT_COMMANDS, sizeof(Command));
   _ackQueue    = xQueueCreate(16, sizeof(AckMessage));
   // event bits to wait on finish
   _doneEvents  = xEventGroupCreate();
@@ -311,6 +311,8 @@ BaseType_t Orchestrator::enqueueFromISR(const Command& cmd, BaseType_t* pxHigher
 		  ack.includeSeq32 = cmd.hasSeq32;
 		  ack.includeCapabilities = true;
 		  ack.capabilities = TRANSPORT_CAPABILITIES;
+		  ack.includeMaxInflight = true;
+		  ack.maxInflight = TRANSPORT_MAX_INFLIGHT_COMMANDS;
 		  return enqueueAckFromISR(ack, pxHigherPriorityTaskWoken);
 		}
 		case CMD_GOODBYE: {
@@ -1318,7 +1320,9 @@ void Orchestrator::drainAckQueue() {
       ack.includeExpectedSeq32,
       ack.expectedSeq32,
       ack.includeCapabilities,
-      ack.capabilities
+      ack.capabilities,
+      ack.includeMaxInflight,
+      ack.maxInflight
     );
     if (ack.ackCmd == CMD_CLEAR_ACK) {
       Logger::instance()->log("[Clear] ACK attempted\r\n");
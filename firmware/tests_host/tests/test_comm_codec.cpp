@@ -286,6 +286,35 @@ TEST(CommCodec, QueueAckWithResultExpectedAndCapabilitiesMatchesGoldenBytes) {
     MEMCMP_EQUAL(expected, payload, sizeof(expected));
 }
 
+TEST(CommCodec, HelloAckWithCapabilitiesAndMaxInflightMatchesGoldenBytes) {
+    uint8_t payload[32] = {0};
+    const uint8_t payloadLen = CommCodec::buildAckPayload(
+        0xF3,
+        0x01,
+        0x80000001u,
+        true,
+        payload,
+        sizeof(payload),
+        false,
+        0,
+        false,
+        0,
+        true,
+        0x0000000Fu,
+        true,
+        16u
+    );
+    UNSIGNED_LONGS_EQUAL(20u, payloadLen);
+
+    static const uint8_t expected[] = {
+        0xF3, 0x01,
+        CommCodec::TAG_SEQ32, 0x04, 0x01, 0x00, 0x00, 0x80,
+        CommCodec::TAG_CAPABILITIES, 0x04, 0x0F, 0x00, 0x00, 0x00,
+        CommCodec::TAG_MAX_INFLIGHT, 0x04, 0x10, 0x00, 0x00, 0x00
+    };
+    MEMCMP_EQUAL(expected, payload, sizeof(expected));
+}
+
 TEST(CommCodec, PauseAfterSeq32CommandParsesP1AndSeq32) {
     static const uint8_t payload[] = {
         0xFF, 0x55,
@@ -155,6 +155,12 @@ def pytest_addoption(parser):
         default=False,
         help="Run local SIL stress scenarios.",
     )
+    parser.addoption(
+        "--run-timing-gates",
+        action="store_true",
+        default=False,
+        help="Run wall-clock latency gates against committed benchmark baselines.",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -177,6 +183,11 @@ def pytest_collection_modifyitems(config, items):
             "--run-sil-stress",
             "local SIL stress scenarios",
         ),
+        (
+            "timing_gate",
+            "--run-timing-gates",
+            "wall-clock latency gates",
+        ),
     )
     for item in items:
         if (
@@ -218,6 +229,14 @@ def qapp():
     return app
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _isolate_black_box_log_dir(tmp_path_factory):
+    """Keep snapshots from machines built without black_box_log_dir out of the repo."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("LABCRAFT_BLACK_BOX_LOG_DIR", str(tmp_path_factory.mktemp("machine_black_box")))
+        yield
+
+
 @pytest.fixture(autouse=True)
 def _isolate_qt_top_level_widgets(request):
     """Prevent one Qt test's windows from becoming another test's input."""
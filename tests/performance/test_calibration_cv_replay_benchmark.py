@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tools import calibration_cv_benchmark as bench_mod
+
+
+pytestmark = pytest.mark.virtual_workflow
+
+BASELINE_PATH = (
+    Path(__file__).resolve().parent / "baselines" / "calibration_cv_replay_synthetic_v1.json"
+)
+
+
+def _run_against_baseline():
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    source = baseline["corpus"]
+    corpus = bench_mod.synthetic_replay_corpus(
+        frames=source["frames"],
+        width=source["image_size"]["width"],
+        height=source["image_size"]["height"],
+        seed=source["seed"],
+    )
+    return bench_mod.run_replay_benchmark(corpus, repeats=baseline["repeats"]), baseline
+
+
+def test_calibration_analyzers_match_replay_baseline_detections_and_allocations():
+    payload, baseline = _run_against_baseline()
+    regressions = bench_mod.compare_to_baseline(
+        payload,
+        baseline,
+        max_regression_pct=baseline["gate"]["max_regression_pct"],
+        check_latency=False,
+        metrics=("alloc_peak_kib_p50",),
+    )
+
+    for name, block in payload["analyzers"].items():
+        assert block["detected"] == baseline["analyzers"][name]["detected"]
+    assert regressions == []
+
+
+@pytest.mark.timing_gate
+def test_calibration_analyzers_stay_within_replay_latency_baseline():
+    payload, baseline = _run_against_baseline()
+    if not bench_mod.same_environment(payload, baseline):
+        pytest.skip("latency baseline was recorded on a different environment")
+    regressions = bench_mod.compare_to_baseline(
+        payload,
+        baseline,
+        max_regression_pct=baseline["gate"]["max_regression_pct"],
+        metrics=("p50",),
+    )
+
+    for name, block in payload["analyzers"].items():
+        print(
+            f"{name}: p50 {block['p50']:.2f} ms, p95 {block['p95']:.2f} ms, "
+            f"{block['frames_per_s']:.0f} frames/s, peak alloc {block['alloc_peak_kib_p50']:.0f} KiB"
+        )
+    assert regressions == []
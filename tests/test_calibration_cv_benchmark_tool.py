@@ -2,6 +2,9 @@ import importlib.util
 import json
 from pathlib import Path
 
+import cv2
+import pytest
+
 from tests.calibration_test_utils import ensure_calibration_import_stubs
 
 
@@ -44,3 +47,80 @@ def test_cv_benchmark_tool_output_contract(tmp_path):
     loaded = json.loads(out_path.read_text(encoding="utf-8"))
     assert loaded["schema_version"] == 1
     assert loaded["iterations"] == 5
+
+
+def _write_recorded_run(root: Path, run_id: str, process_name: str, captures):
+    run_dir = root / process_name / run_id
+    (run_dir / "captures").mkdir(parents=True)
+    (run_dir / "run_meta.json").write_text(json.dumps({"process_name": process_name}), encoding="utf-8")
+    for filename, image in captures:
+        assert cv2.imwrite(str(run_dir / "captures" / filename), image)
+    return run_dir
+
+
+def test_replay_corpus_pairs_recorded_captures_and_feeds_every_analyzer(tmp_path):
+    mod = _load_module(TOOL_PATH, "calibration_cv_benchmark_replay_mod")
+    synthetic = mod.synthetic_replay_corpus(frames=2, width=320, height=240, seed=3)
+    (bg0, img0), (_bg1, img1) = synthetic["droplet_pairs"]
+    _write_recorded_run(
+        tmp_path,
+        "run_a",
+        "DropletEmergenceCalibrationProcess",
+        [
+            ("cap_000001_background.png", bg0),
+            ("cap_000002_droplet.png", img0),
+            ("cap_000003_droplet.png", img1),
+        ],
+    )
+    _write_recorded_run(
+        tmp_path,
+        "run_b",
+        "RefuelLevelDatasetCaptureProcess",
+        [("cap_000001_refuel.png", frame) for frame in synthetic["refuel_frames"][:1]],
+    )
+
+    corpus = mod.collect_replay_corpus([tmp_path], include_checklist=False)
+    assert corpus["source"]["run_count"] == 2
+    assert len(corpus["droplet_pairs"]) == 2
+    assert len(corpus["refuel_frames"]) == 1
+
+    payload = mod.run_replay_benchmark(corpus, repeats=1)
+    assert payload["corpus"]["kind"] == "replay"
+    assert set(payload["analyzers"]) == set(mod.REPLAY_ANALYZERS)
+    for name, block in payload["analyzers"].items():
+        expected = 1 if name == "classify_fill_state" else 2
+        assert block["count"] == expected
+        assert block["frames_per_s"] > 0.0
+        assert block["alloc_peak_kib_p50"] > 0.0
+
+
+def test_replay_baseline_gate_flags_slower_or_heavier_analyzers():
+    mod = _load_module(TOOL_PATH, "calibration_cv_benchmark_gate_mod")
+    block = {"p50": 2.0, "p95": 4.0, "alloc_peak_kib_p50": 100.0}
+    baseline = {
+        "corpus": {"kind": "synthetic", "seed": 7},
+        "environment": {"machine": "x86_64", "system": "Linux"},
+        "analyzers": {name: dict(block) for name in mod.REPLAY_ANALYZERS},
+    }
+    payload = json.loads(json.dumps(baseline))
+    payload["analyzers"]["characterize_droplet"]["p50"] = 3.0
+    payload["analyzers"]["classify_fill_state"]["alloc_peak_kib_p50"] = 200.0
+
+    regressions = mod.compare_to_baseline(payload, baseline, max_regression_pct=25.0)
+    assert {(row["analyzer"], row["metric"]) for row in regressions} == {
+        ("characterize_droplet", "p50"),
+        ("classify_fill_state", "alloc_peak_kib_p50"),
+    }
+    assert mod.compare_to_baseline(payload, baseline, max_regression_pct=25.0, check_latency=False) == [
+        {
+            "analyzer": "classify_fill_state",
+            "metric": "alloc_peak_kib_p50",
+            "baseline": 100.0,
+            "current": 200.0,
+            "ratio": 2.0,
+        }
+    ]
+
+    payload["corpus"]["seed"] = 8
+    with pytest.raises(ValueError):
+        mod.compare_to_baseline(payload, baseline)
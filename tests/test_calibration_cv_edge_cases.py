@@ -133,3 +133,42 @@ def test_identify_nozzle_prefers_lowest_candidate_in_noisy_background():
     assert center1 == center2
     assert center1[1] > 250
     assert focus1 is not None and focus2 is not None
+
+
+
+def test_background_model_is_reused_across_analyzers_until_background_or_exposure_changes(monkeypatch):
+    cam = _camera_stub()
+    cam.exposure_time = 16500
+    bg = np.full((240, 320, 3), 120, dtype=np.uint8)
+    img = bg.copy()
+    cv2.circle(img, (160, 150), 20, (40, 40, 40), -1)
+
+    background_conversions = []
+    real_cvt = cv2.cvtColor
+
+    def _counting_cvt(src, code, *args, **kwargs):
+        if src is bg:
+            background_conversions.append(code)
+        return real_cvt(src, code, *args, **kwargs)
+
+    monkeypatch.setattr(cv2, "cvtColor", _counting_cvt)
+
+    _gray, diff = cam.calc_diff_image(img, bg)
+    _gray, dark = cam.calc_neg_diff_image(img, bg)
+    cam.characterize_droplet(img, bg)
+    model = cam.background_model(bg)
+    assert len(background_conversions) == 1
+    assert np.array_equal(diff, real_cvt(bg, cv2.COLOR_BGR2GRAY) - real_cvt(img, cv2.COLOR_BGR2GRAY))
+    assert np.array_equal(dark, diff)
+
+    bg[:] = 130  # capture buffer refilled in place
+    _gray, diff = cam.calc_diff_image(img, bg)
+    assert len(background_conversions) == 2
+    assert int(diff[0, 0]) == 10
+    assert cam.background_model(bg) is not model
+
+    model = cam.background_model(bg)
+    cam.exposure_time = 20000
+    assert cam.background_model(bg) is not model
+    model = cam.background_model(bg)
+    assert cam.background_model(bg.copy()) is not model
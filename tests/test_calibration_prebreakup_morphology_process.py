@@ -300,6 +300,31 @@ def test_analyze_prebreakup_morphology_extends_roi_to_fov_bottom_and_flags_clipp
     assert metrics["protrusion_length_px"] >= 200
 
 
+def test_prebreakup_row_profile_helpers_match_per_row_reference():
+    rng = np.random.default_rng(16)
+    mask = np.uint8(rng.random((60, 40)) < 0.08) * 255
+    mask[10:20] = 0
+
+    reference = []
+    for row in mask:
+        xs = np.where(row > 0)[0]
+        reference.append(int(xs[-1] - xs[0] + 1) if xs.size else 0)
+    assert DropletCameraModel._mask_row_widths(mask).tolist() == reference
+
+    for _ in range(50):
+        profile = np.convolve(rng.integers(0, 40, size=48).astype(float), [0.25, 0.5, 0.25], mode="same")
+        expected = []
+        for idx in range(4, 40):
+            cur = float(profile[idx])
+            if cur > profile[idx - 1] or cur > profile[idx + 1]:
+                continue
+            widening = float(np.max(profile[idx + 1:]) - cur)
+            if widening >= 6.0:
+                expected.append((-widening, cur, -idx, idx))
+        rows = DropletCameraModel._neck_candidate_rows(profile, 4, 40, 6.0)
+        assert rows.tolist() == [item[3] for item in sorted(expected)]
+
+
 def test_prebreakup_classify_morphology_distinguishes_candidate_and_risk():
     proc = _proc_stub()
     proc._timing_mode = "legacy_lead"
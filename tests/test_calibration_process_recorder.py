@@ -64,6 +64,30 @@ def test_calibration_process_recorder_writes_run_files(tmp_path):
     assert len(analysis_lines) == 1
 
 
+def test_calibration_process_recorder_frame_container_setting_packs_captures(monkeypatch, tmp_path):
+    from tools.stream_analysis import frame_container as frame_container_mod
+
+    monkeypatch.setenv(calibration_model.FRAME_CONTAINER_ENV, "1")
+    rec = CalibrationProcessRecorder(_dummy_model(tmp_path))
+    run_dir = Path(rec.start_run("DropletTimecourseProcess", "droplet_timecourse"))
+
+    frame = np.zeros((24, 36, 3), dtype=np.uint8)
+    frame[..., 0] = 200
+    frame[..., 2] = 30
+    cap = rec.save_capture_image(frame, role="capture", file_ext="png")
+    rec.finalize_run("completed")
+
+    image_path = run_dir / cap["image_relpath"]
+    assert not image_path.exists()
+    assert (run_dir / "captures" / frame_container_mod.CONTAINER_FILENAME).exists()
+    assert frame_container_mod.image_available(image_path)
+    np.testing.assert_array_equal(frame_container_mod.read_image(image_path), frame[..., ::-1])
+    with frame_container_mod.FrameContainerReader(run_dir / "captures" / frame_container_mod.CONTAINER_FILENAME) as reader:
+        assert reader.capture_indices() == [cap["capture_index"]]
+    meta = json.loads((run_dir / "run_meta.json").read_text(encoding="utf-8"))
+    assert meta["capture_saved_count"] == 1
+
+
 def test_calibration_process_recorder_queues_capture_writes(monkeypatch, tmp_path):
     model = _dummy_model(tmp_path)
     rec = CalibrationProcessRecorder(model)
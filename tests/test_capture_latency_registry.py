@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from CaptureLatencyRegistry import CAPTURE_LATENCY_METRICS, CaptureLatencyRegistry, LatencyHistogram
+
+
+def test_histogram_percentiles_use_rolling_window_and_buckets_keep_lifetime_counts():
+    histogram = LatencyHistogram(window=100)
+    for value in range(1, 201):
+        histogram.record(float(value))
+
+    snapshot = histogram.snapshot()
+
+    window = np.arange(101, 201, dtype=float)
+    assert snapshot["count"] == 200
+    assert snapshot["window_count"] == 100
+    assert snapshot["p50_ms"] == pytest.approx(np.percentile(window, 50))
+    assert snapshot["p99_ms"] == pytest.approx(np.percentile(window, 99))
+    assert snapshot["mean_ms"] == pytest.approx(100.5)
+    assert snapshot["max_ms"] == 200.0
+    assert sum(snapshot["buckets"].values()) == 200
+    assert snapshot["buckets"]["le_1ms"] == 1
+    assert snapshot["buckets"]["le_100ms"] == 50
+    assert snapshot["buckets"]["le_250ms"] == 100
+
+
+def test_registry_snapshot_lists_all_capture_metrics_and_ignores_incomplete_spans():
+    registry = CaptureLatencyRegistry(window=8)
+    registry.record_span("make_array", 0, 2_000_000)
+    registry.record_span("make_array", None, 2_000_000)
+    registry.record_span("selection", 5_000_000, 4_000_000)
+
+    snapshot = registry.snapshot()
+
+    assert set(CAPTURE_LATENCY_METRICS) <= set(snapshot["metrics"])
+    assert snapshot["metrics"]["make_array"]["count"] == 1
+    assert snapshot["metrics"]["make_array"]["p95_ms"] == 2.0
+    assert snapshot["metrics"]["selection"]["count"] == 0
+    assert snapshot["metrics"]["selection"]["p50_ms"] is None
+    assert snapshot["retained_span_count"] == 1
+
+    registry.reset()
+    assert registry.snapshot()["metrics"]["make_array"]["count"] == 0
+
+
+def test_registry_writes_json_and_chrome_trace(tmp_path):
+    registry = CaptureLatencyRegistry(trace_event_limit=2)
+    registry.record_span("trigger_to_edge", 10_000_000, 12_000_000, args={"request_id": "a"})
+    registry.record_span("make_array", 11_000_000, 11_500_000, track="grabber")
+    registry.record_span("selection", 13_000_000, 13_250_000)
+    registry.record_span("trigger_to_result", 14_000_000, 14_500_000)
+
+    histogram_path = registry.write_json(tmp_path / "latency.json")
+    trace_path = registry.write_chrome_trace(tmp_path / "latency_trace.json")
+
+    assert json.loads(histogram_path.read_text(encoding="utf-8"))["metrics"]["trigger_to_edge"]["count"] == 1
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    threads = {event["args"]["name"]: event["tid"] for event in trace["traceEvents"] if event["name"] == "thread_name"}
+    assert [event["name"] for event in spans] == ["make_array", "selection", "trigger_to_result"]
+    assert spans[1]["ts"] - spans[0]["ts"] == pytest.approx(2000.0)
+    assert spans[1]["dur"] == pytest.approx(250.0)
+    assert spans[0]["tid"] == threads["grabber"]
+    assert spans[1]["tid"] == threads["capture"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_registry_keeps_capture_spans_while_idle_grabber_spans_roll_over():
+    registry = CaptureLatencyRegistry(trace_event_limit=4)
+    registry.record_span("trigger_to_edge", 1_000_000, 2_000_000)
+    registry.record_span("selection", 3_000_000, 3_500_000)
+    for index in range(100):
+        start_ns = 10_000_000 + index * 1_000_000
+        registry.record_span("make_array", start_ns, start_ns + 200_000, track="grabber")
+        registry.record_span("signal_mean", start_ns, start_ns + 50_000, track="grabber")
+
+    snapshot = registry.snapshot()
+    trace = registry.chrome_trace()
+
+    assert snapshot["retained_span_counts"] == {"capture": 2, "grabber": 4}
+    assert snapshot["retained_span_count"] == 6
+    assert snapshot["metrics"]["make_array"]["count"] == 100
+    names = [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert names[:2] == ["trigger_to_edge", "selection"]
+    assert names[2:] == ["make_array", "signal_mean"] * 2
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import CommandCoalescer as cc
+import Machine_FreeRTOS as mfr
+
+
+def _machine(test_profile):
+    machine = mfr.Machine(SimpleNamespace(), profile=test_profile)
+    machine._transport_ready = False
+    machine._write_frame = Mock()
+    return machine
+
+
+def test_coalescer_flags_zero_length_moves_and_repeated_targets():
+    coalescer = cc.CommandCoalescer()
+    z_move = SimpleNamespace(command_type="ABSOLUTE_Z", param1=1, param2=35000, param3=30000, status="Added")
+    coalescer.record(z_move)
+
+    assert coalescer.redundant_reason("RELATIVE_X", 1, 0, 30000) == "zero_length_move"
+    assert coalescer.redundant_reason("RELATIVE_X", 1, 5, 30000) is None
+    assert coalescer.redundant_reason("ABSOLUTE_Z", 1, 35000, 30000) == "repeated_move_target"
+    assert coalescer.redundant_reason("ABSOLUTE_Z", 1, 36000, 30000) is None
+
+    coalescer.record(SimpleNamespace(command_type="RELATIVE_Z", param1=1, param2=10, param3=30000))
+    assert coalescer.redundant_reason("ABSOLUTE_Z", 1, 35000, 30000) is None
+
+
+def test_coalescer_forgets_targets_after_cancel_clear_or_unknown_command():
+    coalescer = cc.CommandCoalescer()
+    pressure = SimpleNamespace(command_type="ABSOLUTE_PRESSURE_P", param1=2000, param2=0, param3=0, status="Added")
+    coalescer.record(pressure, generation=0)
+    assert coalescer.redundant_reason("ABSOLUTE_PRESSURE_P", 2000, 0, 0, generation=0) == "setting_matches_target"
+
+    assert coalescer.redundant_reason("ABSOLUTE_PRESSURE_P", 2000, 0, 0, generation=1) is None
+
+    coalescer.record(pressure, generation=1)
+    pressure.status = "Canceled"
+    assert coalescer.redundant_reason("ABSOLUTE_PRESSURE_P", 2000, 0, 0, generation=1) is None
+
+    pressure.status = "Added"
+    coalescer.record(pressure, generation=1)
+    coalescer.record(SimpleNamespace(command_type="HOME_PR_BOTH", param1=0, param2=0, param3=0), generation=1)
+    assert coalescer.redundant_reason("ABSOLUTE_PRESSURE_P", 2000, 0, 0, generation=1) is None
+
+
+def test_dispense_invalidates_pressure_target_but_not_motion():
+    coalescer = cc.CommandCoalescer()
+    coalescer.record(SimpleNamespace(command_type="ABSOLUTE_PRESSURE_P", param1=2000, param2=0, param3=0, status="Added"))
+    coalescer.record(SimpleNamespace(command_type="ABSOLUTE_XY", param1=10, param2=20, param3=30000, status="Added"))
+    coalescer.record(SimpleNamespace(command_type="DISPENSE_PRINT", param1=5, param2=100, param3=0))
+
+    assert coalescer.redundant_reason("ABSOLUTE_PRESSURE_P", 2000, 0, 0) is None
+    assert coalescer.redundant_reason("ABSOLUTE_XY", 10, 20, 30000) == "repeated_move_target"
+
+
+def test_machine_eliminates_repeated_safe_z_and_runs_its_handler_in_order(qapp, test_profile):
+    machine = _machine(test_profile)
+    completed = []
+
+    first = machine.set_absolute_Z(35000, handler=lambda: completed.append("first"))
+    second = machine.set_absolute_Z(35000, handler=lambda: completed.append("second"))
+    zero = machine.set_relative_X(0)
+
+    assert second is first
+    assert zero is first
+    assert len(machine.command_queue.queue) == 1
+    stats = machine.get_command_coalescing_stats()
+    assert stats["eliminated"] == 2
+    assert stats["eliminated_by_reason"] == {"repeated_move_target": 1, "zero_length_move": 1}
+
+    first.mark_as_sent()
+    machine.command_queue.update_command_status(
+        current_executing_command=None,
+        last_completed_command=first.command_number,
+        last_accepted_command=first.command_number,
+        last_retired_command=first.command_number,
+    )
+    assert completed == ["first", "second"]
+
+
+def test_machine_keeps_commands_when_no_pending_anchor_or_trace_metadata(qapp, test_profile):
+    machine = _machine(test_profile)
+
+    assert machine.set_relative_X(0) is not False
+    assert len(machine.command_queue.queue) == 1
+
+    machine.set_absolute_print_pressure(1.0)
+    machine.set_absolute_print_pressure(1.0, trace_metadata={"request_id": "trace-1"})
+    assert len(machine.command_queue.queue) == 3
+
+    machine.command_queue.clear_queue(reset_counter=False)
+    machine.wait_ms(1)
+    machine.set_absolute_print_pressure(1.0)
+    assert [command.command_type for command in machine.command_queue.queue] == ["WAIT", "ABSOLUTE_PRESSURE_P"]
+
+
+def test_machine_coalescing_can_be_disabled(qapp, test_profile):
+    machine = _machine(test_profile)
+    machine.set_command_coalescing_enabled(False)
+
+    machine.set_absolute_Z(35000)
+    machine.set_absolute_Z(35000)
+
+    assert len(machine.command_queue.queue) == 2
+    assert machine.get_command_coalescing_stats()["eliminated"] == 0
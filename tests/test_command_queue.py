@@ -132,6 +132,56 @@ def test_command_queue_marks_canceled_commands_from_retired_frontier(qapp):
     assert [cmd.status for cmd in queue.completed] == ["Completed", "Canceled"]
 
 
+def test_command_queue_status_counts_follow_command_transitions(qapp):
+    queue = mfr.CommandQueue()
+    commands = [queue.add_command("WAIT", 1, 0, 0) for _ in range(6)]
+    for command in commands[:4]:
+        assert queue.get_next_command() is command
+        command.mark_as_sent()
+
+    assert queue.get_inflight_command_count() == 4
+    assert queue.get_next_command() is None
+
+    queue.mark_command_accepted(1)
+    commands[1].mark_as_executing()
+    assert queue.get_status_counts()["Sent"] == 2
+    assert queue.get_status_counts()["Accepted"] == 1
+    assert queue.get_status_counts()["Executing"] == 1
+
+    queue.update_command_status(
+        current_executing_command=3,
+        last_completed_command=2,
+        last_accepted_command=3,
+        last_retired_command=2,
+    )
+    assert [command.command_number for command in queue.queue] == [3, 4, 5, 6]
+    assert queue.get_inflight_command_count() == 2
+    assert queue.get_status_counts()["Completed"] == 0
+    assert queue.get_next_command() is commands[4]
+
+
+def test_command_queue_next_command_rewinds_for_resend_and_gap_repair(qapp):
+    queue = mfr.CommandQueue()
+    queue.max_inflight_commands = 10
+    commands = [queue.add_command("WAIT", 1, 0, 0) for _ in range(5)]
+    for command in commands[:4]:
+        queue.get_next_command().mark_as_sent()
+    assert queue.get_next_command() is commands[4]
+
+    queue.mark_for_gap_repair([3])
+    assert queue.get_next_command() is commands[2]
+    commands[2].mark_as_sent()
+
+    queue.mark_for_resend_from(2)
+    assert queue.get_status_counts()["Added"] == 4
+    assert queue.get_next_command() is commands[1]
+
+    queue.clear_queue()
+    commands[1].mark_as_sent()
+    assert queue.get_status_counts()["Sent"] == 0
+    assert queue.get_next_command() is None
+
+
 def test_machine_dispense_commands_use_configured_frequency(qapp, test_profile):
     model = SimpleNamespace(
         machine_model=SimpleNamespace(get_dispense_frequency_hz=lambda: 10)
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import CommandWindow as cw
+import Machine_FreeRTOS as mfr
+
+
+class ManualClock:
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self):
+        return self.value
+
+
+def _window(**kwargs):
+    return cw.AdaptiveInflightWindow(clock_ns=ManualClock(), **kwargs)
+
+
+def _ack_ms(window, latency_ms, count):
+    changes = []
+    for _ in range(count):
+        change = window.on_ack(int(latency_ms * 1_000_000))
+        if change:
+            changes.append(change)
+    return changes
+
+
+def test_window_without_advertised_cap_keeps_legacy_size():
+    window = _window()
+    window.reset(None)
+
+    assert _ack_ms(window, 2.0, 100) == []
+    assert window.size == cw.DEFAULT_INFLIGHT_WINDOW
+    assert window.cap == cw.DEFAULT_INFLIGHT_WINDOW
+
+
+def test_window_grows_one_slot_per_clean_round_up_to_firmware_cap():
+    window = _window()
+    window.reset(8)
+
+    changes = _ack_ms(window, 2.0, 200)
+
+    assert [change["window"] for change in changes] == [5, 6, 7, 8]
+    assert all(change["reason"] == "ack_clean_round" for change in changes)
+    assert window.size == 8
+    assert window.snapshot()["grow_events"] == 4
+
+
+def test_window_halves_on_resend_and_stops_at_minimum():
+    window = _window()
+    window.reset(16)
+    _ack_ms(window, 2.0, 200)
+    assert window.size == 16
+
+    assert window.on_resend("queue_busy")["window"] == 8
+    assert window.on_resend("ack_timeout")["window"] == 4
+    assert window.on_resend("queue_gap")["window"] == cw.MIN_INFLIGHT_WINDOW
+    assert window.on_resend("queue_gap") is None
+
+
+def test_window_shrinks_when_ack_latency_inflates():
+    window = _window()
+    window.reset(16)
+    _ack_ms(window, 2.0, 40)
+    grown = window.size
+
+    changes = _ack_ms(window, 40.0, 3)
+
+    assert changes[0]["reason"] == "ack_latency_inflated"
+    assert window.size < grown
+
+
+def test_window_growth_waits_for_firmware_queue_headroom():
+    window = _window()
+    window.reset(8)
+    window.on_firmware_queue_depth(7)
+
+    assert _ack_ms(window, 2.0, 50) == []
+
+    window.on_firmware_queue_depth(0)
+    assert _ack_ms(window, 2.0, 4)[0]["window"] == 5
+    assert window.on_firmware_queue_depth(8)["reason"] == "firmware_queue_full"
+
+
+def test_legacy_firmware_queue_depth_keeps_window_at_four():
+    window = _window()
+    window.reset(None)
+
+    assert window.on_firmware_queue_depth(cw.DEFAULT_INFLIGHT_WINDOW) is None
+    assert _ack_ms(window, 2.0, 50) == []
+    assert window.on_firmware_queue_depth(cw.DEFAULT_INFLIGHT_WINDOW + 2) is None
+    assert window.size == cw.DEFAULT_INFLIGHT_WINDOW
+
+
+def test_disabled_window_is_pinned_at_initial_size():
+    window = _window()
+    window.reset(16)
+    _ack_ms(window, 2.0, 100)
+
+    change = window.set_enabled(False)
+
+    assert change["window"] == cw.DEFAULT_INFLIGHT_WINDOW
+    assert _ack_ms(window, 2.0, 100) == []
+    assert window.on_resend("queue_busy") is None
+
+
+def test_machine_applies_hello_cap_and_records_window_changes(qapp, test_profile, tmp_path):
+    machine = mfr.Machine(SimpleNamespace(), profile=test_profile, black_box_log_dir=tmp_path)
+    machine.ser = SimpleNamespace(name="COM_TEST")
+    machine._start_mcu_response_watchdog = lambda: None
+    machine.begin_execution_timer = lambda: None
+    recorded = []
+    machine._record_black_box_event = lambda kind, payload=None: recorded.append((kind, payload))
+
+    machine._on_hello_ack({"capabilities": mfr.REQUIRED_TRANSPORT_CAPS, "max_inflight": 8})
+    machine._tx_paused = False
+    machine._write_frame = Mock()
+    machine._start_ack_wait = lambda *args, **kwargs: None
+    commands = [machine.wait_ms(1) for _ in range(12)]
+    assert machine.command_queue.get_inflight_command_count() == 4
+
+    for command in commands[:4]:
+        machine._on_queue_ack(command.command_number, {"ack_result": "accepted"})
+
+    assert machine.command_window.size == 5
+    assert machine.command_queue.max_inflight_commands == 5
+    assert machine.command_queue.get_inflight_command_count() == 5
+    window_events = [payload for kind, payload in recorded if kind == "command_window_changed"]
+    assert window_events[-1]["window"] == 5
+    assert window_events[-1]["cap"] == 8
+
+    machine._on_queue_ack(commands[4].command_number, {"ack_result": "busy"})
+
+    assert machine.command_queue.max_inflight_commands == 2
+    assert machine._black_box_transport_state()["command_window"]["window"] == 2
+
+
+def test_parse_ack_reads_advertised_max_inflight():
+    payload = bytes([mfr.HELLO_ACK, 0x01, mfr.ACK_TLV_CAPABILITIES, 4, 0x0F, 0, 0, 0, mfr.ACK_TLV_MAX_INFLIGHT, 4, 16, 0, 0, 0])
+
+    ack = mfr.SerialReader._parse_ack(payload)
+
+    assert ack["capabilities"] == 0x0F
+    assert ack["max_inflight"] == 16
@@ -1237,6 +1237,34 @@ def test_print_array_overshoots_first_well_of_next_row_when_enabled():
     assert [call.kwargs["kwargs"]["well_id"] for call in c.print_droplets.call_args_list] == ["A2", "B1"]
 
 
+def test_travel_optimized_row_overshoot_applies_to_backward_row_transition():
+    a1 = FakeWell("A1", 1, {"X": 0, "Y": 0, "Z": 30})
+    a2 = FakeWell("A2", 1, {"X": 10, "Y": 0, "Z": 30})
+    b1 = FakeWell("B1", 1, {"X": 0, "Y": 10, "Z": 30})
+    c = _make_controller(
+        well_plate=FakeWellPlate([a1, a2, b1]),
+        printer_head=_make_printer_head(),
+    )
+    context = {
+        "row_start_overshoot_steps": ROW_START_OVERSHOOT_FOR_TEST,
+        "last_planned_row_num": None,
+        "last_planned_col": None,
+        "well_order_mode": "travel_optimized",
+    }
+
+    Controller._record_last_planned_array_well(c, context, b1)
+    backward = Controller._get_array_row_start_overshoot_coords(c, context, a1, a1.get_coordinates())
+    Controller._record_last_planned_array_well(c, context, a1)
+    same_row = Controller._get_array_row_start_overshoot_coords(c, context, a2, a2.get_coordinates())
+    context["well_order_mode"] = "linear"
+    Controller._record_last_planned_array_well(c, context, b1)
+    linear_backward = Controller._get_array_row_start_overshoot_coords(c, context, a1, a1.get_coordinates())
+
+    assert backward == {"X": -ROW_START_OVERSHOOT_FOR_TEST, "Y": 0, "Z": 30}
+    assert same_row is None
+    assert linear_backward is None
+
+
 def test_print_array_skips_row_overshoot_when_neighbor_coordinates_are_invalid():
     a2 = FakeWell("A2", 1, {"X": 20, "Y": 0, "Z": 30})
     b1 = FakeWell("B1", 1, {"X": 0, "Y": 10, "Z": 40})
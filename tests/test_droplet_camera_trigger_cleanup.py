@@ -1,5 +1,4 @@
 import sys
-from collections import deque
 import threading
 import time
 import types
@@ -9,6 +8,7 @@ import pytest
 
 import Machine_FreeRTOS as machine_mod
 from GravimetricLedger import ImagingEjectionLifecycle
+from FrameSignalRing import FrameSignalRing
 from Machine_FreeRTOS import DropletCamera, StaleCaptureBackend
 
 
@@ -553,7 +553,8 @@ def test_capture_non_blocking_logs_prearm_phases_before_arm():
     camera._cap_id = 7
     camera._cap_request_id = None
     camera._edge_in = _EdgeNoStaleThenFired()
-    camera._buf = [(np.zeros((2, 2, 3), dtype=np.uint8), {}, time.monotonic_ns() - 1_000_000, 1.0)]
+    camera._buf = FrameSignalRing(16)
+    camera._buf.append(time.monotonic_ns() - 1_000_000, 1.0, md={})
     camera.k_sigma = 4.0
     camera.min_delta = 25.0
     camera._cap_emit_rotate = False
@@ -820,7 +821,7 @@ def test_grabber_records_frame_index_and_interval_when_diagnostics_enabled():
     camera = DropletCamera.__new__(DropletCamera)
     camera._grab_running = True
     camera._cv = threading.Condition(threading.Lock())
-    camera._buf = deque(maxlen=16)
+    camera._buf = FrameSignalRing(16)
     camera._cap_active = False
     camera._grabber_frame_index = 0
     camera._last_grabber_frame_done_ns = None
@@ -838,8 +839,8 @@ def test_grabber_records_frame_index_and_interval_when_diagnostics_enabled():
 
     assert camera._grab_running is False
     assert len(camera._buf) == 2
-    first = camera._buf[0][4]
-    second = camera._buf[1][4]
+    first = camera._buf[0][3]
+    second = camera._buf[1][3]
     assert first["frame_index"] == 1
     assert first["selected_frame_interval_ms"] is None
     assert second["frame_index"] == 2
@@ -851,7 +852,7 @@ def test_dual_stream_grabber_releases_non_selected_frame_without_main_conversion
     camera = DropletCamera.__new__(DropletCamera)
     camera._grab_running = True
     camera._cv = threading.Condition(threading.Lock())
-    camera._buf = deque(maxlen=16)
+    camera._buf = FrameSignalRing(16)
     camera._cap_active = False
     camera._grabber_frame_index = 0
     camera._last_grabber_frame_done_ns = None
@@ -869,11 +870,10 @@ def test_dual_stream_grabber_releases_non_selected_frame_without_main_conversion
     assert request.make_array_calls == ["lores"]
     assert request.events == ["make_array:lores", "release"]
     assert request.released is True
-    entry = camera._buf[0]
-    assert entry["arr"] is None
-    assert entry["mean"] == 0.0
-    assert entry["frame_timing"]["detection_stream"] == "lores"
-    assert entry["frame_timing"]["main_converted_for_selected_frame"] is False
+    _md, _t_done_ns, mean, frame_timing = camera._buf[0]
+    assert mean == 0.0
+    assert frame_timing["detection_stream"] == "lores"
+    assert frame_timing["main_converted_for_selected_frame"] is False
     assert DropletCamera.get_capture_profile_state(camera)["fallback_active"] is False
 
 
@@ -881,7 +881,7 @@ def _make_active_dual_grabber_camera():
     camera = DropletCamera.__new__(DropletCamera)
     camera._grab_running = True
     camera._cv = threading.Condition(threading.Lock())
-    camera._buf = deque(maxlen=16)
+    camera._buf = FrameSignalRing(16)
     camera._cap_active = True
     camera._cap_arm_ns = 0
     camera._cap_deadline = time.monotonic() + 1.0
@@ -1025,7 +1025,7 @@ def test_single_stream_grabber_threshold_completes_with_current_main_frame():
     camera = DropletCamera.__new__(DropletCamera)
     camera._grab_running = True
     camera._cv = threading.Condition(threading.Lock())
-    camera._buf = deque(maxlen=16)
+    camera._buf = FrameSignalRing(16)
     camera._cap_active = True
     camera._cap_arm_ns = 0
     camera._cap_deadline = time.monotonic() + 1.0
@@ -1072,11 +1072,60 @@ def test_single_stream_grabber_threshold_completes_with_current_main_frame():
     assert camera._cap_result["detection_stream"] == "main"
 
 
+def test_grabber_records_capture_latency_histograms_without_diagnostics():
+    camera = DropletCamera.__new__(DropletCamera)
+    camera._grab_running = True
+    camera._cv = threading.Condition(threading.Lock())
+    camera._buf = FrameSignalRing(16)
+    camera._cap_active = True
+    camera._cap_arm_ns = 0
+    camera._cap_deadline = time.monotonic() + 1.0
+    camera._cap_max_new = 10
+    camera._cap_seen = 0
+    camera._cap_threshold = 29.0
+    camera._cap_brightest = None
+    camera._cap_emit_rotate = False
+    camera._cap_done = threading.Event()
+    camera._cap_result = None
+    camera._cap_id = 5
+    camera._cap_request_id = "latency-selected"
+    camera._cap_trigger_ns = 500_000
+    camera._cap_ack_ns = 1_000_000
+    camera._cap_ack_frame_index = 0
+    camera._emit_on_complete = False
+    camera._grabber_frame_index = 0
+    camera._last_grabber_frame_done_ns = None
+    camera._stream_main_size = (1456, 1088)
+    camera._stream_main_format = "RGB888"
+    camera._stream_buffer_count = 3
+    camera.exposure_time = 20000
+    camera._configured_frame_duration_us = 20000
+    camera._trigger_low = lambda: None
+    camera._backend_lock = threading.Lock()
+    camera._capture_backend = None
+    camera.image_captured_signal = _Signal()
+    DropletCamera.set_capture_profile(camera, "single_stream_detection")
+    request = _FakeCaptureRequest(np.full((4, 4, 3), 200, dtype=np.uint8), {"ExposureTime": 20000})
+    camera.camera = _FakeRequestCamera(camera, [request])
+
+    DropletCamera._grabber(camera)
+
+    assert DropletCamera.is_capture_performance_diagnostics_enabled(camera) is False
+    assert camera._cap_result["reason"] == "threshold"
+    metrics = DropletCamera.get_capture_latency_snapshot(camera)["metrics"]
+    for name in ("make_array", "signal_mean", "edge_to_frame", "selection", "trigger_to_result"):
+        assert metrics[name]["count"] == 1
+    assert metrics["trigger_to_edge"]["count"] == 0
+    trace = DropletCamera.get_capture_latency_chrome_trace(camera)
+    selection = [event for event in trace["traceEvents"] if event["name"] == "selection"]
+    assert selection[0]["args"] == {"request_id": "latency-selected", "reason": "threshold"}
+
+
 def test_dual_stream_grabber_converts_main_for_selected_threshold_before_release():
     camera = DropletCamera.__new__(DropletCamera)
     camera._grab_running = True
     camera._cv = threading.Condition(threading.Lock())
-    camera._buf = deque(maxlen=16)
+    camera._buf = FrameSignalRing(16)
     camera._cap_active = True
     camera._cap_arm_ns = 0
     camera._cap_deadline = time.monotonic() + 1.0
@@ -1593,7 +1642,8 @@ def test_capture_trigger_pulse_is_clamped_and_reported(monkeypatch):
     camera._cap_id = 7
     camera._cap_request_id = None
     camera._edge_in = _EdgeNoStaleThenFired()
-    camera._buf = [(np.zeros((2, 2, 3), dtype=np.uint8), {}, time.monotonic_ns() - 1_000_000, 1.0)]
+    camera._buf = FrameSignalRing(16)
+    camera._buf.append(time.monotonic_ns() - 1_000_000, 1.0, md={})
     camera.k_sigma = 4.0
     camera.min_delta = 25.0
     camera._cap_emit_rotate = False
@@ -713,6 +713,40 @@ def test_controller_writes_droplet_capture_perf_snapshot(tmp_path):
     }
 
 
+def test_controller_writes_droplet_capture_latency_report(tmp_path):
+    from CaptureLatencyRegistry import CaptureLatencyRegistry
+
+    registry = CaptureLatencyRegistry()
+    registry.record_span("trigger_to_edge", 1_000_000, 3_500_000, args={"request_id": "r1"})
+    controller = Controller.__new__(Controller)
+    controller.model = SimpleNamespace(experiment_model=SimpleNamespace(experiment_dir_path=str(tmp_path)))
+    controller.machine = SimpleNamespace(
+        get_droplet_capture_latency_registry=Mock(return_value=registry),
+        get_droplet_capture_latency_snapshot=Mock(side_effect=registry.snapshot),
+    )
+
+    snapshot = controller.get_droplet_capture_latency_snapshot()
+    paths = controller.write_droplet_capture_latency_report()
+
+    assert snapshot["metrics"]["trigger_to_edge"]["p50_ms"] == 2.5
+    assert paths["histograms"].parent == tmp_path / "calibration_recordings" / "droplet_capture_performance"
+    assert paths["trace"].name.endswith("_trace.json")
+    histograms = json.loads(paths["histograms"].read_text(encoding="utf-8"))
+    assert histograms["metrics"]["trigger_to_edge"]["count"] == 1
+    trace = json.loads(paths["trace"].read_text(encoding="utf-8"))
+    assert [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"] == ["trigger_to_edge"]
+    summaries = controller._droplet_capture_runtime_summaries()
+    assert summaries["droplet_capture_latency"]["kind"] == "capture_latency_histograms"
+
+
+def test_controller_capture_latency_report_is_none_without_camera_registry(tmp_path):
+    controller = Controller.__new__(Controller)
+    controller.machine = SimpleNamespace()
+
+    assert controller.get_droplet_capture_latency_snapshot() is None
+    assert controller.write_droplet_capture_latency_report(tmp_path) is None
+
+
 class _SignalStub:
     def __init__(self):
         self._slots = []
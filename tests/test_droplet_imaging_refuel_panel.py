@@ -1130,7 +1130,7 @@ def test_refuel_panel_updates_from_sample_trace_when_enabled(monkeypatch, qapp):
     dialog, refuel_model, controller = _build_droplet_dialog(monkeypatch, qapp)
 
     dialog.enable_refuel_level_tracking_checkbox.setChecked(True)
-    refuel_model.analysis_thread = SimpleNamespace(
+    refuel_model.last_analysis_result = SimpleNamespace(
         detected_status="visible",
         detected_details={"channel_bounds": [10, 20, 15, 120]},
     )
@@ -1212,7 +1212,7 @@ def test_refuel_level_chart_uses_fixed_fallback_scale_without_channel_height(mon
 
     dialog.enable_refuel_level_tracking_checkbox.setChecked(True)
     for level in (10.0, 45.0, 90.0):
-        refuel_model.analysis_thread = SimpleNamespace(
+        refuel_model.last_analysis_result = SimpleNamespace(
             detected_status="visible",
             detected_details={},
         )
@@ -1233,7 +1233,7 @@ def test_refuel_level_chart_rolls_last_100_samples_without_truncating_trace(monk
 
     dialog.enable_refuel_level_tracking_checkbox.setChecked(True)
     for level in range(105):
-        refuel_model.analysis_thread = SimpleNamespace(
+        refuel_model.last_analysis_result = SimpleNamespace(
             detected_status="visible",
             detected_details={"channel_bounds": [10, 20, 15, 150]},
         )
@@ -1322,7 +1322,7 @@ def test_refuel_monitor_success_timing_shows_after_analysis_result(monkeypatch,
         "monotonic_s": 20.0,
     }
     refuel_model._analysis_timing_context = {"copy_resize_duration_ms": 2.0}
-    refuel_model.analysis_thread = SimpleNamespace(
+    refuel_model.last_analysis_result = SimpleNamespace(
         detector_runtime_ms=4.0,
         detected_status="visible",
     )
@@ -1339,7 +1339,7 @@ def test_refuel_monitor_success_timing_shows_after_analysis_result(monkeypatch,
     assert dialog.refuel_level_timing_label.parent() is None
 
 
-def test_refuel_monitor_tick_skips_when_analysis_in_progress(monkeypatch, qapp):
+def test_refuel_monitor_tick_captures_while_analysis_in_progress(monkeypatch, qapp):
     dialog, refuel_model, controller = _build_droplet_dialog(monkeypatch, qapp)
 
     dialog.enable_refuel_level_tracking_checkbox.setChecked(True)
@@ -1347,13 +1347,10 @@ def test_refuel_monitor_tick_skips_when_analysis_in_progress(monkeypatch, qapp):
     dialog._capture_refuel_monitor_sample()
     qapp.processEvents()
 
-    controller.capture_refuel_image_with_context.assert_not_called()
+    controller.capture_refuel_image_with_context.assert_called_once()
     status = refuel_model.get_refuel_monitor_status()
-    assert status["skipped_captures"] == 1
-    assert status["message"] == "Waiting for refuel analysis"
-    timing = refuel_model.get_refuel_monitor_timing_log()[-1]
-    assert timing["event_kind"] == "skip"
-    assert timing["skip_reason"] == "analysis_in_progress"
+    assert status["skipped_captures"] == 0
+    assert status["attempted_captures"] == 1
     assert dialog.refuel_level_timing_label.parent() is None
 
 
@@ -2035,7 +2032,7 @@ def test_advisory_label_stays_passive_with_only_level_tracking(monkeypatch, qapp
     dialog, refuel_model, _controller = _build_droplet_dialog(monkeypatch, qapp)
 
     dialog.enable_refuel_level_tracking_checkbox.setChecked(True)
-    refuel_model.analysis_thread = SimpleNamespace(
+    refuel_model.last_analysis_result = SimpleNamespace(
         detected_status="empty",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
@@ -2052,7 +2049,7 @@ def test_advisory_label_shows_process_monitor_empty_and_full_guidance(monkeypatc
 
     dialog.enable_refuel_level_tracking_checkbox.setChecked(True)
     dialog.enable_refuel_process_monitoring_checkbox.setChecked(True)
-    refuel_model.analysis_thread = SimpleNamespace(
+    refuel_model.last_analysis_result = SimpleNamespace(
         detected_status="empty",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
@@ -2061,7 +2058,7 @@ def test_advisory_label_shows_process_monitor_empty_and_full_guidance(monkeypatc
 
     assert "empty" in dialog.refuel_level_advisory_label.text()
 
-    refuel_model.analysis_thread = SimpleNamespace(
+    refuel_model.last_analysis_result = SimpleNamespace(
         detected_status="visible",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from tools.stream_analysis import frame_container as mod
+from tools.stream_analysis import nozzle as nozzle_mod
+from tools.stream_analysis.cli import main
+from tests.test_droplet_optics_config import _make_camera
+
+
+def _frame(value: int, shape=(6, 9, 3)) -> np.ndarray:
+    rng = np.random.default_rng(value)
+    return rng.integers(0, 255, size=shape, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("codec", mod.CODECS)
+def test_writer_and_reader_round_trip_by_capture_index_and_name(tmp_path, codec):
+    path = tmp_path / mod.CONTAINER_FILENAME
+    frames = {index: _frame(index) for index in (3, 1, 2)}
+    with mod.FrameContainerWriter(path, codec=codec) as writer:
+        for index, image in frames.items():
+            writer.append(f"frame_{index:06d}.png", image)
+        writer.append("nozzle_overlay.png", _frame(9, shape=(5, 4)), capture_index=-1)
+
+    with mod.FrameContainerReader(path) as reader:
+        assert len(reader) == 4
+        assert reader.capture_indices() == [1, 2, 3]
+        for index, image in frames.items():
+            np.testing.assert_array_equal(reader.read(index, verify=True), image)
+            np.testing.assert_array_equal(reader.read(f"frame_{index:06d}.png"), image)
+        gray = reader.read("nozzle_overlay.png")
+        assert gray.shape == (5, 4)
+        with pytest.raises(KeyError):
+            reader.read(4)
+
+
+def test_reader_recovers_records_missing_from_the_index(tmp_path):
+    path = tmp_path / mod.CONTAINER_FILENAME
+    writer = mod.FrameContainerWriter(path, codec=mod.CODEC_ZLIB, index_flush_every=1)
+    writer.append("frame_000001.png", _frame(1))
+    writer.append("frame_000002.png", _frame(2))
+    writer.close()
+    # Simulate a crash after the second record reached disk but before its index row.
+    index_path = mod.container_index_path(path)
+    first_row = index_path.read_text(encoding="utf-8").splitlines()[0]
+    index_path.write_text(first_row + "\n", encoding="utf-8")
+
+    with mod.FrameContainerReader(path) as reader:
+        assert reader.capture_indices() == [1, 2]
+        np.testing.assert_array_equal(reader.read(2, verify=True), _frame(2))
+
+
+def test_convert_folder_packs_pngs_and_offline_readers_fall_back_to_container(tmp_path):
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    for index in range(1, 4):
+        cv2.imwrite(str(run_dir / f"frame_{index:06d}.png"), _frame(index))
+    cv2.imwrite(str(run_dir / "nozzle_overlay_000001.png"), _frame(7))
+
+    summary = mod.convert_image_folder(run_dir, remove_sources=True)
+
+    assert summary["packed_count"] == 4
+    assert not list(run_dir.glob("*.png"))
+    with mod.FrameContainerReader(summary["container_path"]) as reader:
+        assert reader.capture_indices() == [1, 2, 3]
+        assert reader.entry("nozzle_overlay_000001.png")["capture_index"] is None
+
+    frame_path = run_dir / "frame_000002.png"
+    assert mod.image_available(frame_path)
+    assert not mod.image_available(run_dir / "frame_000009.png")
+    np.testing.assert_array_equal(mod.read_image(frame_path), _frame(2))
+    gray = nozzle_mod._load_gray_image(frame_path)
+    np.testing.assert_array_equal(gray, cv2.cvtColor(_frame(2), cv2.COLOR_BGR2GRAY))
+
+    again = mod.convert_image_folder(run_dir)
+    assert again["packed_count"] == 0
+
+
+def test_cli_pack_frames_reports_each_folder(tmp_path, capsys):
+    cv2.imwrite(str(tmp_path / "frame_000001.png"), _frame(1))
+
+    assert main(["pack-frames", "--folder", str(tmp_path)]) == 0
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["folders"][0]["packed_count"] == 1
+    assert (tmp_path / "frame_000001.png").exists()
+
+
+def test_camera_container_mode_appends_frames_instead_of_image_files(tmp_path, monkeypatch):
+    cam = _make_camera(tmp_path, monkeypatch)
+    run_dir = cam.start_saving(root_dir=str(tmp_path / "captures"), frame_container=True, save_workers=2)
+    frames = [_frame(value, shape=(8, 10, 3)) for value in range(5)]
+    for frame in frames:
+        cam.update_image(frame)
+    cam.stop_saving()
+
+    run_path = Path(run_dir)
+    assert not list(run_path.glob("frame_*.jpg"))
+    rows = [json.loads(line) for line in (run_path / "metadata.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [row["index"] for row in rows] == [1, 2, 3, 4, 5]
+    assert all(row["container"] == mod.CONTAINER_FILENAME for row in rows)
+
+    with mod.FrameContainerReader(run_path / mod.CONTAINER_FILENAME) as reader:
+        assert reader.capture_indices() == [1, 2, 3, 4, 5]
+        np.testing.assert_array_equal(reader.read(4), frames[3])
+    np.testing.assert_array_equal(
+        mod.read_image(run_path / rows[0]["filename"]),
+        cv2.cvtColor(frames[0], cv2.COLOR_RGB2BGR),
+    )
+    stats = json.loads((run_path / "save_stats.json").read_text(encoding="utf-8"))
+    assert stats["container_frames"] == 5
+
+
+def test_camera_container_mode_follows_frame_container_setting(tmp_path, monkeypatch):
+    from CalibrationClasses import Model as calibration_model
+
+    monkeypatch.setenv(calibration_model.FRAME_CONTAINER_ENV, "1")
+    cam = _make_camera(tmp_path, monkeypatch)
+    run_dir = cam.start_saving(root_dir=str(tmp_path / "captures"))
+    cam.update_image(_frame(1, shape=(8, 10, 3)))
+    cam.stop_saving()
+
+    assert (Path(run_dir) / mod.CONTAINER_FILENAME).exists()
+    assert not list(Path(run_dir).glob("frame_*.jpg"))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+import json
+import queue
+import threading
+from pathlib import Path
+
+import numpy as np
+
+import FramePersistence as fp_mod
+from tests.test_droplet_optics_config import _make_camera
+
+
+class _CountingBuffer(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+        self.closed_by_writer = False
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+    def close(self):
+        self.closed_by_writer = True
+
+
+def test_ordered_writer_commits_in_sequence_and_flushes_in_batches():
+    buffer = _CountingBuffer()
+    writer = fp_mod.OrderedJsonlWriter(buffer, flush_every=3, flush_interval_s=60.0)
+
+    writer.commit(2, {"index": 2})
+    writer.commit(3, {"index": 3})
+    assert buffer.getvalue() == ""
+
+    writer.skip(1)
+    writer.commit(5, {"index": 5})
+    writer.commit(4, {"index": 4})
+
+    rows = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert [row["index"] for row in rows] == [2, 3, 4, 5]
+    assert writer.flush_count == buffer.flushes == 1
+
+    writer.commit(7, {"index": 7})
+    writer.close()
+    rows = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert [row["index"] for row in rows] == [2, 3, 4, 5, 7]
+    assert buffer.closed_by_writer
+
+
+def test_frame_save_stats_reports_percentiles_and_high_water():
+    stats = fp_mod.FrameSaveStats()
+    for depth, encode_ms in enumerate(range(1, 101), start=1):
+        stats.record_enqueued(depth % 7, waited=depth == 50)
+        stats.record_saved(float(encode_ms))
+    stats.record_dropped()
+
+    snapshot = stats.snapshot()
+    assert snapshot["saved"] == 100
+    assert snapshot["dropped_frames"] == 1
+    assert snapshot["waited_for_queue_space"] == 1
+    assert snapshot["queue_depth_high_water"] == 6
+    assert snapshot["encode_ms_p95"] == np.percentile(np.arange(1, 101), 95)
+
+
+def test_camera_encoder_pool_keeps_metadata_in_capture_order(tmp_path, monkeypatch):
+    cam = _make_camera(tmp_path, monkeypatch)
+    real_write = fp_mod.write_frame_image
+    order = []
+    lock = threading.Lock()
+
+    def _slow_first_frame(path, image, save_format, **kwargs):
+        # Frame 1 finishes last, so its metadata has to wait for it.
+        if path.endswith("000001.npy"):
+            threading.Event().wait(0.2)
+        real_write(path, image, save_format, **kwargs)
+        with lock:
+            order.append(Path(path).name)
+
+    monkeypatch.setattr("CalibrationClasses.Model.write_frame_image", _slow_first_frame)
+    run_dir = cam.start_saving(root_dir=str(tmp_path / "captures"), image_ext="npy", save_workers=3)
+    frames = [np.full((8, 10, 3), value, dtype=np.uint8) for value in range(12)]
+    for frame in frames:
+        cam.update_image(frame)
+    cam.stop_saving()
+
+    assert order[-1] == "frame_000001.npy"
+    rows = [json.loads(line) for line in (Path(run_dir) / "metadata.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [row["index"] for row in rows] == list(range(1, 13))
+    assert all(row["color_order"] == "rgb" for row in rows)
+    np.testing.assert_array_equal(np.load(Path(run_dir) / "frame_000005.npy"), frames[4])
+
+    stats = json.loads((Path(run_dir) / "save_stats.json").read_text(encoding="utf-8"))
+    assert stats["saved"] == 12
+    assert stats["dropped_frames"] == 0
+    assert stats["save_workers"] == 3
+    assert stats["encode_ms_p95"] is not None
+
+
+def test_camera_counts_frames_dropped_after_waiting_for_queue_space(tmp_path, monkeypatch):
+    cam = _make_camera(tmp_path, monkeypatch)
+    monkeypatch.setattr(cam, "_start_save_thread", lambda: None)
+    cam.start_saving(
+        root_dir=str(tmp_path / "captures"),
+        image_ext="png",
+        png_compression=1,
+        save_queue_size=2,
+        save_put_timeout_s=0.01,
+    )
+    assert isinstance(cam._save_queue, queue.Queue) and cam._save_queue.maxsize == 2
+
+    saved = [cam.save_frame_with_metadata(np.zeros((4, 4, 3), dtype=np.uint8)) for _ in range(3)]
+
+    assert saved[2] is None
+    stats = cam.get_save_stats()
+    assert stats["enqueued"] == 2
+    assert stats["dropped_frames"] == 1
+    assert stats["waited_for_queue_space"] == 0
+    assert stats["queue_depth_high_water"] == 2
+    cam.stop_saving(drain_timeout_s=0.01)
+    assert cam._last_save_stats["dropped_frames"] == 3
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from FrameSignalRing import FrameSignalRing
+
+
+def _reference_baseline(entries, cutoff_ns, n=4):
+    # The deque walk DropletCamera used before the ring buffer.
+    vals = []
+    for t_done_ns, mean in reversed(entries):
+        if t_done_ns < cutoff_ns:
+            vals.append(mean)
+            if len(vals) >= n:
+                break
+    if len(vals) < 2:
+        tail = [mean for t_done_ns, mean in list(entries)[-n:] if t_done_ns < cutoff_ns]
+        vals = tail if tail else [0.0, 0.0]
+    return float(np.mean(vals)), float(np.std(vals))
+
+
+def test_ring_keeps_newest_entries_in_order_after_wrapping():
+    ring = FrameSignalRing(4)
+    for index in range(6):
+        ring.append(1_000 + index, float(index), md={"index": index}, frame_timing={"frame_index": index})
+
+    assert len(ring) == 4
+    assert [ring[i][0]["index"] for i in range(len(ring))] == [2, 3, 4, 5]
+    assert ring[-1] == ({"index": 5}, 1_005, 5.0, {"frame_index": 5})
+    with pytest.raises(IndexError):
+        ring[4]
+
+    ring.clear()
+    assert len(ring) == 0
+    assert ring.baseline_before(10_000) == (0.0, 0.0)
+
+
+def test_ring_baseline_matches_previous_deque_walk():
+    rng = np.random.default_rng(5)
+    ring = FrameSignalRing(16)
+    entries = deque(maxlen=16)
+    t_done_ns = 0
+    for _ in range(40):
+        t_done_ns += int(rng.integers(1, 20))
+        mean = float(rng.normal(30.0, 4.0))
+        ring.append(t_done_ns, mean)
+        entries.append((t_done_ns, mean))
+        for cutoff_ns in (0, t_done_ns - 60, t_done_ns - 5, t_done_ns, t_done_ns + 1):
+            for n in (1, 4, 8):
+                assert ring.baseline_before(cutoff_ns, n) == pytest.approx(_reference_baseline(entries, cutoff_ns, n))
@@ -4,6 +4,7 @@ from collections import deque
 from types import SimpleNamespace
 from unittest.mock import Mock
 
+import HostBlackBoxLog
 import Machine_FreeRTOS as mfr
 
 
@@ -202,6 +203,14 @@ def _with_actionable_host_context(report):
     return enriched
 
 
+def test_recorder_default_log_dir_honors_environment_override(monkeypatch, tmp_path):
+    monkeypatch.setenv(HostBlackBoxLog.LOG_DIR_ENV, str(tmp_path))
+
+    recorder = HostBlackBoxLog.HostBlackBoxRecorder()
+
+    assert recorder.log_dir == tmp_path
+
+
 def test_orchestrator_stack_status_tlvs_decode_with_phase_name():
     payload = bytearray()
     payload.extend([mfr.TAG_ORCH_STACK_HWM, 2])
@@ -701,3 +710,35 @@ def test_mcu_unresponsive_write_failure_still_emits_and_clears(qapp, test_profil
     assert lost_reports[0]["black_box_log_error"] == "disk unavailable"
     assert len(machine.command_queue.queue) == 0
     assert any(event["kind"] == "black_box_log_write_failed" for event in machine.black_box_recorder.recent_events())
+
+
+def test_status_batch_records_every_sample_but_applies_only_latest(qapp, test_profile, tmp_path):
+    machine = _make_machine(qapp, test_profile, tmp_path)
+    applied = []
+    machine.status_updated.connect(applied.append)
+    batch = [
+        {"Current_command": n, "Last_completed": n - 1, "X": n * 10}
+        for n in range(1, 5)
+    ]
+
+    machine.update_status_batch(batch)
+
+    assert [sample["X"] for sample in machine.status_history] == [10, 20, 30, 40]
+    assert machine.get_status_delivery_diagnostics()["received_count"] == 4
+    assert applied == [batch[-1]]
+    assert machine._latest_status_sample["Current_command"] == 4
+
+
+def test_status_batch_applies_older_fault_sample_in_full(qapp, test_profile, tmp_path):
+    machine = _make_machine(qapp, test_profile, tmp_path)
+    applied = []
+    machine.status_updated.connect(applied.append)
+    fault = {"Current_command": 2}
+    machine._detect_xy_motion_fault = lambda data: {"source": "test"} if data is fault else None
+    machine._latch_xy_motion_fault = lambda candidate: dict(candidate)
+    latest = {"Current_command": 3}
+
+    machine.update_status_batch([{"Current_command": 1}, fault, latest])
+
+    assert applied == [fault, latest]
+    assert len(machine.status_history) == 3
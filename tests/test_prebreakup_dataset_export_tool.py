@@ -4,7 +4,11 @@ import csv
 import json
 from pathlib import Path
 
+import cv2
+import numpy as np
+
 from tools import export_prebreakup_dataset as mod
+from tools.stream_analysis import frame_container as frame_container_mod
 
 
 def _write_jsonl(path: Path, rows):
@@ -201,6 +205,23 @@ def test_build_prebreakup_dataset_tables_flattens_and_joins_labels(tmp_path):
     assert str(run_dir) in frame_row["image_abs_path"]
 
 
+def test_build_prebreakup_dataset_tables_finds_images_in_packed_run(tmp_path):
+    exp_dir, run_dir, labels_path = _make_dataset_run(tmp_path)
+    captures_dir = run_dir / "captures"
+    for name in ("background.png", "frame_0001.png", "overlay_0001.png"):
+        cv2.imwrite(str(captures_dir / name), np.zeros((4, 6, 3), dtype=np.uint8))
+    frame_container_mod.convert_image_folder(captures_dir, remove_sources=True)
+    assert not list(captures_dir.glob("*.png"))
+
+    tables = mod.build_prebreakup_dataset_tables(exp_dir, labels_path=labels_path)
+
+    frame_row = tables["frames"][0]
+    assert tables["conditions"][0]["background_image_exists"] is True
+    assert frame_row["image_exists"] is True
+    assert frame_row["background_image_exists"] is True
+    assert frame_row["overlay_image_exists"] is True
+
+
 def test_export_prebreakup_dataset_tables_writes_csvs_and_manifest(tmp_path):
     exp_dir, _run_dir, labels_path = _make_dataset_run(tmp_path)
     out_dir = tmp_path / "exports"
@@ -7,9 +7,11 @@ from unittest.mock import Mock
 
 import cv2
 import numpy as np
+from PySide6.QtCore import QThread
 
 import CalibrationClasses.Model as CalibrationModelModule
-from CalibrationClasses.Model import ImageAnalysisThread, RefuelCameraModel
+from CalibrationClasses.Model import ImageAnalysisThread, RefuelAnalysisWorker, RefuelCameraModel
+from RefuelLevelDetector import RefuelLevelDetector
 
 
 def _build_analysis_view(
@@ -342,7 +344,7 @@ def test_refuel_camera_model_analysis_result_copies_detector_metadata_to_timing_
         "last_meniscus_row_before_analysis": 17,
     }
     model._analysis_timing_context = {"copy_resize_duration_ms": 2.0}
-    model.analysis_thread = SimpleNamespace(
+    model.last_analysis_result = SimpleNamespace(
         detector_runtime_ms=3.0,
         detected_status="visible",
         detected_details={
@@ -864,7 +866,7 @@ def test_refuel_camera_model_advisory_disabled_when_process_monitoring_off():
 def test_refuel_camera_model_advisory_near_empty_from_level_or_status():
     model = RefuelCameraModel()
     model.set_refuel_process_monitoring_enabled(True)
-    model.analysis_thread = SimpleNamespace(
+    model.last_analysis_result = SimpleNamespace(
         detected_status="visible",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
@@ -877,7 +879,7 @@ def test_refuel_camera_model_advisory_near_empty_from_level_or_status():
     assert model.get_sample_trace()[-1]["detector_status"] == "visible"
     assert model.get_sample_trace()[-1]["channel_height_px"] == 100.0
 
-    model.analysis_thread = SimpleNamespace(
+    model.last_analysis_result = SimpleNamespace(
         detected_status="empty",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
@@ -888,14 +890,14 @@ def test_refuel_camera_model_advisory_near_empty_from_level_or_status():
 def test_refuel_camera_model_advisory_near_full_from_status_or_headroom():
     model = RefuelCameraModel()
     model.set_refuel_process_monitoring_enabled(True)
-    model.analysis_thread = SimpleNamespace(
+    model.last_analysis_result = SimpleNamespace(
         detected_status="visible",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
     model.update_ui_with_analysis(None, None, 94.0, 6)
     assert model.get_refuel_advisory()["code"] == "near_full"
 
-    model.analysis_thread = SimpleNamespace(
+    model.last_analysis_result = SimpleNamespace(
         detected_status="full",
         detected_details={"channel_bounds": [10, 20, 15, 100]},
     )
@@ -1663,15 +1665,19 @@ def test_image_analysis_thread_full_fallback_sets_top_row():
     assert thread.level_data == head_rect[3] - 3
 
 
-def test_refuel_camera_model_start_analysis_uses_last_meniscus_row(monkeypatch):
-    captured = {}
+def _wait_for_analysis(model, qapp, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while model.is_analysis_in_progress() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert model.is_analysis_in_progress() is False
 
-    class _SignalStub:
-        def connect(self, fn):
-            captured["connected"] = fn
 
-    class _ThreadStub:
-        def __init__(
+def test_refuel_camera_model_start_analysis_uses_last_meniscus_row(monkeypatch, qapp):
+    captured = {"loaded_by": []}
+
+    class _DetectorStub:
+        def load_frame(
             self,
             image,
             offset,
@@ -1680,32 +1686,51 @@ def test_refuel_camera_model_start_analysis_uses_last_meniscus_row(monkeypatch):
             prominence,
             empty_cutoff,
             last_row,
-            parent=None,
+            *,
             capture_debug=False,
             bottom_guard_px=2,
         ):
+            captured["loaded_by"].append(id(self))
             captured["shape"] = image.shape
             captured["last_row"] = last_row
             captured["bottom_guard_px"] = bottom_guard_px
-            self.analysis_done = _SignalStub()
+            self.original_image = image
+            return self
 
-        def start(self):
+        def run_detection(self):
             captured["started"] = True
+            return self
+
+        def result(self):
+            return SimpleNamespace(
+                original_image=self.original_image,
+                annotated_image=None,
+                level_data=None,
+                meniscus_row=None,
+            )
 
-    monkeypatch.setattr(CalibrationModelModule, "ImageAnalysisThread", _ThreadStub)
+    monkeypatch.setattr(CalibrationModelModule, "RefuelLevelDetector", _DetectorStub)
 
     model = RefuelCameraModel()
     model.last_meniscus_row = 17
     model.level_log = [91]
 
     ok = model.start_analysis(np.zeros((16, 16, 3), dtype=np.uint8))
+    _wait_for_analysis(model, qapp)
+    model.start_analysis(np.zeros((16, 16, 3), dtype=np.uint8))
+    _wait_for_analysis(model, qapp)
+    worker = model._analysis_worker
+    model.shutdown()
 
     assert ok is True
     assert captured["last_row"] == 17
     assert captured["bottom_guard_px"] == 2
     assert captured["shape"] == (640, 640, 3)
     assert captured["started"] is True
+    assert captured["loaded_by"] == [id(worker.detector)] * 2
     assert model.get_raw_capture_image().shape == (16, 16, 3)
+    assert worker.jobs_completed == 2
+    assert worker.isRunning() is False
 
 
 def test_refuel_camera_model_none_frame_is_safe_noop():
@@ -1747,6 +1772,28 @@ def test_refuel_camera_model_build_dataset_analysis_seed_returns_geometry_and_le
         assert 0 <= point[1] < raw_frame.shape[0]
 
 
+def test_refuel_level_detector_reuse_matches_fresh_detection_per_frame():
+    detector = RefuelLevelDetector()
+    frames = []
+    for meniscus_row in (60, 35):
+        analysis_view, _head_rect = _build_analysis_view(meniscus_row=meniscus_row)
+        frames.append(RefuelCameraModel._build_analysis_working_frame(_thread_input_from_analysis_view(analysis_view)))
+
+    reused = []
+    for frame in frames:
+        detector.load_frame(frame, 40, 20, 80, 4, 0.25, None).run_detection()
+        reused.append(detector.result())
+    fresh = [RefuelLevelDetector(frame, 40, 20, 80, 4, 0.25, None).run_detection().result() for frame in frames]
+
+    assert [result.detected_status for result in reused] == ["visible", "visible"]
+    for reused_result, fresh_result in zip(reused, fresh):
+        assert reused_result.level_data == fresh_result.level_data
+        assert reused_result.meniscus_row == fresh_result.meniscus_row
+        assert reused_result.channel_bounds == fresh_result.channel_bounds
+    assert reused[0].meniscus_row != reused[1].meniscus_row
+    assert not isinstance(detector, QThread)
+
+
 def test_refuel_camera_model_lock_target_tracks_setpoint_and_status():
     model = RefuelCameraModel()
     model.current_level = 52.5
@@ -1796,30 +1843,51 @@ def test_refuel_camera_model_invalid_analysis_does_not_append_sample():
     assert model.get_level_log() == []
 
 
-def test_refuel_camera_model_start_analysis_skips_overlap(monkeypatch):
-    started = []
+def test_refuel_analysis_worker_mailbox_keeps_only_latest_job():
+    worker = RefuelAnalysisWorker()
 
-    class _SignalStub:
-        def connect(self, fn):
-            started.append(fn)
+    assert worker.submit({"name": "first"}) is None
+    assert worker.submit({"name": "second"})["name"] == "first"
+    assert worker.has_work() is True
+    assert worker.frames_superseded == 1
+    assert worker._next_job()["name"] == "second"
+    assert worker.stop() is None
 
-    class _ThreadStub:
-        def __init__(self, *args, **kwargs):
-            self.analysis_done = _SignalStub()
-            self.finished = _SignalStub()
 
-        def start(self):
-            started.append("start")
+def test_refuel_camera_model_start_analysis_supersedes_waiting_frame_and_reuses_buffers(monkeypatch):
+    model = RefuelCameraModel()
+    worker = RefuelAnalysisWorker()
+    monkeypatch.setattr(worker, "isRunning", lambda: True)
+    model._analysis_worker = worker
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
 
-    monkeypatch.setattr(CalibrationModelModule, "ImageAnalysisThread", _ThreadStub)
+    first = model.start_analysis(frame, context={**_sample_context(), "refuel_monitor_tick_index": 1})
+    second = model.start_analysis(frame, context={**_sample_context(), "refuel_monitor_tick_index": 2})
 
-    model = RefuelCameraModel()
-    model._analysis_in_progress = True
+    assert first is True and second is True
+    superseded = model.get_refuel_monitor_timing_log()[-1]
+    assert superseded["tick_index"] == 1
+    assert superseded["event_kind"] == "superseded"
+    assert superseded["analysis_superseded_frames"] == 1
+    assert len(model._analysis_frame_buffers) == 1
 
-    ok = model.start_analysis(np.zeros((8, 8, 3), dtype=np.uint8), context=_sample_context())
+    job = worker.run_job(worker._next_job())
+    worker._busy = False
+    model._on_analysis_job_done(job)
 
-    assert ok is False
-    assert started == []
+    timing = model.get_refuel_monitor_timing_log()[-1]
+    assert timing["tick_index"] == 2
+    assert timing["event_kind"] == "sample_result"
+    assert timing["analysis_queue_wait_ms"] >= 0.0
+    assert timing["detector_runtime_ms"] >= 0.0
+    assert model.is_analysis_in_progress() is False
+    pooled = list(model._analysis_frame_buffers)
+    assert len(pooled) == 2
+
+    model.start_analysis(frame, context=_sample_context())
+    assert any(worker._pending_job["frame_buffer"] is buffer for buffer in pooled)
+    assert worker._pending_job["frame"] is worker._pending_job["frame_buffer"]
+    assert job["result"].original_image is not job["frame"]
 
 
 def test_refuel_camera_model_finalize_burst_recommends_pressure_increase():
@@ -599,6 +599,11 @@ def test_camera_flash_benchmark_warmup_excluded_from_counted_summary(monkeypatch
     assert payload["summary"]["flash_detected_cycles"] == 2
     assert payload["summary"]["success_cycles"] == 2
     assert len(payload["cycles"]) == 2
+    latency = payload["capture_latency"]["metrics"]
+    assert latency["trigger_to_edge"]["count"] == 2
+    assert latency["edge_to_frame"]["count"] == 2
+    assert latency["make_array"]["count"] >= 2
+    assert any(event["name"] == "selection" for event in payload["capture_latency_trace"]["traceEvents"])
 
 
 def test_camera_flash_benchmark_min_trigger_period_enforces_start_spacing(monkeypatch):
@@ -0,0 +1,157 @@
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+import SerialFrameCodec as codec
+
+
+VECTORS = json.loads((Path(__file__).parent / "fixtures" / "protocol_vectors.json").read_text())
+
+
+@pytest.mark.parametrize("case", VECTORS["crc_cases"])
+def test_table_crc_matches_protocol_vectors(case):
+    payload = bytes.fromhex(case["payload_hex"])
+    expected_crc = int.from_bytes(bytes.fromhex(case["crc_hex_le"]), byteorder="little")
+
+    assert codec.crc16_x25(payload) == expected_crc
+    assert codec.crc16_x25(memoryview(payload)) == expected_crc
+    assert codec.crc16_x25_bitwise(payload) == expected_crc
+
+
+def test_table_crc_matches_bitwise_reference_and_supports_running_crc():
+    data = bytes(range(256)) * 3
+
+    assert codec.crc16_x25(data) == codec.crc16_x25_bitwise(data)
+    assert codec.crc16_x25(data[100:], codec.crc16_x25(data[:100])) == codec.crc16_x25(data)
+    assert codec.crc16_x25(b"") == codec.CRC16_INIT
+
+
+def test_batch_crc_preserves_order_across_mixed_lengths():
+    payloads = [bytes([i, i + 1, i + 2]) for i in range(40)] + [b"\x02" * 40, b"", b"\xaa"]
+    payloads.insert(5, memoryview(b"\x10\x04\x01\x00\x00\x00"))
+
+    assert codec.crc16_x25_batch(payloads) == [codec.crc16_x25(p) for p in payloads]
+
+
+@pytest.mark.parametrize("case", VECTORS["frame_cases"])
+def test_encode_frame_matches_vectors(case):
+    payload = bytes([case["cmd"], case["seq32"] & 0xFF, 0x10, 4]) + struct.pack("<I", case["seq32"])
+
+    assert codec.encode_frame(payload).hex() == case["frame_hex"]
+
+
+def test_encode_frame_into_writes_at_offset_and_rejects_oversized_payload():
+    buffer = bytearray(codec.MAX_FRAME_LEN + 3)
+
+    written = codec.encode_frame_into(buffer, 3, b"\x01\x02")
+
+    assert written == 6
+    assert bytes(buffer[3:9]) == codec.encode_frame(b"\x01\x02")
+    with pytest.raises(ValueError, match="Payload length exceeds 255 bytes"):
+        codec.encode_frame(b"\x00" * 256)
+
+
+def test_split_frames_returns_valid_payload_views_and_counts_bad_crc():
+    payloads = [bytes([0x02, i, 0x10, 4, i, 0, 0, 0]) for i in range(40)]
+    stream = bytearray(codec.encode_frames(payloads))
+    corrupt_at = len(codec.encode_frame(payloads[0])) * 3 + 4
+    stream[corrupt_at] ^= 0xFF
+    partial = codec.encode_frame(b"\x02\x99")[:-1]
+
+    valid, consumed, rejected = codec.split_frames(bytes(stream) + partial)
+
+    assert [bytes(p) for p in valid] == payloads[:3] + payloads[4:]
+    assert all(isinstance(p, memoryview) for p in valid)
+    assert consumed == len(stream)
+    assert rejected == 1
+
+
+def test_stream_decoder_emits_all_frames_across_split_reads():
+    payloads = [bytes([0x02, i, 0x10, 4, i, 0, 0, 0]) for i in range(5)]
+    stream = bytes(codec.encode_frames(payloads))
+    decoder = codec.StreamFrameDecoder()
+
+    frames = decoder.feed(stream[:7]) + decoder.feed(stream[7:30]) + decoder.feed(stream[30:])
+
+    assert frames == payloads
+    assert decoder.buffered_byte_count == 0
+    assert decoder.stats()["frames_decoded"] == 5
+    assert decoder.stats()["dropped_bytes"] == 0
+    assert decoder.stats()["resync_events"] == 0
+
+
+def test_stream_decoder_resyncs_after_noise_and_corrupted_length():
+    good = [codec.encode_frame(bytes([0xFE, i, 0x10, 4, i, 0, 0, 0])) for i in range(3)]
+    corrupted = bytearray(good[1])
+    corrupted[1] = 0x40  # length byte hit by line noise
+    stream = b"\x00\x13" + good[0] + bytes(corrupted) + good[2] * 6
+    decoder = codec.StreamFrameDecoder()
+
+    # The bogus length first holds the decoder until enough bytes arrive to
+    # disprove it by CRC; scanning then resumes one byte later.
+    frames = decoder.feed(stream)
+
+    assert frames == [good[0][2:-2]] + [good[2][2:-2]] * 6
+    stats = decoder.stats()
+    assert stats["resync_events"] == 2
+    assert stats["crc_failures"] == 1
+    assert stats["dropped_bytes"] == 2 + len(corrupted)
+
+
+_TAG_MAP = {
+    0x01: ("X", 4, True),
+    0x02: ("Pressure_P", 2, False),
+    0x03: ("paused", 1, False),
+}
+
+
+def _tlv(tag: int, raw: bytes) -> bytes:
+    return bytes([tag, len(raw)]) + raw
+
+
+def _status(x: int, pressure: int, *, extra: bytes = b"") -> bytes:
+    return (
+        b"\x02"
+        + _tlv(0x01, struct.pack("<i", x))
+        + _tlv(0x99, b"\x07")
+        + _tlv(0x02, struct.pack("<H", pressure))
+        + extra
+        + _tlv(0x03, b"\x01")
+    )
+
+
+def test_tlv_layout_decoder_matches_walker_and_compiles_fixed_layout():
+    decoder = codec.TlvLayoutDecoder(_TAG_MAP)
+    payloads = [_status(-5 * n, 1000 + n) for n in range(4)]
+
+    decoded = [decoder.decode(payload, 1) for payload in payloads]
+
+    assert decoded == [codec.decode_tlv_fields(payload, _TAG_MAP, 1) for payload in payloads]
+    assert decoded[2] == {"X": -10, "Pressure_P": 1002, "paused": 1}
+    assert decoder.field_names == ("X", "Pressure_P", "paused")
+    assert decoder.stats() == {
+        "compiled_hits": 3,
+        "fallback_decodes": 1,
+        "layout_changes": 0,
+        "field_count": 3,
+    }
+    record = decoder.decode_record(payloads[3], 1)
+    assert (record.X, record.Pressure_P, record.paused) == (-15, 1003, 1)
+
+
+def test_tlv_layout_decoder_falls_back_and_relearns_when_layout_changes():
+    decoder = codec.TlvLayoutDecoder(_TAG_MAP)
+    decoder.decode(_status(1, 2), 1)
+    same_size_other_tags = bytearray(_status(1, 2))
+    same_size_other_tags[7] = 0x98  # unknown tag byte changes, length does not
+    changed = _status(3, 4, extra=_tlv(0x03, b"\x00"))
+
+    assert decoder.decode(bytes(same_size_other_tags), 1) == {"X": 1, "Pressure_P": 2, "paused": 1}
+    assert decoder.decode(changed, 1) == codec.decode_tlv_fields(changed, _TAG_MAP, 1)
+    assert decoder.decode(_status(5, 6), 1) == {"X": 5, "Pressure_P": 6, "paused": 1}
+    assert decoder.stats()["fallback_decodes"] == 4
+    assert decoder.stats()["compiled_hits"] == 0
+    assert decoder.decode(_status(7, 8), 1) == {"X": 7, "Pressure_P": 8, "paused": 1}
+    assert decoder.stats()["compiled_hits"] == 1
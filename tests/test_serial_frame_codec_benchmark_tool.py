@@ -0,0 +1,42 @@
+import importlib.util
+import json
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TOOL_PATH = REPO_ROOT / "tools" / "serial_frame_codec_benchmark.py"
+
+
+def _load_module(path: Path, name: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_serial_frame_codec_benchmark_output_contract(tmp_path):
+    mod = _load_module(TOOL_PATH, "serial_frame_codec_benchmark_tool_mod")
+    payload = mod.run_benchmark(frames=40, status_tlvs=8, batch=16)
+
+    assert payload["schema_version"] == 1
+    assert payload["frames"] == 40
+    assert payload["status_payload_bytes"] == 1 + 8 * 6
+    for key in (
+        "crc_bitwise",
+        "crc_table",
+        "build_concat_bitwise",
+        "build_encode_frame",
+        "build_preallocated",
+        "split_frames_batched",
+        "status_decode_walker",
+        "status_decode_compiled",
+        "status_decode_compiled_record",
+    ):
+        block = payload["results"][key]
+        assert block["frames"] == 40
+        assert block["elapsed_ms"] >= 0.0
+
+    out_path = tmp_path / "codec_benchmark.json"
+    mod.write_json(out_path, payload)
+    assert json.loads(out_path.read_text(encoding="utf-8"))["frames"] == 40
@@ -676,6 +676,7 @@ def test_serial_reader_decodes_queue_ack_result_and_expected_seq32(qapp):
             "ack_result": "gap",
             "expected_seq32": 7,
             "capabilities": None,
+            "max_inflight": None,
         }
     ]
 
@@ -789,3 +790,79 @@ def test_serial_reader_emits_exception_stop_reason(qapp):
             "message": "device disconnected",
         }
     ]
+
+
+class _BulkSerial(FakeSerial):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.read_sizes = []
+
+    @property
+    def in_waiting(self):
+        return len(self._buf)
+
+    def read(self, n: int) -> bytes:
+        self.read_sizes.append(n)
+        return super().read(n)
+
+
+def test_serial_reader_bulk_reads_and_recovers_after_line_noise(qapp):
+    acks_in = [
+        _frame(bytes([mfr.CMD_QUEUE_ACK, seq, mfr.ACK_TLV_SEQ32, 4, seq, 0, 0, 0]))
+        for seq in range(1, 5)
+    ]
+    noisy = bytearray(acks_in[1])
+    noisy[1] = 0x30
+    stream = acks_in[0] + b"\x55\x00" + bytes(noisy) + acks_in[2] + acks_in[3] * 3
+    fake_ser = _BulkSerial(stream)
+    reader = mfr.SerialReader(fake_ser)
+    acks = []
+    reader.ackReceived.connect(acks.append)
+
+    reader.run()
+
+    assert [ack["seq32"] for ack in acks] == [1, 3, 4, 4, 4]
+    assert fake_ser.read_sizes[0] == len(stream)
+    stats = reader.get_rx_stats()
+    assert stats["frames_decoded"] == 5
+    assert stats["resync_events"] == 1
+    assert stats["crc_failures"] == 1
+    assert stats["dropped_bytes"] == 2 + len(noisy)
+    assert stats["read_calls"] == len(fake_ser.read_sizes)
+
+
+def _status_frame(current: int) -> bytes:
+    return _frame(
+        bytes([mfr.CMD_STATUS, mfr.TAG_CURR_CMD, 4, current, 0, 0, 0])
+    )
+
+
+def test_serial_reader_coalesces_status_frames_into_one_batch(qapp):
+    fake_ser = _BulkSerial(b"".join(_status_frame(n) for n in range(1, 6)))
+    reader = mfr.SerialReader(fake_ser)
+    reader.set_status_coalesce_interval_ms(1000)
+    singles = []
+    batches = []
+    reader.status_received.connect(singles.append)
+    reader.status_batch_received.connect(batches.append)
+
+    reader.run()
+
+    assert singles == []
+    assert len(batches) == 1
+    assert [sample["Current_command"] for sample in batches[0]] == [1, 2, 3, 4, 5]
+
+
+def test_serial_reader_emits_each_status_when_coalescing_disabled(qapp):
+    fake_ser = _BulkSerial(b"".join(_status_frame(n) for n in range(1, 4)))
+    reader = mfr.SerialReader(fake_ser)
+    reader.set_status_coalesce_interval_ms(0)
+    singles = []
+    batches = []
+    reader.status_received.connect(singles.append)
+    reader.status_batch_received.connect(batches.append)
+
+    reader.run()
+
+    assert [sample["Current_command"] for sample in singles] == [1, 2, 3]
+    assert batches == []
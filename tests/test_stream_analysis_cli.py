@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import csv
 import json
+import os
+import shutil
 from pathlib import Path
 
 import pytest
@@ -13,6 +15,7 @@ from tools.stream_analysis import silhouette as silhouette_mod
 from tools.stream_analysis import summary as summary_mod
 from tools.stream_analysis import volume as volume_mod
 from tools.stream_analysis import cli
+from tools.stream_analysis.parallel import resolve_worker_count
 from tests.test_stream_analysis_baseline import _make_baseline_experiment
 from tests.test_stream_analysis_dataset import _make_experiment
 from tests.test_stream_analysis_nozzle import (
@@ -214,6 +217,91 @@ def test_cli_nozzle_main_writes_default_outputs(tmp_path, capsys):
     assert payload["run_ids"] == [run_dir.name]
 
 
+def test_cli_nozzle_workers_match_sequential_outputs_and_report_run_times(tmp_path, capsys):
+    exp_dir, run_dir = _make_nozzle_experiment(tmp_path)
+    second_run = run_dir.parent / "run_20260327_230000_deadbeef"
+    shutil.copytree(run_dir, second_run)
+
+    payloads = {}
+    for workers in ("1", "2"):
+        rc = cli.main(
+            [
+                "nozzle",
+                "--experiment-root",
+                str(exp_dir),
+                "--output-root",
+                str(tmp_path / f"out_{workers}"),
+                "--include-unmatched",
+                "--sample-count",
+                "2",
+                "--workers",
+                workers,
+            ]
+        )
+        assert rc == 0
+        payloads[workers] = json.loads(capsys.readouterr().out)
+
+    assert payloads["2"]["run_ids"] == payloads["1"]["run_ids"] == [run_dir.name, second_run.name]
+    assert payloads["2"]["workers"] == 2
+    assert [row["run_id"] for row in payloads["2"]["run_timings"]] == payloads["2"]["run_ids"]
+    assert all(row["wall_time_s"] >= 0.0 for row in payloads["2"]["run_timings"])
+    for run_id in payloads["1"]["run_ids"]:
+        relpath = Path("runs") / run_id / "stage_02_nozzle" / "nozzle_track.csv"
+        assert (tmp_path / "out_2" / relpath).read_bytes() == (tmp_path / "out_1" / relpath).read_bytes()
+
+    written = json.loads((tmp_path / "out_2" / "nozzle_manifest.json").read_text(encoding="utf-8"))
+    assert "run_timings" not in written
+    assert [row["run_id"] for row in written["runs"]] == payloads["1"]["run_ids"]
+
+
+@pytest.mark.parametrize("command", ["nozzle", "volume"])
+def test_cli_prefetch_options_reach_the_nozzle_frame_reader(tmp_path, monkeypatch, capsys, command):
+    exp_dir, _run_dir = _make_nozzle_experiment(tmp_path)
+    seen = []
+    iter_gray_images = nozzle_mod._iter_gray_images
+
+    def _recording_iter_gray_images(paths, **kwargs):
+        seen.append(dict(kwargs))
+        return iter_gray_images(paths, **kwargs)
+
+    monkeypatch.setattr(nozzle_mod, "_iter_gray_images", _recording_iter_gray_images)
+
+    rc = cli.main(
+        [
+            command,
+            "--experiment-root",
+            str(exp_dir),
+            "--include-unmatched",
+            "--no-plots",
+            "--prefetch-depth",
+            "2",
+            "--prefetch-max-mb",
+            "0",
+        ]
+    )
+
+    assert rc == 0
+    capsys.readouterr()
+    assert seen
+    assert all(kwargs == {"prefetch_depth": 2, "prefetch_max_bytes": 0} for kwargs in seen)
+
+
+def test_cli_prefetch_defaults_match_the_nozzle_reader_defaults():
+    args = cli.build_parser().parse_args(["run-all", "--experiment-root", "exp"])
+
+    assert cli._prefetch_options(args) == {
+        "prefetch_depth": nozzle_mod.PREFETCH_DEPTH,
+        "prefetch_max_bytes": nozzle_mod.PREFETCH_MAX_BYTES,
+    }
+
+
+def test_resolve_worker_count_zero_means_one_worker_per_core():
+    assert resolve_worker_count(None, 8) == 1
+    assert resolve_worker_count(0, 64) == min(os.cpu_count() or 1, 64)
+    assert resolve_worker_count(-1, 2) == min(os.cpu_count() or 1, 2)
+    assert resolve_worker_count(4, 2) == 2
+
+
 def test_cli_nozzle_main_auto_selects_fixed_early_from_metadata(tmp_path, capsys):
     exp_dir, run_dir = _make_fixed_early_nozzle_experiment(tmp_path, variant="happy")
 
@@ -701,6 +789,74 @@ def test_cli_summary_main_writes_default_outputs(tmp_path, capsys, monkeypatch):
     assert payload["analyzed_run_count"] == 1
 
 
+def test_cli_run_all_writes_every_stage_from_one_pass_per_run(tmp_path, capsys, monkeypatch):
+    exp_dir, run_dir = _make_silhouette_experiment(tmp_path)
+    stage2_calls = []
+    monkeypatch.setattr(
+        silhouette_mod,
+        "_build_stage2_run",
+        lambda *args, **kwargs: stage2_calls.append(args[0]) or _fake_stage2_run(*args, **kwargs),
+    )
+    common = [
+        "--experiment-root",
+        str(exp_dir),
+        "--sample-count",
+        "3",
+        "--nozzle-guard-px",
+        "2",
+        "--min-component-area-px",
+        "50",
+    ]
+    late_stage = ["--min-steady-frames", "2", "--width-smooth-window", "3", "--tail-persist-frames", "1"]
+
+    for command, extra in (("silhouette", []), ("volume", []), ("fit", late_stage)):
+        assert cli.main([command, *common, "--output-root", str(tmp_path / "separate"), *extra]) == 0
+    capsys.readouterr()
+    stage2_calls.clear()
+
+    decoded = []
+    real_imread = nozzle_mod.cv2.imread
+    monkeypatch.setattr(
+        nozzle_mod.cv2,
+        "imread",
+        lambda path, *args: decoded.append(path) or real_imread(path, *args),
+    )
+    rc = cli.main(["run-all", *common, "--output-root", str(tmp_path / "fused"), *late_stage])
+
+    assert rc == 0
+    assert stage2_calls == [run_dir.name]
+    assert decoded and len(decoded) == len(set(decoded))
+    fused_root = tmp_path / "fused"
+    stage_root = fused_root / "runs" / run_dir.name
+    for relpath in (
+        "stage_02_nozzle/nozzle_track.csv",
+        "stage_02_nozzle/nozzle_manifest.json",
+        "stage_03_silhouette/silhouette_metrics.csv",
+        "stage_04_volume/frame_metrics.csv",
+        "stage_05_fit/fit_manifest.json",
+        "stage_06_summary/run_summary.json",
+    ):
+        assert (stage_root / relpath).exists(), relpath
+    for relpath in (
+        "stage_03_silhouette/silhouette_metrics.csv",
+        "stage_03_silhouette/component_metrics.csv",
+        "stage_03_silhouette/edge_traces.csv",
+        "stage_04_volume/frame_metrics.csv",
+        "stage_04_volume/component_volumes.csv",
+        "stage_05_fit/phase_features.csv",
+    ):
+        separate = tmp_path / "separate" / "runs" / run_dir.name / relpath
+        assert (stage_root / relpath).read_bytes() == separate.read_bytes(), relpath
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["analyzed_run_count"] == 1
+    assert set(payload["stage_manifest_paths"]) == {"nozzle", "silhouette", "volume", "fit"}
+    for manifest_name in ("nozzle", "silhouette", "volume", "fit"):
+        written = json.loads((fused_root / f"{manifest_name}_manifest.json").read_text(encoding="utf-8"))
+        assert written["run_ids"] == [run_dir.name]
+    assert (fused_root / "summary_manifest.json").exists()
+
+
 def test_cli_summary_main_uses_new_late_stage_defaults(tmp_path, capsys, monkeypatch):
     captured = {}
 
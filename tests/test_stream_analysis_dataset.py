@@ -511,3 +511,31 @@ def test_export_stage0_inventory_handles_online_runs_without_timecourse_summary(
     assert rows[online_run.name]["tracking_mode"] == mod.TRACKING_MODE_FIXED_EARLY
     assert rows[online_run.name]["timecourse_emergence_us"] == ""
     assert rows[online_run.name]["timecourse_start_us"] == ""
+
+
+def test_build_stage0_inventory_reuses_cache_and_rescans_only_changed_runs(tmp_path, monkeypatch):
+    exp_dir, matched_run, unmatched_run = _make_experiment(tmp_path)
+    uncached = mod.build_stage0_inventory(exp_dir, include_unmatched=True, use_cache=False)
+    assert not mod.inventory_cache_dir(exp_dir).exists()
+
+    scanned = []
+    real_scan = mod._scan_run_dir
+    monkeypatch.setattr(mod, "_scan_run_dir", lambda run_dir: scanned.append(run_dir.name) or real_scan(run_dir))
+
+    first = mod.build_stage0_inventory(exp_dir, include_unmatched=True)
+    assert sorted(scanned) == sorted([matched_run.name, unmatched_run.name])
+    assert (mod.inventory_cache_dir(exp_dir) / mod.INVENTORY_CACHE_FILENAME).exists()
+
+    scanned.clear()
+    second = mod.build_stage0_inventory(exp_dir, include_unmatched=True)
+    assert scanned == []
+    assert second["selected_runs"] == first["selected_runs"] == uncached["selected_runs"]
+    for run_id in (matched_run.name, unmatched_run.name):
+        assert second["frames_by_run_id"][run_id] == uncached["frames_by_run_id"][run_id]
+
+    with (matched_run / "events.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"event_index": 99, "event_type": "note", "payload": {}}) + "\n")
+    third = mod.build_stage0_inventory(exp_dir, include_unmatched=True)
+    assert scanned == [matched_run.name]
+    matched_row = next(row for row in third["selected_runs"] if row["run_id"] == matched_run.name)
+    assert matched_row["event_row_count"] == uncached["selected_runs"][0]["event_row_count"] + 1
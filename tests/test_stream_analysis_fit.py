@@ -4,6 +4,7 @@ import csv
 import json
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from tools.stream_analysis import fit as mod
@@ -2728,6 +2729,7 @@ def test_export_stage5_fit_writes_expected_outputs(tmp_path, monkeypatch):
 
     def _fake_stage4_run(run_id: str, frame_rows: list[dict], **_kwargs):
         frame_metric_rows = []
+        component_rows = []
         edge_rows = []
         for capture_index in range(1, 9):
             trust_label = (
@@ -2745,15 +2747,24 @@ def test_export_stage5_fit_writes_expected_outputs(tmp_path, monkeypatch):
                 )
             )
             width_px = 74 if capture_index <= 6 else 60
-            edge_rows.extend(_edge_rows_for_capture(capture_index, width_px=width_px))
+            capture_edge_rows = _edge_rows_for_capture(capture_index, width_px=width_px)
+            component_rows.append(
+                {key: capture_edge_rows[0][key] for key in list(capture_edge_rows[0])[:7]}
+            )
+            edge_rows.extend(capture_edge_rows)
         frame_metric_rows[4]["fov_exit_triggered"] = True
         frame_metric_rows[4]["fov_exit_reason"] = fov_mod.FOV_EXIT_REASON_TRIGGER
 
         return {
             "run_id": run_id,
             "metric_rows": [],
-            "component_rows": [],
-            "edge_rows": edge_rows,
+            "component_rows": component_rows,
+            "edge_columns": {
+                "y_px": np.asarray([row["y_px"] for row in edge_rows]),
+                "x_left_px": np.asarray([row["x_left_px"] for row in edge_rows]),
+                "x_right_px": np.asarray([row["x_right_px"] for row in edge_rows]),
+                "component_index": np.asarray([row["capture_index"] - 1 for row in edge_rows]),
+            },
             "shift_events": [],
             "frame_metric_rows": frame_metric_rows,
             "fov_report": {
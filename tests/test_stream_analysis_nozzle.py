@@ -2754,3 +2754,53 @@ def test_export_stage2_nozzle_keeps_dynamic_mode_when_metadata_is_false_or_missi
     )
     inventory_false = dataset_mod.build_stage0_inventory(exp_dir)
     assert inventory_false["selected_runs"][0]["tracking_mode"] == dataset_mod.TRACKING_MODE_DYNAMIC
+
+
+def test_iter_gray_images_prefetch_keeps_order_and_caps_read_ahead(tmp_path, monkeypatch):
+    paths = []
+    for idx in range(7):
+        path = tmp_path / f"frame_{idx}.png"
+        cv2.imwrite(str(path), np.full((40, 50), idx * 20, dtype=np.uint8))
+        paths.append(path)
+
+    loaded = []
+    real_load = mod._load_gray_image
+    monkeypatch.setattr(mod, "_load_gray_image", lambda path: loaded.append(path) or real_load(path))
+
+    images = []
+    loaded_at_yield = []
+    # The byte cap fits one frame, so after the first frame only one is read ahead.
+    for image in mod._iter_gray_images(paths, prefetch_depth=4, prefetch_max_bytes=40 * 50):
+        loaded_at_yield.append(len(loaded))
+        images.append(image)
+
+    assert [int(image[0, 0]) for image in images] == [idx * 20 for idx in range(7)]
+    assert sorted(loaded) == paths
+    assert all(count <= max(4, idx + 1) for idx, count in enumerate(loaded_at_yield))
+
+    synchronous = list(mod._iter_gray_images(paths, prefetch_depth=0))
+    assert all(np.array_equal(a, b) for a, b in zip(synchronous, images))
+
+
+def test_detect_run_raw_rows_matches_with_and_without_prefetch(tmp_path):
+    exp_dir, run_dir = _make_nozzle_experiment(tmp_path)
+    inventory = dataset_mod.build_stage0_inventory(exp_dir)
+    frame_rows = list(inventory["frames_by_run_id"][run_dir.name])
+    params = dict(
+        search_width_frac=0.30,
+        search_top_frac=0.08,
+        search_bottom_frac=0.34,
+        blur_sigma=12.0,
+        residual_scale=2.5,
+        residual_threshold=18,
+        min_area_px=120,
+        top_band_slack_px=14,
+    )
+
+    serial_rows, _serial_diagnostics = mod._detect_run_raw_rows(run_dir.name, frame_rows, prefetch_depth=0, **params)
+    prefetch_rows, _prefetch_diagnostics = mod._detect_run_raw_rows(
+        run_dir.name, frame_rows, prefetch_depth=4, **params
+    )
+
+    assert len(serial_rows) == len(frame_rows)
+    assert prefetch_rows == serial_rows
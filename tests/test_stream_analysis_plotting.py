@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from tools.stream_analysis import fov as fov_mod
+from tools.stream_analysis import plotting as mod
+from tools.stream_analysis import review_cache as review_cache_mod
+from tools.stream_analysis import volume as volume_mod
+
+
+def _frame_metric_rows():
+    return [
+        {
+            "capture_index": index,
+            "delay_from_emergence_us": index * 100,
+            "total_visible_volume_nl": float(index) * 2.5,
+            "volume_trust_label": fov_mod.TRUST_LABEL_TRUSTED,
+        }
+        for index in range(1, 9)
+    ]
+
+
+def _submit_vt_plot(path, run_id):
+    mod.submit_plot(
+        volume_mod._write_vt_plot,
+        path,
+        _frame_metric_rows(),
+        run_id=run_id,
+        fov_report={},
+    )
+
+
+def test_plot_session_pool_renders_in_workers_before_close(tmp_path):
+    paths = [tmp_path / f"run_{index}_Vt.png" for index in range(3)]
+
+    with mod.plot_session(mod.PLOT_MODE_POOL, workers=2) as queue:
+        for index, path in enumerate(paths):
+            _submit_vt_plot(path, f"run_{index}")
+
+    assert all(path.exists() and path.stat().st_size > 0 for path in paths)
+    stats = queue.stats()
+    assert stats["submitted_plot_count"] == 3
+    assert stats["rendered_plot_count"] == 3
+    assert stats["plot_workers"] == 2
+    assert mod.plot_worker_config() is None
+
+
+def test_plot_session_skip_and_deferred_modes(tmp_path):
+    with mod.plot_session(mod.PLOT_MODE_NONE) as queue:
+        _submit_vt_plot(tmp_path / "skipped.png", "run_skip")
+    assert not (tmp_path / "skipped.png").exists()
+    assert queue.stats()["skipped_plot_count"] == 1
+
+    spec_dir = tmp_path / "plot_specs"
+    plot_path = tmp_path / "run_a_Vt.png"
+    sheet_path = tmp_path / "review" / "vt_fit_review_contact_sheet.png"
+    with mod.plot_session(mod.PLOT_MODE_LATER, spec_dir=spec_dir) as queue:
+        _submit_vt_plot(plot_path, "run_a")
+        mod.plot_barrier()
+        mod.submit_plot(
+            review_cache_mod._plot_vt_review_contact_sheet,
+            sheet_path,
+            [{"run_id": "run_a", "plot_path": str(plot_path)}],
+        )
+        assert queue.worker_config() == {"mode": mod.PLOT_MODE_LATER, "spec_dir": str(spec_dir.resolve())}
+
+    assert not plot_path.exists()
+    assert len(list(spec_dir.glob(f"*{mod.PLOT_SPEC_SUFFIX}"))) == 2
+
+    payload = mod.render_plot_specs(spec_dir)
+
+    assert payload["spec_count"] == 2
+    assert payload["wave_count"] == 2
+    assert payload["rendered_plot_count"] == 2
+    assert plot_path.exists()
+    assert sheet_path.exists()
+    assert not list(spec_dir.glob(f"*{mod.PLOT_SPEC_SUFFIX}"))
+
+
+def test_plot_session_draws_local_functions_inline(tmp_path):
+    calls = []
+
+    with mod.plot_session(mod.PLOT_MODE_POOL, workers=2) as queue:
+        mod.submit_plot(lambda path: calls.append(path), tmp_path / "inline.png")
+        assert calls == [tmp_path / "inline.png"]
+
+    assert queue.stats()["rendered_plot_count"] == 1
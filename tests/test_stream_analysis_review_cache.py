@@ -8,6 +8,7 @@ import pytest
 
 from tools.stream_analysis import fit as fit_mod
 from tools.stream_analysis import fov as fov_mod
+from tools.stream_analysis import plotting as plotting_mod
 from tools.stream_analysis import review_cache as mod
 
 
@@ -720,14 +721,7 @@ def test_export_stage5_review_cache_falls_back_to_raw_stage5_builder(tmp_path, m
     assert run_context["source"]["stage5_kwargs"]["width_smooth_window"] == 5
 
 
-def test_export_stage5_cached_review_uses_cache_only_and_excludes_suspect_gravimetric_by_default(
-    tmp_path,
-    monkeypatch,
-):
-    cache_root = tmp_path / "cache"
-    output_root = tmp_path / "review"
-    captured_review_kwargs = []
-
+def _seed_cached_review(tmp_path, monkeypatch, cache_root, captured_review_kwargs):
     suspect_run = _inventory_run(
         "run_suspect",
         print_pw="3000",
@@ -791,6 +785,17 @@ def test_export_stage5_cached_review_uses_cache_only_and_excludes_suspect_gravim
             ),
         )[-1],
     )
+
+
+def test_export_stage5_cached_review_uses_cache_only_and_excludes_suspect_gravimetric_by_default(
+    tmp_path,
+    monkeypatch,
+):
+    cache_root = tmp_path / "cache"
+    output_root = tmp_path / "review"
+    captured_review_kwargs = []
+
+    _seed_cached_review(tmp_path, monkeypatch, cache_root, captured_review_kwargs)
     monkeypatch.setattr(
         mod.fit_mod,
         "_plot_width_trace",
@@ -970,3 +975,132 @@ def test_export_stage5_cached_review_uses_cache_only_and_excludes_suspect_gravim
     assert manifest_payload["outputs"]["condition_consistency_summary_json"].endswith(
         "condition_consistency_summary.json"
     )
+
+
+def test_export_stage5_cached_review_routes_every_plot_through_the_plot_session(tmp_path, monkeypatch):
+    cache_root = tmp_path / "cache"
+    output_root = tmp_path / "review"
+    _seed_cached_review(tmp_path, monkeypatch, cache_root, [])
+
+    def _write_plot(path, *args, **kwargs):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(b"plot")
+
+    for owner, name in (
+        (mod.fit_mod, "_plot_width_trace"),
+        (mod.fit_mod, "_plot_vt_fit"),
+        (mod, "_plot_width_trace_with_gravimetric"),
+        (mod, "_plot_width_review_contact_sheet"),
+        (mod, "_plot_vt_review_contact_sheet"),
+        (mod, "_plot_predicted_vs_gravimetric_cv_by_condition"),
+        (mod, "_plot_predicted_volume_with_uncertainty_by_condition"),
+        (mod.summary_mod, "_plot_partial_vs_gravimetric"),
+        (mod.summary_mod, "_plot_residual_by_condition"),
+        (mod.summary_mod, "_plot_residual_vs_middle_duration"),
+    ):
+        monkeypatch.setattr(owner, name, _write_plot)
+
+    with plotting_mod.plot_session(plotting_mod.PLOT_MODE_NONE) as queue:
+        payload = mod.export_stage5_cached_review(cache_root, output_root=output_root)
+
+    assert payload["selected_run_count"] == 2
+    assert (output_root / "experiment_summary.csv").exists()
+    assert (output_root / "vt_fit_review" / "vt_fit_review_index.csv").exists()
+    assert not list(output_root.rglob("*.png"))
+    assert queue.stats()["skipped_plot_count"] == queue.stats()["submitted_plot_count"] > 0
+
+
+def test_export_stage5_review_cache_reimports_only_runs_whose_inputs_changed(tmp_path, monkeypatch):
+    exp_root = tmp_path / "exp"
+    exp_root.mkdir(parents=True, exist_ok=True)
+    run_rows = [
+        _inventory_run(run_id, print_pw="3000", print_pressure="0.75", rep=rep, mass_print="0.0900")
+        for run_id, rep in [("run_a", "1"), ("run_b", "2")]
+    ]
+    inventory = {
+        "experiment_root": str(exp_root.resolve()),
+        "selected_runs": run_rows,
+        "frames_by_run_id": {row["run_id"]: [{"capture_index": 1}] for row in run_rows},
+    }
+    source_root = tmp_path / "source"
+    cache_root = tmp_path / "cache"
+    for row in run_rows:
+        _write_stage5_source_artifacts(source_root, row["run_id"])
+
+    monkeypatch.setattr(mod, "build_stage0_inventory", lambda *args, **kwargs: inventory)
+    monkeypatch.setattr(mod, "default_output_root", lambda *args, **kwargs: exp_root / "analysis")
+
+    first = mod.export_stage5_review_cache(exp_root, cache_root=cache_root, source_output_root=source_root)
+    second = mod.export_stage5_review_cache(exp_root, cache_root=cache_root, source_output_root=source_root)
+
+    assert first["stage5_import_count"] == 2
+    assert second["stage5_import_count"] == 0
+    assert second["reused_run_count"] == 2
+    assert [row["input_hash"] for row in second["runs"]] == [row["input_hash"] for row in first["runs"]]
+
+    steady_fit_json = source_root / "runs" / "run_b" / fit_mod.FIT_STAGE_DIRNAME / "steady_fit.json"
+    steady_fit = json.loads(steady_fit_json.read_text(encoding="utf-8"))
+    steady_fit["steady_rate_nl_per_us"] = 0.02
+    steady_fit_json.write_text(json.dumps(steady_fit), encoding="utf-8")
+
+    third = mod.export_stage5_review_cache(exp_root, cache_root=cache_root, source_output_root=source_root)
+    run_context = json.loads(
+        (cache_root / "runs" / "run_b" / mod.FIT_CACHE_STAGE_DIRNAME / "run_context.json").read_text(
+            encoding="utf-8"
+        )
+    )
+
+    assert third["stage5_import_count"] == 1
+    assert third["refreshed_run_count"] == 1
+    assert {row["run_id"]: row["cache_status"] for row in third["runs"]} == {
+        "run_a": "reused",
+        "run_b": "refreshed",
+    }
+    assert run_context["frozen_steady_fit"]["steady_rate_nl_per_us"] == 0.02
+
+
+def test_render_cache_and_contact_sheet_reuse_unchanged_plots(tmp_path):
+    import cv2
+    import numpy as np
+
+    from tools.stream_analysis.render_cache import RenderCache
+
+    draws = []
+
+    def _draw(path, value):
+        draws.append(value)
+        cv2.imwrite(str(path), np.full((60, 90, 3), value, dtype=np.uint8))
+
+    plot_a = tmp_path / "run_a.png"
+    plot_b = tmp_path / "run_b.png"
+    cache = RenderCache(tmp_path)
+    cache.render(plot_a, ["plot", 10], _draw, 10)
+    cache.render(plot_b, ["plot", 20], _draw, 20)
+    cache.save()
+
+    cache = RenderCache(tmp_path)
+    cache.render(plot_a, ["plot", 10], _draw, 10)
+    cache.render(plot_b, ["plot", 30], _draw, 30)
+
+    assert draws == [10, 20, 30]
+    assert cache.stats() == {"redrawn_plot_count": 1, "reused_plot_count": 1}
+
+    sheet_path = tmp_path / "review" / "width_trace_review_contact_sheet.png"
+    rows = [
+        {"run_id": "run_a", "print_pressure": 0.75, "print_pw_us": 3000, "plot_path": str(plot_a)},
+        {"run_id": "run_b", "print_pressure": 0.75, "print_pw_us": 3000, "plot_path": str(plot_b)},
+    ]
+    mod._plot_width_review_contact_sheet(sheet_path, rows)
+    thumbnail_dir = sheet_path.parent / mod.REVIEW_THUMBNAIL_DIRNAME
+    first_thumbnails = sorted(path.name for path in thumbnail_dir.iterdir())
+    first_sheet = cv2.imread(str(sheet_path))
+
+    _draw(plot_b, 40)
+    mod._plot_width_review_contact_sheet(sheet_path, rows)
+    second_thumbnails = sorted(path.name for path in thumbnail_dir.iterdir())
+
+    assert len(first_thumbnails) == 2
+    assert len(second_thumbnails) == 2
+    assert first_thumbnails[0] == second_thumbnails[0]
+    assert first_thumbnails[1] != second_thumbnails[1]
+    assert cv2.imread(str(sheet_path)).shape == first_sheet.shape
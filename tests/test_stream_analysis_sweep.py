@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.stream_analysis import annotations as annotations_mod
+from tools.stream_analysis import nozzle as nozzle_mod
+from tools.stream_analysis import sweep as mod
+from tools.stream_analysis.cli import main
+from tests.test_stream_analysis_silhouette import _fake_stage2_run, _make_silhouette_experiment
+
+
+def _write_annotations(exp_dir: Path, output_root: Path, run_id: str):
+    paths = annotations_mod.annotation_paths(exp_dir, output_root=output_root)
+    paths["annotations_csv"].parent.mkdir(parents=True, exist_ok=True)
+    with paths["annotations_csv"].open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(
+            handle,
+            fieldnames=["frame_key", "run_id", "capture_index", "annotation_mode", "annotated_nozzle_x_px", "annotated_nozzle_y_px"],
+        )
+        writer.writeheader()
+        for capture_index, (x_px, y_px) in enumerate([(180.0, 110.0), (180.0, 110.0), (182.0, 112.0)], start=1):
+            writer.writerow(
+                {
+                    "frame_key": annotations_mod._frame_key(run_id, capture_index),
+                    "run_id": run_id,
+                    "capture_index": capture_index,
+                    "annotation_mode": "visible_nozzle_line",
+                    "annotated_nozzle_x_px": x_px,
+                    "annotated_nozzle_y_px": y_px,
+                }
+            )
+
+
+def test_parse_sweep_grid_casts_values_and_rejects_unknown_parameters():
+    grid = mod.parse_sweep_grid(["roi-width-frac=0.30,0.35,0.30", "min_component_area_px=50,120"])
+
+    assert grid == {"roi_width_frac": [0.30, 0.35], "min_component_area_px": [50, 120]}
+    assert len(mod.sweep_combinations(grid)) == 4
+    assert mod.sweep_combinations({})[0]["params"] == mod.SWEEP_DEFAULTS
+    with pytest.raises(ValueError):
+        mod.parse_sweep_grid(["bogus=1,2"])
+    with pytest.raises(ValueError):
+        mod.sweep_combinations(grid, max_combinations=3)
+
+
+def test_parameter_sweep_decodes_once_and_ranks_combinations_against_annotations(tmp_path, monkeypatch):
+    exp_dir, run_dir = _make_silhouette_experiment(tmp_path)
+    out_dir = tmp_path / "analysis" / "stream_characterization"
+    _write_annotations(exp_dir, out_dir, run_dir.name)
+
+    stage2_calls = []
+
+    def _shifted_stage2_run(run_id, frame_rows, **kwargs):
+        stage2_calls.append(kwargs["search_width_frac"])
+        stage2_run = _fake_stage2_run(run_id, frame_rows)
+        offset_px = round((kwargs["search_width_frac"] - 0.22) * 100.0, 6)
+        for row in stage2_run["tracked_rows"]:
+            row["tracked_nozzle_x_px"] += offset_px
+        return stage2_run
+
+    decoded = []
+    real_imread = nozzle_mod.cv2.imread
+    monkeypatch.setattr(mod, "_build_stage2_run", _shifted_stage2_run)
+    monkeypatch.setattr(nozzle_mod.cv2, "imread", lambda path, *args: decoded.append(path) or real_imread(path, *args))
+
+    payload = mod.export_stage3_parameter_sweep(
+        exp_dir,
+        output_root=out_dir,
+        grid={"search_width_frac": [0.22, 0.30], "min_component_area_px": [50, 100000]},
+        combo_workers=2,
+    )
+
+    assert payload["combination_count"] == 4
+    assert len(decoded) == 3
+    assert sorted(stage2_calls) == [0.22, 0.30]
+    assert payload["runs"][0]["nozzle_tracking_pass_count"] == 2
+
+    comparison = payload["comparison"]
+    best = comparison[0]
+    assert best["combo_id"] == payload["best_combo_id"]
+    assert best["search_width_frac"] == 0.22
+    assert best["min_component_area_px"] == 50
+    assert best["distance_median_px"] == pytest.approx(0.0)
+    assert best["ok_frame_rate"] == 1.0
+    assert best["annotation_count"] == 3
+    assert best["mode_match_rate"] == pytest.approx(2.0 / 3.0)
+    assert comparison[-1]["ok_frame_count"] == 0
+    assert [row["rank"] for row in comparison] == [1, 2, 3, 4]
+    shifted = [row for row in comparison if row["search_width_frac"] == 0.30]
+    assert all(row["distance_median_px"] == pytest.approx(8.0) for row in shifted)
+
+    with Path(payload["outputs"]["sweep_comparison_csv"]).open("r", encoding="utf-8", newline="") as handle:
+        csv_rows = list(csv.DictReader(handle))
+    assert [row["combo_id"] for row in csv_rows] == [row["combo_id"] for row in comparison]
+    with Path(payload["outputs"]["sweep_run_results_csv"]).open("r", encoding="utf-8", newline="") as handle:
+        assert len(list(csv.DictReader(handle))) == 4
+    manifest = json.loads(Path(payload["manifest_path"]).read_text(encoding="utf-8"))
+    assert manifest["grid"] == {"search_width_frac": [0.22, 0.30], "min_component_area_px": [50, 100000]}
+
+
+def test_cli_sweep_rejects_malformed_parameter(capsys):
+    with pytest.raises(SystemExit):
+        main(["sweep", "--experiment-root", "missing", "--param", "roi_width_frac"])
+    assert "name=v1,v2" in capsys.readouterr().err
@@ -5,9 +5,11 @@ import json
 import math
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from tools.stream_analysis import fov as fov_mod
+from tools.stream_analysis import silhouette as silhouette_mod
 from tools.stream_analysis import volume as mod
 from tests.test_stream_analysis_silhouette import _fake_stage2_run, _make_silhouette_experiment
 
@@ -163,6 +165,45 @@ def test_component_volume_rows_sum_when_components_overlap_in_y():
     )
 
 
+def test_component_volume_rows_from_edge_columns_match_row_dicts():
+    frame_row = {"run_id": "run_a", "capture_id": "cap_001", "capture_index": 1, "flash_delay_us": 4750}
+    roi = {"x0": 40, "y0": 90}
+    masks = [np.zeros((30, 40), dtype=np.uint8) for _ in range(2)]
+    masks[0][2:20, 5:15] = 255
+    masks[0][8, 3] = 255
+    masks[1][22:28, 24:30] = 255
+    component_rows = []
+    edge_rows = []
+    edge_columns = []
+    for index, mask in enumerate(masks):
+        component_id = "attached_primary" if index == 0 else "detached_01"
+        columns = silhouette_mod._edge_trace_columns(mask, roi)
+        component_rows.append({**frame_row, "component_id": component_id, "component_rank": index})
+        edge_rows.extend(
+            silhouette_mod._edge_rows_from_columns(
+                columns,
+                frame_row,
+                component_id=component_id,
+                component_role="attached_primary" if index == 0 else "detached_accepted",
+                component_rank=index,
+            )
+        )
+        edge_columns.append(dict(columns, component_index=np.full(len(columns["y_px"]), index)))
+
+    from_rows = mod._component_volume_rows(component_rows, edge_rows, pixel_size_um=2.0)
+    from_columns = mod._component_volume_rows(
+        component_rows,
+        [],
+        pixel_size_um=2.0,
+        edge_columns=silhouette_mod._concat_edge_columns(edge_columns),
+    )
+
+    assert [row["component_volume_nl"] for row in from_columns] == [
+        row["component_volume_nl"] for row in from_rows
+    ]
+    assert edge_rows[6]["x_left_px"] == 43 and edge_rows[6]["width_px"] == 12
+
+
 def test_frame_metric_rows_keep_plausible_unaccepted_volume_out_of_total_visible_volume():
     stage3_rows = [
         {
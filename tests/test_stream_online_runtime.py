@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 
+import cv2
 import numpy as np
 import pytest
 
 from tools.stream_analysis import online_runtime as mod
+from tools.stream_analysis import silhouette as silhouette_mod
 
 
 NOZZLE_CENTER_PX = (110, 60)
@@ -100,26 +102,23 @@ def _edge_rows_from_width_fn(*, y_start: int, y_end: int, width_fn, center_x_px:
 
 
 def _component_from_mask(mask: np.ndarray, *, component_id: str, anchor_center_x_px: float):
-    edge_rows = []
     occupied_rows = np.flatnonzero(np.any(mask > 0, axis=1))
-    for y_local in occupied_rows.tolist():
-        x_indices = np.flatnonzero(mask[y_local] > 0)
-        edge_rows.append(
-            {
-                "y_px": int(50 + y_local),
-                "x_left_px": float(100 + int(x_indices[0])),
-                "x_right_px": float(100 + int(x_indices[-1])),
-                "width_px": float(int(x_indices[-1]) - int(x_indices[0])),
-                "center_x_px": float(100 + ((int(x_indices[0]) + int(x_indices[-1])) / 2.0)),
-            }
-        )
-    return {
+    x_left = [int(np.flatnonzero(mask[y_local] > 0)[0]) for y_local in occupied_rows.tolist()]
+    x_right = [int(np.flatnonzero(mask[y_local] > 0)[-1]) for y_local in occupied_rows.tolist()]
+    component = {
         "component_id": str(component_id),
         "component_role": "detached_accepted",
         "anchor_center_x_px": float(anchor_center_x_px),
         "final_mask": mask,
-        "edge_rows": edge_rows,
+        "component_row": {"component_id": str(component_id), "component_role": "detached_accepted"},
+        "edge_columns": {
+            "y_px": (50 + occupied_rows).astype(np.int64),
+            "x_left_px": 100 + np.asarray(x_left, dtype=np.int64),
+            "x_right_px": 100 + np.asarray(x_right, dtype=np.int64),
+        },
     }
+    component["edge_rows"] = silhouette_mod._component_edge_rows(component)
+    return component
 
 
 def test_analyze_online_stream_frame_returns_measurement_for_valid_attached_stream():
@@ -1574,3 +1573,47 @@ def test_online_runtime_summary_is_json_serializable():
 
     assert isinstance(encoded, str)
     assert "measurement_qc_pass" in encoded
+
+
+def test_analyze_online_stream_frame_color_fast_path_matches_full_gray_conversion():
+    frame = np.full((480, 900, 3), 230, dtype=np.uint8)
+    frame[62:300, 430:470] = 20
+    # Dark clutter far outside the nozzle-anchored window must not matter.
+    frame[:, 20:60] = 0
+    kwargs = {
+        "background_image": None,
+        "nozzle_center_px": (450, 60),
+        "delay_us": 4050,
+        "emergence_time_us": 3200,
+        "analysis_config": None,
+    }
+
+    fast = mod.analyze_online_stream_frame(frame_image=frame, frame_color_order="rgb", **kwargs)
+    full_gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    reference = mod.analyze_online_stream_frame(frame_image=full_gray, **kwargs)
+
+    timing_keys = {"substage_timings_ms", "frame_budget_ms", "frame_budget_exceeded"}
+    fast_summary = {key: value for key, value in fast["summary"].items() if key not in timing_keys}
+    reference_summary = {key: value for key, value in reference["summary"].items() if key not in timing_keys}
+    assert fast_summary["status"] == "accepted"
+    assert fast_summary == reference_summary
+
+    timings = fast["summary"]["substage_timings_ms"]
+    assert set(timings) == {"gray_ms", "stage3_ms", "stage4_ms", "summary_ms", "overlay_ms", "total_ms"}
+    assert timings["total_ms"] == pytest.approx(sum(value for key, value in timings.items() if key != "total_ms"), abs=0.01)
+    assert fast["summary"]["frame_budget_ms"] == mod.ONLINE_FRAME_BUDGET_MS
+    assert fast["summary"]["frame_budget_exceeded"] is (timings["total_ms"] > mod.ONLINE_FRAME_BUDGET_MS)
+
+
+def test_analysis_gray_frame_converts_only_the_adaptive_roi_window():
+    frame = np.random.default_rng(3).integers(0, 255, size=(200, 600, 3), dtype=np.uint8)
+    config = mod._resolved_analysis_config({"adaptive_roi_max_expansion_px": 40})
+
+    gray = mod._analysis_gray_frame(frame, color_order="bgr", tracked_x_px=300.0, config=config)
+
+    # 0.35 * 600 = 210 px wide ROI centred on x=300, widened by 40 px each side.
+    expected = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    assert gray.shape == (200, 600)
+    assert np.array_equal(gray[20:200, 155:405], expected[20:200, 155:405])
+    again = mod._analysis_gray_frame(frame, color_order="bgr", tracked_x_px=300.0, config=config)
+    assert again is gray
@@ -0,0 +1,170 @@
+import json
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import WellPathPlanner as wpp
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _grid(rows, cols, pitch=900, keep=None):
+    points = []
+    for r in range(rows):
+        for c in range(cols):
+            if keep is None or keep(r, c):
+                points.append({"X": c * pitch, "Y": r * pitch, "Z": 0})
+    return points
+
+
+def test_travel_order_visits_every_point_once_and_beats_serpentine_on_sparse_plate():
+    rng = random.Random(7)
+    points = _grid(16, 24, keep=lambda r, c: rng.random() < 0.2)
+
+    order = wpp.plan_travel_order(points)
+    report = wpp.compare_orders(points, order, list(range(len(points))))
+
+    assert sorted(order) == list(range(len(points)))
+    assert order[0] == 0
+    assert report["planned"]["moves"] == len(points) - 1
+    assert report["planned"]["distance_steps"] < report["serpentine"]["distance_steps"]
+    assert report["planned"]["time_s"] < report["serpentine"]["time_s"]
+    assert report["distance_saved_pct"] > 0.0
+
+
+def test_travel_order_keeps_requested_start_and_handles_tiny_inputs():
+    assert wpp.plan_travel_order([]) == []
+    assert wpp.plan_travel_order([{"X": 5, "Y": 5, "Z": 0}]) == [0]
+
+    points = _grid(1, 6)
+    order = wpp.plan_travel_order(points, start=3)
+
+    assert order[0] == 3
+    assert sorted(order) == list(range(6))
+
+
+def test_blocked_edge_mask_only_flags_segments_through_obstacle_at_print_height():
+    points = [
+        {"X": 0, "Y": -500, "Z": 0},
+        {"X": 0, "Y": 500, "Z": 0},
+        {"X": 500, "Y": -500, "Z": 0},
+    ]
+    wall = {"corner1": {"X": -100, "Y": -100, "Z": -10}, "corner2": {"X": 100, "Y": 100, "Z": 10}}
+    high_wall = {"corner1": {"X": -100, "Y": -100, "Z": 50}, "corner2": {"X": 100, "Y": 100, "Z": 60}}
+
+    mask = wpp.blocked_edge_mask(points, [wall])
+
+    assert mask[0, 1] and mask[1, 0]
+    assert not mask[0, 2]
+    assert not wpp.blocked_edge_mask(points, [high_wall]).any()
+
+
+def test_travel_order_routes_around_obstacle_when_a_detour_exists():
+    # Two columns separated by a wall with a gap at the top row.
+    points = [{"X": x, "Y": y, "Z": 0} for x in (0, 2000) for y in (0, 900, 1800, 2700)]
+    wall = {"corner1": {"X": 900, "Y": -100, "Z": -10}, "corner2": {"X": 1100, "Y": 2000, "Z": 10}}
+
+    order = wpp.plan_travel_order(points, obstacles=[wall])
+    report = wpp.estimate_path(points, order, obstacles=[wall])
+
+    assert sorted(order) == list(range(len(points)))
+    assert report["blocked_moves"] == 0
+
+
+def test_normalize_well_order_mode_falls_back_to_default():
+    assert wpp.normalize_well_order_mode("Travel Optimized") == wpp.WELL_ORDER_TRAVEL_OPTIMIZED
+    assert wpp.normalize_well_order_mode("linear") == wpp.WELL_ORDER_LINEAR
+    assert wpp.normalize_well_order_mode(None) == wpp.WELL_ORDER_SERPENTINE
+    assert wpp.normalize_well_order_mode("bogus", default=wpp.WELL_ORDER_LINEAR) == wpp.WELL_ORDER_LINEAR
+
+
+@pytest.fixture
+def well_plate(qapp, tmp_path):
+    from Model import WellPlate
+
+    plates_src = REPO_ROOT / "FreeRTOS-interface" / "Presets" / "Plates.json"
+    plates_data = json.loads(plates_src.read_text(encoding="utf-8"))
+    plates_tmp = tmp_path / "Plates.json"
+    plates_tmp.write_text(json.dumps(plates_data), encoding="utf-8")
+    return WellPlate(plates_data, str(plates_tmp))
+
+
+def _assign_fake_reaction(well, targets):
+    well.assigned_reaction = SimpleNamespace(
+        get_target_droplets_for_stock=lambda stock_id: targets.get(stock_id, 0),
+        get_remaining_droplets_for_stock=lambda stock_id: targets.get(stock_id, 0),
+    )
+
+
+def test_well_plate_travel_order_filters_by_stock_and_caches_the_tour(well_plate, monkeypatch):
+    rng = random.Random(3)
+    stock_a_ids = set()
+    for well in well_plate.wells.values():
+        if rng.random() < 0.25:
+            stock_a_ids.add(well.well_id)
+            _assign_fake_reaction(well, {"stock-a": 2, "stock-b": 1})
+        else:
+            _assign_fake_reaction(well, {"stock-b": 1})
+
+    serpentine = well_plate.get_all_wells_with_reactions(fill_by="rows", stock_id="stock-a")
+    planned = well_plate.get_all_wells_with_reactions(
+        fill_by="rows", order="travel_optimized", stock_id="stock-a"
+    )
+
+    assert {well.well_id for well in planned} == stock_a_ids
+    assert planned[0] is serpentine[0]
+
+    calls = []
+    real_plan = wpp.plan_travel_order
+    import Model
+
+    monkeypatch.setattr(Model, "plan_travel_order", lambda *a, **k: calls.append(1) or real_plan(*a, **k))
+    again = well_plate.get_all_wells_with_reactions(
+        fill_by="rows", order="travel_optimized", stock_id="stock-a"
+    )
+    assert [well.well_id for well in again] == [well.well_id for well in planned]
+    assert calls == []
+
+    report = well_plate.estimate_well_order_travel(stock_id="stock-a", fill_by="rows")
+    assert report["well_count"] == len(stock_a_ids)
+    assert report["planned"]["distance_steps"] < report["serpentine"]["distance_steps"]
+
+
+def test_well_plate_travel_order_falls_back_to_zigzag_without_coordinates(well_plate):
+    for well_id in ("A1", "A2", "B1", "B2"):
+        well = well_plate.get_well(well_id)
+        _assign_fake_reaction(well, {"stock-a": 1})
+    well_plate.get_well("B2").coordinates = None
+
+    planned = well_plate.get_all_wells_with_reactions(
+        fill_by="rows", order="travel_optimized", stock_id="stock-a"
+    )
+
+    assert [well.well_id for well in planned] == ["A1", "A2", "B2", "B1"]
+    assert well_plate.estimate_well_order_travel(stock_id="stock-a") is None
+
+
+def test_controller_uses_experiment_well_order_mode_for_remaining_wells(well_plate):
+    from Controller import Controller
+
+    for well_id in ("A1", "A24", "B1", "P24"):
+        _assign_fake_reaction(well_plate.get_well(well_id), {"stock-a": 1})
+    experiment = SimpleNamespace(get_well_order_mode=lambda: "serpentine")
+    c = Controller.__new__(Controller)
+    c.model = SimpleNamespace(
+        well_plate=well_plate,
+        experiment_model=experiment,
+        location_model=SimpleNamespace(get_obstacles=lambda: []),
+    )
+
+    serpentine_ids = [well.well_id for well in c._get_array_remaining_wells("stock-a")]
+    experiment.get_well_order_mode = lambda: "travel_optimized"
+    travel_ids = [well.well_id for well in c._get_array_remaining_wells("stock-a")]
+    report = c.estimate_array_well_order_travel("stock-a")
+
+    assert serpentine_ids == ["A1", "A24", "B1", "P24"]
+    assert travel_ids == ["A1", "B1", "A24", "P24"]
+    assert report["planned"]["distance_steps"] < report["serpentine"]["distance_steps"]
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
+import platform
 import sys
 import time
+import tracemalloc
 
 import cv2
 import numpy as np
@@ -17,7 +20,30 @@ if str(REPO_ROOT) not in sys.path:
 if str(UI_DIR) not in sys.path:
     sys.path.insert(0, str(UI_DIR))
 
-from CalibrationClasses.Model import DropletCameraModel
+from CalibrationClasses.Model import DropletCameraModel  # noqa: E402
+from RefuelLevelDetector import RefuelLevelDetector  # noqa: E402
+from tools.replay_calibration_run import _load_image_rgb, _load_jsonl  # noqa: E402
+
+
+REPLAY_SCHEMA_VERSION = 1
+REPLAY_ANALYZERS = (
+    "identify_nozzle",
+    "calc_emergence_area",
+    "analyze_prebreakup_morphology",
+    "identify_droplet_contour",
+    "characterize_droplet",
+    "classify_fill_state",
+)
+DROPLET_ANALYZERS = REPLAY_ANALYZERS[:-1]
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
+CHECKLIST_ROOT = UI_DIR / "CalibrationClasses" / "test_images"
+DEFAULT_MAX_REGRESSION_PCT = 25.0
+# Refuel thread defaults from RefuelCameraModel.
+REFUEL_OFFSET = 40
+REFUEL_WIDTH = 20
+REFUEL_THRESHOLD = 60
+REFUEL_PROMINENCE = 4
+REFUEL_EMPTY_CUTOFF = 0.25
 
 
 def _camera_stub():
@@ -125,6 +151,321 @@ def run_benchmark(*, iterations=50, width=420, height=420, seed=7):
     }
 
 
+def _synthetic_replay_pair(rng, width, height):
+    bg = rng.integers(196, 206, size=(height, width, 3), dtype=np.uint8)
+    nozzle_x = int(width // 2 + rng.integers(-width // 10, width // 10 + 1))
+    nozzle_w = max(8, width // 16)
+    nozzle_h = max(12, height // 10)
+    bg[:nozzle_h, nozzle_x - nozzle_w // 2 : nozzle_x + nozzle_w // 2] = 40
+    img = bg.copy()
+
+    protrusion = int(rng.integers(height // 12, height // 4))
+    axes = (max(3, nozzle_w // 3), max(4, protrusion // 2))
+    cv2.ellipse(img, (nozzle_x, nozzle_h + axes[1]), axes, 0, 0, 360, (45, 45, 45), -1)
+    if rng.random() < 0.6:
+        cy = int(nozzle_h + protrusion + rng.integers(height // 10, height // 4))
+        r = int(rng.integers(max(4, width // 60), max(6, width // 30)))
+        cv2.circle(img, (nozzle_x + int(rng.integers(-4, 5)), min(height - r - 1, cy)), r, (50, 50, 50), -1)
+    return bg, img
+
+
+def _synthetic_refuel_frame(rng, width, height):
+    # Analysis view (head upright), rotated the way the refuel camera delivers it.
+    view = np.zeros((height, width, 3), dtype=np.uint8)
+    head_w = max(60, width // 5)
+    head_h = max(100, (3 * height) // 8)
+    x = int(width // 3 + rng.integers(-width // 16, width // 16 + 1))
+    y = int(height // 6)
+    view[y : y + head_h, x : x + head_w] = 160
+    x0 = x + REFUEL_OFFSET
+    channel = view[y : y + head_h, x0 : x0 + REFUEL_WIDTH]
+    meniscus = int(rng.integers(head_h // 8, (7 * head_h) // 8))
+    channel[:meniscus] = 40
+    channel[meniscus:] = 220
+    ref_x0 = x0 + REFUEL_WIDTH + 5
+    view[y : y + head_h, ref_x0 : ref_x0 + REFUEL_WIDTH] = 220
+    return cv2.rotate(view, cv2.ROTATE_90_CLOCKWISE)
+
+
+def synthetic_replay_corpus(*, frames=24, width=640, height=480, seed=7):
+    rng = np.random.default_rng(int(seed))
+    pairs = [_synthetic_replay_pair(rng, int(width), int(height)) for _ in range(int(frames))]
+    refuel_frames = [_synthetic_refuel_frame(rng, int(width), int(height)) for _ in range(int(frames))]
+    return {
+        "source": {
+            "kind": "synthetic",
+            "seed": int(seed),
+            "frames": int(frames),
+            "image_size": {"width": int(width), "height": int(height)},
+        },
+        "droplet_pairs": pairs,
+        "refuel_frames": refuel_frames,
+    }
+
+
+def _run_capture_paths(run_dir):
+    captures_dir = Path(run_dir) / "captures"
+    if not captures_dir.is_dir():
+        return []
+    return sorted(p for p in captures_dir.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def _pairs_from_roles(paths_with_roles):
+    # Each non-background capture is paired with the most recent background before it.
+    pairs = []
+    background = None
+    for path, role in paths_with_roles:
+        if "background" in str(role).lower():
+            background = path
+        elif background is not None:
+            pairs.append((background, path))
+    return pairs
+
+
+def _checklist_pairs(root):
+    pairs = []
+    for records_path in sorted(Path(root).rglob("records.jsonl")):
+        session_dir = records_path.parent
+        rows = [row for row in _load_jsonl(records_path) if row.get("type") == "capture"]
+        by_row = {}
+        for row in rows:
+            relpath = str(row.get("image_relpath") or "").strip()
+            if relpath:
+                by_row.setdefault(str(row.get("row_key") or ""), []).append(
+                    (session_dir / relpath, str(row.get("capture_role") or ""))
+                )
+        for row_captures in by_row.values():
+            pairs.extend(_pairs_from_roles(row_captures))
+    return pairs
+
+
+def collect_replay_corpus(roots, *, limit=200, include_checklist=True):
+    # Recorded calibration runs (run_meta.json + captures/) under each root; refuel
+    # runs feed classify_fill_state, everything else feeds the droplet analyzers.
+    pair_paths = []
+    refuel_paths = []
+    run_count = 0
+    for root in roots or ():
+        for meta_path in sorted(Path(root).rglob("run_meta.json")):
+            try:
+                run_meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            run_count += 1
+            captures = _run_capture_paths(meta_path.parent)
+            if str(run_meta.get("process_name") or "").startswith("Refuel"):
+                refuel_paths.extend(captures)
+            else:
+                roles = [(path, path.stem.split("_", 2)[-1]) for path in captures]
+                pair_paths.extend(_pairs_from_roles(roles))
+    if include_checklist and CHECKLIST_ROOT.is_dir():
+        pair_paths.extend(_checklist_pairs(CHECKLIST_ROOT))
+
+    pairs = []
+    for bg_path, img_path in pair_paths[: int(limit)]:
+        bg = _load_image_rgb(bg_path)
+        img = _load_image_rgb(img_path)
+        if bg is not None and img is not None and bg.shape == img.shape and img.ndim == 3:
+            pairs.append((bg[..., :3], img[..., :3]))
+    refuel_frames = []
+    for path in refuel_paths[: int(limit)]:
+        frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if frame is not None:
+            refuel_frames.append(frame)
+    return {
+        "source": {
+            "kind": "replay",
+            "roots": [str(root) for root in roots or ()],
+            "run_count": int(run_count),
+            "frames": int(len(pairs)),
+            "refuel_frames": int(len(refuel_frames)),
+        },
+        "droplet_pairs": pairs,
+        "refuel_frames": refuel_frames,
+    }
+
+
+def _droplet_calls(cam, bg, img):
+    # identify_nozzle runs first so the emergence and morphology analyzers get the
+    # nozzle prior they receive during live calibration.
+    state = {}
+
+    def _nozzle():
+        center, _focus, _annotated = cam.identify_nozzle(bg, img.copy())
+        state["nozzle_center"] = center
+        return center is not None
+
+    def _emergence():
+        area, _center, _overlay = cam.calc_emergence_area(bg, img, nozzle_center=state.get("nozzle_center"))
+        return area is not None
+
+    def _morphology():
+        metrics, _overlay = cam.analyze_prebreakup_morphology(bg, img, nozzle_center=state.get("nozzle_center"))
+        return int(metrics.get("protrusion_length_px") or 0) > 0
+
+    def _contour():
+        contour, _annotated = cam.identify_droplet_contour(img.copy(), bg)
+        return contour is not None
+
+    def _characterize():
+        result, _annotated = cam.characterize_droplet(img.copy(), bg)
+        return isinstance(result, dict)
+
+    return {
+        "identify_nozzle": _nozzle,
+        "calc_emergence_area": _emergence,
+        "analyze_prebreakup_morphology": _morphology,
+        "identify_droplet_contour": _contour,
+        "characterize_droplet": _characterize,
+    }
+
+
+def _refuel_call(frame):
+    detector = RefuelLevelDetector(
+        frame,
+        offset=REFUEL_OFFSET,
+        width=REFUEL_WIDTH,
+        threshold=REFUEL_THRESHOLD,
+        prominence=REFUEL_PROMINENCE,
+        empty_cutoff=REFUEL_EMPTY_CUTOFF,
+        last_row=None,
+    )
+    cur_img = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    geometry = detector._detect_refuel_head_geometry(cur_img, threshold_value=REFUEL_THRESHOLD)
+    bounds = geometry.get("channel_bounds")
+    if bounds is None:
+        return None
+
+    def _classify():
+        x0, y0, w0, h0 = (int(value) for value in bounds)
+        _row, state, _score, _reason = detector.classify_fill_state(
+            cur_img, x0, y0, w0, h0, empty_cutoff=REFUEL_EMPTY_CUTOFF
+        )
+        return state in {"empty", "full", "visible"}
+
+    return _classify
+
+
+def _time_call(fn):
+    started = time.perf_counter()
+    detected = fn()
+    return (time.perf_counter() - started) * 1000.0, bool(detected)
+
+
+def _peak_alloc_kib(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+def _summarize_analyzer(samples_ms, allocs_kib, detected):
+    block = _summarize_ms(samples_ms)
+    total_s = sum(samples_ms) / 1000.0
+    block["frames_per_s"] = float(len(samples_ms) / total_s) if total_s > 0 else None
+    block["alloc_peak_kib_p50"] = float(_percentile(allocs_kib, 0.50)) if allocs_kib else None
+    block["alloc_peak_kib_max"] = float(max(allocs_kib)) if allocs_kib else None
+    block["detected"] = int(detected)
+    return block
+
+
+def run_replay_benchmark(corpus, *, repeats=3, measure_allocations=True):
+    cam = _camera_stub()
+    samples = {name: [] for name in REPLAY_ANALYZERS}
+    allocs = {name: [] for name in REPLAY_ANALYZERS}
+    detected = {name: 0 for name in REPLAY_ANALYZERS}
+
+    for bg, img in corpus["droplet_pairs"]:
+        for repeat in range(max(1, int(repeats))):
+            for name, fn in _droplet_calls(cam, bg, img).items():
+                elapsed_ms, hit = _time_call(fn)
+                samples[name].append(elapsed_ms)
+                if repeat == 0:
+                    detected[name] += int(hit)
+        if measure_allocations:
+            # Allocation pass is separate so tracing overhead stays out of the timings.
+            for name, fn in _droplet_calls(cam, bg, img).items():
+                allocs[name].append(_peak_alloc_kib(fn))
+
+    for frame in corpus["refuel_frames"]:
+        classify = _refuel_call(frame)
+        if classify is None:
+            continue
+        for repeat in range(max(1, int(repeats))):
+            elapsed_ms, hit = _time_call(classify)
+            samples["classify_fill_state"].append(elapsed_ms)
+            if repeat == 0:
+                detected["classify_fill_state"] += int(hit)
+        if measure_allocations:
+            allocs["classify_fill_state"].append(_peak_alloc_kib(classify))
+
+    return {
+        "schema_version": REPLAY_SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "corpus": dict(corpus["source"]),
+        "repeats": max(1, int(repeats)),
+        "environment": {
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "cpu_count": os.cpu_count(),
+            "python_version": platform.python_version(),
+            "opencv_version": cv2.__version__,
+            "numpy_version": np.__version__,
+        },
+        "analyzers": {
+            name: _summarize_analyzer(samples[name], allocs[name], detected[name])
+            for name in REPLAY_ANALYZERS
+        },
+    }
+
+
+def compare_to_baseline(
+    payload,
+    baseline,
+    *,
+    max_regression_pct=DEFAULT_MAX_REGRESSION_PCT,
+    check_latency=True,
+    metrics=("p50", "p95", "alloc_peak_kib_p50"),
+):
+    # Peak allocations are host-independent; latency is only comparable on the
+    # environment that produced the baseline.
+    if payload.get("corpus") != baseline.get("corpus"):
+        raise ValueError("Benchmark corpus does not match the baseline corpus.")
+    limit = 1.0 + float(max_regression_pct) / 100.0
+    if not check_latency:
+        metrics = [metric for metric in metrics if metric.startswith("alloc_")]
+    regressions = []
+    for name in REPLAY_ANALYZERS:
+        current = (payload.get("analyzers") or {}).get(name) or {}
+        reference = (baseline.get("analyzers") or {}).get(name) or {}
+        for metric in metrics:
+            value = current.get(metric)
+            ref = reference.get(metric)
+            if value is None or ref is None or float(ref) <= 0.0:
+                continue
+            if float(value) > float(ref) * limit:
+                regressions.append(
+                    {
+                        "analyzer": name,
+                        "metric": metric,
+                        "baseline": float(ref),
+                        "current": float(value),
+                        "ratio": round(float(value) / float(ref), 3),
+                    }
+                )
+    return regressions
+
+
+def same_environment(payload, baseline):
+    keys = ("machine", "system", "cpu_count", "python_version")
+    current = payload.get("environment") or {}
+    reference = baseline.get("environment") or {}
+    return all(current.get(key) == reference.get(key) for key in keys)
+
+
 def write_json(path, payload):
     out = Path(path)
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -133,25 +474,91 @@ def write_json(path, payload):
 
 
 def main():
-    p = argparse.ArgumentParser(description="Benchmark droplet CV routines on synthetic frames.")
+    p = argparse.ArgumentParser(description="Benchmark droplet CV routines on synthetic or recorded frames.")
     p.add_argument("--iterations", type=int, default=50)
-    p.add_argument("--width", type=int, default=420)
-    p.add_argument("--height", type=int, default=420)
+    p.add_argument("--width", type=int, default=None, help="Frame width (420 synthetic pair, 640 replay).")
+    p.add_argument("--height", type=int, default=None, help="Frame height (420 synthetic pair, 480 replay).")
     p.add_argument("--seed", type=int, default=7)
     p.add_argument("--out", default="")
+    p.add_argument(
+        "--replay",
+        action="store_true",
+        help="Run every calibration analyzer over a replay corpus instead of the synthetic pair benchmark.",
+    )
+    p.add_argument(
+        "--replay-root",
+        action="append",
+        default=[],
+        help="Directory of recorded calibration runs (repeatable). Without it the replay corpus is synthetic.",
+    )
+    p.add_argument("--frames", type=int, default=24, help="Synthetic replay corpus size.")
+    p.add_argument("--limit", type=int, default=200, help="Maximum recorded frames per kind.")
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--no-allocations", action="store_true")
+    p.add_argument("--baseline", default="", help="Baseline JSON to gate against.")
+    p.add_argument(
+        "--max-regression-pct",
+        type=float,
+        default=None,
+        help=f"Allowed slowdown per metric (default: the baseline's gate, else {DEFAULT_MAX_REGRESSION_PCT:g}).",
+    )
     args = p.parse_args()
 
-    payload = run_benchmark(
-        iterations=max(1, int(args.iterations)),
-        width=max(64, int(args.width)),
-        height=max(64, int(args.height)),
-        seed=int(args.seed),
+    if not (args.replay or args.replay_root or args.baseline):
+        payload = run_benchmark(
+            iterations=max(1, int(args.iterations)),
+            width=max(64, int(args.width or 420)),
+            height=max(64, int(args.height or 420)),
+            seed=int(args.seed),
+        )
+        if args.out:
+            out = write_json(args.out, payload)
+            print(f"Wrote benchmark: {out}")
+        else:
+            print(json.dumps(payload, indent=2))
+        return 0
+
+    if args.replay_root:
+        corpus = collect_replay_corpus(args.replay_root, limit=max(1, int(args.limit)))
+    else:
+        corpus = synthetic_replay_corpus(
+            frames=max(1, int(args.frames)),
+            width=max(64, int(args.width or 640)),
+            height=max(64, int(args.height or 480)),
+            seed=int(args.seed),
+        )
+    if not corpus["droplet_pairs"] and not corpus["refuel_frames"]:
+        print("No replayable frames found.", file=sys.stderr)
+        return 2
+    payload = run_replay_benchmark(
+        corpus,
+        repeats=max(1, int(args.repeats)),
+        measure_allocations=not args.no_allocations,
     )
     if args.out:
         out = write_json(args.out, payload)
         print(f"Wrote benchmark: {out}")
     else:
         print(json.dumps(payload, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        max_regression_pct = args.max_regression_pct
+        if max_regression_pct is None:
+            max_regression_pct = (baseline.get("gate") or {}).get("max_regression_pct", DEFAULT_MAX_REGRESSION_PCT)
+        regressions = compare_to_baseline(
+            payload,
+            baseline,
+            max_regression_pct=float(max_regression_pct),
+            check_latency=same_environment(payload, baseline),
+        )
+        for row in regressions:
+            print(
+                f"REGRESSION {row['analyzer']} {row['metric']}: "
+                f"{row['current']:.2f} vs baseline {row['baseline']:.2f} (x{row['ratio']})",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
     return 0
 
 
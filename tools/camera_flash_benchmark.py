@@ -3,9 +3,17 @@ import glob
 import os
 import statistics
 import subprocess
+import sys
 import time
 from collections import Counter, deque
 from dataclasses import dataclass
+from pathlib import Path
+
+UI_DIR = Path(__file__).resolve().parents[1] / "FreeRTOS-interface"
+if str(UI_DIR) not in sys.path:
+    sys.path.insert(0, str(UI_DIR))
+
+from SerialFrameCodec import crc16_x25
 
 
 CMD_INIT_FLASH = 0xC0
@@ -454,14 +462,7 @@ def _baseline_before_ns(buf: deque, cutoff_ns: int, n: int) -> tuple[float, floa
     return float(np.mean(arr)), float(np.std(arr))
 
 
-def _crc16(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            crc = ((crc >> 1) ^ 0xA001) if (crc & 1) else (crc >> 1)
-            crc &= 0xFFFF
-    return crc
+_crc16 = crc16_x25
 
 
 def _parse_tlvs(payload: bytes) -> dict[int, bytes]:
@@ -1311,6 +1312,16 @@ def run_camera_flash_benchmark(
 
         import numpy as np
         from picamera2 import Picamera2
+        from CaptureLatencyRegistry import (
+            METRIC_EDGE_TO_FRAME,
+            METRIC_MAKE_ARRAY,
+            METRIC_SELECTION,
+            METRIC_SIGNAL_MEAN,
+            METRIC_TRIGGER_TO_EDGE,
+            METRIC_TRIGGER_TO_RESULT,
+            TRACK_GRABBER,
+            CaptureLatencyRegistry,
+        )
 
         trigger_chip, trigger_offset = _gpiofind(f"GPIO{config.trigger_pin_bcm}")
         ack_chip, ack_offset = _gpiofind(f"GPIO{config.flash_ack_pin_bcm}")
@@ -1334,6 +1345,7 @@ def run_camera_flash_benchmark(
         camera.start()
 
         buf = deque(maxlen=16)  # (arr, md, t_done_ns, mean)
+        latency = CaptureLatencyRegistry()
         timeout_s = max(0.001, float(config.attempt_timeout_ms) / 1000.0)
         max_new_frames = max(1, int(config.max_new_frames))
         min_trigger_period_ns = int(min_trigger_period_ms) * 1_000_000
@@ -1438,11 +1450,15 @@ def run_camera_flash_benchmark(
                 t_done_ns = time.monotonic_ns()
                 try:
                     md = req.get_metadata()
+                    t_array_start = time.monotonic_ns()
                     arr = req.make_array("main")
+                    latency.record_span(METRIC_MAKE_ARRAY, t_array_start, time.monotonic_ns(), track=TRACK_GRABBER)
                 finally:
                     req.release()
 
+                t_mean_start = time.monotonic_ns()
                 mean = float(np.mean(arr))
+                latency.record_span(METRIC_SIGNAL_MEAN, t_mean_start, time.monotonic_ns(), track=TRACK_GRABBER)
                 buf.append((arr, md, t_done_ns, mean))
 
                 if t_done_ns <= t_arm_gate:
@@ -1472,6 +1488,11 @@ def run_camera_flash_benchmark(
             t_selected = int(chosen[2]) if chosen is not None else t_cycle_end
             selected_mean = float(chosen[3]) if chosen is not None else None
             flash_detected = reason == "threshold"
+            span_args = {"cycle_index": int(cycle_idx), "phase": str(phase), "reason": reason}
+            latency.record_span(METRIC_TRIGGER_TO_EDGE, t_trigger_high, t_ack_edge, args=span_args)
+            latency.record_span(METRIC_EDGE_TO_FRAME, t_ack_edge, t_selected, args=span_args)
+            latency.record_span(METRIC_SELECTION, t_selected, t_cycle_end, args=span_args)
+            latency.record_span(METRIC_TRIGGER_TO_RESULT, t_trigger_high, t_cycle_end, args=span_args)
 
             row.update(
                 {
@@ -1530,6 +1551,7 @@ def run_camera_flash_benchmark(
         warmup_results = [_capture_cycle_with_rate_limit(i, "warmup") for i in range(warmup_count)]
         warmup_finished_ns = time.monotonic_ns()
         warmup_summary = summarize_cycles(warmup_results, warmup_count, warmup_started_ns, warmup_finished_ns)
+        latency.reset()
 
         results = []
         early_abort = {"triggered": False, "reason": None}
@@ -1601,6 +1623,8 @@ def run_camera_flash_benchmark(
             "warmup_cycles": warmup_results,
             "warmup_summary": warmup_summary,
             "coordinated_diag": coordinated_diag,
+            "capture_latency": latency.snapshot(),
+            "capture_latency_trace": latency.chrome_trace(),
             "cleanup": cleanup_diag,
         })
     finally:
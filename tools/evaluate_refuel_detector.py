@@ -1155,10 +1155,11 @@ def write_overlay_artifacts(
 
 def _import_refuel_detector_deps():
     try:
-        from CalibrationClasses.Model import ImageAnalysisThread, RefuelCameraModel
+        from CalibrationClasses.Model import RefuelCameraModel
+        from RefuelLevelDetector import RefuelLevelDetector
     except Exception as exc:
         raise RuntimeError("Detector debug generation requires the FreeRTOS-interface Python app dependencies.") from exc
-    return ImageAnalysisThread, RefuelCameraModel
+    return RefuelLevelDetector, RefuelCameraModel
 
 
 def _coerce_debug_params(params=None):
@@ -1246,14 +1247,14 @@ def _seed_from_debug_worker(worker, raw_shape, refuel_model_cls, params):
 
 def rerun_refuel_detector_prediction(raw_image, params=None, last_row=None, capture_debug=False):
     _cv2, np = _import_overlay_deps()
-    ImageAnalysisThread, RefuelCameraModel = _import_refuel_detector_deps()
+    RefuelLevelDetector, RefuelCameraModel = _import_refuel_detector_deps()
     if raw_image is None:
         raise ValueError("raw_image is required.")
 
     params = _coerce_debug_params(params)
     raw = np.asarray(raw_image)
     resized = RefuelCameraModel._build_analysis_working_frame(raw)
-    worker = ImageAnalysisThread(
+    worker = RefuelLevelDetector(
         resized,
         params["offset"],
         params["width"],
@@ -4,9 +4,17 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import sys
 from pathlib import Path
 
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.stream_analysis.frame_container import image_available  # noqa: E402
+
+
 PROCESS_NAME = "PreBreakupDatasetAcquisitionProcess"
 
 
@@ -342,7 +350,7 @@ def _abs_path(run_dir: Path, relpath):
     if not rel:
         return None, False
     abs_path = (run_dir / rel).resolve()
-    return str(abs_path), bool(abs_path.exists())
+    return str(abs_path), bool(image_available(abs_path))
 
 
 def _build_analysis_index(run_dir: Path, analysis_rows, frame_rows):
@@ -17,6 +17,7 @@ if str(UI_DIR) not in sys.path:
 
 from CalibrationClasses.Model import NozzlePositionCalibrationProcess  # noqa: E402
 from tools.calibration_recording_updates import load_calibration_updates  # noqa: E402
+from tools.stream_analysis.frame_container import read_image  # noqa: E402
 
 
 def _load_jsonl(path: Path):
@@ -36,7 +37,7 @@ def _load_jsonl(path: Path):
 
 
 def _load_image_rgb(path: Path):
-    img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+    img = read_image(path, cv2.IMREAD_UNCHANGED)
     if img is None:
         return None
     if img.ndim == 2:
@@ -6,15 +6,23 @@ import json
 import os
 import re
 import struct
+import sys
 import tempfile
 import time
 from datetime import datetime, timezone
+from pathlib import Path
 
 try:
     import serial
 except ImportError:
     serial = None
 
+UI_DIR = Path(__file__).resolve().parents[1] / "FreeRTOS-interface"
+if str(UI_DIR) not in sys.path:
+    sys.path.insert(0, str(UI_DIR))
+
+from SerialFrameCodec import crc16_x25, encode_frame
+
 
 START_BYTE = 0xAA
 
@@ -111,19 +119,11 @@ TRACE_MAX_PULSE_WINDOW_MS = 10000
 TRACE_CHANNEL_CODES = {"print": 0, "refuel": 1}
 
 
-def crc16(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            crc = ((crc >> 1) ^ 0xA001) if (crc & 1) else (crc >> 1)
-            crc &= 0xFFFF
-    return crc
+crc16 = crc16_x25
 
 
 def frame_payload(payload: bytes) -> bytes:
-    c = crc16(payload)
-    return bytes([START_BYTE, len(payload)]) + payload + bytes([c & 0xFF, (c >> 8) & 0xFF])
+    return encode_frame(payload)
 
 
 def build_control(cmd: int, seq8: int, seq32: int, tlvs: bytes = b"") -> bytes:
@@ -895,6 +895,11 @@ def _camera_benchmark_artifact_path(base_out: str) -> str:
     return f"{base}_camera_benchmark.json"
 
 
+def _camera_benchmark_latency_trace_path(base_out: str) -> str:
+    base = os.path.splitext(base_out)[0]
+    return f"{base}_camera_benchmark_latency_trace.json"
+
+
 def _resolve_camera_benchmark_order(mode: str, requested_order: str) -> str:
     mode_norm = str(mode or "flash_only").strip().lower()
     if mode_norm not in ("flash_only", "print_then_flash", "coordinated_flash"):
@@ -1011,6 +1016,11 @@ def _run_camera_benchmark_phase(
         except (TypeError, ValueError, AttributeError):
             next_seq32 = int(start_seq32)
         bench_pass = _camera_benchmark_payload_pass(bench_payload)
+        latency_trace = bench_payload.pop("capture_latency_trace", None) if isinstance(bench_payload, dict) else None
+        latency_trace_artifact = None
+        if isinstance(latency_trace, dict):
+            latency_trace_artifact = _camera_benchmark_latency_trace_path(args.out)
+            write_json_atomic(latency_trace_artifact, latency_trace)
         write_json_atomic(bench_artifact, bench_payload)
         host_checks.append(
             {
@@ -1019,6 +1029,7 @@ def _run_camera_benchmark_phase(
                 "details": {
                     "status": bench_payload.get("status", "ok"),
                     "artifact": bench_artifact,
+                    "latency_trace_artifact": latency_trace_artifact,
                     "phase": phase,
                     "mode": mode,
                     "requested_order": str(requested_order),
@@ -1033,6 +1044,7 @@ def _run_camera_benchmark_phase(
                     "init_diag": bench_payload.get("init_diag", {}),
                     "coordinated_diag": bench_payload.get("coordinated_diag", {}),
                     "status_snapshot_delta": bench_payload.get("status_snapshot_delta", {}),
+                    "capture_latency": bench_payload.get("capture_latency", {}),
                 },
                 "timestamp": now_iso(),
             }
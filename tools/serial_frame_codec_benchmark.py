@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+import platform
+import struct
+import sys
+import time
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+UI_DIR = REPO_ROOT / "FreeRTOS-interface"
+if str(UI_DIR) not in sys.path:
+    sys.path.insert(0, str(UI_DIR))
+
+from SerialFrameCodec import (
+    TlvLayoutDecoder,
+    crc16_x25,
+    crc16_x25_bitwise,
+    decode_tlv_fields,
+    encode_frame,
+    encode_frame_into,
+    encode_frames,
+    split_frames,
+    MAX_FRAME_LEN,
+)
+
+
+CMD_STATUS = 0x02
+CMD_ABSOLUTE_XY = 0x40
+TAG_SEQ32 = 0x10
+
+
+def _status_payload(tlv_count, seed):
+    payload = bytearray([CMD_STATUS])
+    for index in range(int(tlv_count)):
+        payload += bytes([0x20 + index, 4]) + struct.pack("<I", (seed * 7919 + index) & 0xFFFFFFFF)
+    return bytes(payload)
+
+
+def _status_tag_map(tlv_count):
+    return {
+        0x20 + index: (f"field_{index}", 4, bool(index % 2))
+        for index in range(int(tlv_count))
+    }
+
+
+def _command_payload(seq32):
+    payload = bytearray([CMD_ABSOLUTE_XY, seq32 & 0xFF, TAG_SEQ32, 4])
+    payload += struct.pack("<I", seq32)
+    for tag, value in ((0x01, seq32 * 3), (0x02, seq32 * 5), (0x03, 0)):
+        payload += bytes([tag, 4]) + struct.pack("<I", value & 0xFFFFFFFF)
+    return bytes(payload)
+
+
+def _rate(count, elapsed_s):
+    if elapsed_s <= 0.0:
+        return None
+    return float(count) / float(elapsed_s)
+
+
+def _timed(fn, count):
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    return {
+        "frames": int(count),
+        "elapsed_ms": elapsed * 1000.0,
+        "frames_per_s": _rate(count, elapsed),
+    }
+
+
+def run_benchmark(*, frames=5000, status_tlvs=24, batch=256):
+    frames = max(1, int(frames))
+    batch = max(1, int(batch))
+    status = [_status_payload(status_tlvs, seed) for seed in range(frames)]
+    commands = [_command_payload(seq32) for seq32 in range(1, frames + 1)]
+    stream = bytes(encode_frames(status))
+
+    def _crc_bitwise():
+        for payload in status:
+            crc16_x25_bitwise(payload)
+
+    def _crc_table():
+        for payload in status:
+            crc16_x25(payload)
+
+    def _build_concat():
+        for payload in commands:
+            c = crc16_x25_bitwise(payload)
+            bytes([0xAA, len(payload)]) + payload + struct.pack("<H", c)
+
+    def _build_frame():
+        for payload in commands:
+            encode_frame(payload)
+
+    def _build_preallocated():
+        buffer = bytearray(MAX_FRAME_LEN * batch)
+        offset = 0
+        for index, payload in enumerate(commands):
+            offset += encode_frame_into(buffer, offset, payload)
+            if (index + 1) % batch == 0:
+                offset = 0
+
+    tag_map = _status_tag_map(status_tlvs)
+
+    def _decode_walker():
+        for payload in status:
+            decode_tlv_fields(payload, tag_map, 1)
+
+    def _decode_compiled():
+        decoder = TlvLayoutDecoder(tag_map)
+        for payload in status:
+            decoder.decode(payload, 1)
+
+    def _decode_compiled_record():
+        decoder = TlvLayoutDecoder(tag_map)
+        for payload in status:
+            decoder.decode_record(payload, 1)
+
+    def _split_batched():
+        view = memoryview(stream)
+        frame_len = len(status[0]) + 4
+        step = frame_len * batch
+        for start in range(0, len(view), step):
+            split_frames(view[start:start + step])
+
+    return {
+        "schema_version": 1,
+        "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "host": {
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+        },
+        "frames": frames,
+        "status_payload_bytes": len(status[0]),
+        "command_payload_bytes": len(commands[0]),
+        "batch": batch,
+        "results": {
+            "crc_bitwise": _timed(_crc_bitwise, frames),
+            "crc_table": _timed(_crc_table, frames),
+            "build_concat_bitwise": _timed(_build_concat, frames),
+            "build_encode_frame": _timed(_build_frame, frames),
+            "build_preallocated": _timed(_build_preallocated, frames),
+            "split_frames_batched": _timed(_split_batched, frames),
+            "status_decode_walker": _timed(_decode_walker, frames),
+            "status_decode_compiled": _timed(_decode_compiled, frames),
+            "status_decode_compiled_record": _timed(_decode_compiled_record, frames),
+        },
+    }
+
+
+def write_json(path, payload):
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return str(out)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark serial frame CRC, encode, batched split and status TLV decode throughput.")
+    p.add_argument("--frames", type=int, default=5000)
+    p.add_argument("--status-tlvs", type=int, default=24)
+    p.add_argument("--batch", type=int, default=256)
+    p.add_argument("--out", default="")
+    args = p.parse_args()
+
+    payload = run_benchmark(
+        frames=max(1, int(args.frames)),
+        status_tlvs=max(1, min(40, int(args.status_tlvs))),
+        batch=max(1, int(args.batch)),
+    )
+    if args.out:
+        out = write_json(args.out, payload)
+        print(f"Wrote benchmark: {out}")
+    else:
+        print(json.dumps(payload, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -781,6 +781,48 @@ def _prediction_for_evaluation(frame: dict, saved_annotation_row: dict | None):
     }
 
 
+def _evaluation_row(frame_key: str, annotation_row: dict, prediction: dict):
+    annotated_x = float(annotation_row["annotated_nozzle_x_px"])
+    annotated_y = float(annotation_row["annotated_nozzle_y_px"])
+    predicted_x = prediction["x_px"]
+    predicted_y = prediction["y_px"]
+    dx_px = None if predicted_x is None else float(predicted_x - annotated_x)
+    dy_px = None if predicted_y is None else float(predicted_y - annotated_y)
+    distance_px = None if dx_px is None or dy_px is None else float(np.hypot(dx_px, dy_px))
+    predicted_mode = _clean_text(prediction.get("mode"))
+    return {
+        "frame_key": frame_key,
+        "run_id": annotation_row["run_id"],
+        "capture_index": int(annotation_row["capture_index"]),
+        "image_relpath": annotation_row.get("image_relpath"),
+        "image_abs_path": annotation_row.get("image_abs_path"),
+        "annotation_mode": annotation_row.get("annotation_mode"),
+        "annotated_nozzle_x_px": annotated_x,
+        "annotated_nozzle_y_px": annotated_y,
+        "predicted_mode": predicted_mode,
+        "predicted_confidence": prediction.get("confidence"),
+        "predicted_x_px": predicted_x,
+        "predicted_y_px": predicted_y,
+        "dx_px": dx_px,
+        "dy_px": dy_px,
+        "distance_px": distance_px,
+        "mode_match": bool(
+            predicted_mode is not None
+            and _normalize_prediction_mode(predicted_mode) == annotation_row.get("annotation_mode")
+        ),
+        "prediction_source": prediction["source"],
+    }
+
+
+def _evaluation_distance_summary(rows: list[dict]):
+    distances = [float(row["distance_px"]) for row in rows if row.get("distance_px") is not None]
+    return {
+        "distance_mean_px": float(np.mean(distances)) if distances else None,
+        "distance_median_px": float(np.median(distances)) if distances else None,
+        "distance_max_px": float(max(distances)) if distances else None,
+    }
+
+
 def _draw_overlay_marker(image: np.ndarray, point, color):
     if point[0] is None or point[1] is None:
         return image
@@ -1446,42 +1488,11 @@ def evaluate_nozzle_annotations(
             continue
         frame = queue_by_key.get(frame_key, {})
         prediction = _prediction_for_evaluation(frame, annotation_row)
-        annotated_x = float(annotation_row["annotated_nozzle_x_px"])
-        annotated_y = float(annotation_row["annotated_nozzle_y_px"])
-        predicted_x = prediction["x_px"]
-        predicted_y = prediction["y_px"]
-        dx_px = None if predicted_x is None else float(predicted_x - annotated_x)
-        dy_px = None if predicted_y is None else float(predicted_y - annotated_y)
-        distance_px = None if dx_px is None or dy_px is None else float(np.hypot(dx_px, dy_px))
-        predicted_mode = _clean_text(prediction.get("mode"))
-        rows.append(
-            {
-                "frame_key": frame_key,
-                "run_id": annotation_row["run_id"],
-                "capture_index": int(annotation_row["capture_index"]),
-                "image_relpath": annotation_row.get("image_relpath"),
-                "image_abs_path": annotation_row.get("image_abs_path"),
-                "annotation_mode": annotation_row.get("annotation_mode"),
-                "annotated_nozzle_x_px": annotated_x,
-                "annotated_nozzle_y_px": annotated_y,
-                "predicted_mode": predicted_mode,
-                "predicted_confidence": prediction.get("confidence"),
-                "predicted_x_px": predicted_x,
-                "predicted_y_px": predicted_y,
-                "dx_px": dx_px,
-                "dy_px": dy_px,
-                "distance_px": distance_px,
-                "mode_match": bool(
-                    predicted_mode is not None
-                    and _normalize_prediction_mode(predicted_mode) == annotation_row.get("annotation_mode")
-                ),
-                "prediction_source": prediction["source"],
-            }
-        )
+        rows.append(_evaluation_row(frame_key, annotation_row, prediction))
 
     _write_csv(paths["evaluation_csv"], _preferred_columns(rows, EVALUATION_COLUMNS), rows)
 
-    distances = [float(row["distance_px"]) for row in rows if row.get("distance_px") is not None]
+    distance_summary = _evaluation_distance_summary(rows)
     matched_prediction_count = int(sum(1 for row in rows if row.get("predicted_x_px") is not None))
     missing_prediction_count = int(len(rows) - matched_prediction_count)
 
@@ -1539,9 +1550,7 @@ def evaluate_nozzle_annotations(
         "annotation_row_count": int(len(rows)),
         "matched_prediction_count": matched_prediction_count,
         "missing_prediction_count": missing_prediction_count,
-        "distance_mean_px": float(np.mean(distances)) if distances else None,
-        "distance_median_px": float(np.median(distances)) if distances else None,
-        "distance_max_px": float(max(distances)) if distances else None,
+        **distance_summary,
         "per_run_summary": _bucket_summary(per_run),
         "per_mode_summary": _bucket_summary(per_mode),
         "worst_frame_count": int(len(worst_frame_paths)),
@@ -19,6 +19,7 @@ from tools.stream_analysis.dataset import (
     build_stage0_inventory,
     default_output_root,
 )
+from tools.stream_analysis.frame_container import read_image
 
 
 BASELINE_STAGE_DIRNAME = "stage_01_baseline"
@@ -58,7 +59,7 @@ FRAME_METRIC_COLUMNS = [
 
 
 def _load_gray_image(path: Path) -> np.ndarray:
-    image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    image = read_image(path, cv2.IMREAD_GRAYSCALE)
     if image is None:
         raise FileNotFoundError(f"Could not load grayscale image: {path}")
     return image
@@ -12,16 +12,89 @@ from tools.stream_analysis.annotations import (
 from tools.stream_analysis.baseline import export_stage1_baseline
 from tools.stream_analysis.dataset import _print_json, export_stage0_inventory
 from tools.stream_analysis.fit import export_stage5_fit
-from tools.stream_analysis.nozzle import export_stage2_nozzle
+from tools.stream_analysis.frame_container import CODEC_PNG, CODECS, convert_image_folder
+from tools.stream_analysis.nozzle import PREFETCH_DEPTH, PREFETCH_MAX_BYTES, export_stage2_nozzle
+from tools.stream_analysis.plotting import (
+    PLOT_MODE_INLINE,
+    PLOT_MODE_LATER,
+    PLOT_MODE_NONE,
+    PLOT_MODE_POOL,
+    plot_session,
+    render_plot_specs,
+)
 from tools.stream_analysis.review_cache import (
     export_stage5_cached_review,
     export_stage5_review_cache,
 )
 from tools.stream_analysis.silhouette import export_stage3_silhouette
 from tools.stream_analysis.summary import export_stage6_summary
+from tools.stream_analysis.sweep import MAX_SWEEP_COMBINATIONS, export_stage3_parameter_sweep, parse_sweep_grid
 from tools.stream_analysis.volume import export_stage4_volume
 
 
+def _add_workers_arg(parser):
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to export runs in parallel. 0 uses one per CPU core.",
+    )
+
+
+def _add_prefetch_args(parser):
+    parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        default=PREFETCH_DEPTH,
+        help="Number of frames decoded ahead of nozzle detection on background threads. 0 reads frames inline.",
+    )
+    parser.add_argument(
+        "--prefetch-max-mb",
+        type=int,
+        default=PREFETCH_MAX_BYTES // (1024 * 1024),
+        help="Memory cap in MiB for frames held ahead by the prefetch. 0 disables the cap.",
+    )
+
+
+def _prefetch_options(args):
+    return {
+        "prefetch_depth": int(args.prefetch_depth),
+        "prefetch_max_bytes": int(args.prefetch_max_mb) * 1024 * 1024,
+    }
+
+
+def _add_plot_args(parser):
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=0,
+        help="Render plots in this many background Agg worker processes while the analysis continues. 0 draws them inline.",
+    )
+    plot_mode = parser.add_mutually_exclusive_group()
+    plot_mode.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="Skip PNG plots; numerical outputs are written as usual.",
+    )
+    plot_mode.add_argument(
+        "--plots-later",
+        default="",
+        metavar="SPEC_DIR",
+        help="Write plot specs to SPEC_DIR instead of drawing them. Render them with the render-plots command.",
+    )
+
+
+def _plot_session_options(args):
+    if getattr(args, "no_plots", False):
+        return {"mode": PLOT_MODE_NONE}
+    if getattr(args, "plots_later", ""):
+        return {"mode": PLOT_MODE_LATER, "spec_dir": args.plots_later}
+    plot_workers = int(getattr(args, "plot_workers", 0) or 0)
+    if plot_workers > 0:
+        return {"mode": PLOT_MODE_POOL, "workers": plot_workers}
+    return {"mode": PLOT_MODE_INLINE}
+
+
 def _add_late_stage_review_args(
     parser,
     *,
@@ -197,6 +270,203 @@ def _add_late_stage_review_args(
     )
 
 
+def _add_summary_args(parser):
+    parser.add_argument(
+        "--experiment-root",
+        help="Experiment directory, stream_metadata.csv, calibration_recordings dir, process dir, or run dir.",
+    )
+    parser.add_argument(
+        "--cache-root",
+        default="",
+        help="Optional Stage 5 review cache directory to drive the canonical late-stage summary path from frozen inputs.",
+    )
+    parser.add_argument(
+        "--output-root",
+        default="",
+        help="Optional output directory. Defaults to the experiment-local analysis directory.",
+    )
+    parser.add_argument(
+        "--run-id",
+        action="append",
+        default=[],
+        help="Optional run id to export. May be provided multiple times.",
+    )
+    parser.add_argument(
+        "--include-unmatched",
+        action="store_true",
+        help="Include unmatched run directories when no explicit run ids are supplied.",
+    )
+    parser.add_argument(
+        "--limit-runs",
+        type=int,
+        default=0,
+        help="Optional cap on the number of selected runs to export.",
+    )
+    parser.add_argument(
+        "--sample-count",
+        type=int,
+        default=6,
+        help="Number of evenly spaced sample frames to render per run.",
+    )
+    parser.add_argument(
+        "--extra-frame-index",
+        action="append",
+        type=int,
+        default=[],
+        help="Additional 1-based frame indices to include in the review artifacts.",
+    )
+    parser.add_argument(
+        "--search-width-frac",
+        type=float,
+        default=0.22,
+        help="Fraction of image width to search for nozzle structure around the frame center.",
+    )
+    parser.add_argument(
+        "--search-top-frac",
+        type=float,
+        default=0.08,
+        help="Top search boundary as a fraction of image height.",
+    )
+    parser.add_argument(
+        "--search-bottom-frac",
+        type=float,
+        default=0.30,
+        help="Bottom search boundary as a fraction of image height.",
+    )
+    parser.add_argument(
+        "--blur-sigma",
+        type=float,
+        default=12.0,
+        help="Gaussian blur sigma used to estimate the local background for dark-structure detection.",
+    )
+    parser.add_argument(
+        "--residual-threshold",
+        type=int,
+        default=18,
+        help="Threshold applied to the local dark-structure residual mask.",
+    )
+    parser.add_argument(
+        "--shift-threshold-px",
+        type=float,
+        default=6.0,
+        help="Median jump threshold used to declare a grip-refresh segment boundary.",
+    )
+    parser.add_argument(
+        "--confidence-threshold",
+        type=float,
+        default=0.55,
+        help="Minimum raw confidence needed before a frame is trusted as an anchor for smoothing.",
+    )
+    parser.add_argument(
+        "--roi-width-frac",
+        type=float,
+        default=0.35,
+        help="Fraction of image width to keep around the tracked nozzle x position.",
+    )
+    parser.add_argument(
+        "--roi-top-frac",
+        type=float,
+        default=0.10,
+        help="Top crop boundary as a fraction of image height.",
+    )
+    parser.add_argument(
+        "--roi-bottom-frac",
+        type=float,
+        default=1.0,
+        help="Bottom crop boundary as a fraction of image height.",
+    )
+    parser.add_argument(
+        "--corridor-width-frac",
+        type=float,
+        default=0.70,
+        help="Fraction of the dynamic ROI width to keep around the tracked nozzle x position.",
+    )
+    parser.add_argument(
+        "--nozzle-guard-px",
+        type=int,
+        default=2,
+        help="Extra pixels below the tracked nozzle row before silhouette rows become eligible.",
+    )
+    parser.add_argument(
+        "--min-component-area-px",
+        type=int,
+        default=120,
+        help="Minimum filled connected-component area eligible for selection.",
+    )
+    parser.add_argument(
+        "--near-nozzle-band-top-px",
+        type=int,
+        default=24,
+        help="Top offset below the tracked nozzle for the width band.",
+    )
+    parser.add_argument(
+        "--near-nozzle-band-height-px",
+        type=int,
+        default=40,
+        help="Height of the attached-stream width band below the nozzle.",
+    )
+    parser.add_argument(
+        "--min-band-valid-rows",
+        type=int,
+        default=24,
+        help="Minimum number of attached edge rows required for a valid near-nozzle width sample.",
+    )
+    parser.add_argument(
+        "--width-smooth-window",
+        type=int,
+        default=5,
+        help="Centered rolling-median window used to smooth the width trace.",
+    )
+    parser.add_argument(
+        "--min-steady-frames",
+        type=int,
+        default=8,
+        help="Minimum contiguous trusted frames required for a steady-window fit.",
+    )
+    parser.add_argument(
+        "--steady-width-tol-frac",
+        type=float,
+        default=0.08,
+        help="Maximum allowed width span as a fraction of the steady width plateau.",
+    )
+    parser.add_argument(
+        "--steady-width-tol-px",
+        type=float,
+        default=4.0,
+        help="Minimum absolute width-span tolerance for the steady window.",
+    )
+    parser.add_argument(
+        "--steady-fit-r2-min",
+        type=float,
+        default=0.985,
+        help="Minimum R^2 required for the steady Theil-Sen fit.",
+    )
+    parser.add_argument(
+        "--steady-fit-nrmse-max",
+        type=float,
+        default=0.03,
+        help="Maximum normalized RMSE allowed for the steady Theil-Sen fit.",
+    )
+    parser.add_argument(
+        "--tail-drop-frac",
+        type=float,
+        default=0.08,
+        help="Fractional drop below the steady width plateau that indicates tail onset.",
+    )
+    parser.add_argument(
+        "--tail-persist-frames",
+        type=int,
+        default=3,
+        help="Number of consecutive width-drop frames required to declare tail onset.",
+    )
+    _add_late_stage_review_args(
+        parser,
+        default_steady_fit_mode="recompute",
+        default_exclude_last_trusted_frames=2,
+        include_suspect=True,
+    )
+
+
 def build_parser():
     parser = argparse.ArgumentParser(
         description="Offline stream-characterization analysis tooling."
@@ -1123,200 +1393,13 @@ def build_parser():
         "summary",
         help="Build Stage 6 run summaries and gravimetric residual artifacts.",
     )
-    summary.add_argument(
-        "--experiment-root",
-        help="Experiment directory, stream_metadata.csv, calibration_recordings dir, process dir, or run dir.",
-    )
-    summary.add_argument(
-        "--cache-root",
-        default="",
-        help="Optional Stage 5 review cache directory to drive the canonical late-stage summary path from frozen inputs.",
-    )
-    summary.add_argument(
-        "--output-root",
-        default="",
-        help="Optional output directory. Defaults to the experiment-local analysis directory.",
-    )
-    summary.add_argument(
-        "--run-id",
-        action="append",
-        default=[],
-        help="Optional run id to export. May be provided multiple times.",
-    )
-    summary.add_argument(
-        "--include-unmatched",
-        action="store_true",
-        help="Include unmatched run directories when no explicit run ids are supplied.",
-    )
-    summary.add_argument(
-        "--limit-runs",
-        type=int,
-        default=0,
-        help="Optional cap on the number of selected runs to export.",
-    )
-    summary.add_argument(
-        "--sample-count",
-        type=int,
-        default=6,
-        help="Number of evenly spaced sample frames to render per run.",
-    )
-    summary.add_argument(
-        "--extra-frame-index",
-        action="append",
-        type=int,
-        default=[],
-        help="Additional 1-based frame indices to include in the review artifacts.",
-    )
-    summary.add_argument(
-        "--search-width-frac",
-        type=float,
-        default=0.22,
-        help="Fraction of image width to search for nozzle structure around the frame center.",
-    )
-    summary.add_argument(
-        "--search-top-frac",
-        type=float,
-        default=0.08,
-        help="Top search boundary as a fraction of image height.",
-    )
-    summary.add_argument(
-        "--search-bottom-frac",
-        type=float,
-        default=0.30,
-        help="Bottom search boundary as a fraction of image height.",
-    )
-    summary.add_argument(
-        "--blur-sigma",
-        type=float,
-        default=12.0,
-        help="Gaussian blur sigma used to estimate the local background for dark-structure detection.",
-    )
-    summary.add_argument(
-        "--residual-threshold",
-        type=int,
-        default=18,
-        help="Threshold applied to the local dark-structure residual mask.",
-    )
-    summary.add_argument(
-        "--shift-threshold-px",
-        type=float,
-        default=6.0,
-        help="Median jump threshold used to declare a grip-refresh segment boundary.",
-    )
-    summary.add_argument(
-        "--confidence-threshold",
-        type=float,
-        default=0.55,
-        help="Minimum raw confidence needed before a frame is trusted as an anchor for smoothing.",
-    )
-    summary.add_argument(
-        "--roi-width-frac",
-        type=float,
-        default=0.35,
-        help="Fraction of image width to keep around the tracked nozzle x position.",
-    )
-    summary.add_argument(
-        "--roi-top-frac",
-        type=float,
-        default=0.10,
-        help="Top crop boundary as a fraction of image height.",
-    )
-    summary.add_argument(
-        "--roi-bottom-frac",
-        type=float,
-        default=1.0,
-        help="Bottom crop boundary as a fraction of image height.",
-    )
-    summary.add_argument(
-        "--corridor-width-frac",
-        type=float,
-        default=0.70,
-        help="Fraction of the dynamic ROI width to keep around the tracked nozzle x position.",
-    )
-    summary.add_argument(
-        "--nozzle-guard-px",
-        type=int,
-        default=2,
-        help="Extra pixels below the tracked nozzle row before silhouette rows become eligible.",
-    )
-    summary.add_argument(
-        "--min-component-area-px",
-        type=int,
-        default=120,
-        help="Minimum filled connected-component area eligible for selection.",
-    )
-    summary.add_argument(
-        "--near-nozzle-band-top-px",
-        type=int,
-        default=24,
-        help="Top offset below the tracked nozzle for the width band.",
-    )
-    summary.add_argument(
-        "--near-nozzle-band-height-px",
-        type=int,
-        default=40,
-        help="Height of the attached-stream width band below the nozzle.",
-    )
-    summary.add_argument(
-        "--min-band-valid-rows",
-        type=int,
-        default=24,
-        help="Minimum number of attached edge rows required for a valid near-nozzle width sample.",
-    )
-    summary.add_argument(
-        "--width-smooth-window",
-        type=int,
-        default=5,
-        help="Centered rolling-median window used to smooth the width trace.",
-    )
-    summary.add_argument(
-        "--min-steady-frames",
-        type=int,
-        default=8,
-        help="Minimum contiguous trusted frames required for a steady-window fit.",
-    )
-    summary.add_argument(
-        "--steady-width-tol-frac",
-        type=float,
-        default=0.08,
-        help="Maximum allowed width span as a fraction of the steady width plateau.",
-    )
-    summary.add_argument(
-        "--steady-width-tol-px",
-        type=float,
-        default=4.0,
-        help="Minimum absolute width-span tolerance for the steady window.",
-    )
-    summary.add_argument(
-        "--steady-fit-r2-min",
-        type=float,
-        default=0.985,
-        help="Minimum R^2 required for the steady Theil-Sen fit.",
-    )
-    summary.add_argument(
-        "--steady-fit-nrmse-max",
-        type=float,
-        default=0.03,
-        help="Maximum normalized RMSE allowed for the steady Theil-Sen fit.",
-    )
-    summary.add_argument(
-        "--tail-drop-frac",
-        type=float,
-        default=0.08,
-        help="Fractional drop below the steady width plateau that indicates tail onset.",
-    )
-    summary.add_argument(
-        "--tail-persist-frames",
-        type=int,
-        default=3,
-        help="Number of consecutive width-drop frames required to declare tail onset.",
-    )
-    _add_late_stage_review_args(
-        summary,
-        default_steady_fit_mode="recompute",
-        default_exclude_last_trusted_frames=2,
-        include_suspect=True,
+    _add_summary_args(summary)
+
+    run_all = subparsers.add_parser(
+        "run-all",
+        help="Run Stages 2-6 once per run in memory and write every stage's artifacts.",
     )
+    _add_summary_args(run_all)
 
     annotate = subparsers.add_parser(
         "annotate-nozzle",
@@ -1416,6 +1499,57 @@ def build_parser():
         help="Maximum number of worst-frame overlays to export.",
     )
 
+    sweep = subparsers.add_parser(
+        "sweep",
+        help="Evaluate a grid of nozzle and silhouette parameters on each run's frames, decoded once.",
+    )
+    sweep.add_argument(
+        "--experiment-root",
+        required=True,
+        help="Experiment directory, stream_metadata.csv, calibration_recordings dir, process dir, or run dir.",
+    )
+    sweep.add_argument(
+        "--output-root",
+        default="",
+        help="Optional output directory. Defaults to the experiment-local analysis directory.",
+    )
+    sweep.add_argument(
+        "--run-id",
+        action="append",
+        default=[],
+        help="Optional run id to sweep. May be provided multiple times.",
+    )
+    sweep.add_argument(
+        "--include-unmatched",
+        action="store_true",
+        help="Include unmatched run directories when no explicit run ids are supplied.",
+    )
+    sweep.add_argument(
+        "--limit-runs",
+        type=int,
+        default=0,
+        help="Optional cap on the number of selected runs to sweep.",
+    )
+    sweep.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="Values to sweep for one nozzle or silhouette parameter, e.g. roi_width_frac=0.30,0.35. May be provided multiple times.",
+    )
+    sweep.add_argument(
+        "--max-combinations",
+        type=int,
+        default=MAX_SWEEP_COMBINATIONS,
+        help="Refuse grids with more parameter combinations than this.",
+    )
+    sweep.add_argument(
+        "--combo-workers",
+        type=int,
+        default=1,
+        help="Number of threads evaluating parameter combinations on a run's shared decoded frames.",
+    )
+
     diagnose = subparsers.add_parser(
         "diagnose-nozzle",
         help="Score Stage 2 raw nozzle candidates against saved annotations.",
@@ -1478,6 +1612,62 @@ def build_parser():
         default="",
         help="Optional output directory. Defaults to the experiment-local halo debug directory.",
     )
+
+    render_plots = subparsers.add_parser(
+        "render-plots",
+        help="Render plot specs written by a stage run with --plots-later.",
+    )
+    render_plots.add_argument(
+        "--spec-dir",
+        required=True,
+        help="Directory passed to --plots-later.",
+    )
+    render_plots.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of Agg worker processes used to render the specs.",
+    )
+    render_plots.add_argument(
+        "--keep-specs",
+        action="store_true",
+        help="Keep spec files after their plots are rendered.",
+    )
+
+    pack_frames = subparsers.add_parser(
+        "pack-frames",
+        help="Pack a folder of loose frame images into one append-only frame container.",
+    )
+    pack_frames.add_argument(
+        "--folder",
+        action="append",
+        required=True,
+        help="Folder of frame images, e.g. a run's captures directory. May be provided multiple times.",
+    )
+    pack_frames.add_argument(
+        "--codec",
+        choices=CODECS,
+        default=CODEC_PNG,
+        help="Frame encoding inside the container. png and zlib are lossless; raw is fastest to read.",
+    )
+    pack_frames.add_argument(
+        "--compression-level",
+        type=int,
+        default=1,
+        help="png (0-9) or zlib (0-9) compression level.",
+    )
+    pack_frames.add_argument(
+        "--remove-sources",
+        action="store_true",
+        help="Delete the loose images once every packed frame has been verified against its source.",
+    )
+
+    for stage_parser in (nozzle, silhouette, sweep, volume, fit, summary, run_all):
+        _add_workers_arg(stage_parser)
+    for stage_parser in (nozzle, volume, fit, fit_review, summary, run_all):
+        _add_plot_args(stage_parser)
+    for stage_parser in (nozzle, silhouette, volume, fit, summary, run_all):
+        _add_prefetch_args(stage_parser)
     return parser
 
 
@@ -1485,6 +1675,23 @@ def main(argv=None):
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.command == "render-plots":
+        payload = render_plot_specs(
+            args.spec_dir,
+            workers=int(args.workers),
+            keep_specs=bool(args.keep_specs),
+        )
+    else:
+        with plot_session(**_plot_session_options(args)) as plot_queue:
+            payload = _run_command(parser, args)
+        if plot_queue.mode != PLOT_MODE_INLINE and isinstance(payload, dict):
+            payload["plot_rendering"] = plot_queue.stats()
+
+    _print_json(payload)
+    return 0
+
+
+def _run_command(parser, args):
     if args.command == "inventory":
         payload = export_stage0_inventory(
             args.experiment_root,
@@ -1523,6 +1730,8 @@ def main(argv=None):
             residual_threshold=int(args.residual_threshold),
             shift_threshold_px=float(args.shift_threshold_px),
             confidence_threshold=float(args.confidence_threshold),
+            **_prefetch_options(args),
+            workers=int(args.workers),
         )
     elif args.command == "silhouette":
         payload = export_stage3_silhouette(
@@ -1546,6 +1755,8 @@ def main(argv=None):
             corridor_width_frac=float(args.corridor_width_frac),
             nozzle_guard_px=int(args.nozzle_guard_px),
             min_component_area_px=int(args.min_component_area_px),
+            **_prefetch_options(args),
+            workers=int(args.workers),
         )
     elif args.command == "volume":
         payload = export_stage4_volume(
@@ -1570,6 +1781,8 @@ def main(argv=None):
             nozzle_guard_px=int(args.nozzle_guard_px),
             min_component_area_px=int(args.min_component_area_px),
             pixel_size_um=(float(args.pixel_size_um) if float(args.pixel_size_um or 0.0) > 0 else None),
+            **_prefetch_options(args),
+            workers=int(args.workers),
         )
     elif args.command == "fit":
         payload = export_stage5_fit(
@@ -1656,6 +1869,8 @@ def main(argv=None):
             volume_uncertainty_sample_count=int(args.volume_uncertainty_sample_count),
             volume_uncertainty_seed=int(args.volume_uncertainty_seed),
             tail_uncertainty_score_tolerance=float(args.tail_uncertainty_score_tolerance),
+            **_prefetch_options(args),
+            workers=int(args.workers),
         )
     elif args.command == "fit-cache":
         payload = export_stage5_review_cache(
@@ -1731,7 +1946,7 @@ def main(argv=None):
             tail_drop_frac=float(args.tail_drop_frac),
             tail_persist_frames=int(args.tail_persist_frames),
         )
-    elif args.command == "summary":
+    elif args.command in {"summary", "run-all"}:
         payload = export_stage6_summary(
             args.experiment_root or None,
             cache_root=args.cache_root or None,
@@ -1818,6 +2033,9 @@ def main(argv=None):
             volume_uncertainty_sample_count=int(args.volume_uncertainty_sample_count),
             volume_uncertainty_seed=int(args.volume_uncertainty_seed),
             tail_uncertainty_score_tolerance=float(args.tail_uncertainty_score_tolerance),
+            write_stage_outputs=(args.command == "run-all"),
+            **_prefetch_options(args),
+            workers=int(args.workers),
         )
     elif args.command == "annotate-nozzle":
         payload = launch_nozzle_annotation_session(
@@ -1841,6 +2059,22 @@ def main(argv=None):
             include_unmatched=bool(args.include_unmatched),
             limit_worst_frames=int(args.limit_worst_frames),
         )
+    elif args.command == "sweep":
+        try:
+            grid = parse_sweep_grid(args.param)
+        except ValueError as exc:
+            parser.error(str(exc))
+        payload = export_stage3_parameter_sweep(
+            args.experiment_root,
+            grid=grid,
+            output_root=args.output_root or None,
+            run_ids=args.run_id or None,
+            limit_runs=(args.limit_runs or None),
+            include_unmatched=bool(args.include_unmatched),
+            max_combinations=int(args.max_combinations),
+            workers=int(args.workers),
+            combo_workers=int(args.combo_workers),
+        )
     elif args.command == "diagnose-nozzle":
         payload = diagnose_nozzle_candidates(
             args.experiment_root,
@@ -1850,6 +2084,18 @@ def main(argv=None):
             include_unmatched=bool(args.include_unmatched),
             limit_worst_frames=int(args.limit_worst_frames),
         )
+    elif args.command == "pack-frames":
+        payload = {
+            "folders": [
+                convert_image_folder(
+                    folder,
+                    codec=args.codec,
+                    compression_level=int(args.compression_level),
+                    remove_sources=bool(args.remove_sources),
+                )
+                for folder in args.folder
+            ]
+        }
     elif args.command == "halo-debug-frame":
         payload = export_online_halo_debug_bundle(
             args.experiment_root,
@@ -1859,6 +2105,4 @@ def main(argv=None):
         )
     else:
         parser.error(f"Unsupported command: {args.command}")
-
-    _print_json(payload)
-    return 0
+    return payload
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import csv
 import json
+import os
 import re
+from collections.abc import Mapping
 from pathlib import Path
 
+from tools.stream_analysis.frame_container import image_available
+
 
 PROCESS_NAME = "DropletTimecourseProcess"
 ONLINE_STREAM_PROCESS_NAME = "OnlineStreamCalibrationProcess"
@@ -13,6 +17,12 @@ METADATA_FILENAME = "stream_metadata.csv"
 STREAM_CAPTURE_LOG_FILENAME = "stream_capture_log.jsonl"
 ANALYSIS_DIRNAME = "stream_characterization"
 STAGE_DIRNAME = "stage_00_inventory"
+INVENTORY_CACHE_DIRNAME = "stage_00_inventory_cache"
+INVENTORY_CACHE_FILENAME = "inventory_cache.json"
+INVENTORY_CACHE_SCHEMA_VERSION = 1
+# Files whose (mtime_ns, size) key a run's cached inventory entry; the captures
+# directory mtime changes whenever an image is added, removed or renamed.
+RUN_CACHE_INPUTS = ("run_meta.json", "events.jsonl", "analysis.jsonl", "captures")
 TRACKING_MODE_DYNAMIC = "dynamic"
 TRACKING_MODE_FIXED_EARLY = "fixed_early"
 
@@ -398,7 +408,7 @@ def build_frame_index(run_dir: str | Path, *, run_id: str | None = None):
         if image_relpath:
             image_path = (run_path / image_relpath).resolve()
             image_abs_path = str(image_path)
-            image_exists = bool(image_path.exists())
+            image_exists = bool(image_available(image_path))
 
         row = {
             "run_id": run_id or run_path.name,
@@ -443,12 +453,234 @@ def _count_capture_files(run_dir: Path) -> int:
     return sum(1 for path in captures_dir.iterdir() if path.is_file())
 
 
+def _path_signature(path: Path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [int(stat.st_mtime_ns), int(stat.st_size)]
+
+
+def _run_dir_signature(run_dir: Path):
+    return {name: _path_signature(run_dir / name) for name in RUN_CACHE_INPUTS}
+
+
+def _scan_run_dir(run_dir: Path):
+    run_meta = _load_json(run_dir / "run_meta.json")
+    event_row_count = sum(1 for _event in _iter_jsonl(run_dir / "events.jsonl"))
+    analysis_row_count = sum(1 for _analysis in _iter_jsonl(run_dir / "analysis.jsonl"))
+    frame_index = build_frame_index(run_dir, run_id=run_dir.name)
+    frame_rows = list(frame_index["frames"])
+    summary = {
+        "process_name": _clean_text(run_meta.get("process_name")),
+        "phase_name": _clean_text(run_meta.get("phase_name")),
+        "outcome": _clean_text(run_meta.get("outcome")),
+        "error_message": _clean_text(run_meta.get("error_message")),
+        "started_at_utc": _clean_text(run_meta.get("started_at_utc")),
+        "ended_at_utc": _clean_text(run_meta.get("ended_at_utc")),
+        "capture_file_count": _count_capture_files(run_dir),
+        "indexed_frame_count": len(frame_rows),
+        "analysis_row_count": analysis_row_count,
+        "event_row_count": event_row_count,
+        "image_width": frame_rows[0]["width"] if frame_rows else None,
+        "image_height": frame_rows[0]["height"] if frame_rows else None,
+        "first_flash_delay_us": frame_rows[0]["flash_delay_us"] if frame_rows else None,
+        "last_flash_delay_us": frame_rows[-1]["flash_delay_us"] if frame_rows else None,
+        "timecourse_emergence_us": frame_index["timecourse_emergence_us"],
+        "timecourse_start_us": frame_index["timecourse_start_us"],
+        "timecourse_step_us": frame_index["timecourse_step_us"],
+        "timecourse_window_us": frame_index["timecourse_window_us"],
+        "timecourse_planned_frame_count": frame_index["timecourse_planned_frame_count"],
+        "missing_indexed_files": sum(1 for frame in frame_rows if not frame["image_exists"]),
+    }
+    return summary, frame_rows
+
+
+def _write_json_atomic(path: Path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def inventory_cache_dir(experiment_root: str | Path) -> Path:
+    return default_output_root(experiment_root) / INVENTORY_CACHE_DIRNAME
+
+
+class RunInventoryCache:
+    """
+    Persisted Stage 0 scan results for one experiment root.
+
+    The cache file holds each run's summary keyed by the signatures of its
+    inputs; frame rows live in one file per run and are only read when a stage
+    asks for that run. A run whose inputs changed is rescanned on its own.
+    Cache I/O failures never fail the inventory; the run is simply rescanned.
+    """
+
+    def __init__(self, experiment_root: Path, cache_dir: Path | None = None):
+        self.experiment_root = Path(experiment_root)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else inventory_cache_dir(self.experiment_root)
+        self.index_path = self.cache_dir / INVENTORY_CACHE_FILENAME
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            payload = _load_json(self.index_path)
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict):
+            return
+        if int(payload.get("schema_version") or 0) != INVENTORY_CACHE_SCHEMA_VERSION:
+            return
+        if payload.get("experiment_root") != str(self.experiment_root):
+            return
+        entries = payload.get("runs")
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def frames_path(self, run_id: str) -> Path:
+        return self.cache_dir / "runs" / f"{run_id}.frames.json"
+
+    def summary(self, run_dir: Path):
+        run_id = run_dir.name
+        signature = _run_dir_signature(run_dir)
+        entry = self.entries.get(run_id)
+        if (
+            isinstance(entry, dict)
+            and entry.get("run_dir") == str(run_dir)
+            and entry.get("signature") == signature
+            and isinstance(entry.get("summary"), dict)
+        ):
+            self.hits += 1
+            return entry["summary"], None
+
+        self.misses += 1
+        summary, frame_rows = _scan_run_dir(run_dir)
+        try:
+            _write_json_atomic(self.frames_path(run_id), {"run_id": run_id, "frames": frame_rows})
+        except OSError:
+            self.entries.pop(run_id, None)
+        else:
+            self.entries[run_id] = {"run_dir": str(run_dir), "signature": signature, "summary": summary}
+        self._dirty = True
+        return summary, frame_rows
+
+    def load_frames(self, run_dir: Path):
+        try:
+            payload = _load_json(self.frames_path(run_dir.name))
+            frames = payload["frames"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return list(build_frame_index(run_dir, run_id=run_dir.name)["frames"])
+        if not isinstance(frames, list):
+            return list(build_frame_index(run_dir, run_id=run_dir.name)["frames"])
+        return frames
+
+    def save(self, run_dirs):
+        live = {path.name for path in run_dirs}
+        for run_id in [run_id for run_id in self.entries if run_id not in live]:
+            self.entries.pop(run_id, None)
+            try:
+                self.frames_path(run_id).unlink()
+            except OSError:
+                pass
+            self._dirty = True
+        if not self._dirty:
+            return
+        try:
+            _write_json_atomic(
+                self.index_path,
+                {
+                    "schema_version": INVENTORY_CACHE_SCHEMA_VERSION,
+                    "experiment_root": str(self.experiment_root),
+                    "runs": self.entries,
+                },
+            )
+        except OSError:
+            return
+        self._dirty = False
+
+
+class LazyFrameIndex(Mapping):
+    """Per-run frame rows, read from the inventory cache on first access."""
+
+    def __init__(self, cache: RunInventoryCache | None, run_dirs: dict):
+        self._cache = cache
+        self._run_dirs = dict(run_dirs)
+        self._frames = {}
+
+    def _set(self, run_id: str, frame_rows):
+        self._frames[run_id] = frame_rows
+
+    def __getitem__(self, run_id):
+        if run_id not in self._run_dirs:
+            raise KeyError(run_id)
+        if run_id not in self._frames:
+            run_dir = self._run_dirs[run_id]
+            if self._cache is None:
+                self._frames[run_id] = list(build_frame_index(run_dir, run_id=run_id)["frames"])
+            else:
+                self._frames[run_id] = self._cache.load_frames(run_dir)
+        return self._frames[run_id]
+
+    def __iter__(self):
+        return iter(self._run_dirs)
+
+    def __len__(self):
+        return len(self._run_dirs)
+
+
+def _inventory_run_row(run_id: str, run_dir: Path, summary: dict, stream_capture_row: dict, *, metadata_row=None):
+    row = {
+        "run_id": run_id,
+        "metadata_match_status": "matched_csv" if metadata_row is not None else "unmatched_run_dir",
+        "metadata_row_index": metadata_row["metadata_row_index"] if metadata_row is not None else None,
+        "run_dir": str(run_dir),
+        "process_name": summary["process_name"],
+        "phase_name": summary["phase_name"],
+        "capture_mode": stream_capture_row.get("capture_mode"),
+        "dataset_process_name": stream_capture_row.get("dataset_process_name"),
+        "outcome": summary["outcome"],
+        "error_message": summary["error_message"],
+        "started_at_utc": summary["started_at_utc"],
+        "ended_at_utc": summary["ended_at_utc"],
+        "capture_file_count": summary["capture_file_count"],
+        "indexed_frame_count": summary["indexed_frame_count"],
+        "analysis_row_count": summary["analysis_row_count"],
+        "event_row_count": summary["event_row_count"],
+        "image_width": summary["image_width"],
+        "image_height": summary["image_height"],
+        "first_flash_delay_us": summary["first_flash_delay_us"],
+        "last_flash_delay_us": summary["last_flash_delay_us"],
+        "timecourse_emergence_us": summary["timecourse_emergence_us"],
+        "timecourse_start_us": summary["timecourse_start_us"],
+        "timecourse_step_us": summary["timecourse_step_us"],
+        "timecourse_window_us": summary["timecourse_window_us"],
+        "timecourse_planned_frame_count": summary["timecourse_planned_frame_count"],
+        "gripper_refresh_suspended": stream_capture_row.get("gripper_refresh_suspended"),
+        "tracking_mode": stream_capture_row.get("tracking_mode") or TRACKING_MODE_DYNAMIC,
+        "missing_indexed_files": summary["missing_indexed_files"],
+        "frame_index_csv_path": None,
+        "frame_index_json_path": None,
+    }
+    if metadata_row is not None:
+        for key, value in metadata_row.items():
+            row[key] = value
+    return row
+
+
 def build_stage0_inventory(
     experiment_root: str | Path,
     *,
     include_unmatched: bool = False,
     run_ids: list[str] | None = None,
     limit_runs: int | None = None,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
 ):
     experiment_path = resolve_experiment_root(experiment_root)
     process_root = process_root_for_experiment(experiment_path)
@@ -456,11 +688,21 @@ def build_stage0_inventory(
     stream_capture_rows, stream_capture_log_path = load_stream_capture_rows(experiment_path)
     discovered_run_dirs = discover_run_dirs(experiment_path)
     run_dir_by_id = {path.name: path for path in discovered_run_dirs}
+    cache = RunInventoryCache(experiment_path, Path(cache_dir) if cache_dir else None) if use_cache else None
 
     matched_run_ids = []
     missing_metadata_run_ids = []
     all_rows_by_id = {}
-    frames_by_run_id = {}
+    frames_by_run_id = LazyFrameIndex(cache, run_dir_by_id)
+
+    def _summary(run_dir: Path):
+        if cache is not None:
+            summary, frame_rows = cache.summary(run_dir)
+        else:
+            summary, frame_rows = _scan_run_dir(run_dir)
+        if frame_rows is not None:
+            frames_by_run_id._set(run_dir.name, frame_rows)
+        return summary
 
     for metadata_row in metadata_rows:
         run_id = metadata_row.get("metadata_dataset_name")
@@ -469,98 +711,31 @@ def build_stage0_inventory(
             missing_metadata_run_ids.append(run_id)
             continue
 
-        run_meta = _load_json(run_dir / "run_meta.json")
-        events = list(_iter_jsonl(run_dir / "events.jsonl"))
-        analyses = list(_iter_jsonl(run_dir / "analysis.jsonl"))
-        frame_index = build_frame_index(run_dir, run_id=run_id)
-        frame_rows = list(frame_index["frames"])
-        frames_by_run_id[run_id] = frame_rows
         matched_run_ids.append(run_id)
-        stream_capture_row = stream_capture_rows.get(run_id, {})
-
-        row = {
-            "run_id": run_id,
-            "metadata_match_status": "matched_csv",
-            "metadata_row_index": metadata_row["metadata_row_index"],
-            "run_dir": str(run_dir),
-            "process_name": _clean_text(run_meta.get("process_name")),
-            "phase_name": _clean_text(run_meta.get("phase_name")),
-            "capture_mode": stream_capture_row.get("capture_mode"),
-            "dataset_process_name": stream_capture_row.get("dataset_process_name"),
-            "outcome": _clean_text(run_meta.get("outcome")),
-            "error_message": _clean_text(run_meta.get("error_message")),
-            "started_at_utc": _clean_text(run_meta.get("started_at_utc")),
-            "ended_at_utc": _clean_text(run_meta.get("ended_at_utc")),
-            "capture_file_count": _count_capture_files(run_dir),
-            "indexed_frame_count": len(frame_rows),
-            "analysis_row_count": len(analyses),
-            "event_row_count": len(events),
-            "image_width": frame_rows[0]["width"] if frame_rows else None,
-            "image_height": frame_rows[0]["height"] if frame_rows else None,
-            "first_flash_delay_us": frame_rows[0]["flash_delay_us"] if frame_rows else None,
-            "last_flash_delay_us": frame_rows[-1]["flash_delay_us"] if frame_rows else None,
-            "timecourse_emergence_us": frame_index["timecourse_emergence_us"],
-            "timecourse_start_us": frame_index["timecourse_start_us"],
-            "timecourse_step_us": frame_index["timecourse_step_us"],
-            "timecourse_window_us": frame_index["timecourse_window_us"],
-            "timecourse_planned_frame_count": frame_index["timecourse_planned_frame_count"],
-            "gripper_refresh_suspended": stream_capture_row.get("gripper_refresh_suspended"),
-            "tracking_mode": stream_capture_row.get("tracking_mode") or TRACKING_MODE_DYNAMIC,
-            "missing_indexed_files": sum(1 for frame in frame_rows if not frame["image_exists"]),
-            "frame_index_csv_path": None,
-            "frame_index_json_path": None,
-        }
-        for key, value in metadata_row.items():
-            row[key] = value
-        all_rows_by_id[run_id] = row
+        all_rows_by_id[run_id] = _inventory_run_row(
+            run_id,
+            run_dir,
+            _summary(run_dir),
+            stream_capture_rows.get(run_id, {}),
+            metadata_row=metadata_row,
+        )
 
     unmatched_rows = []
     for run_dir in discovered_run_dirs:
         if run_dir.name in matched_run_ids:
             continue
-        run_meta = _load_json(run_dir / "run_meta.json")
-        events = list(_iter_jsonl(run_dir / "events.jsonl"))
-        analyses = list(_iter_jsonl(run_dir / "analysis.jsonl"))
-        frame_index = build_frame_index(run_dir, run_id=run_dir.name)
-        frame_rows = list(frame_index["frames"])
-        frames_by_run_id[run_dir.name] = frame_rows
-        stream_capture_row = stream_capture_rows.get(run_dir.name, {})
-
-        row = {
-            "run_id": run_dir.name,
-            "metadata_match_status": "unmatched_run_dir",
-            "metadata_row_index": None,
-            "run_dir": str(run_dir),
-            "process_name": _clean_text(run_meta.get("process_name")),
-            "phase_name": _clean_text(run_meta.get("phase_name")),
-            "capture_mode": stream_capture_row.get("capture_mode"),
-            "dataset_process_name": stream_capture_row.get("dataset_process_name"),
-            "outcome": _clean_text(run_meta.get("outcome")),
-            "error_message": _clean_text(run_meta.get("error_message")),
-            "started_at_utc": _clean_text(run_meta.get("started_at_utc")),
-            "ended_at_utc": _clean_text(run_meta.get("ended_at_utc")),
-            "capture_file_count": _count_capture_files(run_dir),
-            "indexed_frame_count": len(frame_rows),
-            "analysis_row_count": len(analyses),
-            "event_row_count": len(events),
-            "image_width": frame_rows[0]["width"] if frame_rows else None,
-            "image_height": frame_rows[0]["height"] if frame_rows else None,
-            "first_flash_delay_us": frame_rows[0]["flash_delay_us"] if frame_rows else None,
-            "last_flash_delay_us": frame_rows[-1]["flash_delay_us"] if frame_rows else None,
-            "timecourse_emergence_us": frame_index["timecourse_emergence_us"],
-            "timecourse_start_us": frame_index["timecourse_start_us"],
-            "timecourse_step_us": frame_index["timecourse_step_us"],
-            "timecourse_window_us": frame_index["timecourse_window_us"],
-            "timecourse_planned_frame_count": frame_index["timecourse_planned_frame_count"],
-            "gripper_refresh_suspended": stream_capture_row.get("gripper_refresh_suspended"),
-            "tracking_mode": stream_capture_row.get("tracking_mode") or TRACKING_MODE_DYNAMIC,
-            "missing_indexed_files": sum(1 for frame in frame_rows if not frame["image_exists"]),
-            "frame_index_csv_path": None,
-            "frame_index_json_path": None,
-        }
+        row = _inventory_run_row(
+            run_dir.name,
+            run_dir,
+            _summary(run_dir),
+            stream_capture_rows.get(run_dir.name, {}),
+        )
         all_rows_by_id[run_dir.name] = row
         unmatched_rows.append(row)
 
+    if cache is not None:
+        cache.save(discovered_run_dirs)
+
     unmatched_rows.sort(key=lambda item: item["run_id"])
 
     if run_ids:
@@ -16,7 +16,10 @@ from tools.stream_analysis.dataset import (
     default_output_root,
 )
 from tools.stream_analysis import fov as fov_mod
+from tools.stream_analysis import nozzle as nozzle_mod
 from tools.stream_analysis import volume as volume_mod
+from tools.stream_analysis.parallel import attach_run_timings, export_selected_runs
+from tools.stream_analysis.plotting import submit_plot
 
 
 FIT_STAGE_DIRNAME = "stage_05_fit"
@@ -220,7 +223,11 @@ def _build_phase_feature_rows(
     width_smooth_window: int,
 ):
     attached_edge_rows_by_capture = {}
-    for edge_row in stage4_run["edge_rows"]:
+    edge_rows = volume_mod.silhouette_mod._stage3_edge_rows(
+        stage4_run["edge_columns"],
+        stage4_run["component_rows"],
+    )
+    for edge_row in edge_rows:
         if _clean_text(edge_row.get("component_id")) != "attached_primary":
             continue
         attached_edge_rows_by_capture.setdefault(_capture_key(edge_row), []).append(edge_row)
@@ -3920,6 +3927,8 @@ def _build_stage5_run(
     volume_uncertainty_sample_count: int = VOLUME_UNCERTAINTY_SAMPLE_COUNT,
     volume_uncertainty_seed: int = VOLUME_UNCERTAINTY_SEED,
     tail_uncertainty_score_tolerance: float = TAIL_UNCERTAINTY_SCORE_TOLERANCE,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
 ):
     stage4_run = volume_mod._build_stage4_run(
         run_id,
@@ -3940,6 +3949,8 @@ def _build_stage5_run(
         corridor_width_frac=corridor_width_frac,
         nozzle_guard_px=nozzle_guard_px,
         min_component_area_px=min_component_area_px,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
     )
     phase_feature_rows = _build_phase_feature_rows(
         stage4_run,
@@ -4171,6 +4182,7 @@ def _write_stage5_outputs(
     referenced_stage5_manifest_json: str | None = None,
     stage4_summary: dict | None = None,
     shift_events: list[dict] | None = None,
+    render_cache=None,
 ):
     stage4_run = dict(stage5_run.get("stage4_run") or {})
     feature_rows = list(stage5_run.get("phase_feature_rows") or [])
@@ -4243,23 +4255,37 @@ def _write_stage5_outputs(
     _write_json(paths["phase_boundaries_json"], stage5_run["phase_boundaries"])
     _write_json(paths["steady_fit_json"], stage5_run["steady_fit_payload"])
     _write_json(paths["middle_extrapolation_json"], stage5_run["middle_payload"])
-    _plot_vt_fit(
-        paths["vt_fit_png"],
-        feature_rows,
-        run_id=run_id,
-        steady_fit=resolved_steady_fit,
-        middle=resolved_middle,
-        fov_report=stage4_run.get("fov_report") or {},
-        tail_onset=resolved_tail_onset,
-    )
-    _plot_width_trace(
-        paths["width_trace_png"],
-        feature_rows,
-        run_id=run_id,
-        steady_fit=resolved_steady_fit,
-        tail_onset=resolved_tail_onset,
-        fov_report=stage4_run.get("fov_report") or {},
-    )
+    vt_fit_kwargs = {
+        "run_id": run_id,
+        "steady_fit": resolved_steady_fit,
+        "middle": resolved_middle,
+        "fov_report": stage4_run.get("fov_report") or {},
+        "tail_onset": resolved_tail_onset,
+    }
+    width_trace_kwargs = {
+        "run_id": run_id,
+        "steady_fit": resolved_steady_fit,
+        "tail_onset": resolved_tail_onset,
+        "fov_report": stage4_run.get("fov_report") or {},
+    }
+    if render_cache is None:
+        submit_plot(_plot_vt_fit, paths["vt_fit_png"], feature_rows, **vt_fit_kwargs)
+        submit_plot(_plot_width_trace, paths["width_trace_png"], feature_rows, **width_trace_kwargs)
+    else:
+        render_cache.render(
+            paths["vt_fit_png"],
+            ["vt_fit", feature_rows, vt_fit_kwargs],
+            _plot_vt_fit,
+            feature_rows,
+            **vt_fit_kwargs,
+        )
+        render_cache.render(
+            paths["width_trace_png"],
+            ["width_trace", feature_rows, width_trace_kwargs],
+            _plot_width_trace,
+            feature_rows,
+            **width_trace_kwargs,
+        )
 
     resolved_parameters = dict(parameters or {})
     run_manifest = {
@@ -4297,6 +4323,74 @@ def _write_stage5_outputs(
     return paths
 
 
+def _export_stage5_run(
+    run_row: dict,
+    frame_rows: list[dict],
+    output_path: Path,
+    *,
+    parameter_payload: dict,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
+
+    stage5_run = _build_stage5_run(
+        run_id,
+        frame_rows,
+        tracking_mode=tracking_mode,
+        **parameter_payload,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
+    output_paths = _write_stage5_outputs(
+        output_path,
+        run_id,
+        stage5_run,
+        run_dir=run_row.get("run_dir"),
+        parameters=parameter_payload,
+        analysis_source_mode="raw",
+    )
+    return _stage5_run_manifest(run_row, stage5_run, output_paths)
+
+
+def _stage5_run_manifest(run_row: dict, stage5_run: dict, output_paths: dict):
+    return {
+        "run_id": str(run_row["run_id"]),
+        "run_dir": run_row["run_dir"],
+        "phase_features_csv": str(output_paths["phase_features_csv"]),
+        "tail_start_candidates_csv": str(output_paths["tail_start_candidates_csv"]),
+        "phase_boundaries_json": str(output_paths["phase_boundaries_json"]),
+        "steady_fit_json": str(output_paths["steady_fit_json"]),
+        "middle_extrapolation_json": str(output_paths["middle_extrapolation_json"]),
+        "vt_fit_png": str(output_paths["vt_fit_png"]),
+        "width_trace_png": str(output_paths["width_trace_png"]),
+        "fit_manifest_json": str(output_paths["fit_manifest_json"]),
+        "phase_feature_row_count": len(stage5_run["phase_feature_rows"]),
+        "steady_fit_status": stage5_run["steady_fit"].get("steady_fit_status"),
+        "tail_onset_status": stage5_run["tail_onset"].get("tail_onset_status"),
+        "tail_detection_mode": stage5_run["tail_onset"].get("tail_detection_mode"),
+        "tail_start_selection_mode": stage5_run["tail_onset"].get(
+            "tail_start_selection_mode"
+        ),
+        "tail_confirmation_capture_index": stage5_run["tail_onset"].get(
+            "tail_confirmation_capture_index"
+        ),
+        "tail_shoulder_end_capture_index": stage5_run["tail_onset"].get(
+            "tail_shoulder_end_capture_index"
+        ),
+        "tail_start_capture_index": stage5_run["tail_onset"].get(
+            "tail_start_capture_index"
+        ),
+        "middle_extrapolation_status": stage5_run["middle_extrapolation"].get(
+            "middle_extrapolation_status"
+        ),
+        "partial_total_without_tail_nl": stage5_run["middle_extrapolation"].get(
+            "partial_total_without_tail_nl"
+        ),
+    }
+
+
 def export_stage5_fit(
     experiment_root: str | Path,
     *,
@@ -4360,6 +4454,9 @@ def export_stage5_fit(
     volume_uncertainty_sample_count: int = VOLUME_UNCERTAINTY_SAMPLE_COUNT,
     volume_uncertainty_seed: int = VOLUME_UNCERTAINTY_SEED,
     tail_uncertainty_score_tolerance: float = TAIL_UNCERTAINTY_SCORE_TOLERANCE,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
+    workers: int | None = 1,
 ):
     inventory = build_stage0_inventory(
         experiment_root,
@@ -4433,70 +4530,37 @@ def export_stage5_fit(
         tail_uncertainty_score_tolerance=tail_uncertainty_score_tolerance,
     )
 
-    run_manifests = []
-    for run_row in inventory["selected_runs"]:
-        run_id = str(run_row["run_id"])
-        tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
-        frame_rows = list(inventory["frames_by_run_id"][run_id])
-        if not frame_rows:
-            raise ValueError(f"No frame index rows available for run: {run_id}")
-
-        stage5_run = _build_stage5_run(
-            run_id,
-            frame_rows,
-            tracking_mode=tracking_mode,
-            **parameter_payload,
-        )
-        output_paths = _write_stage5_outputs(
-            output_path,
-            run_id,
-            stage5_run,
-            run_dir=run_row.get("run_dir"),
-            parameters=parameter_payload,
-            analysis_source_mode="raw",
-        )
+    run_manifests, run_timings = export_selected_runs(
+        _export_stage5_run,
+        inventory,
+        output_path,
+        workers=workers,
+        parameter_payload=parameter_payload,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
 
-        run_manifests.append(
-            {
-                "run_id": run_id,
-                "run_dir": run_row["run_dir"],
-                "phase_features_csv": str(output_paths["phase_features_csv"]),
-                "tail_start_candidates_csv": str(output_paths["tail_start_candidates_csv"]),
-                "phase_boundaries_json": str(output_paths["phase_boundaries_json"]),
-                "steady_fit_json": str(output_paths["steady_fit_json"]),
-                "middle_extrapolation_json": str(output_paths["middle_extrapolation_json"]),
-                "vt_fit_png": str(output_paths["vt_fit_png"]),
-                "width_trace_png": str(output_paths["width_trace_png"]),
-                "fit_manifest_json": str(output_paths["fit_manifest_json"]),
-                "phase_feature_row_count": len(stage5_run["phase_feature_rows"]),
-                "steady_fit_status": stage5_run["steady_fit"].get("steady_fit_status"),
-                "tail_onset_status": stage5_run["tail_onset"].get("tail_onset_status"),
-                "tail_detection_mode": stage5_run["tail_onset"].get("tail_detection_mode"),
-                "tail_start_selection_mode": stage5_run["tail_onset"].get(
-                    "tail_start_selection_mode"
-                ),
-                "tail_confirmation_capture_index": stage5_run["tail_onset"].get(
-                    "tail_confirmation_capture_index"
-                ),
-                "tail_shoulder_end_capture_index": stage5_run["tail_onset"].get(
-                    "tail_shoulder_end_capture_index"
-                ),
-                "tail_start_capture_index": stage5_run["tail_onset"].get(
-                    "tail_start_capture_index"
-                ),
-                "middle_extrapolation_status": stage5_run["middle_extrapolation"].get(
-                    "middle_extrapolation_status"
-                ),
-                "partial_total_without_tail_nl": stage5_run["middle_extrapolation"].get(
-                    "partial_total_without_tail_nl"
-                ),
-            }
-        )
+    manifest = _write_stage5_manifest(
+        inventory["experiment_root"],
+        output_path,
+        run_manifests,
+        parameter_payload=parameter_payload,
+    )
+    attach_run_timings(manifest, run_timings, workers=workers)
+    return manifest
 
+
+def _write_stage5_manifest(
+    experiment_root: str,
+    output_path: Path,
+    run_manifests: list[dict],
+    *,
+    parameter_payload: dict,
+):
     manifest = {
         "schema_version": 1,
         "stage": "fit",
-        "experiment_root": inventory["experiment_root"],
+        "experiment_root": experiment_root,
         "output_root": str(output_path),
         "selected_run_count": len(run_manifests),
         "run_ids": [row["run_id"] for row in run_manifests],
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+import json
+import mmap
+import re
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+CONTAINER_FILENAME = "frames.lcfc"
+CONTAINER_INDEX_SUFFIX = ".idx.jsonl"
+CONTAINER_MAGIC = b"LCFRAMES"
+CONTAINER_VERSION = 1
+RECORD_MAGIC = b"FREC"
+
+# magic, version, header size, flags, created (unix ns), reserved
+FILE_HEADER = struct.Struct("<8sHHIQ40s")
+# magic, codec, dtype, channels (0 for 2-D), height, width, capture index, name len, meta len, payload len, crc32
+RECORD_HEADER = struct.Struct("<4sBBHIIiHIQI")
+
+CODEC_RAW = "raw"
+CODEC_ZLIB = "zlib"
+CODEC_PNG = "png"
+CODECS = (CODEC_RAW, CODEC_ZLIB, CODEC_PNG)
+_CODEC_IDS = {CODEC_RAW: 0, CODEC_ZLIB: 1, CODEC_PNG: 2}
+_CODEC_NAMES = {value: key for key, value in _CODEC_IDS.items()}
+_DTYPE_IDS = {"uint8": 0, "uint16": 1, "float32": 2}
+_DTYPE_NAMES = {value: key for key, value in _DTYPE_IDS.items()}
+
+INDEX_FLUSH_EVERY = 32
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+_CAPTURE_INDEX_RE = re.compile(r"(\d+)(?!.*\d)")
+
+_reader_cache = {}
+_reader_cache_lock = threading.Lock()
+
+
+def container_index_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + CONTAINER_INDEX_SUFFIX)
+
+
+def _encode_payload(image: np.ndarray, codec: str, compression_level: int) -> bytes:
+    if codec == CODEC_RAW:
+        return np.ascontiguousarray(image).tobytes()
+    if codec == CODEC_ZLIB:
+        return zlib.compress(np.ascontiguousarray(image).tobytes(), int(compression_level))
+    ok, encoded = cv2.imencode(".png", image, [int(cv2.IMWRITE_PNG_COMPRESSION), int(compression_level)])
+    if not ok:
+        raise ValueError("PNG encoding failed")
+    return encoded.tobytes()
+
+
+def _capture_index_from_name(name: str) -> int | None:
+    match = _CAPTURE_INDEX_RE.search(Path(name).stem)
+    return int(match.group(1)) if match else None
+
+
+class FrameContainerWriter:
+    """
+    Appends frames to one container file plus its JSONL index.
+
+    Records are self-describing, so the index can be rebuilt by scanning the
+    container if it is lost or truncated. ``append`` is thread-safe and
+    compresses outside the lock. ``capture_index`` defaults to the last number
+    in the record name; pass -1 to make a record addressable by name only.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        codec: str = CODEC_ZLIB,
+        compression_level: int = 1,
+        index_flush_every: int = INDEX_FLUSH_EVERY,
+    ):
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported frame container codec: {codec}")
+        self.path = Path(path)
+        self.index_path = container_index_path(self.path)
+        self.codec = codec
+        self.compression_level = int(compression_level)
+        self._index_flush_every = max(1, int(index_flush_every))
+        self._lock = threading.Lock()
+        self._unflushed = 0
+        self.frame_count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        self._fp = self.path.open("ab")
+        if new_file:
+            self._fp.write(
+                FILE_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, FILE_HEADER.size, 0, time.time_ns(), b"")
+            )
+        else:
+            _read_file_header(self.path)
+        self._index_fp = self.index_path.open("a", encoding="utf-8")
+
+    def append(
+        self,
+        name: str,
+        image: np.ndarray,
+        *,
+        capture_index: int | None = None,
+        color_order: str = "bgr",
+        metadata: dict | None = None,
+    ) -> dict:
+        image = np.asarray(image)
+        if image.dtype.name not in _DTYPE_IDS:
+            raise ValueError(f"Unsupported frame dtype: {image.dtype}")
+        if image.ndim not in (2, 3):
+            raise ValueError(f"Frames must be 2-D or 3-D arrays, got shape {image.shape}")
+        height, width = int(image.shape[0]), int(image.shape[1])
+        channels = 0 if image.ndim == 2 else int(image.shape[2])
+        if capture_index is None:
+            capture_index = _capture_index_from_name(name)
+        elif int(capture_index) < 0:
+            capture_index = None
+        name_bytes = str(name).encode("utf-8")
+        meta = {"color_order": str(color_order), **dict(metadata or {})}
+        meta_bytes = json.dumps(meta, default=str).encode("utf-8")
+        payload = _encode_payload(image, self.codec, self.compression_level)
+        header = RECORD_HEADER.pack(
+            RECORD_MAGIC,
+            _CODEC_IDS[self.codec],
+            _DTYPE_IDS[image.dtype.name],
+            channels,
+            height,
+            width,
+            -1 if capture_index is None else int(capture_index),
+            len(name_bytes),
+            len(meta_bytes),
+            len(payload),
+            zlib.crc32(payload),
+        )
+
+        with self._lock:
+            record_offset = self._fp.tell()
+            self._fp.write(header)
+            self._fp.write(name_bytes)
+            self._fp.write(meta_bytes)
+            self._fp.write(payload)
+            entry = {
+                "name": str(name),
+                "capture_index": None if capture_index is None else int(capture_index),
+                "record_offset": int(record_offset),
+                "payload_offset": int(record_offset + RECORD_HEADER.size + len(name_bytes) + len(meta_bytes)),
+                "payload_length": len(payload),
+                "codec": self.codec,
+                "dtype": image.dtype.name,
+                "shape": list(image.shape),
+                "crc32": zlib.crc32(payload),
+                "metadata": meta,
+            }
+            self._index_fp.write(json.dumps(entry, default=str) + "\n")
+            self.frame_count += 1
+            self._unflushed += 1
+            if self._unflushed >= self._index_flush_every:
+                self._flush_locked()
+        return entry
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # Data before index, so an index line never points past the container end.
+        self._fp.flush()
+        self._index_fp.flush()
+        self._unflushed = 0
+
+    def close(self):
+        with self._lock:
+            if self._fp.closed:
+                return
+            self._flush_locked()
+            self._fp.close()
+            self._index_fp.close()
+        _drop_cached_reader(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+def _read_file_header(path: Path):
+    with Path(path).open("rb") as fp:
+        raw = fp.read(FILE_HEADER.size)
+    if len(raw) < FILE_HEADER.size:
+        raise ValueError(f"Not a frame container: {path}")
+    magic, version, header_size, _flags, created_ns, _reserved = FILE_HEADER.unpack(raw)
+    if magic != CONTAINER_MAGIC:
+        raise ValueError(f"Not a frame container: {path}")
+    if int(version) > CONTAINER_VERSION:
+        raise ValueError(f"Unsupported frame container version {version}: {path}")
+    return {"version": int(version), "header_size": int(header_size), "created_ns": int(created_ns)}
+
+
+class FrameContainerReader:
+    """
+    Random access to a frame container through a read-only memory map.
+
+    Raw frames are returned as zero-copy read-only views of the map; compressed
+    frames are decoded on access. Records appended after the last index line
+    (a crash before the index was flushed) are recovered by scanning.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.header = _read_file_header(self.path)
+        self._fp = self.path.open("rb")
+        self._size = self.path.stat().st_size
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self.entries = []
+        self._by_name = {}
+        self._by_capture_index = {}
+        self._load_index()
+
+    def _load_index(self):
+        scan_from = int(self.header["header_size"])
+        index_path = container_index_path(self.path)
+        if index_path.exists():
+            with index_path.open("r", encoding="utf-8") as fp:
+                for line in fp:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    end = int(entry["payload_offset"]) + int(entry["payload_length"])
+                    if end > self._size:
+                        break
+                    self._add_entry(entry)
+                    scan_from = max(scan_from, end)
+        for entry in self._scan_records(scan_from):
+            self._add_entry(entry)
+
+    def _scan_records(self, offset: int):
+        while offset + RECORD_HEADER.size <= self._size:
+            (
+                magic,
+                codec_id,
+                dtype_id,
+                channels,
+                height,
+                width,
+                capture_index,
+                name_len,
+                meta_len,
+                payload_len,
+                crc,
+            ) = RECORD_HEADER.unpack_from(self._mm, offset)
+            payload_offset = offset + RECORD_HEADER.size + name_len + meta_len
+            if magic != RECORD_MAGIC or payload_offset + payload_len > self._size:
+                return
+            name_start = offset + RECORD_HEADER.size
+            name = bytes(self._mm[name_start:name_start + name_len]).decode("utf-8")
+            metadata = json.loads(bytes(self._mm[name_start + name_len:payload_offset]) or b"{}")
+            shape = [int(height), int(width)] if int(channels) == 0 else [int(height), int(width), int(channels)]
+            yield {
+                "name": name,
+                "capture_index": None if capture_index < 0 else int(capture_index),
+                "record_offset": int(offset),
+                "payload_offset": int(payload_offset),
+                "payload_length": int(payload_len),
+                "codec": _CODEC_NAMES[int(codec_id)],
+                "dtype": _DTYPE_NAMES[int(dtype_id)],
+                "shape": shape,
+                "crc32": int(crc),
+                "metadata": metadata,
+            }
+            offset = payload_offset + payload_len
+
+    def _add_entry(self, entry: dict):
+        self.entries.append(entry)
+        self._by_name[str(entry["name"])] = entry
+        capture_index = entry.get("capture_index")
+        if capture_index is not None:
+            # The first record wins, so aux images that share an index do not shadow the frame.
+            self._by_capture_index.setdefault(int(capture_index), entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return str(name) in self._by_name
+
+    def names(self) -> list[str]:
+        return [str(entry["name"]) for entry in self.entries]
+
+    def capture_indices(self) -> list[int]:
+        return sorted(self._by_capture_index)
+
+    def entry(self, key) -> dict:
+        entry = self._by_capture_index.get(int(key)) if isinstance(key, (int, np.integer)) else self._by_name.get(str(key))
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def read(self, key, *, verify: bool = False) -> np.ndarray:
+        entry = self.entry(key)
+        offset = int(entry["payload_offset"])
+        length = int(entry["payload_length"])
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(int(value) for value in entry["shape"])
+        if verify and zlib.crc32(self._mm[offset:offset + length]) != int(entry["crc32"]):
+            raise ValueError(f"Frame container record is corrupt: {entry['name']}")
+        if entry["codec"] == CODEC_RAW:
+            return np.frombuffer(self._mm, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+        if entry["codec"] == CODEC_ZLIB:
+            return np.frombuffer(zlib.decompress(self._mm[offset:offset + length]), dtype=dtype).reshape(shape)
+        encoded = np.frombuffer(self._mm, dtype=np.uint8, count=length, offset=offset)
+        image = cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"Could not decode frame container record: {entry['name']}")
+        return image
+
+    def read_image(self, key, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+        # Matches cv2.imread(path, flags) for the frame stored under key.
+        image = self.read(key)
+        color_order = str(self.entry(key).get("metadata", {}).get("color_order") or "bgr")
+        if flags == cv2.IMREAD_UNCHANGED:
+            if color_order == "rgb" and image.ndim == 3 and image.shape[2] == 3:
+                return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            return image
+        if image.ndim == 2:
+            return image if flags == cv2.IMREAD_GRAYSCALE else cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if flags == cv2.IMREAD_GRAYSCALE:
+            return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY if color_order == "rgb" else cv2.COLOR_BGR2GRAY)
+        if color_order == "rgb":
+            return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        return np.array(image, copy=True)
+
+    def __iter__(self):
+        for entry in self.entries:
+            yield entry, self.read(entry["name"])
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            # Raw frames handed out as views still reference the map; it is
+            # released when the last of them is garbage collected.
+            pass
+        finally:
+            self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+def _drop_cached_reader(path: Path):
+    with _reader_cache_lock:
+        cached = _reader_cache.pop(str(Path(path).resolve()), None)
+    if cached is not None:
+        cached[1].close()
+
+
+def _cached_reader(container_path: Path):
+    key = str(container_path.resolve())
+    try:
+        stat = container_path.stat()
+    except OSError:
+        return None
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _reader_cache_lock:
+        cached = _reader_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            reader = FrameContainerReader(container_path)
+        except (OSError, ValueError):
+            return None
+        if cached is not None:
+            cached[1].close()
+        _reader_cache[key] = (signature, reader)
+        return reader
+
+
+def container_reader_for(image_path: str | Path):
+    # The container that stands in for the loose image files of a run directory.
+    container_path = Path(image_path).parent / CONTAINER_FILENAME
+    if not container_path.exists():
+        return None
+    reader = _cached_reader(container_path)
+    if reader is None or Path(image_path).name not in reader:
+        return None
+    return reader
+
+
+def image_available(image_path: str | Path) -> bool:
+    return Path(image_path).exists() or container_reader_for(image_path) is not None
+
+
+def read_image(image_path: str | Path, flags: int = cv2.IMREAD_COLOR):
+    # cv2.imread that falls back to the run's frame container for packed images.
+    if Path(image_path).exists():
+        return cv2.imread(str(image_path), flags)
+    reader = container_reader_for(image_path)
+    if reader is None:
+        return None
+    return reader.read_image(Path(image_path).name, flags)
+
+
+def convert_image_folder(
+    folder: str | Path,
+    *,
+    output_path: str | Path | None = None,
+    codec: str = CODEC_PNG,
+    compression_level: int = 1,
+    remove_sources: bool = False,
+    verify: bool = True,
+) -> dict:
+    # Packs every loose image in folder into one container. Images are stored
+    # exactly as cv2 decodes them (BGR), so read_image returns the same pixels.
+    folder = Path(folder).expanduser().resolve()
+    container_path = Path(output_path).expanduser().resolve() if output_path else folder / CONTAINER_FILENAME
+    image_paths = sorted(path for path in folder.iterdir() if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES)
+    # Capture indices go to the largest name series (the frames); overlays and
+    # other aux images that reuse an index stay addressable by name only.
+    series_counts = {}
+    for image_path in image_paths:
+        series = _CAPTURE_INDEX_RE.sub("", image_path.stem)
+        series_counts[series] = series_counts.get(series, 0) + 1
+    frame_series = min(series_counts, key=lambda series: (-series_counts[series], series)) if series_counts else None
+
+    started = time.perf_counter()
+    existing = set()
+    if container_path.exists():
+        with FrameContainerReader(container_path) as reader:
+            existing = set(reader.names())
+    packed = []
+    skipped = []
+    source_bytes = 0
+    with FrameContainerWriter(container_path, codec=codec, compression_level=compression_level) as writer:
+        for image_path in image_paths:
+            if image_path.name in existing:
+                skipped.append(image_path.name)
+                continue
+            image = cv2.imread(str(image_path), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                skipped.append(image_path.name)
+                continue
+            is_frame = _CAPTURE_INDEX_RE.sub("", image_path.stem) == frame_series
+            writer.append(
+                image_path.name,
+                image,
+                capture_index=_capture_index_from_name(image_path.name) if is_frame else -1,
+                color_order="bgr",
+                metadata={"source_suffix": image_path.suffix.lower()},
+            )
+            source_bytes += image_path.stat().st_size
+            packed.append(image_path)
+
+    if verify and packed:
+        # Lossy sources (JPEG) are compared against their own decode, which is
+        # exactly what the offline tools saw before packing.
+        with FrameContainerReader(container_path) as reader:
+            for image_path in packed:
+                original = cv2.imread(str(image_path), cv2.IMREAD_UNCHANGED)
+                if not np.array_equal(reader.read(image_path.name, verify=True), original):
+                    raise ValueError(f"Packed frame does not match its source: {image_path}")
+    if remove_sources:
+        for image_path in packed:
+            image_path.unlink()
+
+    return {
+        "folder": str(folder),
+        "container_path": str(container_path),
+        "index_path": str(container_index_path(container_path)),
+        "codec": codec,
+        "packed_count": len(packed),
+        "skipped_count": len(skipped),
+        "source_bytes": int(source_bytes),
+        "container_bytes": int(container_path.stat().st_size) if container_path.exists() else 0,
+        "removed_sources": bool(remove_sources),
+        "wall_time_s": round(time.perf_counter() - started, 3),
+    }
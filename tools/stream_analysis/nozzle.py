@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from pathlib import Path
 
 import cv2
@@ -17,6 +20,9 @@ from tools.stream_analysis.dataset import (
     build_stage0_inventory,
     default_output_root,
 )
+from tools.stream_analysis.frame_container import read_image
+from tools.stream_analysis.parallel import attach_run_timings, export_selected_runs
+from tools.stream_analysis.plotting import submit_plot
 
 
 NOZZLE_STAGE_DIRNAME = "stage_02_nozzle"
@@ -52,6 +58,10 @@ FIXED_EARLY_REQUIRED_FRAMES = 3
 FIXED_EARLY_CENTER_TOLERANCE_PX = 12.0
 FIXED_EARLY_AREA_SLACK_FRAC = 0.05
 FIXED_EARLY_NET_GROWTH_MIN_FRAC = 0.10
+# Frames decoded ahead of nozzle detection; 0 disables read-ahead.
+PREFETCH_DEPTH = 4
+PREFETCH_MAX_BYTES = 256 * 1024 * 1024
+PREFETCH_MAX_THREADS = 4
 
 TRACK_COLUMNS = [
     "run_id",
@@ -226,13 +236,73 @@ def _serialize_float_list(values: list[float] | tuple[float, ...] | None, *, dig
     return "|".join(f"{value:.{digits}f}" for value in cleaned)
 
 
+_SHARED_GRAY_IMAGES = None
+
+
+@contextmanager
+def shared_gray_images():
+    # Inside this block each image path is decoded once and the read-only array is
+    # reused by every stage. Scope it to one run: it holds every decoded frame.
+    global _SHARED_GRAY_IMAGES
+    previous = _SHARED_GRAY_IMAGES
+    _SHARED_GRAY_IMAGES = {}
+    try:
+        yield _SHARED_GRAY_IMAGES
+    finally:
+        _SHARED_GRAY_IMAGES = previous
+
+
 def _load_gray_image(path: Path) -> np.ndarray:
-    image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    cache = _SHARED_GRAY_IMAGES
+    key = str(path)
+    if cache is not None and key in cache:
+        return cache[key]
+    image = read_image(key, cv2.IMREAD_GRAYSCALE)
     if image is None:
         raise FileNotFoundError(f"Could not load grayscale image: {path}")
+    if cache is not None:
+        image.setflags(write=False)
+        cache[key] = image
     return image
 
 
+def _iter_gray_images(
+    image_paths,
+    *,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
+):
+    # Yields frames in order while up to prefetch_depth later frames are read and
+    # decoded on worker threads (cv2 releases the GIL). Once a frame size is known
+    # the read-ahead shrinks so frames held ahead stay under prefetch_max_bytes.
+    paths = list(image_paths)
+    depth = max(0, int(prefetch_depth or 0))
+    if depth <= 0 or len(paths) <= 1:
+        for path in paths:
+            yield _load_gray_image(path)
+        return
+
+    window = depth
+    pending = deque()
+    next_index = 0
+    with ThreadPoolExecutor(
+        max_workers=min(depth, PREFETCH_MAX_THREADS),
+        thread_name_prefix="nozzle-prefetch",
+    ) as executor:
+        try:
+            while next_index < len(paths) or pending:
+                while next_index < len(paths) and len(pending) < window:
+                    pending.append(executor.submit(_load_gray_image, paths[next_index]))
+                    next_index += 1
+                image = pending.popleft().result()
+                if prefetch_max_bytes and image.nbytes > 0:
+                    window = max(1, min(depth, int(prefetch_max_bytes) // int(image.nbytes)))
+                yield image
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 def _search_bounds(
     image_shape,
     *,
@@ -3721,6 +3791,8 @@ def _detect_run_raw_rows(
     residual_threshold: int,
     min_area_px: int,
     top_band_slack_px: int,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
 ):
     raw_rows = []
     frame_diagnostics = []
@@ -3740,82 +3812,86 @@ def _detect_run_raw_rows(
     recent_attached_center_history: list[float] = []
     attached_support_low = float(MODE_SCORE_THRESHOLDS["attached_support_low"])
 
-    for frame_row in frame_rows:
-        image_path = Path(str(frame_row["image_abs_path"]))
-        gray = _load_gray_image(image_path)
-        diagnostics = _detect_raw_nozzle(
-            gray,
-            search_width_frac=search_width_frac,
-            search_top_frac=search_top_frac,
-            search_bottom_frac=search_bottom_frac,
-            blur_sigma=blur_sigma,
-            residual_scale=residual_scale,
-            residual_threshold=residual_threshold,
-            min_area_px=min_area_px,
-            top_band_slack_px=top_band_slack_px,
-            previous_nozzle_x_px=previous_nozzle_x_px,
-            previous_nozzle_y_px=previous_nozzle_y_px,
-            previous_attached_y_px=previous_attached_y_px,
-            previous_mode_history=tuple(previous_mode_history[-3:]),
-            stable_visible_line_y_px=stable_visible_line_y_px,
-            provisional_visible_line_y_px=provisional_visible_line_y_px,
-            visible_line_streak_length=int(visible_line_streak_length),
-            missing_visible_line_count=int(missing_visible_line_count),
-            recent_attached_width_median_px=(
-                None
-                if not recent_attached_width_history
-                else float(np.median(np.array(recent_attached_width_history, dtype=np.float32)))
-            ),
-            recent_attached_center_x_px=(
-                None
-                if not recent_attached_center_history
-                else float(np.median(np.array(recent_attached_center_history, dtype=np.float32)))
-            ),
-        )
-        raw_row = _raw_track_row(run_id, frame_row, diagnostics)
-        state_update = _update_visible_line_state_v2(
-            raw_row,
-            stable_visible_line_y_px=stable_visible_line_y_px,
-            stable_visible_line_history=stable_visible_line_history,
-            visible_line_streak_length=visible_line_streak_length,
-            missing_visible_line_count=missing_visible_line_count,
-            pending_visible_line_y_px=pending_visible_line_y_px,
-            pending_visible_line_count=pending_visible_line_count,
-            provisional_visible_line_y_px=provisional_visible_line_y_px,
-            provisional_visible_line_count=provisional_visible_line_count,
-            attached_support_low=attached_support_low,
-        )
-        stable_visible_line_y_px = state_update["stable_visible_line_y_px"]
-        stable_visible_line_history = list(state_update["stable_visible_line_history"])
-        visible_line_streak_length = int(state_update["visible_line_streak_length"])
-        missing_visible_line_count = int(state_update["missing_visible_line_count"])
-        pending_visible_line_y_px = state_update["pending_visible_line_y_px"]
-        pending_visible_line_count = int(state_update["pending_visible_line_count"])
-        provisional_visible_line_y_px = state_update["provisional_visible_line_y_px"]
-        provisional_visible_line_count = int(state_update["provisional_visible_line_count"])
-        keep_raw = bool(state_update["keep_raw"])
-
-        raw_row["stable_visible_line_y_px"] = stable_visible_line_y_px
-        raw_row["pending_visible_line_y_px"] = pending_visible_line_y_px
-        raw_row["provisional_visible_line_y_px"] = provisional_visible_line_y_px
-        raw_row["provisional_visible_line_count"] = provisional_visible_line_count
-        raw_rows.append(raw_row)
-        frame_diagnostics.append(diagnostics)
-
-        if raw_row.get("raw_nozzle_x_px") is not None and raw_row.get("raw_nozzle_y_px") is not None:
-            previous_nozzle_x_px = float(raw_row["raw_nozzle_x_px"])
-            previous_nozzle_y_px = float(raw_row["raw_nozzle_y_px"])
-        raw_mode = _clean_text(raw_row.get("raw_mode")) or "no_signal"
-        if keep_raw and raw_mode in ATTACHED_MODES and raw_row.get("raw_nozzle_y_px") is not None:
-            previous_attached_y_px = float(raw_row["raw_nozzle_y_px"])
-            if raw_row.get("contour_width_median_px") is not None:
-                recent_attached_width_history.append(float(raw_row["contour_width_median_px"]))
-                recent_attached_width_history = recent_attached_width_history[-3:]
-            if raw_row.get("raw_nozzle_x_px") is not None:
-                recent_attached_center_history.append(float(raw_row["raw_nozzle_x_px"]))
-                recent_attached_center_history = recent_attached_center_history[-3:]
-        if raw_row.get("raw_mode"):
-            previous_mode_history.append(str(raw_row["raw_mode"]))
+    images = _iter_gray_images(
+        (Path(str(frame_row["image_abs_path"])) for frame_row in frame_rows),
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
+    with closing(images):
+        for frame_row, gray in zip(frame_rows, images):
+            diagnostics = _detect_raw_nozzle(
+                gray,
+                search_width_frac=search_width_frac,
+                search_top_frac=search_top_frac,
+                search_bottom_frac=search_bottom_frac,
+                blur_sigma=blur_sigma,
+                residual_scale=residual_scale,
+                residual_threshold=residual_threshold,
+                min_area_px=min_area_px,
+                top_band_slack_px=top_band_slack_px,
+                previous_nozzle_x_px=previous_nozzle_x_px,
+                previous_nozzle_y_px=previous_nozzle_y_px,
+                previous_attached_y_px=previous_attached_y_px,
+                previous_mode_history=tuple(previous_mode_history[-3:]),
+                stable_visible_line_y_px=stable_visible_line_y_px,
+                provisional_visible_line_y_px=provisional_visible_line_y_px,
+                visible_line_streak_length=int(visible_line_streak_length),
+                missing_visible_line_count=int(missing_visible_line_count),
+                recent_attached_width_median_px=(
+                    None
+                    if not recent_attached_width_history
+                    else float(np.median(np.array(recent_attached_width_history, dtype=np.float32)))
+                ),
+                recent_attached_center_x_px=(
+                    None
+                    if not recent_attached_center_history
+                    else float(np.median(np.array(recent_attached_center_history, dtype=np.float32)))
+                ),
+            )
+            raw_row = _raw_track_row(run_id, frame_row, diagnostics)
+            state_update = _update_visible_line_state_v2(
+                raw_row,
+                stable_visible_line_y_px=stable_visible_line_y_px,
+                stable_visible_line_history=stable_visible_line_history,
+                visible_line_streak_length=visible_line_streak_length,
+                missing_visible_line_count=missing_visible_line_count,
+                pending_visible_line_y_px=pending_visible_line_y_px,
+                pending_visible_line_count=pending_visible_line_count,
+                provisional_visible_line_y_px=provisional_visible_line_y_px,
+                provisional_visible_line_count=provisional_visible_line_count,
+                attached_support_low=attached_support_low,
+            )
+            stable_visible_line_y_px = state_update["stable_visible_line_y_px"]
+            stable_visible_line_history = list(state_update["stable_visible_line_history"])
+            visible_line_streak_length = int(state_update["visible_line_streak_length"])
+            missing_visible_line_count = int(state_update["missing_visible_line_count"])
+            pending_visible_line_y_px = state_update["pending_visible_line_y_px"]
+            pending_visible_line_count = int(state_update["pending_visible_line_count"])
+            provisional_visible_line_y_px = state_update["provisional_visible_line_y_px"]
+            provisional_visible_line_count = int(state_update["provisional_visible_line_count"])
+            keep_raw = bool(state_update["keep_raw"])
+
+            raw_row["stable_visible_line_y_px"] = stable_visible_line_y_px
+            raw_row["pending_visible_line_y_px"] = pending_visible_line_y_px
+            raw_row["provisional_visible_line_y_px"] = provisional_visible_line_y_px
+            raw_row["provisional_visible_line_count"] = provisional_visible_line_count
+            raw_rows.append(raw_row)
+            frame_diagnostics.append(diagnostics)
+
+            if raw_row.get("raw_nozzle_x_px") is not None and raw_row.get("raw_nozzle_y_px") is not None:
+                previous_nozzle_x_px = float(raw_row["raw_nozzle_x_px"])
+                previous_nozzle_y_px = float(raw_row["raw_nozzle_y_px"])
+            raw_mode = _clean_text(raw_row.get("raw_mode")) or "no_signal"
+            if keep_raw and raw_mode in ATTACHED_MODES and raw_row.get("raw_nozzle_y_px") is not None:
+                previous_attached_y_px = float(raw_row["raw_nozzle_y_px"])
+                if raw_row.get("contour_width_median_px") is not None:
+                    recent_attached_width_history.append(float(raw_row["contour_width_median_px"]))
+                    recent_attached_width_history = recent_attached_width_history[-3:]
+                if raw_row.get("raw_nozzle_x_px") is not None:
+                    recent_attached_center_history.append(float(raw_row["raw_nozzle_x_px"]))
+                    recent_attached_center_history = recent_attached_center_history[-3:]
+            if raw_row.get("raw_mode"):
+                previous_mode_history.append(str(raw_row["raw_mode"]))
 
     return raw_rows, frame_diagnostics
 
@@ -4330,6 +4406,8 @@ def _build_stage2_run(
     top_band_slack_px: int,
     shift_threshold_px: float,
     confidence_threshold: float,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
 ):
     raw_rows, frame_diagnostics = _detect_run_raw_rows(
         run_id,
@@ -4342,6 +4420,8 @@ def _build_stage2_run(
         residual_threshold=residual_threshold,
         min_area_px=min_area_px,
         top_band_slack_px=top_band_slack_px,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
     )
     resolved_tracking_mode = (
         TRACKING_MODE_FIXED_EARLY
@@ -5436,6 +5516,254 @@ def _raw_track_row(run_id: str, frame_row: dict, diagnostics: dict):
     }
 
 
+def _export_stage2_run(
+    run_row: dict,
+    frame_rows: list[dict],
+    output_path: Path,
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_scale: float,
+    residual_threshold: int,
+    min_area_px: int,
+    top_band_slack_px: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or TRACKING_MODE_DYNAMIC)
+
+    stage2_run = _build_stage2_run(
+        run_id,
+        frame_rows,
+        tracking_mode=tracking_mode,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_scale=residual_scale,
+        residual_threshold=residual_threshold,
+        min_area_px=min_area_px,
+        top_band_slack_px=top_band_slack_px,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
+    return _write_stage2_run_outputs(
+        run_row,
+        frame_rows,
+        stage2_run,
+        output_path,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_scale=residual_scale,
+        residual_threshold=residual_threshold,
+        min_area_px=min_area_px,
+        top_band_slack_px=top_band_slack_px,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+    )
+
+
+def _write_stage2_run_outputs(
+    run_row: dict,
+    frame_rows: list[dict],
+    stage2_run: dict,
+    output_path: Path,
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_scale: float,
+    residual_threshold: int,
+    min_area_px: int,
+    top_band_slack_px: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or TRACKING_MODE_DYNAMIC)
+    # Copies, so flagging sample frames does not leak into later stages' rows.
+    tracked_rows = [dict(row) for row in stage2_run["tracked_rows"]]
+    shift_events = list(stage2_run["shift_events"])
+    frame_diagnostics = list(stage2_run["frame_diagnostics"])
+    fixed_anchor = stage2_run.get("fixed_anchor")
+    fixed_anchor_frame_rows = list(stage2_run.get("fixed_anchor_frame_rows") or [])
+    sample_indices = set(
+        _sample_indices(
+            len(frame_rows),
+            sample_count=sample_count,
+            extra_frame_indices=extra_frame_indices,
+        )
+    )
+    sample_indices.update(int(event["previous_capture_index"]) for event in shift_events if event.get("previous_capture_index"))
+    sample_indices.update(int(event["next_capture_index"]) for event in shift_events if event.get("next_capture_index"))
+    if tracking_mode == TRACKING_MODE_FIXED_EARLY:
+        sample_indices.update(
+            _int_or_none(frame_row.get("capture_index")) or (index + 1)
+            for index, frame_row in enumerate(frame_rows[:FIXED_EARLY_FRAME_LIMIT])
+        )
+
+    stage_dir = output_path / "runs" / run_id / NOZZLE_STAGE_DIRNAME
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    sample_dir = stage_dir / "samples"
+    if sample_dir.exists():
+        for stale_panel in sample_dir.glob("*.png"):
+            stale_panel.unlink()
+
+    sample_panels = []
+    sample_panel_paths = []
+    for frame_row, tracked_row, diagnostics in zip(frame_rows, tracked_rows, frame_diagnostics):
+        capture_index = _int_or_none(tracked_row["capture_index"]) or 0
+        if capture_index not in sample_indices:
+            continue
+        tracked_row["sample_frame"] = True
+        image_path = Path(str(frame_row["image_abs_path"]))
+        gray = _load_gray_image(image_path)
+        panel = _build_sample_panel(gray, diagnostics, tracked_row)
+        panel_path = sample_dir / f"frame_{capture_index:03d}_panel.png"
+        panel_path.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(panel_path), panel)
+        sample_panels.append(panel)
+        sample_panel_paths.append(str(panel_path))
+
+    track_csv = stage_dir / "nozzle_track.csv"
+    track_json = stage_dir / "nozzle_track.json"
+    shift_json = stage_dir / "shift_events.json"
+    summary_json = stage_dir / "nozzle_manifest.json"
+    contact_sheet_png = stage_dir / "sample_contact_sheet.png"
+    track_plot_png = stage_dir / "nozzle_track.png"
+    fixed_anchor_json = stage_dir / "fixed_anchor.json"
+    fixed_anchor_frames_csv = stage_dir / "fixed_anchor_frames.csv"
+
+    _write_csv(track_csv, _preferred_columns(tracked_rows, TRACK_COLUMNS), tracked_rows)
+    _write_json(track_json, {"rows": tracked_rows})
+    _write_json(shift_json, {"shift_events": shift_events})
+    if tracking_mode == TRACKING_MODE_FIXED_EARLY:
+        _write_json(
+            fixed_anchor_json,
+            {
+                "schema_version": 1,
+                "run_id": run_id,
+                "tracking_mode": tracking_mode,
+                "anchor_status": None if fixed_anchor is None else fixed_anchor.get("anchor_status"),
+                "anchor_failure_reason": None if fixed_anchor is None else fixed_anchor.get("anchor_failure_reason"),
+                "fixed_nozzle_x_px": None if fixed_anchor is None else fixed_anchor.get("fixed_nozzle_x_px"),
+                "fixed_nozzle_y_px": None if fixed_anchor is None else fixed_anchor.get("fixed_nozzle_y_px"),
+                "selected_capture_indices": []
+                if fixed_anchor is None
+                else list(fixed_anchor.get("selected_capture_indices") or []),
+                "selected_early_frame_ranks": []
+                if fixed_anchor is None
+                else list(fixed_anchor.get("selected_early_frame_ranks") or []),
+                "max_center_dx_px": None if fixed_anchor is None else fixed_anchor.get("max_center_dx_px"),
+                "max_center_dy_px": None if fixed_anchor is None else fixed_anchor.get("max_center_dy_px"),
+                "net_area_growth_ratio": None
+                if fixed_anchor is None
+                else fixed_anchor.get("net_area_growth_ratio"),
+                "mean_anchor_area_px": None
+                if fixed_anchor is None
+                else fixed_anchor.get("mean_anchor_area_px"),
+                "frames": fixed_anchor_frame_rows,
+            },
+        )
+        _write_csv(
+            fixed_anchor_frames_csv,
+            _preferred_columns(fixed_anchor_frame_rows, FIXED_ANCHOR_FRAME_COLUMNS),
+            fixed_anchor_frame_rows,
+        )
+    if sample_panels:
+        contact_sheet = cv2.vconcat(sample_panels)
+        cv2.imwrite(str(contact_sheet_png), contact_sheet)
+    submit_plot(_plot_track, tracked_rows, shift_events, track_plot_png)
+
+    summary = {
+        "schema_version": 2,
+        "stage": "nozzle",
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "tracking_mode": tracking_mode,
+        "gripper_refresh_suspended": run_row.get("gripper_refresh_suspended"),
+        "search": {
+            "width_frac": float(search_width_frac),
+            "top_frac": float(search_top_frac),
+            "bottom_frac": float(search_bottom_frac),
+            "blur_sigma": float(blur_sigma),
+            "residual_scale": float(residual_scale),
+            "residual_threshold": int(residual_threshold),
+            "min_area_px": int(min_area_px),
+            "top_band_slack_px": int(top_band_slack_px),
+        },
+        "confidence_threshold": float(confidence_threshold),
+        "shift_threshold_px": float(shift_threshold_px),
+        "sample_capture_indices": sorted(sample_indices),
+        "sample_panel_paths": sample_panel_paths,
+        "outputs": {
+            "nozzle_track_csv": str(track_csv),
+            "nozzle_track_json": str(track_json),
+            "shift_events_json": str(shift_json),
+            "fixed_anchor_json": (
+                str(fixed_anchor_json) if tracking_mode == TRACKING_MODE_FIXED_EARLY else None
+            ),
+            "fixed_anchor_frames_csv": (
+                str(fixed_anchor_frames_csv)
+                if tracking_mode == TRACKING_MODE_FIXED_EARLY
+                else None
+            ),
+            "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
+            "nozzle_track_png": str(track_plot_png),
+        },
+        "summary": _track_summary(tracked_rows),
+        "shift_events": shift_events,
+        "fixed_anchor": None
+        if fixed_anchor is None
+        else {
+            "anchor_status": fixed_anchor.get("anchor_status"),
+            "anchor_failure_reason": fixed_anchor.get("anchor_failure_reason"),
+            "fixed_nozzle_x_px": fixed_anchor.get("fixed_nozzle_x_px"),
+            "fixed_nozzle_y_px": fixed_anchor.get("fixed_nozzle_y_px"),
+            "selected_capture_indices": list(fixed_anchor.get("selected_capture_indices") or []),
+            "selected_early_frame_ranks": list(
+                fixed_anchor.get("selected_early_frame_ranks") or []
+            ),
+        },
+    }
+    _write_json(summary_json, summary)
+    return {
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "tracking_mode": tracking_mode,
+        "nozzle_track_csv": str(track_csv),
+        "nozzle_track_json": str(track_json),
+        "shift_events_json": str(shift_json),
+        "fixed_anchor_json": str(fixed_anchor_json)
+        if tracking_mode == TRACKING_MODE_FIXED_EARLY
+        else None,
+        "fixed_anchor_frames_csv": str(fixed_anchor_frames_csv)
+        if tracking_mode == TRACKING_MODE_FIXED_EARLY
+        else None,
+        "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
+        "nozzle_track_png": str(track_plot_png),
+        "frame_count": len(tracked_rows),
+        "sample_frame_count": len(sample_indices),
+        "shift_event_count": len(shift_events),
+    }
+
+
 def export_stage2_nozzle(
     experiment_root: str | Path,
     *,
@@ -5455,6 +5783,9 @@ def export_stage2_nozzle(
     top_band_slack_px: int = 14,
     shift_threshold_px: float = 6.0,
     confidence_threshold: float = 0.55,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
+    workers: int | None = 1,
 ):
     inventory = build_stage0_inventory(
         experiment_root,
@@ -5466,200 +5797,68 @@ def export_stage2_nozzle(
     output_path = Path(output_root).expanduser().resolve() if output_root else default_output_root(experiment_root)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    run_manifests = []
-    for run_row in inventory["selected_runs"]:
-        run_id = str(run_row["run_id"])
-        tracking_mode = str(run_row.get("tracking_mode") or TRACKING_MODE_DYNAMIC)
-        frame_rows = list(inventory["frames_by_run_id"][run_id])
-        if not frame_rows:
-            raise ValueError(f"No frame index rows available for run: {run_id}")
+    run_manifests, run_timings = export_selected_runs(
+        _export_stage2_run,
+        inventory,
+        output_path,
+        workers=workers,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_scale=residual_scale,
+        residual_threshold=residual_threshold,
+        min_area_px=min_area_px,
+        top_band_slack_px=top_band_slack_px,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
 
-        stage2_run = _build_stage2_run(
-            run_id,
-            frame_rows,
-            tracking_mode=tracking_mode,
-            search_width_frac=search_width_frac,
-            search_top_frac=search_top_frac,
-            search_bottom_frac=search_bottom_frac,
-            blur_sigma=blur_sigma,
-            residual_scale=residual_scale,
-            residual_threshold=residual_threshold,
-            min_area_px=min_area_px,
-            top_band_slack_px=top_band_slack_px,
-            shift_threshold_px=shift_threshold_px,
-            confidence_threshold=confidence_threshold,
-        )
-        tracked_rows = list(stage2_run["tracked_rows"])
-        shift_events = list(stage2_run["shift_events"])
-        frame_diagnostics = list(stage2_run["frame_diagnostics"])
-        fixed_anchor = stage2_run.get("fixed_anchor")
-        fixed_anchor_frame_rows = list(stage2_run.get("fixed_anchor_frame_rows") or [])
-        sample_indices = set(
-            _sample_indices(
-                len(frame_rows),
-                sample_count=sample_count,
-                extra_frame_indices=extra_frame_indices,
-            )
-        )
-        sample_indices.update(int(event["previous_capture_index"]) for event in shift_events if event.get("previous_capture_index"))
-        sample_indices.update(int(event["next_capture_index"]) for event in shift_events if event.get("next_capture_index"))
-        if tracking_mode == TRACKING_MODE_FIXED_EARLY:
-            sample_indices.update(
-                _int_or_none(frame_row.get("capture_index")) or (index + 1)
-                for index, frame_row in enumerate(frame_rows[:FIXED_EARLY_FRAME_LIMIT])
-            )
+    manifest = _write_stage2_manifest(
+        inventory["experiment_root"],
+        output_path,
+        run_manifests,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_scale=residual_scale,
+        residual_threshold=residual_threshold,
+        min_area_px=min_area_px,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+    )
+    attach_run_timings(manifest, run_timings, workers=workers)
+    return manifest
 
-        stage_dir = output_path / "runs" / run_id / NOZZLE_STAGE_DIRNAME
-        stage_dir.mkdir(parents=True, exist_ok=True)
-        sample_dir = stage_dir / "samples"
-        if sample_dir.exists():
-            for stale_panel in sample_dir.glob("*.png"):
-                stale_panel.unlink()
-
-        sample_panels = []
-        sample_panel_paths = []
-        for frame_row, tracked_row, diagnostics in zip(frame_rows, tracked_rows, frame_diagnostics):
-            capture_index = _int_or_none(tracked_row["capture_index"]) or 0
-            if capture_index not in sample_indices:
-                continue
-            tracked_row["sample_frame"] = True
-            image_path = Path(str(frame_row["image_abs_path"]))
-            gray = _load_gray_image(image_path)
-            panel = _build_sample_panel(gray, diagnostics, tracked_row)
-            panel_path = sample_dir / f"frame_{capture_index:03d}_panel.png"
-            panel_path.parent.mkdir(parents=True, exist_ok=True)
-            cv2.imwrite(str(panel_path), panel)
-            sample_panels.append(panel)
-            sample_panel_paths.append(str(panel_path))
-
-        track_csv = stage_dir / "nozzle_track.csv"
-        track_json = stage_dir / "nozzle_track.json"
-        shift_json = stage_dir / "shift_events.json"
-        summary_json = stage_dir / "nozzle_manifest.json"
-        contact_sheet_png = stage_dir / "sample_contact_sheet.png"
-        track_plot_png = stage_dir / "nozzle_track.png"
-        fixed_anchor_json = stage_dir / "fixed_anchor.json"
-        fixed_anchor_frames_csv = stage_dir / "fixed_anchor_frames.csv"
-
-        _write_csv(track_csv, _preferred_columns(tracked_rows, TRACK_COLUMNS), tracked_rows)
-        _write_json(track_json, {"rows": tracked_rows})
-        _write_json(shift_json, {"shift_events": shift_events})
-        if tracking_mode == TRACKING_MODE_FIXED_EARLY:
-            _write_json(
-                fixed_anchor_json,
-                {
-                    "schema_version": 1,
-                    "run_id": run_id,
-                    "tracking_mode": tracking_mode,
-                    "anchor_status": None if fixed_anchor is None else fixed_anchor.get("anchor_status"),
-                    "anchor_failure_reason": None if fixed_anchor is None else fixed_anchor.get("anchor_failure_reason"),
-                    "fixed_nozzle_x_px": None if fixed_anchor is None else fixed_anchor.get("fixed_nozzle_x_px"),
-                    "fixed_nozzle_y_px": None if fixed_anchor is None else fixed_anchor.get("fixed_nozzle_y_px"),
-                    "selected_capture_indices": []
-                    if fixed_anchor is None
-                    else list(fixed_anchor.get("selected_capture_indices") or []),
-                    "selected_early_frame_ranks": []
-                    if fixed_anchor is None
-                    else list(fixed_anchor.get("selected_early_frame_ranks") or []),
-                    "max_center_dx_px": None if fixed_anchor is None else fixed_anchor.get("max_center_dx_px"),
-                    "max_center_dy_px": None if fixed_anchor is None else fixed_anchor.get("max_center_dy_px"),
-                    "net_area_growth_ratio": None
-                    if fixed_anchor is None
-                    else fixed_anchor.get("net_area_growth_ratio"),
-                    "mean_anchor_area_px": None
-                    if fixed_anchor is None
-                    else fixed_anchor.get("mean_anchor_area_px"),
-                    "frames": fixed_anchor_frame_rows,
-                },
-            )
-            _write_csv(
-                fixed_anchor_frames_csv,
-                _preferred_columns(fixed_anchor_frame_rows, FIXED_ANCHOR_FRAME_COLUMNS),
-                fixed_anchor_frame_rows,
-            )
-        if sample_panels:
-            contact_sheet = cv2.vconcat(sample_panels)
-            cv2.imwrite(str(contact_sheet_png), contact_sheet)
-        _plot_track(tracked_rows, shift_events, track_plot_png)
-
-        summary = {
-            "schema_version": 2,
-            "stage": "nozzle",
-            "run_id": run_id,
-            "run_dir": run_row["run_dir"],
-            "tracking_mode": tracking_mode,
-            "gripper_refresh_suspended": run_row.get("gripper_refresh_suspended"),
-            "search": {
-                "width_frac": float(search_width_frac),
-                "top_frac": float(search_top_frac),
-                "bottom_frac": float(search_bottom_frac),
-                "blur_sigma": float(blur_sigma),
-                "residual_scale": float(residual_scale),
-                "residual_threshold": int(residual_threshold),
-                "min_area_px": int(min_area_px),
-                "top_band_slack_px": int(top_band_slack_px),
-            },
-            "confidence_threshold": float(confidence_threshold),
-            "shift_threshold_px": float(shift_threshold_px),
-            "sample_capture_indices": sorted(sample_indices),
-            "sample_panel_paths": sample_panel_paths,
-            "outputs": {
-                "nozzle_track_csv": str(track_csv),
-                "nozzle_track_json": str(track_json),
-                "shift_events_json": str(shift_json),
-                "fixed_anchor_json": (
-                    str(fixed_anchor_json) if tracking_mode == TRACKING_MODE_FIXED_EARLY else None
-                ),
-                "fixed_anchor_frames_csv": (
-                    str(fixed_anchor_frames_csv)
-                    if tracking_mode == TRACKING_MODE_FIXED_EARLY
-                    else None
-                ),
-                "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
-                "nozzle_track_png": str(track_plot_png),
-            },
-            "summary": _track_summary(tracked_rows),
-            "shift_events": shift_events,
-            "fixed_anchor": None
-            if fixed_anchor is None
-            else {
-                "anchor_status": fixed_anchor.get("anchor_status"),
-                "anchor_failure_reason": fixed_anchor.get("anchor_failure_reason"),
-                "fixed_nozzle_x_px": fixed_anchor.get("fixed_nozzle_x_px"),
-                "fixed_nozzle_y_px": fixed_anchor.get("fixed_nozzle_y_px"),
-                "selected_capture_indices": list(fixed_anchor.get("selected_capture_indices") or []),
-                "selected_early_frame_ranks": list(
-                    fixed_anchor.get("selected_early_frame_ranks") or []
-                ),
-            },
-        }
-        _write_json(summary_json, summary)
-        run_manifests.append(
-            {
-                "run_id": run_id,
-                "run_dir": run_row["run_dir"],
-                "tracking_mode": tracking_mode,
-                "nozzle_track_csv": str(track_csv),
-                "nozzle_track_json": str(track_json),
-                "shift_events_json": str(shift_json),
-                "fixed_anchor_json": str(fixed_anchor_json)
-                if tracking_mode == TRACKING_MODE_FIXED_EARLY
-                else None,
-                "fixed_anchor_frames_csv": str(fixed_anchor_frames_csv)
-                if tracking_mode == TRACKING_MODE_FIXED_EARLY
-                else None,
-                "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
-                "nozzle_track_png": str(track_plot_png),
-                "frame_count": len(tracked_rows),
-                "sample_frame_count": len(sample_indices),
-                "shift_event_count": len(shift_events),
-            }
-        )
 
+def _write_stage2_manifest(
+    experiment_root: str,
+    output_path: Path,
+    run_manifests: list[dict],
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_scale: float,
+    residual_threshold: int,
+    min_area_px: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+):
     manifest = {
         "schema_version": 2,
         "stage": "nozzle",
-        "experiment_root": inventory["experiment_root"],
+        "experiment_root": experiment_root,
         "output_root": str(output_path),
         "selected_run_count": len(run_manifests),
         "run_ids": [row["run_id"] for row in run_manifests],
@@ -344,12 +344,12 @@ def _frame_analysis_from_capture(
         None,
     )
     detached_components = [
-        dict(component)
+        dict(component, edge_rows=silhouette_mod._component_edge_rows(component))
         for component in accepted_components
         if str(component.get("component_role") or "") == "detached_accepted"
     ]
 
-    attached_edge_rows = [] if attached_component is None else [dict(row) for row in list(attached_component.get("edge_rows") or [])]
+    attached_edge_rows = [] if attached_component is None else silhouette_mod._component_edge_rows(attached_component)
     attached_mask = _ensure_mask(
         None if attached_component is None else attached_component.get("final_mask"),
         shape=stage3["raw_mask"].shape,
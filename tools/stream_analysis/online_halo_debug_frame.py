@@ -313,6 +313,7 @@ def _component_entries(stage3_frame: dict, stage4_frame: dict, *, image_shape) -
     entries = []
     for component in list(stage3_frame.get("accepted_components") or []):
         component_state = dict(component or {})
+        edge_rows = silhouette_mod._component_edge_rows(component_state)
         full_mask = runtime_mod._project_component_mask(component_state, roi, image_shape)
         contour = _mask_to_contour(full_mask)
         moments = None if full_mask is None else cv2.moments(full_mask)
@@ -335,11 +336,11 @@ def _component_entries(stage3_frame: dict, stage4_frame: dict, *, image_shape) -
                 "full_mask": full_mask,
                 "contour": contour,
                 "centroid": centroid,
-                "edge_rows": list(component_state.get("edge_rows") or []),
+                "edge_rows": edge_rows,
                 "volume_nl": float(
                     component_volumes.get(
                         str(component_state.get("component_id") or ""),
-                        _edge_rows_volume_nl(component_state.get("edge_rows") or []),
+                        _edge_rows_volume_nl(edge_rows),
                     )
                 ),
             }
@@ -10,6 +10,7 @@ from pathlib import Path
 import cv2
 
 from tools.stream_analysis import dataset as dataset_mod
+from tools.stream_analysis.frame_container import read_image
 from tools.stream_analysis import online_calibration as online_cal_mod
 from tools.stream_analysis import online_chroma_edge_prototype as chroma_proto_mod
 from tools.stream_analysis import online_fit as online_fit_mod
@@ -537,7 +538,7 @@ def _runtime_rgb_fix_frame_rows_for_run(
             continue
 
         image_path = run_dir / str(image_relpath)
-        frame_bgr = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        frame_bgr = read_image(image_path, cv2.IMREAD_COLOR)
         if frame_bgr is None:
             corrected_rows.append(record)
             continue
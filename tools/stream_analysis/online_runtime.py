@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+import time
+
 import cv2
 import numpy as np
 
@@ -21,6 +24,9 @@ _WIDTH_CANDIDATE_IQR_FRAC = 0.08
 _WIDTH_CANDIDATE_NARROWER_MIN_PX = 18.0
 _WIDTH_CANDIDATE_NARROWER_FRAC = 0.15
 _WIDTH_MAX_CANDIDATE_START_DELTA_PX = 100
+# Per-frame analysis budget on the Pi 5; summaries flag frames that exceed it.
+ONLINE_FRAME_BUDGET_MS = 30.0
+_GRAY_BUFFERS = threading.local()
 
 
 def _resolved_analysis_config(config: dict | None = None) -> dict:
@@ -1560,6 +1566,17 @@ def _detached_geometry_summary(
     }
 
 
+def _boundary_chroma_score(frame_image, boundary_mask: np.ndarray, *, color_order: str) -> float:
+    # Mean |R - B| over the boundary pixels, sampled without building a BGR copy.
+    arr = np.asarray(frame_image)
+    if arr.ndim == 2 or arr.shape[2] == 1:
+        return 0.0
+    blue_index, red_index = (2, 0) if _normalized_color_order(color_order) == "rgb" else (0, 2)
+    pixels = arr[boundary_mask]
+    chroma = np.abs(pixels[:, red_index].astype(np.float32) - pixels[:, blue_index].astype(np.float32))
+    return float(np.mean(chroma))
+
+
 def _attached_optical_summary(
     *,
     frame_image,
@@ -1599,8 +1616,8 @@ def _attached_optical_summary(
     boundary_chroma_aberration_score = None
     flow_optical_confidence = 1.0 if not optical_confidence_active else None
     try:
-        display_frame = _coerce_bgr_frame(frame_image, color_order=frame_color_order)
-        component_mask = _project_component_mask(attached_component, roi, display_frame.shape)
+        frame_shape = _analysis_frame_shape(frame_image)
+        component_mask = _project_component_mask(attached_component, roi, frame_shape)
         if component_mask is not None and np.any(component_mask > 0) and lower_rows:
             boundary_mask = component_mask > 0
             eroded = cv2.erode(component_mask, np.ones((3, 3), dtype=np.uint8), iterations=1) > 0
@@ -1608,12 +1625,13 @@ def _attached_optical_summary(
             y_threshold = int(lower_rows[0]["y_px"])
             boundary_mask[: max(0, y_threshold), :] = False
             if np.any(boundary_mask):
-                b_channel = display_frame[:, :, 0].astype(np.float32)
-                r_channel = display_frame[:, :, 2].astype(np.float32)
-                chroma = np.abs(r_channel - b_channel)
-                boundary_chroma_aberration_score = float(np.mean(chroma[boundary_mask]))
+                boundary_chroma_aberration_score = _boundary_chroma_score(
+                    frame_image,
+                    boundary_mask,
+                    color_order=frame_color_order,
+                )
         if optical_confidence_active:
-            image_height = int(display_frame.shape[0])
+            image_height = int(frame_shape[0])
             lower_band_fraction = float(
                 config.get("optical_lower_image_band_fraction")
                 or config.get("optical_lower_row_fraction")
@@ -1642,10 +1660,11 @@ def _attached_optical_summary(
                 band_boundary_mask = band_boundary_mask & ~band_eroded
                 band_boundary_mask[: max(0, lower_band_y0), :] = False
                 if np.any(band_boundary_mask):
-                    b_channel = display_frame[:, :, 0].astype(np.float32)
-                    r_channel = display_frame[:, :, 2].astype(np.float32)
-                    chroma = np.abs(r_channel - b_channel)
-                    active_boundary_chroma_aberration_score = float(np.mean(chroma[band_boundary_mask]))
+                    active_boundary_chroma_aberration_score = _boundary_chroma_score(
+                        frame_image,
+                        band_boundary_mask,
+                        color_order=frame_color_order,
+                    )
             flow_optical_confidence = _min_confidence(
                 _confidence_smaller_better(
                     active_lower_edge_jitter_px,
@@ -1752,6 +1771,69 @@ def _coerce_bgr_frame(frame_image, *, color_order: str = "bgr") -> np.ndarray:
     raise ValueError(f"Unsupported frame shape for online stream color conversion: {getattr(arr, 'shape', None)}")
 
 
+def _analysis_frame_shape(frame_image) -> tuple[int, int]:
+    arr = np.asarray(frame_image)
+    if arr.ndim == 2 or (arr.ndim == 3 and arr.shape[2] in {1, 3, 4}):
+        return int(arr.shape[0]), int(arr.shape[1])
+    raise ValueError(f"Unsupported frame shape for online stream analysis: {getattr(arr, 'shape', None)}")
+
+
+def _analysis_gray_frame(
+    frame_image,
+    *,
+    color_order: str,
+    tracked_x_px: float | None,
+    config: dict,
+) -> np.ndarray:
+    # Stage 3 only reads the nozzle-anchored ROI, widened by at most the adaptive
+    # expansion, so only that window is converted. The full-size buffer is reused
+    # across same-sized frames on this thread; pixels outside the window are stale
+    # and never read. Gray frames are used as-is.
+    arr = np.asarray(frame_image)
+    if arr.ndim == 2:
+        return arr
+    if arr.ndim != 3 or arr.shape[2] not in {1, 3, 4} or arr.dtype != np.uint8:
+        return _coerce_analysis_gray_frame(arr, color_order=color_order)
+    height, width = arr.shape[:2]
+    roi = silhouette_mod._dynamic_roi_bounds(
+        arr.shape,
+        tracked_x_px=tracked_x_px,
+        roi_width_frac=_ROI_WIDTH_FRAC,
+        roi_top_frac=_ROI_TOP_FRAC,
+        roi_bottom_frac=_ROI_BOTTOM_FRAC,
+    )
+    expansion_px = 0
+    if bool(config.get("adaptive_roi_expansion_enabled")):
+        expansion_px = max(0, int(config.get("adaptive_roi_max_expansion_px") or 0))
+    x0 = max(0, int(roi["x0"]) - expansion_px)
+    x1 = min(int(width), int(roi["x1"]) + expansion_px)
+    y0 = int(roi["y0"])
+    y1 = int(roi["y1"])
+
+    buffer = getattr(_GRAY_BUFFERS, "gray", None)
+    if buffer is None or buffer.shape != (height, width):
+        buffer = np.zeros((height, width), dtype=np.uint8)
+        _GRAY_BUFFERS.gray = buffer
+    window = arr[y0:y1, x0:x1]
+    target = buffer[y0:y1, x0:x1]
+    if arr.shape[2] == 1:
+        target[...] = window[:, :, 0]
+    else:
+        order = _normalized_color_order(color_order)
+        if arr.shape[2] == 3:
+            conversion = cv2.COLOR_RGB2GRAY if order == "rgb" else cv2.COLOR_BGR2GRAY
+        else:
+            conversion = cv2.COLOR_RGBA2GRAY if order == "rgb" else cv2.COLOR_BGRA2GRAY
+        cv2.cvtColor(window, conversion, dst=target)
+    return buffer
+
+
+def _add_elapsed_ms(timings: dict, key: str, started: float) -> float:
+    now = time.perf_counter()
+    timings[key] = round(float(timings.get(key) or 0.0) + ((now - started) * 1000.0), 3)
+    return now
+
+
 def _project_component_mask(component: dict, roi: dict, image_shape) -> np.ndarray | None:
     final_mask = component.get("final_mask")
     if final_mask is None:
@@ -1790,11 +1872,13 @@ def _blend_component_overlay(image: np.ndarray, component_mask: np.ndarray, colo
 
     blended = image.copy()
     color_arr = np.asarray(color, dtype=np.float32)
-    mask = component_mask > 0
-    if np.any(mask):
-        base = blended.astype(np.float32)
-        base[mask] = ((1.0 - float(alpha)) * base[mask]) + (float(alpha) * color_arr)
-        blended = np.clip(base, 0, 255).astype(np.uint8)
+    # Blend only the masked pixels inside the component's bounding box.
+    x, y, w, h = cv2.boundingRect(component_mask)
+    mask = component_mask[y : y + h, x : x + w] > 0
+    target = blended[y : y + h, x : x + w]
+    pixels = target[mask].astype(np.float32)
+    pixels = ((1.0 - float(alpha)) * pixels) + (float(alpha) * color_arr)
+    target[mask] = np.clip(pixels, 0, 255).astype(np.uint8)
 
     contours, _hierarchy = cv2.findContours(component_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     if contours:
@@ -1922,23 +2006,37 @@ def analyze_online_stream_frame(
     background_color_order: str | None = None,
     sticky_window_state: dict | None = None,
     _adaptive_retry: bool = True,
+    _analysis_gray: np.ndarray | None = None,
+    _timings: dict | None = None,
 ) -> dict:
+    timings = {} if _timings is None else _timings
+    mark = time.perf_counter()
     config = _resolved_analysis_config(analysis_config)
     frame_color_order = _normalized_color_order(frame_color_order)
     background_color_order = _normalized_color_order(
         background_color_order,
         default=frame_color_order,
     )
+    frame_row = _frame_row(
+        delay_us=int(delay_us),
+        emergence_time_us=int(emergence_time_us),
+        capture_ref=capture_ref,
+        capture_index=capture_index,
+    )
+    tracked_row = _tracked_row(nozzle_center_px)
+    if _analysis_gray is None:
+        _analysis_gray = _analysis_gray_frame(
+            frame_image,
+            color_order=frame_color_order,
+            tracked_x_px=tracked_row["tracked_nozzle_x_px"],
+            config=config,
+        )
+    mark = _add_elapsed_ms(timings, "gray_ms", mark)
     stage3_frame = silhouette_mod._analyze_stage3_gray(
         "online_stream_runtime",
-        _frame_row(
-            delay_us=int(delay_us),
-            emergence_time_us=int(emergence_time_us),
-            capture_ref=capture_ref,
-            capture_index=capture_index,
-        ),
-        _tracked_row(nozzle_center_px),
-        _coerce_analysis_gray_frame(frame_image, color_order=frame_color_order),
+        frame_row,
+        tracked_row,
+        _analysis_gray,
         roi_width_frac=_ROI_WIDTH_FRAC,
         roi_top_frac=_ROI_TOP_FRAC,
         roi_bottom_frac=_ROI_BOTTOM_FRAC,
@@ -1950,25 +2048,34 @@ def analyze_online_stream_frame(
         adaptive_roi_edge_margin_px=int(config["adaptive_roi_edge_margin_px"]),
         adaptive_roi_expansion_step_px=int(config["adaptive_roi_expansion_step_px"]),
         adaptive_roi_max_expansion_px=int(config["adaptive_roi_max_expansion_px"]),
+        copy_gray=False,
     )
+    mark = _add_elapsed_ms(timings, "stage3_ms", mark)
     stage4_frame = volume_mod._analyze_stage4_frame(
         stage3_frame,
         near_bottom_px=int(config["detached_near_bottom_warning_px"]),
     )
-
-    stage3_metric_row = dict(stage3_frame.get("metric_row") or {})
-    frame_metric_row = dict(stage4_frame.get("frame_metric_row") or {})
-    component_rows = [dict(row) for row in list(stage3_frame.get("component_rows") or [])]
-    component_volume_rows = [dict(row) for row in list(stage4_frame.get("component_volume_rows") or [])]
-    accepted_components = [dict(component) for component in list(stage3_frame.get("accepted_components") or [])]
-    roi = dict(stage3_frame.get("roi") or {})
+    mark = _add_elapsed_ms(timings, "stage4_ms", mark)
+
+    # Stage 3/4 results are private to this call and only read below, so the rows
+    # are used without copying.
+    stage3_metric_row = stage3_frame.get("metric_row") or {}
+    frame_metric_row = stage4_frame.get("frame_metric_row") or {}
+    component_rows = list(stage3_frame.get("component_rows") or [])
+    component_volume_rows = list(stage4_frame.get("component_volume_rows") or [])
+    # Stage 3 keeps edge traces as columns; the width and geometry checks below read dict rows.
+    accepted_components = [
+        dict(component, edge_rows=silhouette_mod._component_edge_rows(component))
+        for component in list(stage3_frame.get("accepted_components") or [])
+    ]
+    roi = stage3_frame.get("roi") or {}
     attached_component_row = next(
         (row for row in component_rows if str(row.get("component_role") or "") == "attached_primary"),
         None,
     )
     attached_component = next(
         (
-            dict(component)
+            component
             for component in accepted_components
             if str(component.get("component_role") or "") == "attached_primary"
         ),
@@ -2207,11 +2314,7 @@ def analyze_online_stream_frame(
 
     if background_image is not None:
         try:
-            bg_gray = _coerce_analysis_gray_frame(
-                background_image,
-                color_order=background_color_order,
-            )
-            if bg_gray.shape[:2] != stage3_frame["gray"].shape[:2]:
+            if _analysis_frame_shape(background_image) != _analysis_gray.shape[:2]:
                 warnings.append("background_shape_mismatch")
         except Exception:
             warnings.append("background_image_unavailable")
@@ -2386,6 +2489,7 @@ def analyze_online_stream_frame(
     )
     summary["late_coverage_candidate"] = bool(late_coverage_candidate)
     summary["late_coverage_metric"] = late_coverage_metric
+    mark = _add_elapsed_ms(timings, "summary_ms", mark)
 
     if bool(_adaptive_retry) and _adaptive_roi_retry_needed(summary, config):
         retry_config = dict(config)
@@ -2403,6 +2507,8 @@ def analyze_online_stream_frame(
             background_color_order=background_color_order,
             sticky_window_state=sticky_window_state,
             _adaptive_retry=False,
+            _analysis_gray=_analysis_gray,
+            _timings=timings,
         )
     if bool(_adaptive_retry) and bool(config.get("adaptive_roi_expansion_enabled")):
         summary["adaptive_roi_stop_reason"] = "retry_not_needed"
@@ -2419,6 +2525,14 @@ def analyze_online_stream_frame(
         )
     except Exception:
         overlay = None
+    _add_elapsed_ms(timings, "overlay_ms", mark)
+
+    # Retried frames report the time of both passes.
+    total_ms = round(sum(float(value) for value in timings.values()), 3)
+    summary["adaptive_roi_retried"] = not bool(_adaptive_retry)
+    summary["substage_timings_ms"] = dict(timings, total_ms=total_ms)
+    summary["frame_budget_ms"] = float(ONLINE_FRAME_BUDGET_MS)
+    summary["frame_budget_exceeded"] = bool(total_ms > float(ONLINE_FRAME_BUDGET_MS))
 
     return {
         "summary": summary,
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.stream_analysis.plotting import configure_worker_plots, plot_worker_config
+
+
+def resolve_worker_count(workers: int | None, run_count: int) -> int:
+    # 0 or a negative count means one worker per CPU core.
+    requested = 1 if workers is None else int(workers)
+    if requested <= 0:
+        requested = os.cpu_count() or 1
+    return max(1, min(requested, max(1, int(run_count))))
+
+
+def _timed_run_export(export_run, run_row: dict, frame_rows: list[dict], output_path, params: dict):
+    started = time.perf_counter()
+    run_manifest = export_run(run_row, frame_rows, output_path, **params)
+    timing = {
+        "run_id": str(run_row["run_id"]),
+        "wall_time_s": round(time.perf_counter() - started, 3),
+        "frame_count": len(frame_rows),
+        "worker_pid": os.getpid(),
+    }
+    return run_manifest, timing
+
+
+def export_selected_runs(
+    export_run,
+    inventory: dict,
+    output_path,
+    *,
+    workers: int | None = 1,
+    **params,
+):
+    # export_run(run_row, frame_rows, output_path, **params) must be a module-level
+    # function so the pool can pickle it. Results are merged in inventory order, so
+    # the experiment manifest does not depend on which worker finished first.
+    jobs = []
+    for run_row in inventory["selected_runs"]:
+        run_id = str(run_row["run_id"])
+        frame_rows = list(inventory["frames_by_run_id"][run_id])
+        if not frame_rows:
+            raise ValueError(f"No frame index rows available for run: {run_id}")
+        jobs.append((run_row, frame_rows))
+
+    worker_count = resolve_worker_count(workers, len(jobs))
+    if worker_count <= 1:
+        results = [
+            _timed_run_export(export_run, run_row, frame_rows, output_path, params)
+            for run_row, frame_rows in jobs
+        ]
+    else:
+        # Spawn keeps OpenCV and matplotlib state out of forked children.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            mp_context=context,
+            initializer=configure_worker_plots,
+            initargs=(plot_worker_config(),),
+        ) as executor:
+            futures = [
+                executor.submit(_timed_run_export, export_run, run_row, frame_rows, output_path, params)
+                for run_row, frame_rows in jobs
+            ]
+            try:
+                results = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    run_manifests = [run_manifest for run_manifest, _timing in results]
+    run_timings = [timing for _run_manifest, timing in results]
+    return run_manifests, run_timings
+
+
+def attach_run_timings(manifest: dict, run_timings: list[dict], *, workers: int | None = 1) -> dict:
+    # Timings go on the returned payload only; the written manifest is unchanged.
+    manifest["workers"] = resolve_worker_count(workers, len(run_timings))
+    manifest["run_timings"] = list(run_timings)
+    manifest["total_run_wall_time_s"] = round(
+        sum(float(timing["wall_time_s"]) for timing in run_timings), 3
+    )
+    return manifest
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+
+PLOT_MODE_INLINE = "inline"
+PLOT_MODE_POOL = "pool"
+PLOT_MODE_LATER = "later"
+PLOT_MODE_NONE = "none"
+PLOT_MODES = (PLOT_MODE_INLINE, PLOT_MODE_POOL, PLOT_MODE_LATER, PLOT_MODE_NONE)
+PLOT_SPEC_SUFFIX = ".plotspec.pkl"
+
+_active_queue = None
+
+
+def _init_agg_worker():
+    # Workers live for the whole export, so the Agg backend, pyplot and the font
+    # cache are loaded once and reused by every figure the worker draws.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import pyplot  # noqa: F401
+
+
+def _function_ref(func) -> str | None:
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None)
+    if not module or not qualname or "<" in qualname:
+        return None
+    return f"{module}:{qualname}"
+
+
+def _resolve_function(ref: str):
+    module_name, qualname = ref.split(":", 1)
+    target = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def _render_spec(spec: dict):
+    started = time.perf_counter()
+    _resolve_function(spec["function"])(*spec["args"], **spec["kwargs"])
+    return time.perf_counter() - started
+
+
+class PlotQueue:
+    """
+    Routes plot calls for one export.
+
+    ``inline`` draws immediately (the default without a queue), ``pool`` hands
+    each plot to a pool of Agg worker processes, ``later`` pickles the call to
+    ``spec_dir`` for ``render_plot_specs`` and ``none`` skips plotting. A
+    barrier separates plots that read PNGs written by earlier ones.
+    """
+
+    def __init__(self, mode: str = PLOT_MODE_INLINE, *, workers: int = 1, spec_dir=None):
+        if mode not in PLOT_MODES:
+            raise ValueError(f"Unsupported plot mode: {mode}")
+        if mode == PLOT_MODE_LATER and not spec_dir:
+            raise ValueError("Deferred plotting needs a spec directory.")
+        self.mode = mode
+        self.workers = max(1, int(workers or 1))
+        self.spec_dir = None if spec_dir is None else Path(spec_dir).expanduser().resolve()
+        self.wave = 0
+        self.submitted = 0
+        self.rendered = 0
+        self.deferred = 0
+        self.skipped = 0
+        self.render_s = 0.0
+        self._executor = None
+        self._futures = []
+        if self.mode == PLOT_MODE_LATER:
+            self.spec_dir.mkdir(parents=True, exist_ok=True)
+
+    def _pool(self):
+        if self._executor is None:
+            # Spawn keeps OpenCV and matplotlib state out of forked children.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_agg_worker,
+            )
+        return self._executor
+
+    def submit(self, func, *args, **kwargs):
+        self.submitted += 1
+        if self.mode == PLOT_MODE_NONE:
+            self.skipped += 1
+            return None
+        ref = _function_ref(func)
+        if self.mode == PLOT_MODE_INLINE or ref is None:
+            # Lambdas and local functions cannot be re-imported in another process.
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.render_s += time.perf_counter() - started
+            self.rendered += 1
+            return result
+        spec = {"function": ref, "args": args, "kwargs": kwargs, "wave": self.wave}
+        if self.mode == PLOT_MODE_LATER:
+            spec_path = self.spec_dir / f"{self.wave:03d}_{os.getpid()}_{self.deferred:06d}{PLOT_SPEC_SUFFIX}"
+            with spec_path.open("wb") as handle:
+                pickle.dump(spec, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            self.deferred += 1
+            return None
+        self._futures.append(self._pool().submit(_render_spec, spec))
+        return None
+
+    def barrier(self):
+        futures, self._futures = self._futures, []
+        for future in futures:
+            self.render_s += future.result()
+            self.rendered += 1
+        self.wave += 1
+
+    def close(self, *, wait: bool = True):
+        try:
+            if wait:
+                self.barrier()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+    def worker_config(self):
+        # Run-export workers draw their own plots; a nested pool would only oversubscribe.
+        mode = PLOT_MODE_INLINE if self.mode == PLOT_MODE_POOL else self.mode
+        return {"mode": mode, "spec_dir": None if self.spec_dir is None else str(self.spec_dir)}
+
+    def stats(self) -> dict:
+        return {
+            "plot_mode": self.mode,
+            "plot_workers": self.workers if self.mode == PLOT_MODE_POOL else 0,
+            "submitted_plot_count": self.submitted,
+            "rendered_plot_count": self.rendered,
+            "deferred_plot_count": self.deferred,
+            "skipped_plot_count": self.skipped,
+            "plot_render_s": round(self.render_s, 3),
+            "plot_spec_dir": None if self.spec_dir is None else str(self.spec_dir),
+        }
+
+
+def submit_plot(func, *args, **kwargs):
+    if _active_queue is None:
+        return func(*args, **kwargs)
+    return _active_queue.submit(func, *args, **kwargs)
+
+
+def plot_barrier():
+    if _active_queue is not None:
+        _active_queue.barrier()
+
+
+def plot_worker_config():
+    return None if _active_queue is None else _active_queue.worker_config()
+
+
+def configure_worker_plots(config):
+    # ProcessPoolExecutor initializer for run-export workers.
+    global _active_queue
+    if config:
+        _active_queue = PlotQueue(config["mode"], spec_dir=config.get("spec_dir"))
+
+
+@contextmanager
+def plot_session(mode: str = PLOT_MODE_INLINE, *, workers: int = 1, spec_dir=None):
+    global _active_queue
+    previous = _active_queue
+    queue = PlotQueue(mode, workers=workers, spec_dir=spec_dir)
+    _active_queue = queue
+    try:
+        yield queue
+    except BaseException:
+        queue.close(wait=False)
+        raise
+    else:
+        queue.close()
+    finally:
+        _active_queue = previous
+
+
+def render_plot_specs(spec_dir, *, workers: int = 1, keep_specs: bool = False):
+    spec_root = Path(spec_dir).expanduser().resolve()
+    spec_paths = sorted(spec_root.glob(f"*{PLOT_SPEC_SUFFIX}"))
+    waves = {}
+    for spec_path in spec_paths:
+        waves.setdefault(spec_path.name.split("_", 1)[0], []).append(spec_path)
+
+    started = time.perf_counter()
+    mode = PLOT_MODE_POOL if int(workers or 1) > 1 else PLOT_MODE_INLINE
+    queue = PlotQueue(mode, workers=workers)
+    try:
+        for wave_key in sorted(waves):
+            for spec_path in waves[wave_key]:
+                with spec_path.open("rb") as handle:
+                    spec = pickle.load(handle)
+                queue.submit(_resolve_function(spec["function"]), *spec["args"], **spec["kwargs"])
+            queue.barrier()
+            if not keep_specs:
+                for spec_path in waves[wave_key]:
+                    spec_path.unlink(missing_ok=True)
+    finally:
+        queue.close()
+    return {
+        "plot_spec_dir": str(spec_root),
+        "spec_count": len(spec_paths),
+        "wave_count": len(waves),
+        "rendered_plot_count": queue.rendered,
+        "plot_workers": queue.workers if mode == PLOT_MODE_POOL else 1,
+        "wall_time_s": round(time.perf_counter() - started, 3),
+    }
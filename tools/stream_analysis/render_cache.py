@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from tools.stream_analysis.dataset import _load_json, _write_json_atomic
+from tools.stream_analysis.plotting import submit_plot
+
+
+RENDER_CACHE_FILENAME = "render_cache.json"
+# Bump when a cached plot's drawing code changes so existing PNGs are redrawn.
+RENDER_CACHE_SCHEMA_VERSION = 1
+
+
+def content_hash(payload) -> str:
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str | Path) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with Path(path).open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Input hashes of the plots written under one output root.
+
+    A plot is redrawn only when its PNG is missing or the hash of the inputs
+    it was drawn from changed. Index I/O failures never fail an export; the
+    plots are simply redrawn on the next run.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.index_path = self.root / RENDER_CACHE_FILENAME
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            payload = _load_json(self.index_path)
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict):
+            return
+        if int(payload.get("schema_version") or 0) != RENDER_CACHE_SCHEMA_VERSION:
+            return
+        entries = payload.get("plots")
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def _key(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def is_current(self, path: str | Path, input_hash: str) -> bool:
+        return Path(path).exists() and self.entries.get(self._key(path)) == input_hash
+
+    def record(self, path: str | Path, input_hash: str):
+        self.entries[self._key(path)] = input_hash
+        self._dirty = True
+
+    def render(self, path: str | Path, inputs, draw, *args, **kwargs):
+        # draw(path, *args, **kwargs) runs only when the hashed inputs changed. The
+        # stale PNG is removed first so a skipped or deferred plot is never mistaken
+        # for a current one; the hash is recorded once the plot has been handed off.
+        input_hash = content_hash(inputs)
+        if self.is_current(path, input_hash):
+            self.hits += 1
+            return path
+        self.misses += 1
+        Path(path).unlink(missing_ok=True)
+        submit_plot(draw, path, *args, **kwargs)
+        self.record(path, input_hash)
+        return path
+
+    def stats(self) -> dict:
+        return {"redrawn_plot_count": self.misses, "reused_plot_count": self.hits}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            _write_json_atomic(
+                self.index_path,
+                {"schema_version": RENDER_CACHE_SCHEMA_VERSION, "plots": self.entries},
+            )
+        except OSError:
+            return
+        self._dirty = False
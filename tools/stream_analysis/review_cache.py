@@ -8,6 +8,7 @@ from tools.stream_analysis.dataset import (
     _int_or_none,
     _load_json,
     _preferred_columns,
+    _run_dir_signature,
     _write_csv,
     _write_json,
     build_stage0_inventory,
@@ -15,6 +16,8 @@ from tools.stream_analysis.dataset import (
 )
 from tools.stream_analysis import fit as fit_mod
 from tools.stream_analysis import summary as summary_mod
+from tools.stream_analysis.plotting import plot_barrier, submit_plot
+from tools.stream_analysis.render_cache import RENDER_CACHE_SCHEMA_VERSION, content_hash, file_digest
 
 
 FIT_CACHE_STAGE_DIRNAME = "stage_05_review_cache"
@@ -22,6 +25,8 @@ FIT_REVIEW_STAGE_DIRNAME = "stage_05_review"
 CACHE_MANIFEST_FILENAME = "cache_manifest.json"
 CACHE_RUN_MANIFEST_FILENAME = "cache_run_manifest.json"
 REVIEW_MANIFEST_FILENAME = "review_manifest.json"
+REVIEW_THUMBNAIL_DIRNAME = "thumbnails"
+CACHE_ENTRY_SCHEMA_VERSION = 1
 SUSPECT_GRAVIMETRIC_CONDITIONS = {(0.65, 3000)}
 
 RAW_FALLBACK_STAGE5_KWARGS = {
@@ -459,6 +464,59 @@ def _source_stage4_paths(source_root: str | Path, run_id: str):
     }
 
 
+def _stage5_source_digests(source_root: str | Path, run_id: str):
+    source_paths = _source_stage5_paths(source_root, run_id)
+    stage4_paths = _source_stage4_paths(source_root, run_id)
+    required_keys = [
+        "phase_features_csv",
+        "steady_fit_json",
+        "middle_extrapolation_json",
+        "phase_boundaries_json",
+    ]
+    if not all(source_paths[key].exists() for key in required_keys):
+        return None
+    digests = {key: file_digest(source_paths[key]) for key in required_keys + ["fit_manifest_json"]}
+    digests["volume_manifest_json"] = file_digest(stage4_paths["volume_manifest_json"])
+    return digests
+
+
+def _cache_entry_input_hash(run_row: dict, source_roots: list[Path]):
+    # Mirrors the source order used when the entry is (re)built: the first root with
+    # complete Stage 5 artifacts wins, otherwise the raw run directory is refit.
+    run_id = str(run_row["run_id"])
+    inputs = None
+    for source_root in source_roots:
+        digests = _stage5_source_digests(source_root, run_id)
+        if digests is not None:
+            inputs = {
+                "kind": "stage5_output_import",
+                "source_output_root": str(Path(source_root).expanduser().resolve()),
+                "files": digests,
+            }
+            break
+    if inputs is None:
+        run_dir = _clean_text(run_row.get("run_dir"))
+        inputs = {
+            "kind": "raw_stage5_fallback",
+            "run_dir_signature": None if run_dir is None else _run_dir_signature(Path(run_dir)),
+            "stage5_kwargs": dict(RAW_FALLBACK_STAGE5_KWARGS),
+        }
+    return content_hash(
+        {
+            "schema_version": CACHE_ENTRY_SCHEMA_VERSION,
+            "run_row": dict(run_row),
+            **inputs,
+        }
+    )
+
+
+def _stored_input_hash(paths: dict):
+    try:
+        return _load_json(paths["cache_run_manifest_json"]).get("input_hash")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
 def _import_stage5_artifacts(run_row: dict, source_root: str | Path):
     run_id = str(run_row["run_id"])
     source_paths = _source_stage5_paths(source_root, run_id)
@@ -583,7 +641,13 @@ def _build_raw_stage5_cache_entry(run_row: dict, frame_rows: list[dict]):
     }
 
 
-def _write_cache_entry(cache_root: str | Path, run_id: str, cache_entry: dict):
+def _write_cache_entry(
+    cache_root: str | Path,
+    run_id: str,
+    cache_entry: dict,
+    *,
+    input_hash: str | None = None,
+):
     paths = _cache_entry_paths(cache_root, run_id)
     phase_input_rows = list(cache_entry["phase_input_rows"])
     run_context = dict(cache_entry["run_context"])
@@ -600,6 +664,7 @@ def _write_cache_entry(cache_root: str | Path, run_id: str, cache_entry: dict):
             "stage": "review_cache",
             "run_id": run_id,
             "cache_source_kind": run_context["source"].get("kind"),
+            "input_hash": input_hash,
             "outputs": {
                 "phase_input_csv": str(paths["phase_input_csv"]),
                 "run_context_json": str(paths["run_context_json"]),
@@ -652,6 +717,21 @@ def _selected_cache_entries(
     return entries
 
 
+def _reused_cache_run_manifest(run_id: str, cache_paths: dict, input_hash: str | None):
+    run_context = _load_json(cache_paths["run_context_json"])
+    return {
+        "run_id": run_id,
+        "cache_source_kind": run_context.get("source", {}).get("kind"),
+        "cache_status": "reused",
+        "input_hash": input_hash,
+        "phase_input_csv": str(cache_paths["phase_input_csv"]),
+        "run_context_json": str(cache_paths["run_context_json"]),
+        "cache_run_manifest_json": str(cache_paths["cache_run_manifest_json"])
+        if cache_paths["cache_run_manifest_json"].exists()
+        else None,
+    }
+
+
 def export_stage5_review_cache(
     experiment_root: str | Path,
     *,
@@ -679,6 +759,7 @@ def export_stage5_review_cache(
 
     source_roots = _candidate_source_roots(experiment_root, source_output_root)
     reused_count = 0
+    refreshed_count = 0
     stage5_import_count = 0
     raw_fallback_count = 0
     run_manifests = []
@@ -686,20 +767,11 @@ def export_stage5_review_cache(
     for run_row in inventory["selected_runs"]:
         run_id = str(run_row["run_id"])
         cache_paths = _cache_entry_paths(cache_root_path, run_id)
-        if not rebuild and _cache_entry_valid(cache_paths):
-            run_context = _load_json(cache_paths["run_context_json"])
+        input_hash = _cache_entry_input_hash(run_row, source_roots)
+        entry_exists = _cache_entry_valid(cache_paths)
+        if not rebuild and entry_exists and _stored_input_hash(cache_paths) == input_hash:
             reused_count += 1
-            run_manifests.append(
-                {
-                    "run_id": run_id,
-                    "cache_source_kind": run_context.get("source", {}).get("kind"),
-                    "phase_input_csv": str(cache_paths["phase_input_csv"]),
-                    "run_context_json": str(cache_paths["run_context_json"]),
-                    "cache_run_manifest_json": str(cache_paths["cache_run_manifest_json"])
-                    if cache_paths["cache_run_manifest_json"].exists()
-                    else None,
-                }
-            )
+            run_manifests.append(_reused_cache_run_manifest(run_id, cache_paths, input_hash))
             continue
 
         cache_entry = None
@@ -714,15 +786,26 @@ def export_stage5_review_cache(
         if cache_entry is None:
             frame_rows = list(inventory["frames_by_run_id"].get(run_id) or [])
             if not frame_rows:
+                if entry_exists and not rebuild:
+                    # Nothing left to rebuild from; keep the entry that is already cached.
+                    reused_count += 1
+                    run_manifests.append(
+                        _reused_cache_run_manifest(run_id, cache_paths, _stored_input_hash(cache_paths))
+                    )
+                    continue
                 raise ValueError(f"No frame index rows available for run: {run_id}")
             cache_entry = _build_raw_stage5_cache_entry(run_row, frame_rows)
             raw_fallback_count += 1
 
-        cache_paths = _write_cache_entry(cache_root_path, run_id, cache_entry)
+        if entry_exists:
+            refreshed_count += 1
+        cache_paths = _write_cache_entry(cache_root_path, run_id, cache_entry, input_hash=input_hash)
         run_manifests.append(
             {
                 "run_id": run_id,
                 "cache_source_kind": cache_entry["run_context"]["source"].get("kind"),
+                "cache_status": "refreshed" if entry_exists else "created",
+                "input_hash": input_hash,
                 "phase_input_csv": str(cache_paths["phase_input_csv"]),
                 "run_context_json": str(cache_paths["run_context_json"]),
                 "cache_run_manifest_json": str(cache_paths["cache_run_manifest_json"]),
@@ -737,6 +820,7 @@ def export_stage5_review_cache(
         "selected_run_count": len(inventory["selected_runs"]),
         "cached_run_count": len(run_manifests),
         "reused_run_count": reused_count,
+        "refreshed_run_count": refreshed_count,
         "stage5_import_count": stage5_import_count,
         "raw_fallback_count": raw_fallback_count,
         "source_output_roots": [str(path) for path in source_roots],
@@ -1944,6 +2028,37 @@ def _vt_review_index_row(summary_row: dict, stage5_run: dict, plot_path: Path):
     } | _steady_fit_review_metrics(stage5_run, summary_row) | {"plot_path": str(plot_path)}
 
 
+def _review_thumbnail_path(sheet_path: Path, kind: str, row: dict, target_plot_width: int):
+    # Panels are content-addressed by the plot bytes and caption fields, so an
+    # unchanged run reuses its panel and only changed runs are re-captioned.
+    plot_digest = file_digest(row["plot_path"])
+    if plot_digest is None:
+        return None
+    key = content_hash(
+        [
+            kind,
+            RENDER_CACHE_SCHEMA_VERSION,
+            int(target_plot_width),
+            plot_digest,
+            {name: value for name, value in row.items() if name != "plot_path"},
+        ]
+    )
+    run_id = _clean_text(row.get("run_id")) or "run"
+    return Path(sheet_path).parent / REVIEW_THUMBNAIL_DIRNAME / f"{run_id}_{kind}_{key[:16]}.png"
+
+
+def _store_review_thumbnail(thumbnail_path: Path, panel):
+    import cv2
+
+    thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+    prefix = thumbnail_path.stem.rsplit("_", 1)[0]
+    for stale_path in thumbnail_path.parent.glob(f"{prefix}_*.png"):
+        if stale_path != thumbnail_path:
+            stale_path.unlink(missing_ok=True)
+    cv2.imwrite(str(thumbnail_path), panel)
+    return thumbnail_path
+
+
 def _plot_width_review_contact_sheet(path: Path, width_review_rows: list[dict]):
     import cv2
     import numpy as np
@@ -1966,6 +2081,13 @@ def _plot_width_review_contact_sheet(path: Path, width_review_rows: list[dict]):
 
     panels = []
     for row in rows:
+        thumbnail_path = _review_thumbnail_path(path, "width_review", row, target_plot_width)
+        if thumbnail_path is None:
+            continue
+        panel = cv2.imread(str(thumbnail_path), cv2.IMREAD_COLOR) if thumbnail_path.exists() else None
+        if panel is not None:
+            panels.append(panel)
+            continue
         image = cv2.imread(str(row["plot_path"]), cv2.IMREAD_COLOR)
         if image is None:
             continue
@@ -2083,6 +2205,7 @@ def _plot_width_review_contact_sheet(path: Path, width_review_rows: list[dict]):
             1,
         )
         panels.append(panel)
+        _store_review_thumbnail(thumbnail_path, panel)
 
     if not panels:
         return None
@@ -2134,6 +2257,13 @@ def _plot_vt_review_contact_sheet(path: Path, vt_review_rows: list[dict]):
 
     panels = []
     for row in rows:
+        thumbnail_path = _review_thumbnail_path(path, "vt_review", row, target_plot_width)
+        if thumbnail_path is None:
+            continue
+        panel = cv2.imread(str(thumbnail_path), cv2.IMREAD_COLOR) if thumbnail_path.exists() else None
+        if panel is not None:
+            panels.append(panel)
+            continue
         image = cv2.imread(str(row["plot_path"]), cv2.IMREAD_COLOR)
         if image is None:
             continue
@@ -2266,6 +2396,7 @@ def _plot_vt_review_contact_sheet(path: Path, vt_review_rows: list[dict]):
             1,
         )
         panels.append(panel)
+        _store_review_thumbnail(thumbnail_path, panel)
 
     if not panels:
         return None
@@ -2475,7 +2606,8 @@ def export_stage5_cached_review(
         )
 
         review_paths = _review_entry_paths(output_path, run_id)
-        fit_mod._plot_width_trace(
+        submit_plot(
+            fit_mod._plot_width_trace,
             review_paths["width_trace_png"],
             stage5_run["phase_feature_rows"],
             run_id=run_id,
@@ -2483,7 +2615,8 @@ def export_stage5_cached_review(
             tail_onset=stage5_run["tail_onset"],
             fov_report=stage5_run["stage4_run"]["fov_report"],
         )
-        fit_mod._plot_vt_fit(
+        submit_plot(
+            fit_mod._plot_vt_fit,
             review_paths["vt_fit_png"],
             stage5_run["phase_feature_rows"],
             run_id=run_id,
@@ -2684,7 +2817,8 @@ def export_stage5_cached_review(
         )
 
         gravimetric_plot_path = width_review_dir / f"{run_id}_width_trace_with_gravimetric.png"
-        _plot_width_trace_with_gravimetric(
+        submit_plot(
+            _plot_width_trace_with_gravimetric,
             gravimetric_plot_path,
             stage5_run["phase_feature_rows"],
             run_id=run_id,
@@ -2806,32 +2940,37 @@ def export_stage5_cached_review(
         _preferred_columns(width_review_rows, WIDTH_REVIEW_INDEX_COLUMNS),
         width_review_rows,
     )
-    _plot_width_review_contact_sheet(width_review_contact_sheet_png, width_review_rows)
     _write_csv(
         vt_review_index_csv,
         _preferred_columns(vt_review_rows, VT_REVIEW_INDEX_COLUMNS),
         vt_review_rows,
     )
-    _plot_vt_review_contact_sheet(vt_review_contact_sheet_png, vt_review_rows)
-    summary_mod._plot_partial_vs_gravimetric(scatter_png, plot_rows)
-    summary_mod._plot_residual_by_condition(
+    submit_plot(summary_mod._plot_partial_vs_gravimetric, scatter_png, plot_rows)
+    submit_plot(
+        summary_mod._plot_residual_by_condition,
         residual_condition_png,
         condition_rows,
         plot_rows,
         fraction=False,
     )
-    summary_mod._plot_residual_by_condition(
+    submit_plot(
+        summary_mod._plot_residual_by_condition,
         residual_fraction_condition_png,
         condition_rows,
         plot_rows,
         fraction=True,
     )
-    summary_mod._plot_residual_vs_middle_duration(residual_middle_png, plot_rows)
-    _plot_predicted_vs_gravimetric_cv_by_condition(cv_condition_png, condition_rows)
-    _plot_predicted_volume_with_uncertainty_by_condition(
+    submit_plot(summary_mod._plot_residual_vs_middle_duration, residual_middle_png, plot_rows)
+    submit_plot(_plot_predicted_vs_gravimetric_cv_by_condition, cv_condition_png, condition_rows)
+    submit_plot(
+        _plot_predicted_volume_with_uncertainty_by_condition,
         uncertainty_condition_png,
         plot_rows,
     )
+    # Contact sheets read the per-run PNGs, so they wait for every queued run plot.
+    plot_barrier()
+    submit_plot(_plot_width_review_contact_sheet, width_review_contact_sheet_png, width_review_rows)
+    submit_plot(_plot_vt_review_contact_sheet, vt_review_contact_sheet_png, vt_review_rows)
 
     manifest = {
         "schema_version": 1,
@@ -15,11 +15,23 @@ from tools.stream_analysis.dataset import (
     build_stage0_inventory,
     default_output_root,
 )
-from tools.stream_analysis.nozzle import _build_stage2_run
+from tools.stream_analysis.nozzle import (
+    PREFETCH_DEPTH,
+    PREFETCH_MAX_BYTES,
+    _build_stage2_run,
+    _load_gray_image,
+)
+from tools.stream_analysis.parallel import attach_run_timings, export_selected_runs
 
 
 SILHOUETTE_STAGE_DIRNAME = "stage_03_silhouette"
+# Edge traces are held as int64 column arrays; dict rows are built from them.
+EDGE_COLUMN_KEYS = ("y_px", "x_left_px", "x_right_px")
 INPUT_POLICY = "direct_threshold"
+# Nozzle-tracking settings used when silhouette runs Stage 2 itself.
+NOZZLE_RESIDUAL_SCALE = 2.5
+NOZZLE_MIN_AREA_PX = 120
+NOZZLE_TOP_BAND_SLACK_PX = 14
 DETACHED_CONTINUATION_BBOX_EXPAND_PX = 12
 DETACHED_PLAUSIBLE_BBOX_EXPAND_PX = 24
 DETACHED_PLAUSIBLE_ANCHOR_TOLERANCE_MIN_PX = 56.0
@@ -147,19 +159,12 @@ EDGE_TRACE_COLUMNS = [
 ]
 
 
-def _load_gray_image(path: Path) -> np.ndarray:
-    image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
-    if image is None:
-        raise FileNotFoundError(f"Could not load grayscale image: {path}")
-    return image
-
-
-def _coerce_gray_image(image) -> np.ndarray:
+def _coerce_gray_image(image, *, copy: bool = True) -> np.ndarray:
     if image is None:
         raise ValueError("Image is required for silhouette analysis.")
     arr = np.asarray(image)
     if arr.ndim == 2:
-        return arr.copy()
+        return arr.copy() if copy else arr
     if arr.ndim == 3:
         if arr.shape[2] == 1:
             return arr[:, :, 0].copy()
@@ -316,8 +321,17 @@ def _clean_filled_mask(mask: np.ndarray):
     close_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
     cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, open_kernel)
     cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, close_kernel)
-    filled = ndimage.binary_fill_holes(cleaned > 0)
-    return (filled.astype(np.uint8) * 255)
+    return _fill_holes(cleaned)
+
+
+def _fill_holes(mask: np.ndarray):
+    # Same result as ndimage.binary_fill_holes: background 4-connected to the border
+    # is flooded from a one-pixel frame and everything else becomes foreground.
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1] + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1][mask > 0] = 255
+    flood_mask = np.zeros((padded.shape[0] + 2, padded.shape[1] + 2), dtype=np.uint8)
+    cv2.floodFill(padded, flood_mask, (0, 0), 128, flags=4)
+    return np.where(padded[1:-1, 1:-1] != 128, 255, 0).astype(np.uint8)
 
 
 def _row_envelope_fill(mask: np.ndarray):
@@ -344,27 +358,26 @@ def _find_open_bottom_interior_seed(
     local_x = max(0, min(selected_mask.shape[1] - 1, local_x))
     start_y = max(0, min(selected_mask.shape[0] - 1, int(cutoff_y_px) - int(roi["y0"]) + 8))
 
-    for row_local in range(start_y, selected_mask.shape[0]):
-        xs = np.flatnonzero(selected_mask[row_local] > 0)
-        if xs.size < 2:
-            continue
-        left_candidates = xs[xs < local_x]
-        right_candidates = xs[xs > local_x]
-        if left_candidates.size <= 0 or right_candidates.size <= 0:
-            continue
-        gap_x0 = int(left_candidates[-1]) + 1
-        gap_x1 = int(right_candidates[0]) - 1
-        if gap_x1 < gap_x0:
-            continue
-        if np.any(selected_mask[row_local, gap_x0 : gap_x1 + 1] > 0):
-            continue
-        return {
-            "row_local": int(row_local),
-            "seed_x_local": int((gap_x0 + gap_x1) // 2),
-            "gap_x0_local": int(gap_x0),
-            "gap_x1_local": int(gap_x1),
-        }
-    return None
+    # The first row below the cutoff whose tracked column is background with
+    # foreground on both sides; the gap around that column is the seed.
+    rows = selected_mask[start_y:] > 0
+    open_rows = np.flatnonzero(
+        rows[:, :local_x].any(axis=1)
+        & rows[:, local_x + 1 :].any(axis=1)
+        & ~rows[:, local_x]
+    )
+    if open_rows.size <= 0:
+        return None
+    row_local = start_y + int(open_rows[0])
+    xs = np.flatnonzero(selected_mask[row_local] > 0)
+    gap_x0 = int(xs[xs < local_x][-1]) + 1
+    gap_x1 = int(xs[xs > local_x][0]) - 1
+    return {
+        "row_local": int(row_local),
+        "seed_x_local": int((gap_x0 + gap_x1) // 2),
+        "gap_x0_local": int(gap_x0),
+        "gap_x1_local": int(gap_x1),
+    }
 
 
 def _background_component_border_info(background_mask: np.ndarray, *, seed_y_local: int, seed_x_local: int):
@@ -858,6 +871,115 @@ def _plausible_unaccepted_detached_components(
     )
 
 
+def _edge_trace_columns(selected_mask: np.ndarray, roi: dict):
+    occupied = np.asarray(selected_mask) > 0
+    rows_local = np.flatnonzero(occupied.any(axis=1))
+    hits = occupied[rows_local]
+    x_left_local = np.argmax(hits, axis=1)
+    x_right_local = hits.shape[1] - 1 - np.argmax(hits[:, ::-1], axis=1)
+    return {
+        "y_px": rows_local.astype(np.int64) + int(roi["y0"]),
+        "x_left_px": x_left_local.astype(np.int64) + int(roi["x0"]),
+        "x_right_px": x_right_local.astype(np.int64) + int(roi["x0"]),
+    }
+
+
+def _concat_edge_columns(columns_list: list[dict]):
+    if not columns_list:
+        return {key: np.zeros(0, dtype=np.int64) for key in EDGE_COLUMN_KEYS + ("component_index",)}
+    return {
+        key: np.concatenate([columns[key] for columns in columns_list])
+        for key in columns_list[0]
+    }
+
+
+def _edge_column_extent(edge_columns: dict):
+    # (valid_row_count, first_valid_y_px, last_valid_y_px, max_width_px) of one trace.
+    y_px = edge_columns["y_px"]
+    if not len(y_px):
+        return 0, None, None, None
+    width_px = edge_columns["x_right_px"] - edge_columns["x_left_px"] + 1
+    return int(len(y_px)), int(y_px[0]), int(y_px[-1]), int(width_px.max())
+
+
+def _edge_row_identity(
+    frame_row: dict,
+    *,
+    component_id: str,
+    component_role: str,
+    component_rank: int,
+):
+    return {
+        "run_id": frame_row.get("run_id"),
+        "capture_id": frame_row.get("capture_id"),
+        "capture_index": _int_or_none(frame_row.get("capture_index")),
+        "flash_delay_us": _int_or_none(frame_row.get("flash_delay_us")),
+        "component_id": str(component_id),
+        "component_role": str(component_role),
+        "component_rank": int(component_rank),
+    }
+
+
+def _component_row_identity(component_row: dict):
+    return _edge_row_identity(
+        component_row,
+        component_id=component_row.get("component_id"),
+        component_role=component_row.get("component_role"),
+        component_rank=int(component_row.get("component_rank") or 0),
+    )
+
+
+def _edge_rows_from_identities(edge_columns: dict, identities: list[dict], component_index):
+    return [
+        {
+            **identities[index],
+            "y_px": y_px,
+            "x_left_px": x_left_px,
+            "x_right_px": x_right_px,
+            "width_px": x_right_px - x_left_px + 1,
+            "center_x_px": (x_left_px + x_right_px) / 2.0,
+        }
+        for index, y_px, x_left_px, x_right_px in zip(
+            component_index,
+            edge_columns["y_px"].tolist(),
+            edge_columns["x_left_px"].tolist(),
+            edge_columns["x_right_px"].tolist(),
+        )
+    ]
+
+
+def _edge_rows_from_columns(
+    edge_columns: dict,
+    frame_row: dict,
+    *,
+    component_id: str,
+    component_role: str,
+    component_rank: int,
+):
+    identity = _edge_row_identity(
+        frame_row,
+        component_id=component_id,
+        component_role=component_role,
+        component_rank=component_rank,
+    )
+    return _edge_rows_from_identities(edge_columns, [identity], [0] * len(edge_columns["y_px"]))
+
+
+def _component_edge_rows(component: dict):
+    # Component states carry edge_columns only; callers that need dict rows build them here.
+    return _edge_rows_from_identities(
+        component["edge_columns"],
+        [_component_row_identity(component["component_row"])],
+        [0] * len(component["edge_columns"]["y_px"]),
+    )
+
+
+def _stage3_edge_rows(edge_columns: dict, component_rows: list[dict]):
+    """Dict edge rows for a frame or run, from columns indexed into component_rows."""
+    identities = [_component_row_identity(row) for row in component_rows]
+    return _edge_rows_from_identities(edge_columns, identities, edge_columns["component_index"].tolist())
+
+
 def _trace_edges(
     selected_mask: np.ndarray,
     roi: dict,
@@ -867,31 +989,13 @@ def _trace_edges(
     component_role: str = "attached_primary",
     component_rank: int = 0,
 ):
-    edge_rows = []
-    for row_local in np.flatnonzero(np.any(selected_mask > 0, axis=1)):
-        xs = np.flatnonzero(selected_mask[row_local] > 0)
-        if xs.size <= 0:
-            continue
-        x_left_px = int(int(roi["x0"]) + int(xs[0]))
-        x_right_px = int(int(roi["x0"]) + int(xs[-1]))
-        width_px = int(x_right_px - x_left_px + 1)
-        edge_rows.append(
-            {
-                "run_id": frame_row.get("run_id"),
-                "capture_id": frame_row.get("capture_id"),
-                "capture_index": _int_or_none(frame_row.get("capture_index")),
-                "flash_delay_us": _int_or_none(frame_row.get("flash_delay_us")),
-                "component_id": str(component_id),
-                "component_role": str(component_role),
-                "component_rank": int(component_rank),
-                "y_px": int(int(roi["y0"]) + int(row_local)),
-                "x_left_px": x_left_px,
-                "x_right_px": x_right_px,
-                "width_px": width_px,
-                "center_x_px": float((float(x_left_px) + float(x_right_px)) / 2.0),
-            }
-        )
-    return edge_rows
+    return _edge_rows_from_columns(
+        _edge_trace_columns(selected_mask, roi),
+        frame_row,
+        component_id=component_id,
+        component_role=component_role,
+        component_rank=component_rank,
+    )
 
 
 def _resize_to_height(image: np.ndarray, target_height: int) -> np.ndarray:
@@ -966,7 +1070,7 @@ def _contour_overlay(
     overlay = cv2.cvtColor(roi_gray, cv2.COLOR_GRAY2BGR)
     for component in accepted_components:
         component_mask = component.get("final_mask")
-        component_edges = component.get("edge_rows") or []
+        edge_columns = component.get("edge_columns")
         color = _component_color(component.get("component_role", "detached_accepted"))
 
         if component_mask is not None and np.any(component_mask > 0):
@@ -974,21 +1078,10 @@ def _contour_overlay(
             if contours:
                 cv2.drawContours(overlay, contours, -1, color, 2)
 
-        if component_edges:
-            left_points = np.array(
-                [
-                    [int(row["x_left_px"]) - int(roi["x0"]), int(row["y_px"]) - int(roi["y0"])]
-                    for row in component_edges
-                ],
-                dtype=np.int32,
-            )
-            right_points = np.array(
-                [
-                    [int(row["x_right_px"]) - int(roi["x0"]), int(row["y_px"]) - int(roi["y0"])]
-                    for row in component_edges
-                ],
-                dtype=np.int32,
-            )
+        if edge_columns is not None and len(edge_columns["y_px"]):
+            y_local = edge_columns["y_px"] - int(roi["y0"])
+            left_points = np.column_stack((edge_columns["x_left_px"] - int(roi["x0"]), y_local)).astype(np.int32)
+            right_points = np.column_stack((edge_columns["x_right_px"] - int(roi["x0"]), y_local)).astype(np.int32)
             if len(left_points) >= 2:
                 cv2.polylines(overlay, [left_points.reshape((-1, 1, 2))], False, color, 1)
             if len(right_points) >= 2:
@@ -1069,9 +1162,8 @@ def _build_sample_panel(
     return cv2.hconcat(row_images)
 
 
-def _component_metric_row(frame_row: dict, component: dict, edge_rows: list[dict], fill_refinement: dict):
-    valid_row_count = len(edge_rows)
-    max_width_px = max((int(row["width_px"]) for row in edge_rows), default=None)
+def _component_metric_row(frame_row: dict, component: dict, edge_columns: dict, fill_refinement: dict):
+    valid_row_count, first_valid_y_px, last_valid_y_px, max_width_px = _edge_column_extent(edge_columns)
     final_mask = component.get("final_mask")
     return {
         "run_id": frame_row.get("run_id"),
@@ -1096,8 +1188,8 @@ def _component_metric_row(frame_row: dict, component: dict, edge_rows: list[dict
         "open_bottom_interior_detected": bool(fill_refinement.get("open_bottom_interior_detected")),
         "row_fill_added_pixel_count": int(fill_refinement.get("row_fill_added_pixel_count") or 0),
         "valid_row_count": valid_row_count,
-        "first_valid_y_px": None if not edge_rows else int(edge_rows[0]["y_px"]),
-        "last_valid_y_px": None if not edge_rows else int(edge_rows[-1]["y_px"]),
+        "first_valid_y_px": first_valid_y_px,
+        "last_valid_y_px": last_valid_y_px,
         "max_width_px": max_width_px,
     }
 
@@ -1115,15 +1207,14 @@ def _silhouette_metric_row(
     final_selected_mask: np.ndarray,
     selection: dict,
     fill_refinement: dict,
-    edge_rows: list[dict],
+    edge_columns: dict,
     accepted_components: list[dict],
     plausible_unaccepted_components: list[dict],
     silhouette_status: str,
     failure_reason: str | None,
 ):
     selected = selection.get("selected_component")
-    valid_row_count = len(edge_rows)
-    max_width_px = max((int(row["width_px"]) for row in edge_rows), default=None)
+    valid_row_count, first_valid_y_px, last_valid_y_px, max_width_px = _edge_column_extent(edge_columns)
     selected_component_area_px = (
         None if selected is None else int(np.count_nonzero(final_selected_mask))
     )
@@ -1214,14 +1305,14 @@ def _silhouette_metric_row(
         "silhouette_status": str(silhouette_status),
         "failure_reason": _clean_text(failure_reason),
         "valid_row_count": valid_row_count,
-        "first_valid_y_px": None if not edge_rows else int(edge_rows[0]["y_px"]),
-        "last_valid_y_px": None if not edge_rows else int(edge_rows[-1]["y_px"]),
+        "first_valid_y_px": first_valid_y_px,
+        "last_valid_y_px": last_valid_y_px,
         "max_width_px": max_width_px,
         "sample_frame": False,
     }
 
 
-def _summary_from_metric_rows(metric_rows: list[dict], component_rows: list[dict], edge_rows: list[dict]):
+def _summary_from_metric_rows(metric_rows: list[dict], component_rows: list[dict], edge_row_count: int):
     status_counts = {}
     fill_strategy_counts = {}
     valid_row_counts = []
@@ -1251,7 +1342,7 @@ def _summary_from_metric_rows(metric_rows: list[dict], component_rows: list[dict
         "open_bottom_interior_detected_count": sum(
             1 for row in metric_rows if bool(row.get("open_bottom_interior_detected"))
         ),
-        "edge_row_count": len(edge_rows),
+        "edge_row_count": int(edge_row_count),
         "accepted_component_count_max": max(accepted_component_counts) if accepted_component_counts else None,
         "accepted_detached_component_count_max": max(accepted_detached_component_counts) if accepted_detached_component_counts else None,
         "valid_row_count_min": min(valid_row_counts) if valid_row_counts else None,
@@ -1277,22 +1368,15 @@ def _analyze_accepted_component(
         cutoff_y_px=int(cutoff_y_px),
     )
     final_mask = fill_refinement["final_mask"]
-    edge_rows = _trace_edges(
-        final_mask,
-        roi,
-        frame_row,
-        component_id=str(component["component_id"]),
-        component_role=str(component["component_role"]),
-        component_rank=int(component["component_rank"]),
-    )
+    edge_columns = _edge_trace_columns(final_mask, roi)
     component_state = dict(component)
     component_state["final_mask"] = final_mask
     component_state["fill_refinement"] = fill_refinement
-    component_state["edge_rows"] = edge_rows
+    component_state["edge_columns"] = edge_columns
     component_state["component_row"] = _component_metric_row(
         frame_row,
         component_state,
-        edge_rows,
+        edge_columns,
         fill_refinement,
     )
     return component_state
@@ -1313,7 +1397,8 @@ def _analyze_stage3_gray_single_pass(
     roi_left_expansion_px: int = 0,
     roi_right_expansion_px: int = 0,
 ):
-    gray = _coerce_gray_image(gray)
+    # Only called from _analyze_stage3_gray, which already owns a gray copy.
+    gray = _coerce_gray_image(gray, copy=False)
     tracked_x_px = tracked_row.get("tracked_nozzle_x_px")
     tracked_y_px = tracked_row.get("tracked_nozzle_y_px")
     roi, corridor, _base_roi, _base_corridor = _stage3_bounds(
@@ -1348,11 +1433,11 @@ def _analyze_stage3_gray_single_pass(
         "fallback_component": None,
         "interior_border_info": None,
     }
-    attached_edge_rows = []
     accepted_components = []
     plausible_unaccepted_components = []
     component_rows = []
-    edge_rows = []
+    edge_columns = _concat_edge_columns([])
+    attached_edge_columns = edge_columns
     corridor_exclusion = {
         "left_dark_pixel_count": 0,
         "right_dark_pixel_count": 0,
@@ -1412,8 +1497,8 @@ def _analyze_stage3_gray_single_pass(
                 )
                 fill_refinement = attached_state["fill_refinement"]
                 final_selected_mask = attached_state["final_mask"]
-                attached_edge_rows = list(attached_state["edge_rows"])
-                if not attached_edge_rows:
+                attached_edge_columns = attached_state["edge_columns"]
+                if not len(attached_edge_columns["y_px"]):
                     silhouette_status = "no_valid_rows"
                     failure_reason = "selected component did not produce row-wise edge traces"
                 else:
@@ -1460,11 +1545,20 @@ def _analyze_stage3_gray_single_pass(
                         )
                     diagnostic_components = list(accepted_components) + list(plausible_unaccepted_components)
                     component_rows = [component["component_row"] for component in diagnostic_components]
-                    edge_rows = [
-                        row
-                        for component in diagnostic_components
-                        for row in component["edge_rows"]
-                    ]
+                    # component_index points into component_rows for this frame.
+                    edge_columns = _concat_edge_columns(
+                        [
+                            dict(
+                                component["edge_columns"],
+                                component_index=np.full(
+                                    len(component["edge_columns"]["y_px"]),
+                                    component_index,
+                                    dtype=np.int64,
+                                ),
+                            )
+                            for component_index, component in enumerate(diagnostic_components)
+                        ]
+                    )
                     silhouette_status = "ok"
                     failure_reason = None
 
@@ -1480,7 +1574,7 @@ def _analyze_stage3_gray_single_pass(
         final_selected_mask=final_selected_mask if selection.get("selected_component") is not None else filled_mask,
         selection=selection,
         fill_refinement=fill_refinement,
-        edge_rows=attached_edge_rows,
+        edge_columns=attached_edge_columns,
         accepted_components=accepted_components,
         plausible_unaccepted_components=plausible_unaccepted_components,
         silhouette_status=silhouette_status,
@@ -1493,7 +1587,7 @@ def _analyze_stage3_gray_single_pass(
         "raw_mask": raw_mask,
         "metric_row": metric_row,
         "component_rows": component_rows,
-        "edge_rows": edge_rows,
+        "edge_columns": edge_columns,
         "accepted_components": accepted_components,
         "plausible_unaccepted_components": plausible_unaccepted_components,
         "tracked_row": tracked_row,
@@ -1559,8 +1653,9 @@ def _analyze_stage3_gray(
     adaptive_roi_edge_margin_px: int = 8,
     adaptive_roi_expansion_step_px: int = 48,
     adaptive_roi_max_expansion_px: int = 160,
+    copy_gray: bool = True,
 ):
-    gray = _coerce_gray_image(gray)
+    gray = _coerce_gray_image(gray, copy=copy_gray)
     tracked_x_px = tracked_row.get("tracked_nozzle_x_px")
     base_roi = _dynamic_roi_bounds(
         gray.shape,
@@ -1742,6 +1837,8 @@ def _build_stage3_run(
     corridor_width_frac: float,
     nozzle_guard_px: int,
     min_component_area_px: int,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
 ):
     stage2_run = _build_stage2_run(
         run_id,
@@ -1751,12 +1848,14 @@ def _build_stage3_run(
         search_top_frac=search_top_frac,
         search_bottom_frac=search_bottom_frac,
         blur_sigma=blur_sigma,
-        residual_scale=2.5,
+        residual_scale=NOZZLE_RESIDUAL_SCALE,
         residual_threshold=residual_threshold,
-        min_area_px=120,
-        top_band_slack_px=14,
+        min_area_px=NOZZLE_MIN_AREA_PX,
+        top_band_slack_px=NOZZLE_TOP_BAND_SLACK_PX,
         shift_threshold_px=shift_threshold_px,
         confidence_threshold=confidence_threshold,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
     )
     tracked_rows = list(stage2_run["tracked_rows"])
     shift_events = list(stage2_run["shift_events"])
@@ -1780,7 +1879,7 @@ def _build_stage3_run(
 
     metric_rows = []
     component_rows = []
-    edge_rows = []
+    edge_columns = []
     sample_inputs = {}
 
     for frame_row, tracked_row in zip(frame_rows, tracked_rows):
@@ -1809,8 +1908,14 @@ def _build_stage3_run(
                 "accepted_components": analysis["accepted_components"],
             }
         metric_rows.append(metric_row)
+        frame_edge_columns = analysis["edge_columns"]
+        edge_columns.append(
+            dict(
+                frame_edge_columns,
+                component_index=frame_edge_columns["component_index"] + len(component_rows),
+            )
+        )
         component_rows.extend(analysis["component_rows"])
-        edge_rows.extend(analysis["edge_rows"])
 
     return {
         "tracked_rows": tracked_rows,
@@ -1818,8 +1923,210 @@ def _build_stage3_run(
         "sample_indices": sorted(sample_indices),
         "metric_rows": metric_rows,
         "component_rows": component_rows,
-        "edge_rows": edge_rows,
+        "edge_columns": _concat_edge_columns(edge_columns),
         "sample_inputs": sample_inputs,
+        "stage2_run": stage2_run,
+    }
+
+
+def _export_stage3_run(
+    run_row: dict,
+    frame_rows: list[dict],
+    output_path: Path,
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_threshold: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+    roi_width_frac: float,
+    roi_top_frac: float,
+    roi_bottom_frac: float,
+    corridor_width_frac: float,
+    nozzle_guard_px: int,
+    min_component_area_px: int,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
+    stage3_run = _build_stage3_run(
+        run_id,
+        frame_rows,
+        tracking_mode=tracking_mode,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
+    return _write_stage3_run_outputs(
+        run_row,
+        stage3_run,
+        output_path,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+    )
+
+
+def _write_stage3_run_outputs(
+    run_row: dict,
+    stage3_run: dict,
+    output_path: Path,
+    *,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_threshold: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+    roi_width_frac: float,
+    roi_top_frac: float,
+    roi_bottom_frac: float,
+    corridor_width_frac: float,
+    nozzle_guard_px: int,
+    min_component_area_px: int,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
+    shift_events = list(stage3_run["shift_events"])
+    sample_indices = set(stage3_run["sample_indices"])
+
+    stage_dir = output_path / "runs" / run_id / SILHOUETTE_STAGE_DIRNAME
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    sample_dir = stage_dir / "samples"
+    if sample_dir.exists():
+        for stale_panel in sample_dir.glob("*.png"):
+            stale_panel.unlink()
+    else:
+        sample_dir.mkdir(parents=True, exist_ok=True)
+
+    metric_rows = list(stage3_run["metric_rows"])
+    component_rows = list(stage3_run["component_rows"])
+    edge_rows = _stage3_edge_rows(stage3_run["edge_columns"], component_rows)
+    sample_panels = []
+    sample_panel_paths = []
+
+    for capture_index in stage3_run["sample_indices"]:
+        sample_input = stage3_run["sample_inputs"].get(int(capture_index))
+        if sample_input is None:
+            continue
+        gray = _load_gray_image(Path(str(sample_input["image_path"])))
+        panel = _build_sample_panel(
+            gray,
+            sample_input["roi"],
+            sample_input["corridor"],
+            sample_input["tracked_row"],
+            sample_input["metric_row"],
+            sample_input["raw_mask"],
+            sample_input["accepted_components"],
+        )
+        panel_path = sample_dir / f"frame_{int(capture_index):03d}_panel.png"
+        cv2.imwrite(str(panel_path), panel)
+        sample_panels.append(panel)
+        sample_panel_paths.append(str(panel_path))
+
+    metrics_csv = stage_dir / "silhouette_metrics.csv"
+    component_csv = stage_dir / "component_metrics.csv"
+    edge_csv = stage_dir / "edge_traces.csv"
+    edge_json = stage_dir / "edge_traces.json"
+    summary_json = stage_dir / "silhouette_manifest.json"
+    contact_sheet_png = stage_dir / "sample_contact_sheet.png"
+
+    _write_csv(metrics_csv, _preferred_columns(metric_rows, SILHOUETTE_METRIC_COLUMNS), metric_rows)
+    _write_csv(component_csv, _preferred_columns(component_rows, COMPONENT_METRIC_COLUMNS), component_rows)
+    _write_csv(edge_csv, _preferred_columns(edge_rows, EDGE_TRACE_COLUMNS), edge_rows)
+    _write_json(
+        edge_json,
+        {
+            "schema_version": 1,
+            "stage": "silhouette",
+            "run_id": run_id,
+            "row_count": len(edge_rows),
+            "rows": edge_rows,
+        },
+    )
+    if sample_panels:
+        cv2.imwrite(str(contact_sheet_png), cv2.vconcat(sample_panels))
+
+    summary = {
+        "schema_version": 1,
+        "stage": "silhouette",
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "tracking_mode": tracking_mode,
+        "input_policy": INPUT_POLICY,
+        "nozzle_tracking": {
+            "search_width_frac": float(search_width_frac),
+            "search_top_frac": float(search_top_frac),
+            "search_bottom_frac": float(search_bottom_frac),
+            "blur_sigma": float(blur_sigma),
+            "residual_threshold": int(residual_threshold),
+            "shift_threshold_px": float(shift_threshold_px),
+            "confidence_threshold": float(confidence_threshold),
+        },
+        "roi": {
+            "width_frac": float(roi_width_frac),
+            "top_frac": float(roi_top_frac),
+            "bottom_frac": float(roi_bottom_frac),
+            "corridor_width_frac": float(corridor_width_frac),
+        },
+        "nozzle_guard_px": int(nozzle_guard_px),
+        "min_component_area_px": int(min_component_area_px),
+        "sample_capture_indices": sorted(sample_indices),
+        "sample_panel_paths": sample_panel_paths,
+        "outputs": {
+            "silhouette_metrics_csv": str(metrics_csv),
+            "component_metrics_csv": str(component_csv),
+            "edge_traces_csv": str(edge_csv),
+            "edge_traces_json": str(edge_json),
+            "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
+        },
+        "summary": _summary_from_metric_rows(metric_rows, component_rows, len(edge_rows)),
+        "shift_events": shift_events,
+    }
+    _write_json(summary_json, summary)
+    return {
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "tracking_mode": tracking_mode,
+        "silhouette_metrics_csv": str(metrics_csv),
+        "component_metrics_csv": str(component_csv),
+        "edge_traces_csv": str(edge_csv),
+        "edge_traces_json": str(edge_json),
+        "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
+        "frame_count": len(metric_rows),
+        "component_row_count": len(component_rows),
+        "edge_row_count": len(edge_rows),
+        "sample_frame_count": len(sample_indices),
     }
 
 
@@ -1845,6 +2152,9 @@ def export_stage3_silhouette(
     corridor_width_frac: float = 0.70,
     nozzle_guard_px: int = 2,
     min_component_area_px: int = 120,
+    prefetch_depth: int = PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = PREFETCH_MAX_BYTES,
+    workers: int | None = 1,
 ):
     inventory = build_stage0_inventory(
         experiment_root,
@@ -1856,151 +2166,79 @@ def export_stage3_silhouette(
     output_path = Path(output_root).expanduser().resolve() if output_root else default_output_root(experiment_root)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    run_manifests = []
-    for run_row in inventory["selected_runs"]:
-        run_id = str(run_row["run_id"])
-        tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
-        frame_rows = list(inventory["frames_by_run_id"][run_id])
-        if not frame_rows:
-            raise ValueError(f"No frame index rows available for run: {run_id}")
-        stage3_run = _build_stage3_run(
-            run_id,
-            frame_rows,
-            tracking_mode=tracking_mode,
-            sample_count=sample_count,
-            extra_frame_indices=extra_frame_indices,
-            search_width_frac=search_width_frac,
-            search_top_frac=search_top_frac,
-            search_bottom_frac=search_bottom_frac,
-            blur_sigma=blur_sigma,
-            residual_threshold=residual_threshold,
-            shift_threshold_px=shift_threshold_px,
-            confidence_threshold=confidence_threshold,
-            roi_width_frac=roi_width_frac,
-            roi_top_frac=roi_top_frac,
-            roi_bottom_frac=roi_bottom_frac,
-            corridor_width_frac=corridor_width_frac,
-            nozzle_guard_px=nozzle_guard_px,
-            min_component_area_px=min_component_area_px,
-        )
-        shift_events = list(stage3_run["shift_events"])
-        sample_indices = set(stage3_run["sample_indices"])
-
-        stage_dir = output_path / "runs" / run_id / SILHOUETTE_STAGE_DIRNAME
-        stage_dir.mkdir(parents=True, exist_ok=True)
-        sample_dir = stage_dir / "samples"
-        if sample_dir.exists():
-            for stale_panel in sample_dir.glob("*.png"):
-                stale_panel.unlink()
-        else:
-            sample_dir.mkdir(parents=True, exist_ok=True)
-
-        metric_rows = list(stage3_run["metric_rows"])
-        component_rows = list(stage3_run["component_rows"])
-        edge_rows = list(stage3_run["edge_rows"])
-        sample_panels = []
-        sample_panel_paths = []
+    run_manifests, run_timings = export_selected_runs(
+        _export_stage3_run,
+        inventory,
+        output_path,
+        workers=workers,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
 
-        for capture_index in stage3_run["sample_indices"]:
-            sample_input = stage3_run["sample_inputs"].get(int(capture_index))
-            if sample_input is None:
-                continue
-            gray = _load_gray_image(Path(str(sample_input["image_path"])))
-            panel = _build_sample_panel(
-                gray,
-                sample_input["roi"],
-                sample_input["corridor"],
-                sample_input["tracked_row"],
-                sample_input["metric_row"],
-                sample_input["raw_mask"],
-                sample_input["accepted_components"],
-            )
-            panel_path = sample_dir / f"frame_{int(capture_index):03d}_panel.png"
-            cv2.imwrite(str(panel_path), panel)
-            sample_panels.append(panel)
-            sample_panel_paths.append(str(panel_path))
-
-        metrics_csv = stage_dir / "silhouette_metrics.csv"
-        component_csv = stage_dir / "component_metrics.csv"
-        edge_csv = stage_dir / "edge_traces.csv"
-        edge_json = stage_dir / "edge_traces.json"
-        summary_json = stage_dir / "silhouette_manifest.json"
-        contact_sheet_png = stage_dir / "sample_contact_sheet.png"
-
-        _write_csv(metrics_csv, _preferred_columns(metric_rows, SILHOUETTE_METRIC_COLUMNS), metric_rows)
-        _write_csv(component_csv, _preferred_columns(component_rows, COMPONENT_METRIC_COLUMNS), component_rows)
-        _write_csv(edge_csv, _preferred_columns(edge_rows, EDGE_TRACE_COLUMNS), edge_rows)
-        _write_json(
-            edge_json,
-            {
-                "schema_version": 1,
-                "stage": "silhouette",
-                "run_id": run_id,
-                "row_count": len(edge_rows),
-                "rows": edge_rows,
-            },
-        )
-        if sample_panels:
-            cv2.imwrite(str(contact_sheet_png), cv2.vconcat(sample_panels))
+    manifest = _write_stage3_manifest(
+        inventory["experiment_root"],
+        output_path,
+        run_manifests,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+    )
+    attach_run_timings(manifest, run_timings, workers=workers)
+    return manifest
 
-        summary = {
-            "schema_version": 1,
-            "stage": "silhouette",
-            "run_id": run_id,
-            "run_dir": run_row["run_dir"],
-            "tracking_mode": tracking_mode,
-            "input_policy": INPUT_POLICY,
-            "nozzle_tracking": {
-                "search_width_frac": float(search_width_frac),
-                "search_top_frac": float(search_top_frac),
-                "search_bottom_frac": float(search_bottom_frac),
-                "blur_sigma": float(blur_sigma),
-                "residual_threshold": int(residual_threshold),
-                "shift_threshold_px": float(shift_threshold_px),
-                "confidence_threshold": float(confidence_threshold),
-            },
-            "roi": {
-                "width_frac": float(roi_width_frac),
-                "top_frac": float(roi_top_frac),
-                "bottom_frac": float(roi_bottom_frac),
-                "corridor_width_frac": float(corridor_width_frac),
-            },
-            "nozzle_guard_px": int(nozzle_guard_px),
-            "min_component_area_px": int(min_component_area_px),
-            "sample_capture_indices": sorted(sample_indices),
-            "sample_panel_paths": sample_panel_paths,
-            "outputs": {
-                "silhouette_metrics_csv": str(metrics_csv),
-                "component_metrics_csv": str(component_csv),
-                "edge_traces_csv": str(edge_csv),
-                "edge_traces_json": str(edge_json),
-                "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
-            },
-            "summary": _summary_from_metric_rows(metric_rows, component_rows, edge_rows),
-            "shift_events": shift_events,
-        }
-        _write_json(summary_json, summary)
-        run_manifests.append(
-            {
-                "run_id": run_id,
-                "run_dir": run_row["run_dir"],
-                "tracking_mode": tracking_mode,
-                "silhouette_metrics_csv": str(metrics_csv),
-                "component_metrics_csv": str(component_csv),
-                "edge_traces_csv": str(edge_csv),
-                "edge_traces_json": str(edge_json),
-                "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
-                "frame_count": len(metric_rows),
-                "component_row_count": len(component_rows),
-                "edge_row_count": len(edge_rows),
-                "sample_frame_count": len(sample_indices),
-            }
-        )
 
+def _write_stage3_manifest(
+    experiment_root: str,
+    output_path: Path,
+    run_manifests: list[dict],
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_threshold: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+    roi_width_frac: float,
+    roi_top_frac: float,
+    roi_bottom_frac: float,
+    corridor_width_frac: float,
+    nozzle_guard_px: int,
+    min_component_area_px: int,
+):
     manifest = {
         "schema_version": 1,
         "stage": "silhouette",
-        "experiment_root": inventory["experiment_root"],
+        "experiment_root": experiment_root,
         "output_root": str(output_path),
         "input_policy": INPUT_POLICY,
         "selected_run_count": len(run_manifests),
@@ -17,11 +17,33 @@ from tools.stream_analysis.dataset import (
     default_output_root,
 )
 from tools.stream_analysis import fit as fit_mod
+from tools.stream_analysis import nozzle as nozzle_mod
+from tools.stream_analysis import silhouette as silhouette_mod
 from tools.stream_analysis import volume as volume_mod
+from tools.stream_analysis.parallel import export_selected_runs, resolve_worker_count
+from tools.stream_analysis.plotting import plot_barrier, submit_plot
+from tools.stream_analysis.render_cache import RenderCache
 
 
 SUMMARY_STAGE_DIRNAME = "stage_06_summary"
 SUMMARY_PROGRESS_FILENAME = "summary_progress.json"
+NOZZLE_TRACKING_PARAMETER_KEYS = (
+    "search_width_frac",
+    "search_top_frac",
+    "search_bottom_frac",
+    "blur_sigma",
+    "residual_threshold",
+    "shift_threshold_px",
+    "confidence_threshold",
+)
+SILHOUETTE_PARAMETER_KEYS = NOZZLE_TRACKING_PARAMETER_KEYS + (
+    "roi_width_frac",
+    "roi_top_frac",
+    "roi_bottom_frac",
+    "corridor_width_frac",
+    "nozzle_guard_px",
+    "min_component_area_px",
+)
 NL_PER_MG_WATER = 1000.0
 
 RUN_SUMMARY_COLUMNS = [
@@ -938,8 +960,8 @@ def _condition_consistency_rows(condition_bundles: list[dict], *, review_dir: Pa
         if len(ordered_bundles) >= 2 and review_dir is not None:
             vt_overlay_path = review_dir / f"{condition_key}__vt_overlay.png"
             width_overlay_path = review_dir / f"{condition_key}__width_overlay.png"
-            _plot_condition_vt_overlay(vt_overlay_path, condition_key, ordered_bundles)
-            _plot_condition_width_overlay(width_overlay_path, condition_key, ordered_bundles)
+            submit_plot(_plot_condition_vt_overlay, vt_overlay_path, condition_key, ordered_bundles)
+            submit_plot(_plot_condition_width_overlay, width_overlay_path, condition_key, ordered_bundles)
 
         if len(ordered_bundles) < 2:
             consistency_status = "insufficient_runs"
@@ -1162,6 +1184,150 @@ def _build_raw_run_context(review_cache_mod, run_row: dict, stage5_run: dict, *,
     )
 
 
+def _write_stage2_to_4_run_outputs(
+    run_row: dict,
+    frame_rows: list[dict],
+    stage5_run: dict,
+    output_path: Path,
+    parameter_payload: dict,
+):
+    stage4_run = stage5_run["stage4_run"]
+    nozzle_params = {key: parameter_payload[key] for key in NOZZLE_TRACKING_PARAMETER_KEYS}
+    silhouette_params = {key: parameter_payload[key] for key in SILHOUETTE_PARAMETER_KEYS}
+    return {
+        "nozzle": nozzle_mod._write_stage2_run_outputs(
+            run_row,
+            frame_rows,
+            stage4_run["stage2_run"],
+            output_path,
+            sample_count=parameter_payload["sample_count"],
+            extra_frame_indices=parameter_payload["extra_frame_indices"],
+            residual_scale=silhouette_mod.NOZZLE_RESIDUAL_SCALE,
+            min_area_px=silhouette_mod.NOZZLE_MIN_AREA_PX,
+            top_band_slack_px=silhouette_mod.NOZZLE_TOP_BAND_SLACK_PX,
+            **nozzle_params,
+        ),
+        "silhouette": silhouette_mod._write_stage3_run_outputs(
+            run_row,
+            stage4_run,
+            output_path,
+            **silhouette_params,
+        ),
+        "volume": volume_mod._write_stage4_run_outputs(run_row, stage4_run, output_path),
+    }
+
+
+def _analyze_raw_run(
+    run_row: dict,
+    frame_rows: list[dict],
+    output_path: Path,
+    *,
+    experiment_root: str | Path,
+    parameter_payload: dict,
+    write_stage_outputs: bool = False,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
+):
+    run_id = str(run_row["run_id"])
+    stage_run_manifests = {}
+    # Stages 2-5 run once in memory; with write_stage_outputs their per-run
+    # artifacts are written from that result instead of being recomputed.
+    with nozzle_mod.shared_gray_images():
+        stage5_run = fit_mod._build_stage5_run(
+            run_id,
+            frame_rows,
+            tracking_mode=str(run_row.get("tracking_mode") or "dynamic"),
+            **parameter_payload,
+            prefetch_depth=prefetch_depth,
+            prefetch_max_bytes=prefetch_max_bytes,
+        )
+        if write_stage_outputs:
+            stage_run_manifests = _write_stage2_to_4_run_outputs(
+                run_row,
+                frame_rows,
+                stage5_run,
+                output_path,
+                parameter_payload,
+            )
+    # Decoded masks and Stage 2 diagnostics are not needed past this point.
+    stage5_run["stage4_run"] = {
+        key: value
+        for key, value in dict(stage5_run.get("stage4_run") or {}).items()
+        if key not in {"sample_inputs", "stage2_run"}
+    }
+    artifact_refs = _artifact_references(experiment_root, output_path, run_id)
+    stage5_paths = fit_mod._write_stage5_outputs(
+        output_path,
+        run_id,
+        stage5_run,
+        run_dir=run_row.get("run_dir"),
+        parameters=parameter_payload,
+        analysis_source_mode="raw",
+        referenced_stage4_fit_output_root=artifact_refs["referenced_stage4_fit_output_root"],
+        referenced_stage4_manifest_json=artifact_refs["referenced_stage4_manifest_json"],
+        referenced_stage5_fit_output_root=str(output_path),
+        referenced_stage5_manifest_json=None,
+        stage4_summary=stage5_run["stage4_run"].get("summary_counts"),
+        shift_events=stage5_run["stage4_run"].get("shift_events"),
+    )
+    if write_stage_outputs:
+        stage_run_manifests["fit"] = fit_mod._stage5_run_manifest(run_row, stage5_run, stage5_paths)
+    return {
+        "run_id": run_id,
+        "stage5_run": stage5_run,
+        "stage5_paths": stage5_paths,
+        "artifact_refs": artifact_refs,
+        "stage_run_manifests": stage_run_manifests,
+    }
+
+
+def _write_stage2_to_5_manifests(
+    experiment_root: str,
+    output_path: Path,
+    stage_run_manifests: list[dict],
+    parameter_payload: dict,
+):
+    nozzle_params = {key: parameter_payload[key] for key in NOZZLE_TRACKING_PARAMETER_KEYS}
+    silhouette_params = {key: parameter_payload[key] for key in SILHOUETTE_PARAMETER_KEYS}
+    sample_params = {
+        "sample_count": parameter_payload["sample_count"],
+        "extra_frame_indices": parameter_payload["extra_frame_indices"],
+    }
+    manifests = {
+        "nozzle": nozzle_mod._write_stage2_manifest(
+            experiment_root,
+            output_path,
+            [row["nozzle"] for row in stage_run_manifests],
+            residual_scale=silhouette_mod.NOZZLE_RESIDUAL_SCALE,
+            min_area_px=silhouette_mod.NOZZLE_MIN_AREA_PX,
+            **sample_params,
+            **nozzle_params,
+        ),
+        "silhouette": silhouette_mod._write_stage3_manifest(
+            experiment_root,
+            output_path,
+            [row["silhouette"] for row in stage_run_manifests],
+            **sample_params,
+            **silhouette_params,
+        ),
+        "volume": volume_mod._write_stage4_manifest(
+            experiment_root,
+            output_path,
+            [row["volume"] for row in stage_run_manifests],
+            pixel_size_um=volume_mod.resolve_pixel_size_um(None),
+            **sample_params,
+            **silhouette_params,
+        ),
+        "fit": fit_mod._write_stage5_manifest(
+            experiment_root,
+            output_path,
+            [row["fit"] for row in stage_run_manifests],
+            parameter_payload=parameter_payload,
+        ),
+    }
+    return {stage: manifest["manifest_path"] for stage, manifest in manifests.items()}
+
+
 def _validate_cache_mode_raw_overrides(
     review_cache_mod,
     *,
@@ -1276,11 +1442,17 @@ def export_stage6_summary(
     volume_uncertainty_sample_count: int = fit_mod.VOLUME_UNCERTAINTY_SAMPLE_COUNT,
     volume_uncertainty_seed: int = fit_mod.VOLUME_UNCERTAINTY_SEED,
     tail_uncertainty_score_tolerance: float = fit_mod.TAIL_UNCERTAINTY_SCORE_TOLERANCE,
+    write_stage_outputs: bool = False,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
+    workers: int | None = 1,
 ):
     from tools.stream_analysis import review_cache as review_cache_mod
 
     if bool(experiment_root) == bool(cache_root):
         raise ValueError("Provide exactly one source: --experiment-root or --cache-root.")
+    if write_stage_outputs and cache_root:
+        raise ValueError("Stage 2-5 outputs can only be written from --experiment-root.")
 
     analysis_source_mode = "cache" if cache_root else "raw"
     parameter_payload = fit_mod._stage5_parameter_payload(
@@ -1397,6 +1569,7 @@ def export_stage6_summary(
         )
     )
     output_path.mkdir(parents=True, exist_ok=True)
+    render_cache = RenderCache(output_path)
 
     selected_run_ids = (
         [str(row["run_id"]) for row in selected_runs]
@@ -1420,8 +1593,24 @@ def export_stage6_summary(
         ),
     )
 
+    analyzed_runs = {}
+    if analysis_source_mode == "raw" and resolve_worker_count(workers, len(selected_runs)) > 1:
+        analyzed_results, _run_timings = export_selected_runs(
+            _analyze_raw_run,
+            inventory,
+            output_path,
+            workers=workers,
+            experiment_root=experiment_root,
+            parameter_payload=parameter_payload,
+            write_stage_outputs=write_stage_outputs,
+            prefetch_depth=prefetch_depth,
+            prefetch_max_bytes=prefetch_max_bytes,
+        )
+        analyzed_runs = {result["run_id"]: result for result in analyzed_results}
+
     summary_rows = []
     run_manifests = []
+    stage_run_manifests = []
     width_review_rows = []
     vt_review_rows = []
     condition_consistency_bundles = []
@@ -1447,30 +1636,26 @@ def export_stage6_summary(
         started = time.perf_counter()
         if analysis_source_mode == "raw":
             run_row = next(row for row in selected_runs if str(row["run_id"]) == run_id)
-            frame_rows = list(inventory["frames_by_run_id"][run_id])
-            if not frame_rows:
-                raise ValueError(f"No frame index rows available for run: {run_id}")
-            stage5_run = fit_mod._build_stage5_run(
-                run_id,
-                frame_rows,
-                tracking_mode=str(run_row.get("tracking_mode") or "dynamic"),
-                **parameter_payload,
-            )
-            artifact_refs = _artifact_references(experiment_root, output_path, run_id)
-            stage5_paths = fit_mod._write_stage5_outputs(
-                output_path,
-                run_id,
-                stage5_run,
-                run_dir=run_row.get("run_dir"),
-                parameters=parameter_payload,
-                analysis_source_mode=analysis_source_mode,
-                referenced_stage4_fit_output_root=artifact_refs["referenced_stage4_fit_output_root"],
-                referenced_stage4_manifest_json=artifact_refs["referenced_stage4_manifest_json"],
-                referenced_stage5_fit_output_root=str(output_path),
-                referenced_stage5_manifest_json=None,
-                stage4_summary=stage5_run["stage4_run"].get("summary_counts"),
-                shift_events=stage5_run["stage4_run"].get("shift_events"),
-            )
+            analyzed = analyzed_runs.pop(run_id, None)
+            if analyzed is None:
+                frame_rows = list(inventory["frames_by_run_id"][run_id])
+                if not frame_rows:
+                    raise ValueError(f"No frame index rows available for run: {run_id}")
+                analyzed = _analyze_raw_run(
+                    run_row,
+                    frame_rows,
+                    output_path,
+                    experiment_root=experiment_root,
+                    parameter_payload=parameter_payload,
+                    write_stage_outputs=write_stage_outputs,
+                    prefetch_depth=prefetch_depth,
+                    prefetch_max_bytes=prefetch_max_bytes,
+                )
+            stage5_run = analyzed["stage5_run"]
+            stage5_paths = analyzed["stage5_paths"]
+            artifact_refs = analyzed["artifact_refs"]
+            if write_stage_outputs:
+                stage_run_manifests.append(analyzed["stage_run_manifests"])
             run_context = _build_raw_run_context(
                 review_cache_mod,
                 dict(run_row),
@@ -1578,6 +1763,7 @@ def export_stage6_summary(
                 or source.get("source_output_root"),
                 referenced_stage5_manifest_json=source.get("stage5_manifest_json")
                 or source.get("fit_manifest_json"),
+                render_cache=render_cache,
             )
 
         summary_row = review_cache_mod._review_summary_row(
@@ -1656,22 +1842,27 @@ def export_stage6_summary(
         )
 
         gravimetric_plot_path = width_review_dir / f"{run_id}_width_trace_with_gravimetric.png"
-        review_cache_mod._plot_width_trace_with_gravimetric(
-            gravimetric_plot_path,
-            review_feature_rows,
-            run_id=run_id,
-            steady_fit=review_steady_fit,
-            tail_onset=review_tail_onset,
-            fov_report=review_fov_report,
-            gravimetric_equality_delay_us=summary_row.get("gravimetric_equality_delay_us"),
-            gravimetric_equality_delay_low_us=summary_row.get(
+        gravimetric_plot_kwargs = {
+            "run_id": run_id,
+            "steady_fit": review_steady_fit,
+            "tail_onset": review_tail_onset,
+            "fov_report": review_fov_report,
+            "gravimetric_equality_delay_us": summary_row.get("gravimetric_equality_delay_us"),
+            "gravimetric_equality_delay_low_us": summary_row.get(
                 "gravimetric_equality_delay_low_us"
             ),
-            gravimetric_equality_delay_high_us=summary_row.get(
+            "gravimetric_equality_delay_high_us": summary_row.get(
                 "gravimetric_equality_delay_high_us"
             ),
-            max_shrink_rate_delay_us=summary_row.get("max_shrink_rate_delay_us"),
-            max_shrink_rate_norm_per_ms=summary_row.get("max_shrink_rate_norm_per_ms"),
+            "max_shrink_rate_delay_us": summary_row.get("max_shrink_rate_delay_us"),
+            "max_shrink_rate_norm_per_ms": summary_row.get("max_shrink_rate_norm_per_ms"),
+        }
+        render_cache.render(
+            gravimetric_plot_path,
+            ["width_trace_with_gravimetric", review_feature_rows, gravimetric_plot_kwargs],
+            review_cache_mod._plot_width_trace_with_gravimetric,
+            review_feature_rows,
+            **gravimetric_plot_kwargs,
         )
         if bool(summary_row.get("include_in_gravimetric_plots")):
             width_review_rows.append(
@@ -1839,27 +2030,49 @@ def export_stage6_summary(
         _preferred_columns(width_review_rows, review_cache_mod.WIDTH_REVIEW_INDEX_COLUMNS),
         width_review_rows,
     )
-    review_cache_mod._plot_width_review_contact_sheet(width_review_contact_sheet_png, width_review_rows)
     _write_csv(
         vt_review_index_csv,
         _preferred_columns(vt_review_rows, review_cache_mod.VT_REVIEW_INDEX_COLUMNS),
         vt_review_rows,
     )
-    review_cache_mod._plot_vt_review_contact_sheet(vt_review_contact_sheet_png, vt_review_rows)
-    _plot_partial_vs_gravimetric(scatter_png, plot_rows)
-    _plot_residual_by_condition(residual_condition_png, condition_rows, plot_rows, fraction=False)
-    _plot_residual_by_condition(
+    submit_plot(_plot_partial_vs_gravimetric, scatter_png, plot_rows)
+    submit_plot(
+        _plot_residual_by_condition,
+        residual_condition_png,
+        condition_rows,
+        plot_rows,
+        fraction=False,
+    )
+    submit_plot(
+        _plot_residual_by_condition,
         residual_fraction_condition_png,
         condition_rows,
         plot_rows,
         fraction=True,
     )
-    _plot_residual_vs_middle_duration(residual_middle_png, plot_rows)
-    review_cache_mod._plot_predicted_vs_gravimetric_cv_by_condition(cv_condition_png, condition_rows)
-    review_cache_mod._plot_predicted_volume_with_uncertainty_by_condition(
+    submit_plot(_plot_residual_vs_middle_duration, residual_middle_png, plot_rows)
+    submit_plot(
+        review_cache_mod._plot_predicted_vs_gravimetric_cv_by_condition,
+        cv_condition_png,
+        condition_rows,
+    )
+    submit_plot(
+        review_cache_mod._plot_predicted_volume_with_uncertainty_by_condition,
         uncertainty_condition_png,
         summary_rows,
     )
+    # Contact sheets read the per-run PNGs, so they wait for every queued run plot.
+    plot_barrier()
+    submit_plot(
+        review_cache_mod._plot_width_review_contact_sheet,
+        width_review_contact_sheet_png,
+        width_review_rows,
+    )
+    submit_plot(
+        review_cache_mod._plot_vt_review_contact_sheet,
+        vt_review_contact_sheet_png,
+        vt_review_rows,
+    )
 
     usable_gravimetric_rows = sum(
         1 for row in summary_rows if bool(row.get("include_in_gravimetric_plots"))
@@ -1912,7 +2125,19 @@ def export_stage6_summary(
         "runs": run_manifests,
     }
     _write_json(manifest_json, manifest)
+    render_cache.save()
     manifest["manifest_path"] = str(manifest_json)
+    manifest["render_cache"] = render_cache.stats()
+    if write_stage_outputs:
+        manifest["stage_manifest_paths"] = _write_stage2_to_5_manifests(
+            experiment_root_text,
+            output_path,
+            stage_run_manifests,
+            parameter_payload,
+        )
+    manifest["workers"] = (
+        resolve_worker_count(workers, len(selected_run_ids)) if analysis_source_mode == "raw" else 1
+    )
 
     _write_progress(
         progress_path,
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from tools.stream_analysis.annotations import (
+    _evaluation_distance_summary,
+    _evaluation_row,
+    _frame_key,
+    load_nozzle_annotations,
+)
+from tools.stream_analysis.dataset import (
+    _clean_text,
+    _preferred_columns,
+    _write_csv,
+    _write_json,
+    build_stage0_inventory,
+    default_output_root,
+)
+from tools.stream_analysis.nozzle import _build_stage2_run, _load_gray_image, shared_gray_images
+from tools.stream_analysis.parallel import attach_run_timings, export_selected_runs
+from tools.stream_analysis.silhouette import (
+    INPUT_POLICY,
+    NOZZLE_MIN_AREA_PX,
+    NOZZLE_RESIDUAL_SCALE,
+    NOZZLE_TOP_BAND_SLACK_PX,
+    _analyze_stage3_gray,
+    _summary_from_metric_rows,
+)
+
+
+SWEEP_DIRNAME = "parameter_sweep"
+MAX_SWEEP_COMBINATIONS = 256
+
+NOZZLE_SWEEP_DEFAULTS = {
+    "search_width_frac": 0.22,
+    "search_top_frac": 0.08,
+    "search_bottom_frac": 0.30,
+    "blur_sigma": 12.0,
+    "residual_threshold": 18,
+    "shift_threshold_px": 6.0,
+    "confidence_threshold": 0.55,
+}
+SILHOUETTE_SWEEP_DEFAULTS = {
+    "roi_width_frac": 0.35,
+    "roi_top_frac": 0.10,
+    "roi_bottom_frac": 1.0,
+    "corridor_width_frac": 0.70,
+    "nozzle_guard_px": 2,
+    "min_component_area_px": 120,
+}
+SWEEP_DEFAULTS = {**NOZZLE_SWEEP_DEFAULTS, **SILHOUETTE_SWEEP_DEFAULTS}
+
+SWEEP_RUN_COLUMNS = [
+    "combo_id",
+    "run_id",
+    "frame_count",
+    "ok_frame_count",
+    "ok_frame_rate",
+    "open_bottom_interior_detected_count",
+    "shift_event_count",
+    "selected_component_area_median_px",
+    "valid_row_count_median",
+    "annotation_count",
+    "matched_prediction_count",
+    "mode_match_count",
+    "distance_mean_px",
+    "distance_median_px",
+    "distance_max_px",
+]
+
+SWEEP_COMPARISON_COLUMNS = [
+    "rank",
+    "combo_id",
+    "is_default",
+    *SWEEP_DEFAULTS,
+    "run_count",
+    "frame_count",
+    "ok_frame_count",
+    "ok_frame_rate",
+    "open_bottom_interior_detected_count",
+    "shift_event_count",
+    "selected_component_area_median_px",
+    "valid_row_count_median",
+    "annotation_count",
+    "matched_prediction_count",
+    "mode_match_rate",
+    "distance_mean_px",
+    "distance_median_px",
+    "distance_max_px",
+]
+
+
+def parse_sweep_grid(specs: list[str]) -> dict:
+    # Each spec is "name=v1,v2,..." naming a nozzle or silhouette parameter.
+    grid = {}
+    for spec in specs or []:
+        name, separator, values_text = str(spec).partition("=")
+        name = name.strip().replace("-", "_")
+        if not separator or not values_text.strip():
+            raise ValueError(f"Sweep parameter must look like name=v1,v2: {spec}")
+        if name not in SWEEP_DEFAULTS:
+            raise ValueError(f"Unsupported sweep parameter: {name}")
+        cast = type(SWEEP_DEFAULTS[name])
+        values = []
+        for text in values_text.split(","):
+            text = text.strip()
+            if not text:
+                continue
+            value = cast(float(text)) if cast is int else cast(text)
+            if value not in values:
+                values.append(value)
+        grid[name] = values
+    return grid
+
+
+def sweep_combinations(grid: dict, *, max_combinations: int = MAX_SWEEP_COMBINATIONS) -> list[dict]:
+    names = [name for name in SWEEP_DEFAULTS if grid.get(name)]
+    unknown = sorted(set(grid) - set(SWEEP_DEFAULTS))
+    if unknown:
+        raise ValueError(f"Unsupported sweep parameter: {unknown[0]}")
+    combo_count = int(np.prod([len(grid[name]) for name in names])) if names else 1
+    if combo_count > int(max_combinations):
+        raise ValueError(f"Sweep grid has {combo_count} combinations; the limit is {int(max_combinations)}.")
+
+    combinations = []
+    for index, values in enumerate(itertools.product(*(grid[name] for name in names))):
+        params = dict(SWEEP_DEFAULTS)
+        params.update(zip(names, values))
+        combinations.append({"combo_id": f"combo_{index:03d}", "params": params})
+    return combinations
+
+
+def _nozzle_key(params: dict):
+    return tuple(params[name] for name in NOZZLE_SWEEP_DEFAULTS)
+
+
+def _median_or_none(values: list):
+    return float(np.median(values)) if values else None
+
+
+def _sweep_prediction(tracked_row: dict):
+    # Same tracked-then-raw preference as the annotation queue.
+    tracked_x = tracked_row.get("tracked_nozzle_x_px")
+    tracked_y = tracked_row.get("tracked_nozzle_y_px")
+    if tracked_x is not None and tracked_y is not None:
+        return {
+            "x_px": float(tracked_x),
+            "y_px": float(tracked_y),
+            "mode": _clean_text(tracked_row.get("final_mode")) or _clean_text(tracked_row.get("detection_mode")),
+            "confidence": tracked_row.get("tracked_confidence"),
+            "source": "sweep_stage2",
+        }
+    raw_x = tracked_row.get("raw_nozzle_x_px")
+    raw_y = tracked_row.get("raw_nozzle_y_px")
+    return {
+        "x_px": None if raw_x is None or raw_y is None else float(raw_x),
+        "y_px": None if raw_x is None or raw_y is None else float(raw_y),
+        "mode": _clean_text(tracked_row.get("raw_mode")),
+        "confidence": tracked_row.get("raw_confidence"),
+        "source": "sweep_stage2" if raw_x is not None and raw_y is not None else "missing_prediction",
+    }
+
+
+def _nozzle_evaluation_rows(run_id: str, tracked_rows: list[dict], annotations_by_key: dict):
+    rows = []
+    for tracked_row in tracked_rows:
+        capture_index = tracked_row.get("capture_index")
+        if capture_index is None:
+            continue
+        frame_key = _frame_key(run_id, int(capture_index))
+        annotation_row = annotations_by_key.get(frame_key)
+        if annotation_row is None or annotation_row.get("annotated_nozzle_x_px") is None:
+            continue
+        rows.append(_evaluation_row(frame_key, annotation_row, _sweep_prediction(tracked_row)))
+    return rows
+
+
+def _evaluate_silhouette_combo(run_id: str, frame_rows: list[dict], grays: list, tracked_rows: list[dict], params: dict):
+    metric_rows = []
+    component_rows = []
+    edge_row_count = 0
+    for frame_row, tracked_row, gray in zip(frame_rows, tracked_rows, grays):
+        analysis = _analyze_stage3_gray(
+            run_id,
+            frame_row,
+            tracked_row,
+            gray,
+            **{name: params[name] for name in SILHOUETTE_SWEEP_DEFAULTS},
+        )
+        metric_rows.append(analysis["metric_row"])
+        component_rows.extend(analysis["component_rows"])
+        edge_row_count += len(analysis["edge_columns"]["y_px"])
+    return metric_rows, _summary_from_metric_rows(metric_rows, component_rows, edge_row_count)
+
+
+def _sweep_run(
+    run_row: dict,
+    frame_rows: list[dict],
+    output_path: Path,
+    *,
+    combinations: list[dict],
+    annotations_by_key: dict,
+    combo_workers: int,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
+    with shared_gray_images():
+        # Every frame is decoded once; the read-only grays are shared by all combinations.
+        grays = [_load_gray_image(Path(str(frame_row["image_abs_path"]))) for frame_row in frame_rows]
+
+        stage2_by_key = {}
+        for combo in combinations:
+            key = _nozzle_key(combo["params"])
+            if key in stage2_by_key:
+                continue
+            params = combo["params"]
+            stage2_by_key[key] = _build_stage2_run(
+                run_id,
+                frame_rows,
+                tracking_mode=tracking_mode,
+                search_width_frac=params["search_width_frac"],
+                search_top_frac=params["search_top_frac"],
+                search_bottom_frac=params["search_bottom_frac"],
+                blur_sigma=params["blur_sigma"],
+                residual_scale=NOZZLE_RESIDUAL_SCALE,
+                residual_threshold=params["residual_threshold"],
+                min_area_px=NOZZLE_MIN_AREA_PX,
+                top_band_slack_px=NOZZLE_TOP_BAND_SLACK_PX,
+                shift_threshold_px=params["shift_threshold_px"],
+                confidence_threshold=params["confidence_threshold"],
+            )
+
+        def _evaluate(combo):
+            stage2_run = stage2_by_key[_nozzle_key(combo["params"])]
+            tracked_rows = list(stage2_run["tracked_rows"])
+            return _evaluate_silhouette_combo(run_id, frame_rows, grays, tracked_rows, combo["params"])
+
+        # cv2 and scipy release the GIL, so combinations overlap on threads without
+        # copying the decoded frames into other processes.
+        worker_count = max(1, min(int(combo_workers or 1), len(combinations)))
+        if worker_count <= 1:
+            evaluated = [_evaluate(combo) for combo in combinations]
+        else:
+            with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="sweep-combo") as executor:
+                evaluated = list(executor.map(_evaluate, combinations))
+
+    combo_results = []
+    for combo, (metric_rows, summary) in zip(combinations, evaluated):
+        stage2_run = stage2_by_key[_nozzle_key(combo["params"])]
+        evaluation_rows = _nozzle_evaluation_rows(run_id, list(stage2_run["tracked_rows"]), annotations_by_key)
+        areas = [int(row["selected_component_area_px"]) for row in metric_rows if row.get("selected_component_area_px") is not None]
+        valid_rows = [int(row["valid_row_count"]) for row in metric_rows if row.get("valid_row_count") is not None]
+        combo_results.append(
+            {
+                "combo_id": combo["combo_id"],
+                "run_id": run_id,
+                "frame_count": int(summary["frame_count"]),
+                "ok_frame_count": int(summary["ok_frame_count"]),
+                "ok_frame_rate": float(summary["ok_frame_count"] / summary["frame_count"]) if summary["frame_count"] else None,
+                "open_bottom_interior_detected_count": int(summary["open_bottom_interior_detected_count"]),
+                "shift_event_count": len(stage2_run["shift_events"]),
+                "selected_component_area_median_px": _median_or_none(areas),
+                "valid_row_count_median": _median_or_none(valid_rows),
+                "annotation_count": len(evaluation_rows),
+                "matched_prediction_count": sum(1 for row in evaluation_rows if row.get("predicted_x_px") is not None),
+                "mode_match_count": sum(1 for row in evaluation_rows if row.get("mode_match")),
+                **_evaluation_distance_summary(evaluation_rows),
+                "status_counts": summary["status_counts"],
+                "selected_component_areas": areas,
+                "valid_row_counts": valid_rows,
+                "distances": [float(row["distance_px"]) for row in evaluation_rows if row.get("distance_px") is not None],
+            }
+        )
+    return {
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "tracking_mode": tracking_mode,
+        "frame_count": len(frame_rows),
+        "nozzle_tracking_pass_count": len(stage2_by_key),
+        "combo_results": combo_results,
+    }
+
+
+def _comparison_rows(combinations: list[dict], run_manifests: list[dict]):
+    rows = []
+    for combo in combinations:
+        results = [
+            result
+            for run_manifest in run_manifests
+            for result in run_manifest["combo_results"]
+            if result["combo_id"] == combo["combo_id"]
+        ]
+        frame_count = sum(result["frame_count"] for result in results)
+        ok_frame_count = sum(result["ok_frame_count"] for result in results)
+        annotation_count = sum(result["annotation_count"] for result in results)
+        distances = [value for result in results for value in result["distances"]]
+        areas = [value for result in results for value in result["selected_component_areas"]]
+        valid_rows = [value for result in results for value in result["valid_row_counts"]]
+        rows.append(
+            {
+                "combo_id": combo["combo_id"],
+                "is_default": combo["params"] == SWEEP_DEFAULTS,
+                **combo["params"],
+                "run_count": len(results),
+                "frame_count": frame_count,
+                "ok_frame_count": ok_frame_count,
+                "ok_frame_rate": float(ok_frame_count / frame_count) if frame_count else None,
+                "open_bottom_interior_detected_count": sum(result["open_bottom_interior_detected_count"] for result in results),
+                "shift_event_count": sum(result["shift_event_count"] for result in results),
+                "selected_component_area_median_px": _median_or_none(areas),
+                "valid_row_count_median": _median_or_none(valid_rows),
+                "annotation_count": annotation_count,
+                "matched_prediction_count": sum(result["matched_prediction_count"] for result in results),
+                "mode_match_rate": (
+                    float(sum(result["mode_match_count"] for result in results) / annotation_count)
+                    if annotation_count
+                    else None
+                ),
+                "distance_mean_px": float(np.mean(distances)) if distances else None,
+                "distance_median_px": _median_or_none(distances),
+                "distance_max_px": float(max(distances)) if distances else None,
+            }
+        )
+
+    # Best first: lowest annotated nozzle error, then the most accepted silhouettes.
+    def _rank_key(row):
+        median = row["distance_median_px"]
+        return (median is None, median if median is not None else 0.0, -(row["ok_frame_rate"] or 0.0), row["combo_id"])
+
+    rows.sort(key=_rank_key)
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
+def export_stage3_parameter_sweep(
+    experiment_root: str | Path,
+    *,
+    grid: dict,
+    output_root: str | Path | None = None,
+    run_ids: list[str] | None = None,
+    limit_runs: int | None = None,
+    include_unmatched: bool = False,
+    max_combinations: int = MAX_SWEEP_COMBINATIONS,
+    workers: int | None = 1,
+    combo_workers: int = 1,
+):
+    combinations = sweep_combinations(grid, max_combinations=max_combinations)
+    inventory = build_stage0_inventory(
+        experiment_root,
+        include_unmatched=include_unmatched,
+        run_ids=run_ids,
+        limit_runs=limit_runs,
+    )
+
+    output_path = Path(output_root).expanduser().resolve() if output_root else default_output_root(experiment_root)
+    sweep_dir = output_path / SWEEP_DIRNAME
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+    annotations_by_key = load_nozzle_annotations(experiment_root, output_root=output_root)
+
+    run_manifests, run_timings = export_selected_runs(
+        _sweep_run,
+        inventory,
+        output_path,
+        workers=workers,
+        combinations=combinations,
+        annotations_by_key=annotations_by_key,
+        combo_workers=combo_workers,
+    )
+
+    run_rows = [
+        {key: result[key] for key in SWEEP_RUN_COLUMNS}
+        for run_manifest in run_manifests
+        for result in run_manifest["combo_results"]
+    ]
+    comparison_rows = _comparison_rows(combinations, run_manifests)
+
+    run_csv = sweep_dir / "sweep_run_results.csv"
+    comparison_csv = sweep_dir / "sweep_comparison.csv"
+    manifest_path = sweep_dir / "sweep_manifest.json"
+    _write_csv(run_csv, _preferred_columns(run_rows, SWEEP_RUN_COLUMNS), run_rows)
+    _write_csv(comparison_csv, _preferred_columns(comparison_rows, SWEEP_COMPARISON_COLUMNS), comparison_rows)
+
+    manifest = {
+        "schema_version": 1,
+        "stage": "parameter_sweep",
+        "experiment_root": inventory["experiment_root"],
+        "output_root": str(output_path),
+        "input_policy": INPUT_POLICY,
+        "grid": {name: list(values) for name, values in grid.items() if values},
+        "combination_count": len(combinations),
+        "combinations": combinations,
+        "selected_run_count": len(run_manifests),
+        "run_ids": [row["run_id"] for row in run_manifests],
+        "annotation_count": len(annotations_by_key),
+        "runs": [
+            {
+                "run_id": run_manifest["run_id"],
+                "run_dir": run_manifest["run_dir"],
+                "tracking_mode": run_manifest["tracking_mode"],
+                "frame_count": run_manifest["frame_count"],
+                "nozzle_tracking_pass_count": run_manifest["nozzle_tracking_pass_count"],
+            }
+            for run_manifest in run_manifests
+        ],
+        "best_combo_id": comparison_rows[0]["combo_id"] if comparison_rows else None,
+        "comparison": comparison_rows,
+        "outputs": {
+            "sweep_comparison_csv": str(comparison_csv),
+            "sweep_run_results_csv": str(run_csv),
+        },
+    }
+    _write_json(manifest_path, manifest)
+    manifest["manifest_path"] = str(manifest_path)
+    manifest["combo_workers"] = max(1, int(combo_workers or 1))
+    attach_run_timings(manifest, run_timings, workers=workers)
+    return manifest
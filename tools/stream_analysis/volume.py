@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 
 import cv2
+import numpy as np
 
 from tools.stream_analysis.dataset import (
     _clean_text,
@@ -16,7 +17,10 @@ from tools.stream_analysis.dataset import (
     default_output_root,
 )
 from tools.stream_analysis import fov as fov_mod
+from tools.stream_analysis import nozzle as nozzle_mod
 from tools.stream_analysis import silhouette as silhouette_mod
+from tools.stream_analysis.parallel import attach_run_timings, export_selected_runs
+from tools.stream_analysis.plotting import submit_plot
 
 
 VOLUME_STAGE_DIRNAME = "stage_04_volume"
@@ -140,18 +144,33 @@ def resolve_pixel_size_um(pixel_size_um: float | None = None, *, config_path: st
     return configured if configured is not None else float(DEFAULT_PIXEL_SIZE_UM)
 
 
-def _row_volume_um3(edge_row: dict, *, pixel_size_um: float | None = None):
-    pixel_size_um = resolve_pixel_size_um(pixel_size_um)
+def _edge_volumes_um3(x_left_px, x_right_px, *, pixel_size_um: float):
     # Edge traces are inclusive pixel bounds, so convert the occupied span to
     # diameter with a +1 px width before halving to a radius.
-    radius_px = max(0.0, (float(edge_row["x_right_px"]) - float(edge_row["x_left_px"]) + 1.0) / 2.0)
+    radius_px = np.maximum(
+        0.0,
+        (np.asarray(x_right_px, dtype=np.float64) - np.asarray(x_left_px, dtype=np.float64) + 1.0) / 2.0,
+    )
     radius_um = radius_px * float(pixel_size_um)
     return math.pi * (radius_um**2) * float(pixel_size_um)
 
 
+def _row_volume_um3(edge_row: dict, *, pixel_size_um: float | None = None):
+    pixel_size_um = resolve_pixel_size_um(pixel_size_um)
+    return float(
+        _edge_volumes_um3(edge_row["x_left_px"], edge_row["x_right_px"], pixel_size_um=pixel_size_um)
+    )
+
+
 def _component_volume_um3(edge_rows: list[dict], *, pixel_size_um: float | None = None):
     pixel_size_um = resolve_pixel_size_um(pixel_size_um)
-    return float(sum(_row_volume_um3(row, pixel_size_um=pixel_size_um) for row in edge_rows))
+    row_volumes = _edge_volumes_um3(
+        [row["x_left_px"] for row in edge_rows],
+        [row["x_right_px"] for row in edge_rows],
+        pixel_size_um=pixel_size_um,
+    )
+    # Sequential sum keeps totals identical to the per-component bincount path.
+    return float(sum(np.atleast_1d(row_volumes).tolist()))
 
 
 def _um3_to_nl(value_um3: float | None):
@@ -349,16 +368,55 @@ def _build_sample_panel(
     return cv2.hconcat(row_images)
 
 
-def _component_volume_rows(component_rows: list[dict], edge_rows: list[dict], *, pixel_size_um: float | None = None):
-    pixel_size_um = resolve_pixel_size_um(pixel_size_um)
+def _component_volumes_um3(
+    component_rows: list[dict],
+    edge_rows: list[dict],
+    edge_columns: dict | None,
+    *,
+    pixel_size_um: float,
+):
+    if edge_columns is not None:
+        # Columnar traces carry the owning component's position in component_rows.
+        row_volumes = _edge_volumes_um3(
+            edge_columns["x_left_px"],
+            edge_columns["x_right_px"],
+            pixel_size_um=pixel_size_um,
+        )
+        return np.bincount(
+            np.asarray(edge_columns["component_index"], dtype=np.int64),
+            weights=row_volumes,
+            minlength=len(component_rows),
+        )[: len(component_rows)].tolist()
+
     edges_by_component = {}
     for row in edge_rows:
         edges_by_component.setdefault(_component_row_key(row), []).append(row)
+    return [
+        _component_volume_um3(
+            edges_by_component.get(_component_row_key(component_row), []),
+            pixel_size_um=pixel_size_um,
+        )
+        for component_row in component_rows
+    ]
+
+
+def _component_volume_rows(
+    component_rows: list[dict],
+    edge_rows: list[dict],
+    *,
+    pixel_size_um: float | None = None,
+    edge_columns: dict | None = None,
+):
+    pixel_size_um = resolve_pixel_size_um(pixel_size_um)
+    component_volumes_um3 = _component_volumes_um3(
+        component_rows,
+        edge_rows,
+        edge_columns,
+        pixel_size_um=pixel_size_um,
+    )
 
     volume_rows = []
-    for component_row in component_rows:
-        key = _component_row_key(component_row)
-        component_edge_rows = edges_by_component.get(key, [])
+    for component_row, component_volume_um3 in zip(component_rows, component_volumes_um3):
         volume_rows.append(
             {
                 "run_id": component_row.get("run_id"),
@@ -368,9 +426,7 @@ def _component_volume_rows(component_rows: list[dict], edge_rows: list[dict], *,
                 "component_id": component_row.get("component_id"),
                 "component_role": component_row.get("component_role"),
                 "component_rank": _int_or_none(component_row.get("component_rank")),
-                "component_volume_nl": _um3_to_nl(
-                    _component_volume_um3(component_edge_rows, pixel_size_um=pixel_size_um)
-                ),
+                "component_volume_nl": _um3_to_nl(component_volume_um3),
                 "valid_row_count": _int_or_none(component_row.get("valid_row_count")),
                 "top_y_px": _int_or_none(component_row.get("top_y_px")),
                 "bottom_y_px": _int_or_none(component_row.get("bottom_y_px")),
@@ -392,13 +448,17 @@ def _analyze_stage4_frame(
     pixel_size_um = resolve_pixel_size_um(pixel_size_um)
     stage3_metric_row = dict(stage3_frame.get("metric_row") or {})
     component_rows = [dict(row) for row in list(stage3_frame.get("component_rows") or [])]
-    edge_rows = [dict(row) for row in list(stage3_frame.get("edge_rows") or [])]
     labeled_stage3_rows, fov_report = fov_mod.label_frame_trust(
         [stage3_metric_row],
         component_rows,
         near_bottom_px=int(near_bottom_px),
     )
-    component_volume_rows = _component_volume_rows(component_rows, edge_rows, pixel_size_um=pixel_size_um)
+    component_volume_rows = _component_volume_rows(
+        component_rows,
+        [],
+        pixel_size_um=pixel_size_um,
+        edge_columns=stage3_frame["edge_columns"],
+    )
     frame_metric_rows = _frame_metric_rows(labeled_stage3_rows, component_volume_rows)
     return {
         "pixel_size_um": float(pixel_size_um),
@@ -735,6 +795,8 @@ def _build_stage4_run(
     nozzle_guard_px: int,
     min_component_area_px: int,
     pixel_size_um: float | None = None,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
 ):
     pixel_size_um = resolve_pixel_size_um(pixel_size_um)
     stage3_run = silhouette_mod._build_stage3_run(
@@ -756,6 +818,8 @@ def _build_stage4_run(
         corridor_width_frac=corridor_width_frac,
         nozzle_guard_px=nozzle_guard_px,
         min_component_area_px=min_component_area_px,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
     )
     labeled_stage3_rows, fov_report = fov_mod.label_frame_trust(
         list(stage3_run["metric_rows"]),
@@ -764,8 +828,9 @@ def _build_stage4_run(
     )
     component_volume_rows = _component_volume_rows(
         list(stage3_run["component_rows"]),
-        list(stage3_run["edge_rows"]),
+        [],
         pixel_size_um=pixel_size_um,
+        edge_columns=stage3_run["edge_columns"],
     )
     frame_metric_rows = _frame_metric_rows(
         labeled_stage3_rows,
@@ -785,6 +850,192 @@ def _build_stage4_run(
     }
 
 
+def _export_stage4_run(
+    run_row: dict,
+    frame_rows: list[dict],
+    output_path: Path,
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_threshold: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+    roi_width_frac: float,
+    roi_top_frac: float,
+    roi_bottom_frac: float,
+    corridor_width_frac: float,
+    nozzle_guard_px: int,
+    min_component_area_px: int,
+    pixel_size_um: float,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
+):
+    run_id = str(run_row["run_id"])
+    tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
+
+    stage4_run = _build_stage4_run(
+        run_id,
+        frame_rows,
+        tracking_mode=tracking_mode,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+        pixel_size_um=pixel_size_um,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
+    return _write_stage4_run_outputs(run_row, stage4_run, output_path)
+
+
+def _write_stage4_run_outputs(run_row: dict, stage4_run: dict, output_path: Path):
+    run_id = str(run_row["run_id"])
+    pixel_size_um = float(stage4_run["pixel_size_um"])
+    component_volume_rows = list(stage4_run["component_volume_rows"])
+    frame_metric_rows = list(stage4_run["frame_metric_rows"])
+    timeseries_rows = list(stage4_run["timeseries_rows"])
+    summary_counts = dict(stage4_run["summary_counts"])
+
+    fov_report = {
+        **dict(stage4_run["fov_report"]),
+        "stage": "volume",
+        "run_id": run_id,
+        "volume_unit": "nL",
+        "trusted_frame_count": int(summary_counts["trusted_frame_count"]),
+        "untrusted_frame_count": int(summary_counts["untrusted_frame_count"]),
+        "unavailable_geometry_frame_count": int(summary_counts["unavailable_geometry_frame_count"]),
+    }
+
+    stage_dir = output_path / "runs" / run_id / VOLUME_STAGE_DIRNAME
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    sample_dir = stage_dir / "samples"
+    if sample_dir.exists():
+        for stale_panel in sample_dir.glob("*.png"):
+            stale_panel.unlink()
+    else:
+        sample_dir.mkdir(parents=True, exist_ok=True)
+
+    component_rows_by_capture = {}
+    for row in component_volume_rows:
+        component_rows_by_capture.setdefault(_capture_key(row), []).append(row)
+
+    sample_panels = []
+    sample_panel_paths = []
+    for capture_index in stage4_run["sample_indices"]:
+        sample_input = stage4_run["sample_inputs"].get(int(capture_index))
+        if sample_input is None:
+            continue
+        frame_metric_row = next(
+            (
+                row
+                for row in frame_metric_rows
+                if int(row.get("capture_index") or 0) == int(capture_index)
+            ),
+            None,
+        )
+        if frame_metric_row is None:
+            continue
+        gray = silhouette_mod._load_gray_image(Path(str(sample_input["image_path"])))
+        panel = _build_sample_panel(
+            gray,
+            sample_input,
+            frame_metric_row,
+            component_rows_by_capture.get(_capture_key(frame_metric_row), []),
+            fov_report=fov_report,
+        )
+        panel_path = sample_dir / f"frame_{int(capture_index):03d}_panel.png"
+        cv2.imwrite(str(panel_path), panel)
+        sample_panels.append(panel)
+        sample_panel_paths.append(str(panel_path))
+
+    frame_metrics_csv = stage_dir / "frame_metrics.csv"
+    component_volumes_csv = stage_dir / "component_volumes.csv"
+    timeseries_csv = stage_dir / "volume_timeseries.csv"
+    timeseries_json = stage_dir / "volume_timeseries.json"
+    fov_exit_report_json = stage_dir / "fov_exit_report.json"
+    vt_png = stage_dir / "Vt.png"
+    summary_json = stage_dir / "volume_manifest.json"
+    contact_sheet_png = stage_dir / "sample_contact_sheet.png"
+
+    _write_csv(frame_metrics_csv, _preferred_columns(frame_metric_rows, FRAME_METRIC_COLUMNS), frame_metric_rows)
+    _write_csv(component_volumes_csv, _preferred_columns(component_volume_rows, COMPONENT_VOLUME_COLUMNS), component_volume_rows)
+    _write_csv(timeseries_csv, _preferred_columns(timeseries_rows, TIMESERIES_COLUMNS), timeseries_rows)
+    _write_json(
+        timeseries_json,
+        {
+            "schema_version": 1,
+            "stage": "volume",
+            "run_id": run_id,
+            "volume_unit": "nL",
+            "row_count": len(timeseries_rows),
+            "rows": timeseries_rows,
+        },
+    )
+    _write_json(fov_exit_report_json, fov_report)
+    submit_plot(_write_vt_plot, vt_png, frame_metric_rows, run_id=run_id, fov_report=fov_report)
+    if sample_panels:
+        cv2.imwrite(str(contact_sheet_png), cv2.vconcat(sample_panels))
+
+    summary = {
+        "schema_version": 1,
+        "stage": "volume",
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "pixel_size_um": float(pixel_size_um),
+        "volume_unit": "nL",
+        "fov_near_bottom_px": int(fov_mod.FOV_NEAR_BOTTOM_PX),
+        "sample_capture_indices": list(stage4_run["sample_indices"]),
+        "sample_panel_paths": sample_panel_paths,
+        "outputs": {
+            "frame_metrics_csv": str(frame_metrics_csv),
+            "component_volumes_csv": str(component_volumes_csv),
+            "volume_timeseries_csv": str(timeseries_csv),
+            "volume_timeseries_json": str(timeseries_json),
+            "fov_exit_report_json": str(fov_exit_report_json),
+            "vt_png": str(vt_png),
+            "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
+        },
+        "first_fov_exit_capture_index": fov_report.get("first_fov_exit_capture_index"),
+        "first_fov_exit_capture_id": fov_report.get("first_fov_exit_capture_id"),
+        "first_untrusted_capture_index": fov_report.get("first_untrusted_capture_index"),
+        "trusted_frame_count": int(summary_counts["trusted_frame_count"]),
+        "untrusted_frame_count": int(summary_counts["untrusted_frame_count"]),
+        "unavailable_geometry_frame_count": int(summary_counts["unavailable_geometry_frame_count"]),
+        "summary": summary_counts,
+        "shift_events": list(stage4_run["shift_events"]),
+    }
+    _write_json(summary_json, summary)
+    return {
+        "run_id": run_id,
+        "run_dir": run_row["run_dir"],
+        "frame_metrics_csv": str(frame_metrics_csv),
+        "component_volumes_csv": str(component_volumes_csv),
+        "volume_timeseries_csv": str(timeseries_csv),
+        "volume_timeseries_json": str(timeseries_json),
+        "fov_exit_report_json": str(fov_exit_report_json),
+        "vt_png": str(vt_png),
+        "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
+        "frame_count": len(frame_metric_rows),
+        "component_volume_row_count": len(component_volume_rows),
+        "sample_frame_count": len(stage4_run["sample_indices"]),
+    }
+
+
 def export_stage4_volume(
     experiment_root: str | Path,
     *,
@@ -808,6 +1059,9 @@ def export_stage4_volume(
     nozzle_guard_px: int = 2,
     min_component_area_px: int = 120,
     pixel_size_um: float | None = None,
+    prefetch_depth: int = nozzle_mod.PREFETCH_DEPTH,
+    prefetch_max_bytes: int | None = nozzle_mod.PREFETCH_MAX_BYTES,
+    workers: int | None = 1,
 ):
     pixel_size_um = resolve_pixel_size_um(pixel_size_um)
     inventory = build_stage0_inventory(
@@ -820,170 +1074,82 @@ def export_stage4_volume(
     output_path = Path(output_root).expanduser().resolve() if output_root else default_output_root(experiment_root)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    run_manifests = []
-    for run_row in inventory["selected_runs"]:
-        run_id = str(run_row["run_id"])
-        tracking_mode = str(run_row.get("tracking_mode") or "dynamic")
-        frame_rows = list(inventory["frames_by_run_id"][run_id])
-        if not frame_rows:
-            raise ValueError(f"No frame index rows available for run: {run_id}")
-
-        stage4_run = _build_stage4_run(
-            run_id,
-            frame_rows,
-            tracking_mode=tracking_mode,
-            sample_count=sample_count,
-            extra_frame_indices=extra_frame_indices,
-            search_width_frac=search_width_frac,
-            search_top_frac=search_top_frac,
-            search_bottom_frac=search_bottom_frac,
-            blur_sigma=blur_sigma,
-            residual_threshold=residual_threshold,
-            shift_threshold_px=shift_threshold_px,
-            confidence_threshold=confidence_threshold,
-            roi_width_frac=roi_width_frac,
-            roi_top_frac=roi_top_frac,
-            roi_bottom_frac=roi_bottom_frac,
-            corridor_width_frac=corridor_width_frac,
-            nozzle_guard_px=nozzle_guard_px,
-            min_component_area_px=min_component_area_px,
-            pixel_size_um=pixel_size_um,
-        )
-        component_volume_rows = list(stage4_run["component_volume_rows"])
-        frame_metric_rows = list(stage4_run["frame_metric_rows"])
-        timeseries_rows = list(stage4_run["timeseries_rows"])
-        summary_counts = dict(stage4_run["summary_counts"])
+    run_manifests, run_timings = export_selected_runs(
+        _export_stage4_run,
+        inventory,
+        output_path,
+        workers=workers,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+        pixel_size_um=pixel_size_um,
+        prefetch_depth=prefetch_depth,
+        prefetch_max_bytes=prefetch_max_bytes,
+    )
 
-        fov_report = {
-            **dict(stage4_run["fov_report"]),
-            "stage": "volume",
-            "run_id": run_id,
-            "volume_unit": "nL",
-            "trusted_frame_count": int(summary_counts["trusted_frame_count"]),
-            "untrusted_frame_count": int(summary_counts["untrusted_frame_count"]),
-            "unavailable_geometry_frame_count": int(summary_counts["unavailable_geometry_frame_count"]),
-        }
-
-        stage_dir = output_path / "runs" / run_id / VOLUME_STAGE_DIRNAME
-        stage_dir.mkdir(parents=True, exist_ok=True)
-        sample_dir = stage_dir / "samples"
-        if sample_dir.exists():
-            for stale_panel in sample_dir.glob("*.png"):
-                stale_panel.unlink()
-        else:
-            sample_dir.mkdir(parents=True, exist_ok=True)
-
-        component_rows_by_capture = {}
-        for row in component_volume_rows:
-            component_rows_by_capture.setdefault(_capture_key(row), []).append(row)
-
-        sample_panels = []
-        sample_panel_paths = []
-        for capture_index in stage4_run["sample_indices"]:
-            sample_input = stage4_run["sample_inputs"].get(int(capture_index))
-            if sample_input is None:
-                continue
-            frame_metric_row = next(
-                (
-                    row
-                    for row in frame_metric_rows
-                    if int(row.get("capture_index") or 0) == int(capture_index)
-                ),
-                None,
-            )
-            if frame_metric_row is None:
-                continue
-            gray = silhouette_mod._load_gray_image(Path(str(sample_input["image_path"])))
-            panel = _build_sample_panel(
-                gray,
-                sample_input,
-                frame_metric_row,
-                component_rows_by_capture.get(_capture_key(frame_metric_row), []),
-                fov_report=fov_report,
-            )
-            panel_path = sample_dir / f"frame_{int(capture_index):03d}_panel.png"
-            cv2.imwrite(str(panel_path), panel)
-            sample_panels.append(panel)
-            sample_panel_paths.append(str(panel_path))
-
-        frame_metrics_csv = stage_dir / "frame_metrics.csv"
-        component_volumes_csv = stage_dir / "component_volumes.csv"
-        timeseries_csv = stage_dir / "volume_timeseries.csv"
-        timeseries_json = stage_dir / "volume_timeseries.json"
-        fov_exit_report_json = stage_dir / "fov_exit_report.json"
-        vt_png = stage_dir / "Vt.png"
-        summary_json = stage_dir / "volume_manifest.json"
-        contact_sheet_png = stage_dir / "sample_contact_sheet.png"
-
-        _write_csv(frame_metrics_csv, _preferred_columns(frame_metric_rows, FRAME_METRIC_COLUMNS), frame_metric_rows)
-        _write_csv(component_volumes_csv, _preferred_columns(component_volume_rows, COMPONENT_VOLUME_COLUMNS), component_volume_rows)
-        _write_csv(timeseries_csv, _preferred_columns(timeseries_rows, TIMESERIES_COLUMNS), timeseries_rows)
-        _write_json(
-            timeseries_json,
-            {
-                "schema_version": 1,
-                "stage": "volume",
-                "run_id": run_id,
-                "volume_unit": "nL",
-                "row_count": len(timeseries_rows),
-                "rows": timeseries_rows,
-            },
-        )
-        _write_json(fov_exit_report_json, fov_report)
-        _write_vt_plot(vt_png, frame_metric_rows, run_id=run_id, fov_report=fov_report)
-        if sample_panels:
-            cv2.imwrite(str(contact_sheet_png), cv2.vconcat(sample_panels))
+    manifest = _write_stage4_manifest(
+        inventory["experiment_root"],
+        output_path,
+        run_manifests,
+        sample_count=sample_count,
+        extra_frame_indices=extra_frame_indices,
+        search_width_frac=search_width_frac,
+        search_top_frac=search_top_frac,
+        search_bottom_frac=search_bottom_frac,
+        blur_sigma=blur_sigma,
+        residual_threshold=residual_threshold,
+        shift_threshold_px=shift_threshold_px,
+        confidence_threshold=confidence_threshold,
+        roi_width_frac=roi_width_frac,
+        roi_top_frac=roi_top_frac,
+        roi_bottom_frac=roi_bottom_frac,
+        corridor_width_frac=corridor_width_frac,
+        nozzle_guard_px=nozzle_guard_px,
+        min_component_area_px=min_component_area_px,
+        pixel_size_um=pixel_size_um,
+    )
+    attach_run_timings(manifest, run_timings, workers=workers)
+    return manifest
 
-        summary = {
-            "schema_version": 1,
-            "stage": "volume",
-            "run_id": run_id,
-            "run_dir": run_row["run_dir"],
-            "pixel_size_um": float(pixel_size_um),
-            "volume_unit": "nL",
-            "fov_near_bottom_px": int(fov_mod.FOV_NEAR_BOTTOM_PX),
-            "sample_capture_indices": list(stage4_run["sample_indices"]),
-            "sample_panel_paths": sample_panel_paths,
-            "outputs": {
-                "frame_metrics_csv": str(frame_metrics_csv),
-                "component_volumes_csv": str(component_volumes_csv),
-                "volume_timeseries_csv": str(timeseries_csv),
-                "volume_timeseries_json": str(timeseries_json),
-                "fov_exit_report_json": str(fov_exit_report_json),
-                "vt_png": str(vt_png),
-                "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
-            },
-            "first_fov_exit_capture_index": fov_report.get("first_fov_exit_capture_index"),
-            "first_fov_exit_capture_id": fov_report.get("first_fov_exit_capture_id"),
-            "first_untrusted_capture_index": fov_report.get("first_untrusted_capture_index"),
-            "trusted_frame_count": int(summary_counts["trusted_frame_count"]),
-            "untrusted_frame_count": int(summary_counts["untrusted_frame_count"]),
-            "unavailable_geometry_frame_count": int(summary_counts["unavailable_geometry_frame_count"]),
-            "summary": summary_counts,
-            "shift_events": list(stage4_run["shift_events"]),
-        }
-        _write_json(summary_json, summary)
-        run_manifests.append(
-            {
-                "run_id": run_id,
-                "run_dir": run_row["run_dir"],
-                "frame_metrics_csv": str(frame_metrics_csv),
-                "component_volumes_csv": str(component_volumes_csv),
-                "volume_timeseries_csv": str(timeseries_csv),
-                "volume_timeseries_json": str(timeseries_json),
-                "fov_exit_report_json": str(fov_exit_report_json),
-                "vt_png": str(vt_png),
-                "sample_contact_sheet_png": str(contact_sheet_png) if sample_panels else None,
-                "frame_count": len(frame_metric_rows),
-                "component_volume_row_count": len(component_volume_rows),
-                "sample_frame_count": len(stage4_run["sample_indices"]),
-            }
-        )
 
+def _write_stage4_manifest(
+    experiment_root: str,
+    output_path: Path,
+    run_manifests: list[dict],
+    *,
+    sample_count: int,
+    extra_frame_indices: list[int] | None,
+    search_width_frac: float,
+    search_top_frac: float,
+    search_bottom_frac: float,
+    blur_sigma: float,
+    residual_threshold: int,
+    shift_threshold_px: float,
+    confidence_threshold: float,
+    roi_width_frac: float,
+    roi_top_frac: float,
+    roi_bottom_frac: float,
+    corridor_width_frac: float,
+    nozzle_guard_px: int,
+    min_component_area_px: int,
+    pixel_size_um: float,
+):
     manifest = {
         "schema_version": 1,
         "stage": "volume",
-        "experiment_root": inventory["experiment_root"],
+        "experiment_root": experiment_root,
         "output_root": str(output_path),
         "pixel_size_um": float(pixel_size_um),
         "volume_unit": "nL",